@@ -1,35 +1,153 @@
 """Typed representation of a ResticLVM backup configuration file."""
 
+import re
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
+from resticlvm.orchestration.performance import (
+    COMPRESSION_MODES,
+    PerformanceProfile,
+)
 from resticlvm.orchestration.restic_repo import ResticPruneKeepParams
+from resticlvm.orchestration.snapshot_geometry import parse_chunksize
+from resticlvm.orchestration.units import parse_size_bytes
 
 
-def _parse_prune_policy(raw: dict) -> ResticPruneKeepParams:
+def _parse_prune_policy(name: str, raw: dict) -> ResticPruneKeepParams:
+    max_unused = raw.get("max_unused")
+    if max_unused is not None:
+        max_unused = str(max_unused)
+        if max_unused != "unlimited" and not max_unused.endswith("%"):
+            _check_size(name, "max_unused", max_unused)
+    for key in ("max_repack_size", "min_reclaimable"):
+        if key in raw:
+            _check_size(name, key, str(raw[key]))
     return ResticPruneKeepParams(
         last=int(raw["keep_last"]),
         daily=int(raw["keep_daily"]),
         weekly=int(raw["keep_weekly"]),
         monthly=int(raw["keep_monthly"]),
         yearly=int(raw["keep_yearly"]),
+        max_unused=max_unused,
+        max_repack_size=(
+            str(raw["max_repack_size"]) if "max_repack_size" in raw else None
+        ),
+        min_reclaimable=(
+            str(raw["min_reclaimable"]) if "min_reclaimable" in raw else None
+        ),
+        prune_every_days=int(raw.get("prune_every_days", 0)),
     )
 
 
+def _check_size(policy: str, key: str, value: str) -> None:
+    try:
+        parse_size_bytes(value)
+    except ValueError:
+        raise ValueError(
+            f"Prune policy '{policy}': {key} must be a size such as "
+            f"\"500M\" or \"2G\", got '{value}'"
+        ) from None
+
+
+def _parse_performance_profile(name: str, raw: dict) -> PerformanceProfile:
+    def positive_int(key: str) -> int | None:
+        if key not in raw:
+            return None
+        value = raw[key]
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            raise ValueError(
+                f"Performance profile '{name}': {key} must be a positive "
+                f"integer, got '{value}'"
+            )
+        return value
+
+    compression = raw.get("compression")
+    if compression is not None and compression not in COMPRESSION_MODES:
+        raise ValueError(
+            f"Performance profile '{name}': unknown compression "
+            f"'{compression}' (expected one of: {', '.join(COMPRESSION_MODES)})"
+        )
+    pack_size = positive_int("pack_size")
+    if pack_size is not None and not 4 <= pack_size <= 128:
+        raise ValueError(
+            f"Performance profile '{name}': pack_size must be between 4 and "
+            f"128 (MiB), got {pack_size}"
+        )
+
+    connections = {}
+    for backend, limit in raw.get("connections", {}).items():
+        if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+            raise ValueError(
+                f"Performance profile '{name}': connections.{backend} must "
+                f"be a positive integer, got '{limit}'"
+            )
+        connections[backend] = limit
+
+    gogc = raw.get("gogc")
+    if gogc is not None:
+        gogc = str(gogc)
+        if gogc != "off" and not gogc.isdigit():
+            raise ValueError(
+                f"Performance profile '{name}': gogc must be a percentage "
+                f"or \"off\", got '{gogc}'"
+            )
+
+    return PerformanceProfile(
+        compression=compression,
+        pack_size=pack_size,
+        read_concurrency=positive_int("read_concurrency"),
+        connections=connections,
+        gomaxprocs=positive_int("gomaxprocs"),
+        gogc=gogc,
+    )
+
+
+# Copy modes for copy_to destinations. "copy" re-encrypts snapshots with
+# `restic copy`; "mirror" replicates the repository files as-is and requires
+# the destination to share the source's repository ID and keys.
+COPY_MODES = ("copy", "mirror")
+
+# Snapshot mount profiles (see snapshot_mount.sh). "readonly" keeps mounting
+# and reading from writing to the snapshot's COW area; "legacy" is a plain
+# read-write mount.
+MOUNT_PROFILES = ("readonly", "legacy")
+
+# Backends a mirror destination can be written to (see mirror_repo.sh).
+_MIRROR_DEST_PREFIXES = ("sftp:", "rclone:")
+
+
+def is_local_repo(repo_path: str) -> bool:
+    """True if ``repo_path`` is a plain filesystem path (no backend prefix)."""
+    return re.match(r"^[a-z0-9]+:", str(repo_path)) is None
+
+
 class VolumeType(Enum):
     STANDARD_PATH = "standard_path"
     LV_ROOT = "lv_root"
     LV_NONROOT = "lv_nonroot"
+    COMMAND = "command"
 
 
 @dataclass
 class CopyDestConfig:
-    """A copy-to destination for a repository."""
+    """A copy-to destination for a repository.
+
+    Mirror destinations (``mode = "mirror"``) are never pruned on their own;
+    they follow the source through a deletion sync after each source prune,
+    so ``prune_keep_params`` may be None for them.
+
+    ``source`` optionally names another copy_to entry of the same repository
+    to copy from instead of the repository itself (see copy_graph).
+    """
 
     repo_path: str
     password_file: Path
-    prune_keep_params: ResticPruneKeepParams
+    prune_keep_params: ResticPruneKeepParams | None
+    mode: str = "copy"
+    name: str | None = None
+    source: str | None = None
+    performance_profile: PerformanceProfile | None = None
 
 
 @dataclass
@@ -40,6 +158,34 @@ class RepoConfig:
     password_file: Path
     prune_keep_params: ResticPruneKeepParams
     copy_destinations: list[CopyDestConfig] = field(default_factory=list)
+    performance_profile: PerformanceProfile | None = None
+
+
+# Sizes restic accepts for --exclude-larger-than (e.g. "500M", "2G").
+_RESTIC_SIZE_RE = re.compile(r"^\d+[kKmMgGtT]?$")
+
+
+@dataclass
+class ExclusionSettings:
+    """Per-volume exclusion rules applied on top of ``exclude_paths``."""
+
+    exclude_file: list[Path] = field(default_factory=list)
+    exclude_caches: bool = False
+    exclude_if_present: list[str] = field(default_factory=list)
+    exclude_larger_than: str | None = None
+    iexclude: list[str] = field(default_factory=list)
+
+
+@dataclass
+class StandbyConfig:
+    """Where a volume's warm standby copy is kept (see standby.py).
+
+    Exactly one of ``path`` (a directory) or ``lv_name`` (an existing LV in
+    the volume's VG) is set.
+    """
+
+    path: str | None = None
+    lv_name: str | None = None
 
 
 @dataclass
@@ -53,6 +199,19 @@ class VolumeConfig:
     vg_name: str | None = None
     lv_name: str | None = None
     snapshot_size: str | None = None
+    exclusions: ExclusionSettings = field(default_factory=ExclusionSettings)
+    performance_profile: PerformanceProfile | None = None
+    command: str | None = None
+    stdin_filename: str | None = None
+    fan_out: bool = False
+    file_index: bool = False
+    standby: StandbyConfig | None = None
+    retain_snapshots: int = 0
+    # COW geometry of the volume's snapshot (see snapshot_geometry.py).
+    snapshot_chunksize: str | None = None
+    snapshot_pvs: list[str] = field(default_factory=list)
+    # Volumes whose snapshots are always taken together (snapshot_waves.py).
+    consistency_group: str | None = None
 
 
 @dataclass
@@ -61,6 +220,71 @@ class SnapshotSettings:
 
     min_vg_free_after_snapshots: str = "1G"
     snapshot_cow_warn_percent: int = 70
+    # How snapshots are mounted (snapshot_mount.sh): "readonly" or "legacy".
+    mount_profile: str = "readonly"
+    snapshot_readonly_lv: bool = False
+    separate_cow_pv: bool = True
+    # Retained rollback snapshots (see retention.py).
+    retain_budget: str | None = None
+    retain_max_classic_per_origin: int = 1
+    retain_thin_pool_max_percent: int = 80
+
+
+@dataclass
+class ConcurrencySettings:
+    """Top-level limits for parallel repository operations (copies, etc.)."""
+
+    max_parallel: int = 1
+    per_backend: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class GroupingSettings:
+    """Top-level settings for backing up volumes together (see grouping.py)."""
+
+    enabled: bool = False
+
+
+@dataclass
+class CatalogSettings:
+    """Top-level settings for the local snapshot catalog (see catalog.py)."""
+
+    reconcile_every_hours: int = 24
+
+
+@dataclass
+class LayoutSettings:
+    """Top-level settings for the LVM layout manifest (see layout.py)."""
+
+    enabled: bool = True
+
+
+@dataclass
+class CheckSettings:
+    """Top-level settings for ``rlvm check`` (see check_runner.py).
+
+    Each repository's data is read in full once per ``read_data_every_days``,
+    as ``subsets`` rotating ``--read-data-subset`` slices (0 days = structure
+    checks only). ``max_read_bytes`` and ``max_minutes`` bound one run.
+    """
+
+    read_data_every_days: int = 30
+    subsets: int = 30
+    max_read_bytes: str | None = None
+    max_minutes: int | None = None
+
+
+@dataclass
+class ThrottleSettings:
+    """Top-level settings for pacing backups (see throttle.py).
+
+    With ``latency_slo_ms`` unset, backups run unthrottled.
+    """
+
+    latency_slo_ms: float | None = None
+    devices: list[str] = field(default_factory=list)
+    interval_ms: int = 1000
+    min_duty_percent: int = 10
 
 
 @dataclass
@@ -70,6 +294,15 @@ class BackupConfig:
     prune_policies: dict[str, ResticPruneKeepParams]
     volumes: dict[str, VolumeConfig]
     snapshot_settings: SnapshotSettings = field(default_factory=SnapshotSettings)
+    concurrency: ConcurrencySettings = field(default_factory=ConcurrencySettings)
+    performance_profiles: dict[str, PerformanceProfile] = field(
+        default_factory=dict
+    )
+    grouping: GroupingSettings = field(default_factory=GroupingSettings)
+    catalog: CatalogSettings = field(default_factory=CatalogSettings)
+    check: CheckSettings = field(default_factory=CheckSettings)
+    layout: LayoutSettings = field(default_factory=LayoutSettings)
+    throttle: ThrottleSettings = field(default_factory=ThrottleSettings)
 
 
 class BackupConfigFactory:
@@ -78,9 +311,13 @@ class BackupConfigFactory:
     def __init__(self, raw: dict):
         self._raw = raw
         self._policies = {
-            name: _parse_prune_policy(p)
+            name: _parse_prune_policy(name, p)
             for name, p in raw.get("prune_policy", {}).items()
         }
+        self._profiles = {
+            name: _parse_performance_profile(name, p)
+            for name, p in raw.get("performance_profile", {}).items()
+        }
 
     def _resolve_prune_policy(self, repo_entry: dict) -> ResticPruneKeepParams:
         name = repo_entry["prune_policy"]
@@ -91,25 +328,133 @@ class BackupConfigFactory:
             )
         return self._policies[name]
 
+    def _resolve_performance_profile(
+        self, entry: dict
+    ) -> PerformanceProfile | None:
+        name = entry.get("performance_profile")
+        if name is None:
+            return None
+        if name not in self._profiles:
+            raise ValueError(
+                f"Performance profile '{name}' not found in "
+                f"[performance_profile] section"
+            )
+        return self._profiles[name]
+
+    def _parse_copy_dest(self, source_path: str, raw: dict) -> CopyDestConfig:
+        """Parse one copy_to entry; ``source_path`` is the repo it copies from."""
+        mode = raw.get("mode", "copy")
+        if mode not in COPY_MODES:
+            raise ValueError(
+                f"copy_to '{raw['repo']}': unknown mode '{mode}' "
+                f"(expected one of: {', '.join(COPY_MODES)})"
+            )
+
+        prune_keep_params = None
+        if mode == "mirror":
+            if not is_local_repo(source_path):
+                raise ValueError(
+                    f"copy_to '{raw['repo']}': mirror mode needs a local "
+                    f"source repository, got '{source_path}'"
+                )
+            dest = raw["repo"]
+            if not (is_local_repo(dest) or dest.startswith(_MIRROR_DEST_PREFIXES)):
+                raise ValueError(
+                    f"copy_to '{dest}': mirror mode supports local, sftp: "
+                    f"and rclone: destinations only"
+                )
+            if "prune_policy" in raw:
+                prune_keep_params = self._resolve_prune_policy(raw)
+        else:
+            prune_keep_params = self._resolve_prune_policy(raw)
+
+        return CopyDestConfig(
+            repo_path=raw["repo"],
+            password_file=Path(raw["password_file"]),
+            prune_keep_params=prune_keep_params,
+            mode=mode,
+            performance_profile=self._resolve_performance_profile(raw),
+        )
+
+    def _parse_copy_dests(self, repo_raw: dict) -> list[CopyDestConfig]:
+        """Parse a repository's copy_to entries and validate their topology.
+
+        Entries may name another entry as their ``source``; the result must
+        be a tree rooted at the repository (no unknown names, no cycles).
+        """
+        entries = repo_raw.get("copy_to", [])
+        by_name = {}
+        for c in entries:
+            name = c.get("name")
+            if name is None:
+                continue
+            if name in by_name:
+                raise ValueError(
+                    f"Repository '{repo_raw['repo_path']}': duplicate "
+                    f"copy_to name '{name}'"
+                )
+            by_name[name] = c
+
+        def source_path_of(c: dict, seen: tuple = ()) -> str:
+            src = c.get("source")
+            if src is None:
+                return repo_raw["repo_path"]
+            if src not in by_name:
+                raise ValueError(
+                    f"copy_to '{c['repo']}': source '{src}' does not name "
+                    f"another copy_to entry of '{repo_raw['repo_path']}'"
+                )
+            if src in seen or src == c.get("name"):
+                raise ValueError(
+                    f"copy_to '{c['repo']}': source chain forms a cycle "
+                    f"through '{src}'"
+                )
+            source_path_of(by_name[src], seen + (src,))
+            return by_name[src]["repo"]
+
+        dests = []
+        for c in entries:
+            dest = self._parse_copy_dest(source_path_of(c), c)
+            dest.name = c.get("name")
+            dest.source = c.get("source")
+            dests.append(dest)
+        return dests
+
     def _parse_repos(self, job_raw: dict) -> list[RepoConfig]:
         repos = []
         for r in job_raw.get("repositories", []):
-            copy_dests = [
-                CopyDestConfig(
-                    repo_path=c["repo"],
-                    password_file=Path(c["password_file"]),
-                    prune_keep_params=self._resolve_prune_policy(c),
-                )
-                for c in r.get("copy_to", [])
-            ]
+            copy_dests = self._parse_copy_dests(r)
             repos.append(RepoConfig(
                 repo_path=r["repo_path"],
                 password_file=Path(r["password_file"]),
                 prune_keep_params=self._resolve_prune_policy(r),
                 copy_destinations=copy_dests,
+                performance_profile=self._resolve_performance_profile(r),
             ))
         return repos
 
+    @staticmethod
+    def _parse_exclusions(name: str, job: dict) -> ExclusionSettings:
+        def as_list(key: str) -> list[str]:
+            value = job.get(key, [])
+            return [value] if isinstance(value, str) else list(value)
+
+        larger_than = job.get("exclude_larger_than")
+        if larger_than is not None:
+            larger_than = str(larger_than)
+            if not _RESTIC_SIZE_RE.match(larger_than):
+                raise ValueError(
+                    f"Volume '{name}': exclude_larger_than must be a size "
+                    f"such as \"500M\" or \"2G\", got '{larger_than}'"
+                )
+        return ExclusionSettings(
+            exclude_file=[Path(p) for p in as_list("exclude_file")],
+            exclude_caches=bool(job.get("exclude_caches", False)),
+            exclude_if_present=as_list("exclude_if_present"),
+            exclude_larger_than=larger_than,
+            iexclude=as_list("iexclude"),
+        )
+
     def _parse_volumes(self) -> dict[str, VolumeConfig]:
         volumes = {}
         for name, job in self._raw.get("volume", {}).items():
@@ -123,17 +468,180 @@ class BackupConfigFactory:
                 lv_name = job["lv_name"]
                 snapshot_size = job["snapshot_size"]
 
+            command = None
+            stdin_filename = None
+            if volume_type == VolumeType.COMMAND:
+                command = job["command"]
+                stdin_filename = job.get("stdin_filename", name)
+                # restic stores the stream as /<stdin_filename>.
+                source_path = job.get("backup_source_path", f"/{stdin_filename}")
+            else:
+                source_path = job["backup_source_path"]
+
             volumes[name] = VolumeConfig(
                 volume_type=volume_type,
-                backup_source_path=job["backup_source_path"],
+                backup_source_path=source_path,
                 exclude_paths=job.get("exclude_paths", []),
                 repositories=self._parse_repos(job),
                 vg_name=vg_name,
                 lv_name=lv_name,
                 snapshot_size=snapshot_size,
+                exclusions=self._parse_exclusions(name, job),
+                performance_profile=self._resolve_performance_profile(job),
+                command=command,
+                stdin_filename=stdin_filename,
+                fan_out=bool(job.get("fan_out", False)),
+                file_index=self._parse_file_index(name, volume_type, job),
+                standby=self._parse_standby(
+                    name, volume_type, source_path, lv_name, job
+                ),
+                retain_snapshots=self._parse_retain_snapshots(
+                    name, volume_type, job
+                ),
+                snapshot_chunksize=self._parse_snapshot_chunksize(
+                    name, volume_type, job
+                ),
+                snapshot_pvs=self._parse_snapshot_pvs(name, volume_type, job),
+                consistency_group=self._parse_consistency_group(
+                    name, volume_type, job
+                ),
             )
         return volumes
 
+    @staticmethod
+    def _parse_file_index(name: str, volume_type: VolumeType, job: dict) -> bool:
+        file_index = bool(job.get("file_index", False))
+        if file_index and volume_type == VolumeType.COMMAND:
+            raise ValueError(
+                f"Volume '{name}': file_index needs a file tree; command "
+                f"volumes back up a single stream"
+            )
+        return file_index
+
+    @staticmethod
+    def _parse_standby(
+        name: str,
+        volume_type: VolumeType,
+        source_path: str,
+        lv_name: str | None,
+        job: dict,
+    ) -> StandbyConfig | None:
+        raw = job.get("standby")
+        if raw is None:
+            return None
+        if volume_type == VolumeType.COMMAND:
+            raise ValueError(
+                f"Volume '{name}': standby needs a file tree; command "
+                f"volumes back up a single stream"
+            )
+        if isinstance(raw, str):
+            raw = {"path": raw}
+        if not isinstance(raw, dict) or set(raw) - {"path", "lv_name"} or (
+            ("path" in raw) == ("lv_name" in raw)
+        ):
+            raise ValueError(
+                f"Volume '{name}': standby must be a path, or a table with "
+                f"exactly one of 'path' or 'lv_name'"
+            )
+        if "lv_name" in raw:
+            if volume_type not in (VolumeType.LV_ROOT, VolumeType.LV_NONROOT):
+                raise ValueError(
+                    f"Volume '{name}': a standby lv_name needs an LV volume"
+                )
+            if raw["lv_name"] == lv_name:
+                raise ValueError(
+                    f"Volume '{name}': the standby LV must not be the "
+                    f"volume's own LV"
+                )
+            return StandbyConfig(lv_name=str(raw["lv_name"]))
+
+        path = str(raw["path"])
+        if not path.startswith("/") or path.rstrip("/") == "":
+            raise ValueError(
+                f"Volume '{name}': standby path must be an absolute "
+                f"directory other than /, got '{path}'"
+            )
+        # The standby is restored with --delete, so it must never overlap
+        # the data it mirrors.
+        standby, source = Path(path), Path(source_path)
+        if standby == source or source in standby.parents or standby in source.parents:
+            raise ValueError(
+                f"Volume '{name}': standby path '{path}' overlaps the "
+                f"backup source '{source_path}'"
+            )
+        return StandbyConfig(path=path)
+
+    @staticmethod
+    def _parse_retain_snapshots(
+        name: str, volume_type: VolumeType, job: dict
+    ) -> int:
+        keep = job.get("retain_snapshots", 0)
+        if isinstance(keep, bool) or not isinstance(keep, int) or keep < 0:
+            raise ValueError(
+                f"Volume '{name}': retain_snapshots must be a non-negative "
+                f"integer, got {keep!r}"
+            )
+        if keep and volume_type not in (VolumeType.LV_ROOT, VolumeType.LV_NONROOT):
+            raise ValueError(
+                f"Volume '{name}': retain_snapshots needs an LV volume"
+            )
+        return keep
+
+    @staticmethod
+    def _parse_snapshot_chunksize(
+        name: str, volume_type: VolumeType, job: dict
+    ) -> str | None:
+        chunksize = job.get("snapshot_chunksize")
+        if chunksize is None:
+            return None
+        if volume_type not in (VolumeType.LV_ROOT, VolumeType.LV_NONROOT):
+            raise ValueError(
+                f"Volume '{name}': snapshot_chunksize needs an LV volume"
+            )
+        try:
+            parse_chunksize(str(chunksize))
+        except ValueError as e:
+            raise ValueError(f"Volume '{name}': {e}") from None
+        return str(chunksize)
+
+    @staticmethod
+    def _parse_snapshot_pvs(
+        name: str, volume_type: VolumeType, job: dict
+    ) -> list[str]:
+        pvs = job.get("snapshot_pvs", [])
+        if isinstance(pvs, str):
+            pvs = [pvs]
+        if not isinstance(pvs, list) or not all(
+            isinstance(pv, str) and pv.startswith("/dev/") for pv in pvs
+        ):
+            raise ValueError(
+                f"Volume '{name}': snapshot_pvs must be a list of PV device "
+                f"paths such as '/dev/sdb1', got {pvs!r}"
+            )
+        if pvs and volume_type not in (VolumeType.LV_ROOT, VolumeType.LV_NONROOT):
+            raise ValueError(
+                f"Volume '{name}': snapshot_pvs needs an LV volume"
+            )
+        return pvs
+
+    @staticmethod
+    def _parse_consistency_group(
+        name: str, volume_type: VolumeType, job: dict
+    ) -> str | None:
+        group = job.get("consistency_group")
+        if group is None:
+            return None
+        if not isinstance(group, str) or not group:
+            raise ValueError(
+                f"Volume '{name}': consistency_group must be a non-empty "
+                f"string, got {group!r}"
+            )
+        if volume_type not in (VolumeType.LV_ROOT, VolumeType.LV_NONROOT):
+            raise ValueError(
+                f"Volume '{name}': consistency_group needs an LV volume"
+            )
+        return group
+
     def _parse_snapshot_settings(self) -> SnapshotSettings:
         raw = self._raw.get("snapshot_settings", {})
         return SnapshotSettings(
@@ -143,6 +651,136 @@ class BackupConfigFactory:
             snapshot_cow_warn_percent=int(
                 raw.get("snapshot_cow_warn_percent", 70)
             ),
+            mount_profile=self._parse_mount_profile(raw),
+            snapshot_readonly_lv=bool(raw.get("snapshot_readonly_lv", False)),
+            separate_cow_pv=bool(raw.get("separate_cow_pv", True)),
+            retain_budget=self._parse_retain_budget(raw),
+            retain_max_classic_per_origin=int(
+                raw.get("retain_max_classic_per_origin", 1)
+            ),
+            retain_thin_pool_max_percent=int(
+                raw.get("retain_thin_pool_max_percent", 80)
+            ),
+        )
+
+    @staticmethod
+    def _parse_mount_profile(raw: dict) -> str:
+        profile = raw.get("mount_profile", "readonly")
+        if profile not in MOUNT_PROFILES:
+            raise ValueError(
+                f"[snapshot_settings] mount_profile must be one of "
+                f"{', '.join(MOUNT_PROFILES)}, got {profile!r}"
+            )
+        return profile
+
+    @staticmethod
+    def _parse_retain_budget(raw: dict) -> str | None:
+        budget = raw.get("retain_budget")
+        if budget is None:
+            return None
+        try:
+            parse_size_bytes(str(budget))
+        except ValueError:
+            raise ValueError(
+                f"[snapshot_settings] retain_budget must be a size such as "
+                f"'20G', got {budget!r}"
+            ) from None
+        return str(budget)
+
+    def _parse_concurrency(self) -> ConcurrencySettings:
+        raw = self._raw.get("concurrency", {})
+        return ConcurrencySettings(
+            max_parallel=int(raw.get("max_parallel", 1)),
+            per_backend={
+                name: int(limit)
+                for name, limit in raw.get("per_backend", {}).items()
+            },
+        )
+
+    def _parse_grouping(self) -> GroupingSettings:
+        raw = self._raw.get("grouping", {})
+        return GroupingSettings(enabled=bool(raw.get("enabled", False)))
+
+    def _parse_catalog(self) -> CatalogSettings:
+        raw = self._raw.get("catalog", {})
+        hours = raw.get("reconcile_every_hours", 24)
+        if isinstance(hours, bool) or not isinstance(hours, int) or hours < 0:
+            raise ValueError(
+                "[catalog] reconcile_every_hours must be a non-negative "
+                f"integer, got {hours!r}"
+            )
+        return CatalogSettings(reconcile_every_hours=hours)
+
+    def _parse_layout(self) -> LayoutSettings:
+        raw = self._raw.get("layout", {})
+        return LayoutSettings(enabled=bool(raw.get("enabled", True)))
+
+    def _parse_check(self) -> CheckSettings:
+        raw = self._raw.get("check", {})
+
+        def int_setting(key: str, default, minimum: int):
+            value = raw.get(key, default)
+            if value is None:
+                return None
+            if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+                raise ValueError(
+                    f"[check] {key} must be an integer >= {minimum}, "
+                    f"got {value!r}"
+                )
+            return value
+
+        max_read_bytes = raw.get("max_read_bytes")
+        if max_read_bytes is not None:
+            try:
+                parse_size_bytes(str(max_read_bytes))
+            except ValueError:
+                raise ValueError(
+                    f"[check] max_read_bytes must be a size such as '50G', "
+                    f"got {max_read_bytes!r}"
+                ) from None
+            max_read_bytes = str(max_read_bytes)
+        return CheckSettings(
+            read_data_every_days=int_setting("read_data_every_days", 30, 0),
+            subsets=int_setting("subsets", 30, 1),
+            max_read_bytes=max_read_bytes,
+            max_minutes=int_setting("max_minutes", None, 1),
+        )
+
+    def _parse_throttle(self) -> ThrottleSettings:
+        raw = self._raw.get("throttle", {})
+        slo = raw.get("latency_slo_ms")
+        if slo is not None and (
+            isinstance(slo, bool) or not isinstance(slo, (int, float)) or slo <= 0
+        ):
+            raise ValueError(
+                f"[throttle] latency_slo_ms must be a positive number, "
+                f"got {slo!r}"
+            )
+        devices = raw.get("devices", [])
+        if isinstance(devices, str):
+            devices = [devices]
+        for device in devices:
+            if not isinstance(device, str) or not device.startswith("/dev/"):
+                raise ValueError(
+                    f"[throttle] devices must be /dev/ paths, got {device!r}"
+                )
+        interval = raw.get("interval_ms", 1000)
+        if isinstance(interval, bool) or not isinstance(interval, int) or interval < 100:
+            raise ValueError(
+                f"[throttle] interval_ms must be an integer >= 100, "
+                f"got {interval!r}"
+            )
+        duty = raw.get("min_duty_percent", 10)
+        if isinstance(duty, bool) or not isinstance(duty, int) or not 1 <= duty <= 100:
+            raise ValueError(
+                f"[throttle] min_duty_percent must be an integer from 1 to "
+                f"100, got {duty!r}"
+            )
+        return ThrottleSettings(
+            latency_slo_ms=None if slo is None else float(slo),
+            devices=list(devices),
+            interval_ms=interval,
+            min_duty_percent=duty,
         )
 
     def build(self) -> BackupConfig:
@@ -150,4 +788,11 @@ class BackupConfigFactory:
             prune_policies=self._policies,
             volumes=self._parse_volumes(),
             snapshot_settings=self._parse_snapshot_settings(),
+            concurrency=self._parse_concurrency(),
+            performance_profiles=self._profiles,
+            grouping=self._parse_grouping(),
+            catalog=self._parse_catalog(),
+            check=self._parse_check(),
+            layout=self._parse_layout(),
+            throttle=self._parse_throttle(),
         )
@@ -6,6 +6,7 @@ and creates executable backup job instances based on it.
 from pathlib import Path
 
 from resticlvm.orchestration.backup_config import (
+    BackupConfig,
     BackupConfigFactory,
     RepoConfig,
     SnapshotSettings,
@@ -16,22 +17,35 @@ from resticlvm.orchestration.config_loader import load_config
 from resticlvm.orchestration.config_validator import warn_on_validation_issues
 from resticlvm.orchestration.data_classes import BackupJob, TokenConfigKeyPair
 from resticlvm.orchestration.dispatch import RESOURCE_DISPATCH
+from resticlvm.orchestration.performance import (
+    PerformanceProfile,
+    merge_profiles,
+)
 from resticlvm.orchestration.restic_repo import (
     CopyDestination,
     ResticRepo,
 )
 
 
-def _to_restic_repo(repo_cfg: RepoConfig) -> ResticRepo:
+def _to_restic_repo(
+    repo_cfg: RepoConfig, volume_profile: PerformanceProfile | None = None
+) -> ResticRepo:
+    """Build a ResticRepo, layering performance profiles volume → repo → copy_to."""
+    repo_profile = merge_profiles(volume_profile, repo_cfg.performance_profile)
     return ResticRepo(
         repo_path=Path(repo_cfg.repo_path),
         password_file=repo_cfg.password_file,
         prune_keep_params=repo_cfg.prune_keep_params,
+        performance=repo_profile,
         copy_destinations=[
             CopyDestination(
                 repo_path=d.repo_path,
                 password_file=d.password_file,
                 prune_keep_params=d.prune_keep_params,
+                mode=d.mode,
+                name=d.name,
+                source=d.source,
+                performance=merge_profiles(repo_profile, d.performance_profile),
             )
             for d in repo_cfg.copy_destinations
         ],
@@ -48,6 +62,26 @@ def _job_config_dict(vol_cfg: VolumeConfig) -> dict:
         d["vg_name"] = vol_cfg.vg_name
         d["lv_name"] = vol_cfg.lv_name
         d["snapshot_size"] = vol_cfg.snapshot_size
+        if vol_cfg.retain_snapshots:
+            d["retain_snapshots"] = vol_cfg.retain_snapshots
+        if vol_cfg.snapshot_chunksize:
+            d["snapshot_chunksize"] = vol_cfg.snapshot_chunksize
+        if vol_cfg.snapshot_pvs:
+            d["snapshot_pvs"] = vol_cfg.snapshot_pvs
+        if vol_cfg.consistency_group:
+            d["consistency_group"] = vol_cfg.consistency_group
+    if vol_cfg.volume_type == VolumeType.COMMAND:
+        d["command"] = vol_cfg.command
+        d["stdin_filename"] = vol_cfg.stdin_filename
+        d["fan_out"] = vol_cfg.fan_out
+    if vol_cfg.file_index:
+        d["file_index"] = True
+    if vol_cfg.standby is not None:
+        d["standby"] = {
+            "path": vol_cfg.standby.path,
+            "vg_name": vol_cfg.vg_name,
+            "lv_name": vol_cfg.standby.lv_name,
+        }
     return d
 
 
@@ -73,8 +107,17 @@ class BackupPlan:
             config=_job_config_dict(vol_cfg),
             name=name,
             category=vol_cfg.volume_type.value,
-            repositories=[_to_restic_repo(r) for r in vol_cfg.repositories],
+            repositories=[
+                _to_restic_repo(r, vol_cfg.performance_profile)
+                for r in vol_cfg.repositories
+            ],
             dry_run=self.dry_run,
+            concurrency=self._config.concurrency,
+            # A command stream has no file tree to exclude from.
+            exclusions=(
+                None if vol_cfg.volume_type == VolumeType.COMMAND
+                else vol_cfg.exclusions
+            ),
         )
 
     @property
@@ -84,6 +127,10 @@ class BackupPlan:
             for name, cfg in self._config.volumes.items()
         ]
 
+    @property
+    def config(self) -> BackupConfig:
+        return self._config
+
     @property
     def snapshot_settings(self) -> SnapshotSettings:
         return self._config.snapshot_settings
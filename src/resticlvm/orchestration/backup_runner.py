@@ -6,16 +6,30 @@ and executes backup jobs based on the specified filters.
 """
 
 import argparse
+import subprocess
 import sys
 from pathlib import Path
 from typing import Optional
 
 from resticlvm import __version__
-from resticlvm.orchestration.backup_config import SnapshotSettings
+from resticlvm.orchestration.backup_config import (
+    SnapshotSettings,
+    ThrottleSettings,
+)
 from resticlvm.orchestration.backup_plan import BackupPlan
-from resticlvm.orchestration.data_classes import BackupJob
+from resticlvm.orchestration.data_classes import (
+    BackupJob,
+    JobResult,
+    run_job_copies,
+)
+from resticlvm.orchestration.cleanup_runner import sweep
+from resticlvm.orchestration.grouping import BackupGroupJob, group_jobs
+from resticlvm.orchestration.layout import record_layout
 from resticlvm.orchestration.privileges import ensure_running_as_root
 from resticlvm.orchestration.snapshot_coordinator import SnapshotCoordinator
+from resticlvm.orchestration.snapshot_waves import rotation_needs, snapshot_waves
+from resticlvm.orchestration.standby import refresh_standbys
+from resticlvm.orchestration.throttle import latency_throttle
 
 _LV_CATEGORIES = {"lv_root", "lv_nonroot"}
 
@@ -27,9 +41,13 @@ class BackupJobRunner:
         self,
         jobs: list[BackupJob],
         snapshot_settings: SnapshotSettings | None = None,
+        grouping: bool = False,
+        throttle: ThrottleSettings | None = None,
     ):
         self.jobs = jobs
         self._snap_settings = snapshot_settings or SnapshotSettings()
+        self._grouping = grouping
+        self._throttle = throttle or ThrottleSettings()
 
     def run_all(
         self, category: Optional[str] = None, name: Optional[str] = None
@@ -38,12 +56,18 @@ class BackupJobRunner:
 
         LV-backed volumes use batch snapshot coordination (issue #84): all
         snapshots are created before any backup runs, reducing the cross-LV
-        time delta to milliseconds. Copy operations for LV jobs are deferred
-        until after snapshot teardown to minimize snapshot lifetime.
+        time delta to milliseconds. When the VGs cannot hold every snapshot at
+        once, LV volumes are backed up in waves (snapshot_waves.py), each
+        with its own coordinator. Copy operations are deferred until every
+        backup has finished (and snapshots are torn down), then run together.
 
         Each job runs in isolation: a failure in one does not stop the others. A
         summary is printed at the end naming any failed jobs and copy operations.
 
+        With grouping enabled, compatible volumes that share repositories are
+        backed up by one restic run per repository (see grouping.py); each
+        member is still reported as its own job.
+
         Returns:
             int: The number of jobs that failed.
         """
@@ -57,42 +81,138 @@ class BackupJobRunner:
         non_lv_jobs = [j for j in active_jobs if j.category not in _LV_CATEGORIES]
 
         results = []
-        deferred_copy_jobs = []
+        copy_jobs = []  # (job, result) pairs whose backup succeeded
 
         if lv_jobs:
             dry_run = lv_jobs[0].dry_run
-            coord = SnapshotCoordinator(
-                lv_jobs,
-                dry_run=dry_run,
-                min_vg_free_after_snapshots=self._snap_settings.min_vg_free_after_snapshots,
-                snapshot_cow_warn_percent=self._snap_settings.snapshot_cow_warn_percent,
+            waves = (
+                [lv_jobs] if dry_run
+                else snapshot_waves(
+                    lv_jobs, self._snap_settings.min_vg_free_after_snapshots
+                )
             )
+            # Retained snapshots must leave room for the later waves.
+            needs = rotation_needs(waves)
+            for wave, wave_needs in zip(waves, needs):
+                try:
+                    self._run_lv_wave(
+                        wave, dry_run, results, copy_jobs, wave_needs
+                    )
+                except RuntimeError as e:
+                    if len(waves) == 1:
+                        raise
+                    # E.g. retained snapshots of an earlier wave took the
+                    # space; the remaining waves still get their chance.
+                    print(f"❌ {e}")
+                    self._record(
+                        wave,
+                        [JobResult(j.category, j.name, False, []) for j in wave],
+                        results, copy_jobs,
+                    )
 
-            with coord:
-                coord.create_all()
-
-                for job in lv_jobs:
-                    mount = coord.get_mount_point(job.name)
-                    result = job.run(snapshot_mount=mount, defer_copies=True)
-                    results.append(result)
-                    if result.script_ok:
-                        deferred_copy_jobs.append(job)
+        # Snapshots are now torn down.
+        for job in self._units(non_lv_jobs):
+            if isinstance(job, BackupGroupJob):
+                self._record(
+                    job.members, job.run_members(defer_copies=True),
+                    results, copy_jobs,
+                )
+                continue
+            result = job.run(defer_copies=True)
+            self._record([job], [result], results, copy_jobs)
 
-            # Snapshots are now torn down — run deferred copies
-            for job in deferred_copy_jobs:
-                failed = job.run_deferred_copies()
-                if failed:
-                    for r in results:
-                        if r.name == job.name and r.category == job.category:
-                            r.failed_copies = failed
-                            break
+        # All copies run as one graph so that a source → destination pair
+        # shared by several volumes is copied once.
+        if copy_jobs:
+            failed_per_job = run_job_copies([job for job, _ in copy_jobs])
+            for (_, result), failed in zip(copy_jobs, failed_per_job):
+                result.failed_copies = failed
 
-        for job in non_lv_jobs:
-            results.append(job.run())
+        # Standbys are refreshed last, at low priority, from the snapshots
+        # this run created.
+        failed_standbys = refresh_standbys([job for job, _ in copy_jobs])
+        if failed_standbys:
+            print(f"⚠️  Standby not refreshed (behind the latest backup): "
+                  f"{', '.join(failed_standbys)}")
 
         self._print_summary(results)
         return len([r for r in results if not r.ok])
 
+    def _run_lv_wave(
+        self, lv_jobs, dry_run, results, copy_jobs, rotation_needs=None
+    ) -> None:
+        """Snapshot, back up and release one wave of LV jobs."""
+        coord = SnapshotCoordinator(
+            lv_jobs,
+            dry_run=dry_run,
+            min_vg_free_after_snapshots=self._snap_settings.min_vg_free_after_snapshots,
+            snapshot_cow_warn_percent=self._snap_settings.snapshot_cow_warn_percent,
+            mount_profile=self._snap_settings.mount_profile,
+            snapshot_readonly_lv=self._snap_settings.snapshot_readonly_lv,
+            separate_cow_pv=self._snap_settings.separate_cow_pv,
+            retain_budget=self._snap_settings.retain_budget,
+            retain_max_classic_per_origin=self._snap_settings.retain_max_classic_per_origin,
+            retain_thin_pool_max_percent=self._snap_settings.retain_thin_pool_max_percent,
+            rotation_needs=rotation_needs,
+        )
+
+        with coord:
+            coord.create_all()
+            # Paces restic to hold the origins' latency (see throttle.py).
+            with latency_throttle(self._throttle, lv_jobs, dry_run):
+                self._back_up_units(coord, lv_jobs, results, copy_jobs)
+
+    def _back_up_units(self, coord, lv_jobs, results, copy_jobs) -> None:
+        """Back up a wave's jobs from its snapshots, releasing each after."""
+        for job in self._units(lv_jobs):
+            members = (
+                job.members if isinstance(job, BackupGroupJob) else [job]
+            )
+            try:
+                mounts = {
+                    m.name: coord.get_mount_point(m.name)
+                    for m in members
+                }
+            except subprocess.CalledProcessError:
+                unit_results = [
+                    JobResult(m.category, m.name, False, [])
+                    for m in members
+                ]
+            else:
+                if isinstance(job, BackupGroupJob):
+                    unit_results = job.run_members(
+                        mounts, defer_copies=True
+                    )
+                else:
+                    unit_results = [job.run(
+                        snapshot_mount=mounts[job.name],
+                        defer_copies=True,
+                    )]
+            self._record(members, unit_results, results, copy_jobs)
+            self._release(coord, members, unit_results)
+
+    def _units(self, jobs: list[BackupJob]) -> list[BackupJob]:
+        return group_jobs(jobs) if self._grouping else jobs
+
+    @staticmethod
+    def _record(jobs, job_results, results, copy_jobs) -> None:
+        for job, result in zip(jobs, job_results):
+            results.append(result)
+            if result.script_ok:
+                copy_jobs.append((job, result))
+
+    @staticmethod
+    def _release(coord, jobs, job_results) -> None:
+        """Release the jobs' snapshots, keeping rollback points.
+
+        Snapshots of successful backups can be kept (retention.py). A
+        snapshot shared by several volumes is torn down after the last.
+        """
+        for job, result in zip(jobs, job_results):
+            if result.script_ok and job.config.get("retain_snapshots"):
+                coord.retain(job.name)
+            coord.release(job.name)
+
     @staticmethod
     def _print_summary(results):
         failures = [r for r in results if not r.ok]
@@ -123,9 +243,18 @@ def run(args):
     config_path = Path(args.config)
 
     plan = BackupPlan(config_path=config_path, dry_run=args.dry_run)
+    # Release snapshots and mounts that a killed earlier run left behind.
+    sweep(dry_run=args.dry_run)
+    # Stored before the backups so that this run's copies carry it along.
+    record_layout(
+        plan.config, config_path, args.category, args.name,
+        dry_run=args.dry_run,
+    )
     runner = BackupJobRunner(
         plan.backup_jobs,
         snapshot_settings=plan.snapshot_settings,
+        grouping=plan.config.grouping.enabled,
+        throttle=plan.config.throttle,
     )
     failure_count = runner.run_all(category=args.category, name=args.name)
     if failure_count:
@@ -0,0 +1,352 @@
+"""Local catalog of the snapshots in every configured repository.
+
+Listing snapshots with ``restic snapshots`` takes minutes per remote
+repository. rlvm keeps an SQLite catalog (``catalog.db`` in the state
+directory, see state.py) so ``rlvm snapshots`` can answer from disk:
+
+- Backups add the snapshot each repository reported (see parents.py).
+- Copies add the snapshots ``restic copy`` reported saving. They clone the
+  source's catalog rows, since a copy keeps the snapshot's time, host,
+  paths and tags.
+- Mirror syncs replace the mirror's rows with its source's.
+- ``restic forget`` removes the snapshots it listed for removal.
+- Reconciliation replaces a repository's rows with a fresh
+  ``restic snapshots --json --no-lock`` listing. It runs for repositories
+  whose last listing is older than ``[catalog] reconcile_every_hours``, and
+  in parallel across repositories.
+
+Rows written from backup output carry the time restic was started rather
+than restic's own snapshot time, so matching across repositories allows
+TIME_TOLERANCE_S of difference.
+
+Like the other state files, the catalog is advisory: failing to update it
+never fails a backup, copy or prune.
+"""
+
+import json
+import re
+import sqlite3
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from resticlvm.orchestration.concurrency import BackendLimiter
+from resticlvm.orchestration.state import state_dir
+
+CATALOG_FILE = "catalog.db"
+
+# Snapshots in two repositories are the same backup if host and paths match
+# and their times are at most this far apart.
+TIME_TOLERANCE_S = 60
+
+# Repository listings run in parallel with at least this many workers.
+MIN_RECONCILE_PARALLEL = 4
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    repo TEXT NOT NULL,
+    short_id TEXT NOT NULL,
+    id TEXT,
+    time REAL NOT NULL,
+    hostname TEXT NOT NULL,
+    paths TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    PRIMARY KEY (repo, short_id)
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_source
+    ON snapshots (hostname, paths, repo, time);
+CREATE TABLE IF NOT EXISTS repos (
+    repo TEXT PRIMARY KEY,
+    reconciled REAL
+);
+"""
+
+
+@dataclass
+class SnapshotRecord:
+    """One snapshot as stored in the catalog."""
+
+    short_id: str
+    time: float  # epoch seconds
+    hostname: str
+    paths: list[str]
+    tags: list[str] = field(default_factory=list)
+    id: str | None = None
+
+    @classmethod
+    def from_restic_json(cls, obj: dict) -> "SnapshotRecord":
+        """Build a record from one entry of ``restic snapshots --json``."""
+        return cls(
+            short_id=obj.get("short_id") or obj["id"][:8],
+            time=datetime.fromisoformat(obj["time"]).timestamp(),
+            hostname=obj.get("hostname", ""),
+            paths=list(obj.get("paths") or []),
+            tags=list(obj.get("tags") or []),
+            id=obj["id"],
+        )
+
+    @property
+    def local_time(self) -> datetime:
+        return datetime.fromtimestamp(self.time)
+
+
+def _paths_key(paths) -> str:
+    return json.dumps(sorted(paths))
+
+
+def _like_literal(text: str) -> str:
+    """Escape LIKE wildcards so ``text`` only matches itself."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _row_to_record(row) -> SnapshotRecord:
+    short_id, snap_id, time, hostname, paths, tags = row
+    return SnapshotRecord(
+        short_id=short_id,
+        time=time,
+        hostname=hostname,
+        paths=json.loads(paths),
+        tags=json.loads(tags),
+        id=snap_id,
+    )
+
+
+_COLUMNS = "short_id, id, time, hostname, paths, tags"
+
+
+def _insert(conn, repo, records: list[SnapshotRecord]) -> None:
+    conn.executemany(
+        f"INSERT OR REPLACE INTO snapshots (repo, {_COLUMNS}) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (str(repo), r.short_id, r.id, r.time, r.hostname,
+             _paths_key(r.paths), json.dumps(r.tags))
+            for r in records
+        ],
+    )
+
+
+class Catalog:
+    """The SQLite snapshot catalog.
+
+    Writers catch and report database errors instead of raising them.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = Path(path) if path is not None else state_dir() / CATALOG_FILE
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _write(self, action: str, statements) -> None:
+        """Run ``statements(conn)`` in one transaction; report failures."""
+        try:
+            with closing(self._connect()) as conn, conn:
+                statements(conn)
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  Could not update the snapshot catalog ({action}): {e}")
+
+    # ─── Updates ──────────────────────────────────────────────────
+
+    def add(self, repo, records: list[SnapshotRecord]) -> None:
+        """Insert (or update) snapshots of ``repo``."""
+        self._write("add", lambda conn: _insert(conn, repo, records))
+
+    def forget(self, repo, short_ids: list[str]) -> None:
+        """Remove forgotten snapshots of ``repo``."""
+        def delete(conn):
+            conn.executemany(
+                "DELETE FROM snapshots WHERE repo = ? AND short_id = ?",
+                [(str(repo), s) for s in short_ids],
+            )
+        self._write("forget", delete)
+
+    def copy(self, source, dest, pairs: list[tuple[str, str]]) -> None:
+        """Record ``restic copy`` results: (source snapshot, new snapshot)."""
+        def insert(conn):
+            for src_id, new_id in pairs:
+                conn.execute(
+                    "INSERT OR REPLACE INTO snapshots "
+                    f"(repo, {_COLUMNS}) "
+                    "SELECT ?, ?, NULL, time, hostname, paths, tags "
+                    "FROM snapshots WHERE repo = ? AND short_id = ?",
+                    (str(dest), new_id, str(source), src_id),
+                )
+        self._write("copy", insert)
+
+    def mirror(self, source, dest) -> None:
+        """Make ``dest``'s rows a copy of ``source``'s (file-level mirror)."""
+        def replace(conn):
+            conn.execute("DELETE FROM snapshots WHERE repo = ?", (str(dest),))
+            conn.execute(
+                f"INSERT INTO snapshots (repo, {_COLUMNS}) "
+                f"SELECT ?, {_COLUMNS} FROM snapshots WHERE repo = ?",
+                (str(dest), str(source)),
+            )
+        self._write("mirror", replace)
+
+    def replace(self, repo, records: list[SnapshotRecord]) -> None:
+        """Replace ``repo``'s rows with a full listing and mark it reconciled."""
+        def replace_all(conn):
+            conn.execute("DELETE FROM snapshots WHERE repo = ?", (str(repo),))
+            _insert(conn, repo, records)
+            conn.execute(
+                "INSERT OR REPLACE INTO repos (repo, reconciled) VALUES (?, ?)",
+                (str(repo), datetime.now().timestamp()),
+            )
+        self._write("reconcile", replace_all)
+
+    # ─── Queries ──────────────────────────────────────────────────
+
+    def _query(self, sql: str, params: tuple) -> list:
+        if not self.path.exists():
+            return []
+        with closing(self._connect()) as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def reconciled_at(self, repo) -> float | None:
+        rows = self._query(
+            "SELECT reconciled FROM repos WHERE repo = ?", (str(repo),)
+        )
+        return rows[0][0] if rows else None
+
+    def snapshot_ids(self, repo) -> set[str] | None:
+        """Short IDs of ``repo``'s snapshots; None if it has no rows."""
+        rows = self._query(
+            "SELECT short_id FROM snapshots WHERE repo = ?", (str(repo),)
+        )
+        return {r[0] for r in rows} if rows else None
+
+    def snapshots(
+        self, repo, hostname: str, paths: list[str], tag: str | None = None
+    ) -> list[SnapshotRecord]:
+        """Snapshots of ``paths`` from ``hostname`` in ``repo``, oldest first.
+
+        With ``tag``, snapshots carrying that tag (e.g. ``vol:<name>`` for
+        grouped backups) are included whatever their paths.
+        """
+        sql = (
+            f"SELECT {_COLUMNS} FROM snapshots "
+            "WHERE repo = ? AND hostname = ? AND (paths = ?"
+        )
+        params = [str(repo), hostname, _paths_key(paths)]
+        if tag:
+            sql += " OR tags LIKE ? ESCAPE '\\'"
+            params.append(f"%{_like_literal(json.dumps(tag))}%")
+        rows = self._query(sql + ") ORDER BY time", tuple(params))
+        return [_row_to_record(r) for r in rows]
+
+    def missing(
+        self, source, dest, hostname: str, paths: list[str],
+        tag: str | None = None,
+    ) -> list[SnapshotRecord]:
+        """Snapshots in ``source`` with no counterpart in ``dest``."""
+        dest_rows = self.snapshots(dest, hostname, paths, tag)
+        return [
+            s for s in self.snapshots(source, hostname, paths, tag)
+            if not any(
+                d.paths == s.paths and abs(d.time - s.time) <= TIME_TOLERANCE_S
+                for d in dest_rows
+            )
+        ]
+
+
+# ─── restic output parsing ────────────────────────────────────────
+
+_COPY_SOURCE_RE = re.compile(r"^snapshot ([0-9a-f]{8}) of ", re.MULTILINE)
+_SAVED_RE = re.compile(r"^snapshot ([0-9a-f]{8}) saved", re.MULTILINE)
+_FORGET_SECTION_RE = re.compile(r"^(keep|remove) \d+ snapshots:")
+_FORGET_ROW_RE = re.compile(r"^([0-9a-f]{8})\s")
+
+
+def parse_copy_output(output: str) -> list[tuple[str, str]]:
+    """(source snapshot, new snapshot) pairs from ``restic copy`` output.
+
+    restic prints ``snapshot <src> of [...]`` for each snapshot it copies
+    and ``snapshot <new> saved`` once it is written, in the same order.
+    Snapshots that were already copied are not printed as saved.
+    """
+    pending = []
+    pairs = []
+    for line in output.splitlines():
+        m = _COPY_SOURCE_RE.match(line)
+        if m:
+            pending.append(m.group(1))
+            continue
+        m = _SAVED_RE.match(line)
+        if m and pending:
+            pairs.append((pending.pop(0), m.group(1)))
+    return pairs
+
+
+def parse_forget_output(output: str) -> list[str]:
+    """Short IDs listed under ``remove N snapshots:`` in forget output."""
+    removed = []
+    section = None
+    for line in output.splitlines():
+        m = _FORGET_SECTION_RE.match(line)
+        if m:
+            section = m.group(1)
+            continue
+        if section == "remove":
+            m = _FORGET_ROW_RE.match(line)
+            if m:
+                removed.append(m.group(1))
+    return removed
+
+
+# ─── Reconciliation ───────────────────────────────────────────────
+
+
+def list_snapshots(repo, password_file, env: dict) -> list[SnapshotRecord]:
+    """Run ``restic snapshots --json --no-lock`` against one repository."""
+    result = subprocess.run(
+        ["restic", "-r", str(repo), "--password-file", str(password_file),
+         "--no-lock", "snapshots", "--json"],
+        check=True, capture_output=True, text=True, env=env,
+    )
+    return [
+        SnapshotRecord.from_restic_json(obj)
+        for obj in json.loads(result.stdout or "[]")
+    ]
+
+
+def reconcile(
+    catalog: Catalog,
+    targets: dict[str, Path],
+    env: dict,
+    max_parallel: int = 1,
+    per_backend: dict[str, int] | None = None,
+) -> list[str]:
+    """Refresh the catalog rows of ``targets`` (repo → password file).
+
+    Listings run in parallel, bounded by the ``[concurrency]`` per-backend
+    caps. Returns the repositories that could not be listed.
+    """
+    limiter = BackendLimiter(per_backend)
+
+    def fetch(repo):
+        with limiter.slot(repo):
+            return list_snapshots(repo, targets[repo], env)
+
+    failed = []
+    workers = max(max_parallel, MIN_RECONCILE_PARALLEL)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {repo: pool.submit(fetch, repo) for repo in targets}
+        for repo, future in futures.items():
+            try:
+                records = future.result()
+            except (OSError, ValueError, KeyError,
+                    subprocess.CalledProcessError) as e:
+                print(f"❌ Could not list snapshots of {repo}: {e}")
+                failed.append(repo)
+                continue
+            catalog.replace(repo, records)
+            print(f"🔄 Listed {len(records)} snapshot(s) in {repo}")
+    return failed
@@ -0,0 +1,347 @@
+"""``rlvm check``: rotating, budgeted ``restic check`` of every repository.
+
+``restic check --read-data`` downloads a whole repository, which is rarely
+affordable for remote backends. ``rlvm check`` instead spreads the read over
+time. Per repository it keeps a read cycle (in the ``check`` state file, see
+state.py):
+
+- Each cycle reads the data as ``[check] subsets`` slices, passed to restic
+  as ``--read-data-subset=n/N``, in order.
+- A cycle is spread over ``read_data_every_days``. Slice n is due once
+  (n - 1)/N of that period has passed since the cycle started, so a run
+  reads every slice that has come due. A repository checked less often
+  catches up, and one checked more often reads nothing extra.
+- When all N slices have been read and the period has passed, a new cycle
+  begins.
+
+Each run checks the structure of every repository, and the first due slice
+is read in the same restic run. Runs are bounded by ``max_read_bytes`` and
+``max_minutes``, shared by all repositories. A slice whose estimated size
+(repository size / N) or expected duration does not fit is left for the next
+run. Repositories are checked in parallel within the ``[concurrency]``
+limits. Copy destinations and mirrors are checked too.
+"""
+
+import json
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from resticlvm.orchestration.backup_config import (
+    BackupConfigFactory,
+    CheckSettings,
+)
+from resticlvm.orchestration.concurrency import BackendLimiter
+from resticlvm.orchestration.config_loader import load_config
+from resticlvm.orchestration.credentials import (
+    B2CredentialsError,
+    load_b2_credentials,
+    repo_uses_b2,
+)
+from resticlvm.orchestration.performance import (
+    PerformanceProfile,
+    restic_env,
+    restic_options,
+)
+from resticlvm.orchestration.prune_plan import plan_prune
+from resticlvm.orchestration.state import load_state, update_state
+from resticlvm.orchestration.units import format_bytes, parse_size_bytes
+
+STATE_NAME = "check"
+
+# Lines of restic output shown when a check fails.
+_FAILURE_TAIL = 20
+
+
+@dataclass
+class CheckTarget:
+    """One physical repository to check."""
+
+    repo_path: str
+    password_file: Path
+    performance: PerformanceProfile | None = None
+
+
+@dataclass
+class CheckResult:
+    repo_path: str
+    ok: bool
+    subsets_read: list[int] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+def plan_check(
+    config, category: str | None = None, name: str | None = None
+) -> list[CheckTarget]:
+    """Every physical repository of the selected volumes, once.
+
+    Mirrors are checked with their source's password, since they share its
+    keys.
+    """
+    targets = []
+    for repo in plan_prune(config, category=category, name=name):
+        targets.append(CheckTarget(
+            str(repo.repo_path), repo.password_file, repo.performance
+        ))
+        for mirror in repo.copy_destinations:
+            targets.append(CheckTarget(
+                str(mirror.repo_path), repo.password_file, repo.performance
+            ))
+    return targets
+
+
+def due_subsets(
+    record: dict, settings: CheckSettings, now: datetime
+) -> tuple[dict, list[int]]:
+    """Start a new cycle if one is due, and list the slices due now.
+
+    Returns:
+        tuple[dict, list[int]]: The (possibly reset) cycle record and the
+        1-based slice numbers due, in order.
+    """
+    n = settings.subsets
+    period_s = settings.read_data_every_days * 86400
+    if period_s == 0:
+        return record, []
+
+    record = dict(record)
+    if record.get("subsets") != n:
+        record.pop("cycle_start", None)  # slicing changed: start over
+    start = record.get("cycle_start")
+    elapsed = (
+        (now - datetime.fromisoformat(start)).total_seconds()
+        if start else None
+    )
+    next_subset = record.get("next_subset", 1)
+    if elapsed is None or (next_subset > n and elapsed >= period_s):
+        record.update(
+            cycle_start=now.isoformat(timespec="seconds"),
+            next_subset=1,
+            subsets=n,
+        )
+        record.pop("repo_bytes", None)
+        elapsed, next_subset = 0.0, 1
+
+    reached = min(n, math.floor(elapsed / period_s * n) + 1)
+    return record, list(range(next_subset, reached + 1))
+
+
+class ReadBudget:
+    """Byte and time limits shared by the parallel checks of one run.
+
+    A slice is only started if its estimated size fits the remaining bytes
+    and the slowest slice so far would still finish before the deadline.
+    """
+
+    def __init__(self, max_bytes: int | None, max_seconds: float | None):
+        self._lock = threading.Lock()
+        self._bytes_left = max_bytes
+        self._deadline = (
+            time.monotonic() + max_seconds if max_seconds is not None else None
+        )
+        self._slowest = 0.0
+
+    @property
+    def limits_bytes(self) -> bool:
+        return self._bytes_left is not None
+
+    def reserve(self, estimate: int | None) -> bool:
+        with self._lock:
+            if (
+                self._deadline is not None
+                and time.monotonic() + self._slowest > self._deadline
+            ):
+                return False
+            if self._bytes_left is None:
+                return True
+            if estimate is None or estimate > self._bytes_left:
+                return False
+            self._bytes_left -= estimate
+            return True
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._slowest = max(self._slowest, seconds)
+
+
+class RepoChecker:
+    """Runs the checks of one repository."""
+
+    def __init__(self, target: CheckTarget, env: dict):
+        self.target = target
+        self.env = {**env, **restic_env(target.performance)}
+
+    def _restic(self, *args: str) -> subprocess.CompletedProcess:
+        cmd = [
+            "restic", "-r", self.target.repo_path,
+            "--password-file", str(self.target.password_file),
+            *restic_options(
+                self.target.performance, self.target.repo_path,
+                command="check",
+            ),
+            *args,
+        ]
+        return subprocess.run(
+            cmd, capture_output=True, text=True, env=self.env
+        )
+
+    def repo_bytes(self) -> int | None:
+        """Stored size of the repository, from ``restic stats``."""
+        result = self._restic("stats", "--json", "--mode", "raw-data")
+        if result.returncode != 0:
+            return None
+        try:
+            return int(json.loads(result.stdout)["total_size"])
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def check(self, subset: int | None, subsets: int) -> tuple[bool, str]:
+        args = ["check"]
+        if subset is not None:
+            args.append(f"--read-data-subset={subset}/{subsets}")
+        result = self._restic(*args)
+        return result.returncode == 0, result.stdout + result.stderr
+
+
+def _label(subsets: list[int], n: int) -> str:
+    if not subsets:
+        return "structure only"
+    if len(subsets) == 1:
+        return f"read subset {subsets[0]}/{n}"
+    return f"read subsets {subsets[0]}-{subsets[-1]}/{n}"
+
+
+def check_repo(
+    target: CheckTarget,
+    settings: CheckSettings,
+    budget: ReadBudget,
+    env: dict,
+) -> CheckResult:
+    """Check one repository's structure and read the slices due."""
+    repo = target.repo_path
+    n = settings.subsets
+    started = time.monotonic()
+    record, due = due_subsets(
+        load_state(STATE_NAME).get(repo, {}), settings, datetime.now()
+    )
+    checker = RepoChecker(target, env)
+
+    estimate = None
+    if due and budget.limits_bytes:
+        if "repo_bytes" not in record:
+            size = checker.repo_bytes()
+            if size is not None:
+                record["repo_bytes"] = size
+        if "repo_bytes" in record:
+            estimate = math.ceil(record["repo_bytes"] / n)
+
+    read = []
+    ok = True
+    output = ""
+    # The first restic run also checks the structure.
+    for subset in due or [None]:
+        if subset is not None and not budget.reserve(estimate):
+            if read:
+                break
+            subset = None  # nothing fits: structure only
+        slice_started = time.monotonic()
+        ok, output = checker.check(subset, n)
+        if subset is not None:
+            budget.record(time.monotonic() - slice_started)
+        if not ok or subset is None:
+            break
+        read.append(subset)
+
+    if ok:
+        record["last_check"] = datetime.now().isoformat(timespec="seconds")
+    if read:
+        record["next_subset"] = read[-1] + 1
+        if read[-1] == n:
+            record["last_full_read"] = record["last_check"]
+    update_state(STATE_NAME, repo, record)
+
+    seconds = time.monotonic() - started
+    if ok:
+        deferred = len(due) - len(read)
+        note = f", {deferred} slice(s) deferred" if deferred else ""
+        size = f" (~{format_bytes(estimate * len(read))})" if estimate and read else ""
+        print(f"✅ {repo}: {_label(read, n)}{size} in {seconds:.0f}s{note}")
+    else:
+        print(f"❌ {repo}: check failed")
+        for line in output.splitlines()[-_FAILURE_TAIL:]:
+            print(f"     {line}")
+    return CheckResult(repo, ok, read, seconds)
+
+
+def _describe_plan(targets: list[CheckTarget], settings: CheckSettings) -> None:
+    state = load_state(STATE_NAME)
+    for target in targets:
+        _, due = due_subsets(
+            state.get(target.repo_path, {}), settings, datetime.now()
+        )
+        print(f"[DRY RUN] Would check {target.repo_path}: "
+              f"{_label(due, settings.subsets)}")
+
+
+def run(args):
+    """Execute ``rlvm check`` from pre-parsed arguments."""
+    config = BackupConfigFactory(load_config(Path(args.config))).build()
+    settings = config.check
+    if args.no_read_data:
+        settings = CheckSettings(read_data_every_days=0)
+    if args.max_read_bytes is not None:
+        settings.max_read_bytes = args.max_read_bytes
+    if args.max_minutes is not None:
+        settings.max_minutes = args.max_minutes
+    try:
+        max_bytes = (
+            parse_size_bytes(settings.max_read_bytes)
+            if settings.max_read_bytes else None
+        )
+    except ValueError as e:
+        sys.exit(f"rlvm check: {e}")
+
+    targets = plan_check(config, category=args.category, name=args.name)
+    if not targets:
+        print("No matching repositories.")
+        return
+    if args.dry_run:
+        _describe_plan(targets, settings)
+        return
+
+    env = os.environ.copy()
+    env.setdefault("SSH_AUTH_SOCK", "/root/.ssh/ssh-agent.sock")
+    if any(repo_uses_b2(t.repo_path) for t in targets):
+        try:
+            load_b2_credentials(env)
+        except B2CredentialsError as e:
+            print(f"⚠️  {e}")
+
+    print(f"🔍 Checking {len(targets)} repository(ies)...")
+    budget = ReadBudget(
+        max_bytes,
+        settings.max_minutes * 60 if settings.max_minutes else None,
+    )
+    limiter = BackendLimiter(config.concurrency.per_backend)
+
+    def task(target):
+        with limiter.slot(target.repo_path):
+            return check_repo(target, settings, budget, env)
+
+    workers = max(1, config.concurrency.max_parallel)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(task, targets))
+
+    failed = [r.repo_path for r in results if not r.ok]
+    if failed:
+        print(f"\n❌ {len(failed)} of {len(results)} repository check(s) "
+              f"failed: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"\n✅ All {len(results)} repository check(s) passed.")
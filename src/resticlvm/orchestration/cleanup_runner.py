@@ -0,0 +1,256 @@
+"""``rlvm cleanup``: release snapshots and mounts left behind by killed runs.
+
+A run killed with ``kill -9``, by the OOM killer or by a power loss cannot
+tear down its snapshots. A forgotten classic snapshot slows down every
+write to its origin and holds VG space until someone notices. The sweep
+finds leftovers in two ways:
+
+- Journal records (see snapshot_journal.py) whose process is gone, or that
+  were written before the last reboot.
+- rlvm's naming conventions, for anything the journal does not know about:
+  snapshot LVs named ``<vg>_<lv>_snapshot_<YYYYmmdd_HHMMSS>`` and mount
+  directories ``/tmp/resticlvm-<YYYYmmdd_HHMMSS>``.
+
+Anything journaled by a running rlvm process, and anything a process is
+using, is left alone. Retained rollback snapshots
+(``<lv>_rlvm_keep_<timestamp>``, see retention.py) and the mount
+directories of restores and rollbacks do not match these names and are
+never swept. Leftovers are released in parallel with snapshot_teardown.sh.
+
+``rlvm backup`` runs the sweep before taking its own snapshots.
+"""
+
+import importlib.resources as pkg_resources
+import json
+import re
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from resticlvm import scripts
+from resticlvm.orchestration import snapshot_journal
+
+SNAPSHOT_NAME_RE = re.compile(r"_snapshot_(\d{8}_\d{6})$")
+MOUNT_BASE_RE = re.compile(r"^resticlvm-(\d{8}_\d{6})$")
+MOUNT_ROOT = Path("/tmp")
+# Directories next to a mount point that hold the read-only snapshot mount and
+# the tmpfs of an overlay mount (see mount_snapshot_overlay in
+# lib/lv_snapshots.sh). Tearing down the mount point releases them too.
+OVERLAY_SUFFIXES = (".lower", ".upper")
+
+# Leftovers released at once.
+_MAX_WORKERS = 8
+
+
+@dataclass
+class Leftover:
+    """A snapshot and/or mount point to release."""
+
+    mount_point: str
+    mount_base: str
+    vg_name: str | None = None
+    snap_name: str | None = None
+    journal_key: str | None = None
+
+    def describe(self) -> str:
+        if self.snap_name:
+            return f"{self.vg_name}/{self.snap_name}"
+        return self.mount_point
+
+
+def _mount_base_for(timestamp: str) -> str:
+    return str(MOUNT_ROOT / f"resticlvm-{timestamp}")
+
+
+def find_leftovers(
+    journal: dict,
+    snapshot_lvs: list[tuple[str, str]],
+    mount_dirs: dict[str, list[str]],
+    alive: Callable[[dict], bool] = snapshot_journal.entry_alive,
+) -> tuple[list[Leftover], list[str]]:
+    """Reconcile the journal and naming conventions against live state.
+
+    Args:
+        journal: Journal records, keyed by name.
+        snapshot_lvs: ``(vg, lv)`` of each live snapshot LV.
+        mount_dirs: Each live ``/tmp/resticlvm-<ts>`` directory, mapped to
+            its subdirectories.
+        alive: Whether a journal record's process is still running.
+
+    Returns:
+        tuple: The leftovers to release, and the keys of stale journal
+        records that no longer point at anything.
+    """
+    busy_snaps, busy_bases = set(), set()
+    for entry in journal.values():
+        if alive(entry):
+            busy_snaps.add((entry.get("vg_name"), entry.get("snap_name")))
+            busy_bases.add(entry.get("mount_base"))
+
+    live_snaps = set(snapshot_lvs)
+    leftovers: list[Leftover] = []
+    stale: list[str] = []
+    covered_snaps, covered_mounts = set(), set()
+
+    for key, entry in journal.items():
+        if alive(entry):
+            continue
+        snap = (entry.get("vg_name"), entry.get("snap_name"))
+        base = entry.get("mount_base")
+        mounted = entry["mount_point"] in mount_dirs.get(base, [])
+        if snap not in live_snaps and not mounted:
+            stale.append(key)
+            continue
+        leftovers.append(Leftover(
+            mount_point=entry["mount_point"], mount_base=base,
+            vg_name=snap[0] if snap in live_snaps else None,
+            snap_name=snap[1] if snap in live_snaps else None,
+            journal_key=key,
+        ))
+        covered_snaps.add(snap)
+        covered_mounts.add(entry["mount_point"])
+
+    for vg, lv in snapshot_lvs:
+        m = SNAPSHOT_NAME_RE.search(lv)
+        if not m or (vg, lv) in busy_snaps or (vg, lv) in covered_snaps:
+            continue
+        base = _mount_base_for(m.group(1))
+        if base in busy_bases:
+            continue
+        leftovers.append(Leftover(
+            mount_point=f"{base}/{lv}", mount_base=base,
+            vg_name=vg, snap_name=lv,
+        ))
+        covered_mounts.add(f"{base}/{lv}")
+
+    for base, children in sorted(mount_dirs.items()):
+        if base in busy_bases:
+            continue
+        for mount_point in children or [base]:
+            stem, dot, suffix = mount_point.rpartition(".")
+            if f"{dot}{suffix}" in OVERLAY_SUFFIXES and (
+                stem in covered_mounts or stem in children
+            ):
+                continue
+            if mount_point not in covered_mounts:
+                leftovers.append(Leftover(mount_point, base))
+                covered_mounts.add(mount_point)
+
+    return leftovers, stale
+
+
+def list_snapshot_lvs() -> list[tuple[str, str]]:
+    """``(vg, lv)`` of every snapshot LV named like an rlvm snapshot."""
+    if shutil.which("lvs") is None:
+        return []
+    result = subprocess.run(
+        ["lvs", "--reportformat", "json", "-o", "vg_name,lv_name,origin"],
+        check=True, capture_output=True, text=True,
+    )
+    return [
+        (row["vg_name"], row["lv_name"])
+        for row in json.loads(result.stdout)["report"][0]["lv"]
+        if row["origin"] and SNAPSHOT_NAME_RE.search(row["lv_name"])
+    ]
+
+
+def list_mount_dirs() -> dict[str, list[str]]:
+    """Each ``/tmp/resticlvm-<ts>`` directory and its subdirectories."""
+    dirs = {}
+    for base in MOUNT_ROOT.glob("resticlvm-*"):
+        if MOUNT_BASE_RE.match(base.name) and base.is_dir():
+            try:
+                dirs[str(base)] = sorted(
+                    str(p) for p in base.iterdir() if p.is_dir()
+                )
+            except OSError:
+                dirs[str(base)] = []
+    return dirs
+
+
+def in_use(leftover: Leftover) -> bool:
+    """True if a process is using the leftover's mounted filesystem."""
+    if shutil.which("fuser") is None:
+        return False
+    mounted = subprocess.run(
+        ["mountpoint", "-q", leftover.mount_point], capture_output=True,
+    ).returncode == 0
+    return mounted and subprocess.run(
+        ["fuser", "-s", "-m", leftover.mount_point], capture_output=True,
+    ).returncode == 0
+
+
+def teardown_command(leftover: Leftover, dry_run: bool) -> list[str]:
+    script = str(pkg_resources.files(scripts) / "snapshot_teardown.sh")
+    cmd = ["bash", script]
+    if leftover.snap_name:
+        cmd += ["-g", leftover.vg_name, "-s", leftover.snap_name]
+    cmd += ["-m", leftover.mount_point, "-b", leftover.mount_base]
+    if dry_run:
+        cmd.append("-n")
+    return cmd
+
+
+def release(leftover: Leftover, dry_run: bool = False) -> bool:
+    if in_use(leftover):
+        print(f"⏭️  {leftover.describe()} is in use — leaving it.")
+        return False
+    result = subprocess.run(
+        teardown_command(leftover, dry_run), capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        print(f"⚠️  Could not release {leftover.describe()}: "
+              f"{result.stderr.strip()}")
+        return False
+    if dry_run:
+        print(result.stdout.rstrip())
+    return True
+
+
+def sweep(dry_run: bool = False) -> int:
+    """Release leftovers of earlier runs.
+
+    Returns:
+        int: The number of leftovers that could not be released.
+    """
+    try:
+        snapshot_lvs, mount_dirs = list_snapshot_lvs(), list_mount_dirs()
+        # Read the journal last: a run journals each snapshot before creating
+        # it, so anything live in the listings above is already journaled.
+        leftovers, stale = find_leftovers(
+            snapshot_journal.load_journal(), snapshot_lvs, mount_dirs,
+        )
+    except (subprocess.CalledProcessError, OSError, ValueError, KeyError) as e:
+        print(f"⚠️  Could not look for leftover snapshots: {e}")
+        return 0
+    if not dry_run and stale:
+        snapshot_journal.forget(*stale)
+    if not leftovers:
+        return 0
+
+    print(f"🧹 Releasing {len(leftovers)} leftover snapshot(s)/mount(s) "
+          f"from earlier runs:")
+    for leftover in leftovers:
+        print(f"  • {leftover.describe()}")
+    workers = min(_MAX_WORKERS, len(leftovers))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        ok = list(pool.map(lambda lo: release(lo, dry_run), leftovers))
+
+    if not dry_run:
+        snapshot_journal.forget(*(
+            lo.journal_key for lo, done in zip(leftovers, ok)
+            if done and lo.journal_key
+        ))
+    return ok.count(False)
+
+
+def run(args):
+    """Execute ``rlvm cleanup`` from pre-parsed arguments."""
+    failed = sweep(dry_run=args.dry_run)
+    if failed:
+        sys.exit(f"rlvm cleanup: {failed} leftover(s) could not be released")
+    print("✅ Cleanup complete.")
@@ -94,13 +94,293 @@ def main():
     )
     _add_common_arguments(prune_parser)
 
+    tune_parser = subparsers.add_parser(
+        "tune",
+        help="Benchmark restic settings for one volume (--name).",
+    )
+    _add_common_arguments(tune_parser)
+    tune_parser.add_argument(
+        "--sample-size",
+        default="1G",
+        help="Amount of the volume's data to sample. Default: 1G.",
+    )
+    tune_parser.add_argument(
+        "--budget",
+        type=int,
+        default=10,
+        help="Time budget in minutes; no trial starts past it. Default: 10.",
+    )
+    tune_parser.add_argument(
+        "--backends",
+        action="store_true",
+        help=(
+            "Also try connection counts against a scratch repository next "
+            "to each remote repository of the volume. Scratch repositories "
+            "on sftp and rclone are removed afterwards; those on other "
+            "backends (s3, b2, rest, ...) are left behind, and may be "
+            "billed, until you remove them."
+        ),
+    )
+    tune_parser.add_argument(
+        "--prefer",
+        choices=("balanced", "speed", "size"),
+        default="balanced",
+        help="How to pick the winning settings. Default: balanced.",
+    )
+    tune_parser.add_argument(
+        "--scratch-dir",
+        default=None,
+        help="Where to create local scratch repositories. Default: $TMPDIR.",
+    )
+    tune_parser.add_argument(
+        "--output",
+        default=None,
+        help=(
+            "File for the suggested profile snippet."
+            " Default: /var/lib/resticlvm/tune-<name>.toml."
+        ),
+    )
+
+    snapshots_parser = subparsers.add_parser(
+        "snapshots",
+        help="Show the latest snapshot of each volume on every destination.",
+    )
+    _add_common_arguments(snapshots_parser)
+    snapshots_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="List every repository instead of only stale ones.",
+    )
+    snapshots_parser.add_argument(
+        "--cached",
+        action="store_true",
+        help="Answer from the local catalog without listing any repository.",
+    )
+    snapshots_parser.add_argument(
+        "--gaps",
+        action="store_true",
+        help="List the snapshots missing from each copy destination.",
+    )
+
+    find_parser = subparsers.add_parser(
+        "find",
+        help="Find which snapshots contain a path, using local file indexes.",
+    )
+    _add_common_arguments(find_parser)
+    find_parser.add_argument(
+        "pattern",
+        help=(
+            "Path or glob to look up. Patterns without '/' match file names;"
+            " others match whole paths."
+        ),
+    )
+    find_parser.add_argument(
+        "--limit",
+        type=int,
+        default=100,
+        help="Show at most this many matching paths. Default: 100.",
+    )
+
+    check_parser = subparsers.add_parser(
+        "check",
+        help="Check repositories, reading a rotating slice of their data.",
+    )
+    _add_common_arguments(check_parser)
+    check_parser.add_argument(
+        "--no-read-data",
+        action="store_true",
+        help="Only check repository structure; read no data.",
+    )
+    check_parser.add_argument(
+        "--max-read-bytes",
+        default=None,
+        help="Data read budget for this run (e.g. 20G). Default: [check].",
+    )
+    check_parser.add_argument(
+        "--max-minutes",
+        type=int,
+        default=None,
+        help="No slice starts past this many minutes. Default: [check].",
+    )
+
+    restore_parser = subparsers.add_parser(
+        "restore",
+        help="Restore volumes from the fastest repository holding them.",
+    )
+    _add_common_arguments(restore_parser)
+    restore_parser.add_argument(
+        "volumes",
+        nargs="*",
+        help="Names of the volumes to restore (or use --category / --name).",
+    )
+    restore_parser.add_argument(
+        "--target",
+        default=None,
+        help="Restore each volume into TARGET/<volume name>.",
+    )
+    restore_parser.add_argument(
+        "--new-lv",
+        action="store_true",
+        help="Restore each LV volume onto a new LV next to the original.",
+    )
+    restore_parser.add_argument(
+        "--snapshot",
+        default=None,
+        help="Snapshot ID (or prefix) to restore. Default: the latest.",
+    )
+    restore_parser.add_argument(
+        "--before",
+        default=None,
+        help="Restore the latest snapshots taken at or before this time "
+        "(e.g. '2026-03-01 12:00').",
+    )
+    restore_parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Read restored files back and compare them with the repository.",
+    )
+    restore_parser.add_argument(
+        "--connections",
+        type=int,
+        default=None,
+        help="Backend connections per restore, overriding the profile.",
+    )
+
+    rebuild_parser = subparsers.add_parser(
+        "rebuild",
+        help="Recreate the LVM layout on blank disks and restore onto it.",
+    )
+    _add_common_arguments(rebuild_parser)
+    rebuild_parser.add_argument(
+        "--manifest",
+        default=None,
+        help="Layout manifest file (instead of reading it from --repo).",
+    )
+    rebuild_parser.add_argument(
+        "--repo",
+        default=None,
+        help="Repository to read the latest layout manifest from.",
+    )
+    rebuild_parser.add_argument(
+        "--password-file",
+        default=None,
+        help="Password file of --repo.",
+    )
+    rebuild_parser.add_argument(
+        "--host",
+        default=None,
+        help="Use the manifest stored by this host.",
+    )
+    rebuild_parser.add_argument(
+        "--pv",
+        action="append",
+        default=[],
+        metavar="OLD=NEW",
+        help="Recreate physical volume OLD (name or UUID) on device NEW. "
+        "Repeat for each physical volume.",
+    )
+    rebuild_parser.add_argument(
+        "--no-restore",
+        action="store_true",
+        help="Only recreate the layout; restore nothing.",
+    )
+    rebuild_parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Read restored files back and compare them with the repository.",
+    )
+    rebuild_parser.add_argument(
+        "--connections",
+        type=int,
+        default=None,
+        help="Backend connections per restore, overriding the profile.",
+    )
+
+    cleanup_parser = subparsers.add_parser(
+        "cleanup",
+        help="Release snapshots and mounts left behind by killed runs.",
+    )
+    _add_common_arguments(cleanup_parser)
+
+    rollback_parser = subparsers.add_parser(
+        "rollback",
+        help="Roll a volume back to a retained LVM snapshot.",
+    )
+    _add_common_arguments(rollback_parser)
+    rollback_parser.add_argument(
+        "volume",
+        help="Name of the volume to roll back.",
+    )
+    rollback_parser.add_argument(
+        "--list",
+        action="store_true",
+        help="List the volume's retained snapshots (the default action).",
+    )
+    rollback_parser.add_argument(
+        "--snapshot",
+        default=None,
+        help="Retained snapshot LV to use. Default: the newest.",
+    )
+    rollback_parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="Merge the snapshot into the volume (lvconvert --merge).",
+    )
+    rollback_parser.add_argument(
+        "--path",
+        action="append",
+        default=[],
+        help="Copy this path (relative to the volume root) out of the "
+        "snapshot. Repeat for several paths.",
+    )
+    rollback_parser.add_argument(
+        "--target",
+        default=None,
+        help="Copy paths into this directory instead of the live volume.",
+    )
+    rollback_parser.add_argument(
+        "--yes",
+        action="store_true",
+        help="Do not ask for confirmation.",
+    )
+
+    bench_parser = subparsers.add_parser(
+        "bench-snapshot",
+        help="Measure a volume's write latency under snapshots by chunk size.",
+    )
+    _add_common_arguments(bench_parser)
+    bench_parser.add_argument(
+        "volume",
+        help="Name of the LV volume to measure.",
+    )
+    bench_parser.add_argument(
+        "--chunksizes",
+        default="4K,16K,64K,256K",
+        help="Comma-separated snapshot chunk sizes to try. "
+        "Default: 4K,16K,64K,256K.",
+    )
+    bench_parser.add_argument(
+        "--file-size",
+        default="256M",
+        help="Size of the probe file written to the volume. Default: 256M.",
+    )
+    bench_parser.add_argument(
+        "--writes",
+        type=int,
+        default=2000,
+        help="Timed 4 KiB writes per run. Default: 2000.",
+    )
+
     args = parser.parse_args()
 
     if args.command is None:
         parser.print_help()
         sys.exit(0)
 
-    args.config = str(resolve_config(args.config))
+    # A rebuild can run from a rescue system with no config: the layout
+    # manifest carries the config it was taken with. A cleanup needs none.
+    if args.command not in ("rebuild", "cleanup") or args.config is not None:
+        args.config = str(resolve_config(args.config))
 
     ensure_running_as_root()
 
@@ -112,6 +392,42 @@ def main():
         from resticlvm.orchestration.prune_runner import run as run_prune
 
         run_prune(args)
+    elif args.command == "tune":
+        from resticlvm.orchestration.tune import run as run_tune
+
+        run_tune(args)
+    elif args.command == "snapshots":
+        from resticlvm.orchestration.snapshots_runner import run as run_snapshots
+
+        run_snapshots(args)
+    elif args.command == "find":
+        from resticlvm.orchestration.find_runner import run as run_find
+
+        run_find(args)
+    elif args.command == "check":
+        from resticlvm.orchestration.check_runner import run as run_check
+
+        run_check(args)
+    elif args.command == "restore":
+        from resticlvm.orchestration.restore_runner import run as run_restore
+
+        run_restore(args)
+    elif args.command == "rebuild":
+        from resticlvm.orchestration.rebuild_runner import run as run_rebuild
+
+        run_rebuild(args)
+    elif args.command == "cleanup":
+        from resticlvm.orchestration.cleanup_runner import run as run_cleanup
+
+        run_cleanup(args)
+    elif args.command == "rollback":
+        from resticlvm.orchestration.rollback_runner import run as run_rollback
+
+        run_rollback(args)
+    elif args.command == "bench-snapshot":
+        from resticlvm.orchestration.snapshot_bench import run as run_bench
+
+        run_bench(args)
 
 
 if __name__ == "__main__":
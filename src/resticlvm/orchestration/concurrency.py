@@ -0,0 +1,55 @@
+"""Per-backend concurrency limits for parallel repository operations.
+
+Copies, checks and restores can run several restic processes at once. Each
+backend has its own limits: a single SFTP host or a rate-limited B2 account
+should not see as many parallel sessions as a local disk. The
+``[concurrency]`` config section sets an overall ``max_parallel`` plus
+optional ``per_backend`` caps, keyed by the repository backend (``local``,
+``sftp``, ``s3``, ``rclone``, ...).
+"""
+
+import re
+import threading
+from contextlib import ExitStack, contextmanager
+
+_SCHEME_RE = re.compile(r"^([a-z0-9]+):")
+
+
+def backend_of(repo_path) -> str:
+    """Return the backend name of a restic repository path.
+
+    ``sftp:user@host:/p`` → ``sftp``; ``s3:host/bucket`` → ``s3``; a plain
+    filesystem path → ``local``.
+    """
+    m = _SCHEME_RE.match(str(repo_path))
+    return m.group(1) if m else "local"
+
+
+class BackendLimiter:
+    """Hands out per-backend slots so no backend exceeds its configured cap.
+
+    Backends without a configured cap are unlimited (the overall
+    ``max_parallel`` of the caller's thread pool still applies).
+    """
+
+    def __init__(self, per_backend: dict[str, int] | None = None):
+        self._semaphores = {
+            name: threading.BoundedSemaphore(max(1, int(limit)))
+            for name, limit in (per_backend or {}).items()
+        }
+
+    @contextmanager
+    def slot(self, *repo_paths):
+        """Hold one slot on the backend of every given repository.
+
+        Slots are acquired in sorted backend order so that two operations
+        touching the same pair of backends can never deadlock.
+        """
+        backends = sorted({backend_of(p) for p in repo_paths})
+        with ExitStack() as stack:
+            for name in backends:
+                sem = self._semaphores.get(name)
+                if sem is not None:
+                    sem.acquire()
+                    stack.callback(sem.release)
+            yield
@@ -0,0 +1,171 @@
+"""Dependency-ordered execution of copy_to operations.
+
+A ``copy_to`` destination normally copies from its repository. A destination
+can also name another destination of the same repository as its
+``source``. Copies then form a tree, for example local → NAS → B2 and
+NAS → second site. The production host's uplink then carries each new blob
+once, and downstream sites fan out from the NAS.
+
+Copies run in dependency order. Independent branches can run in parallel,
+bounded by ``[concurrency]`` limits. When a copy fails, every copy
+downstream of it is skipped and reported as failed. Identical source →
+destination pairs, from one job or from several, run only once.
+"""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from resticlvm.orchestration.concurrency import BackendLimiter
+from resticlvm.orchestration.restic_repo import CopyDestination
+
+
+@dataclass
+class CopyTask:
+    """One source → destination copy, optionally fed by an upstream copy."""
+
+    source_path: str
+    source_password_file: Path
+    dest: CopyDestination
+    upstream: "CopyTask | None" = None
+
+    @property
+    def key(self) -> tuple[str, str]:
+        """Identity of the physical source → destination pair."""
+        return (str(self.source_path), str(self.dest.repo_path))
+
+
+def copy_tasks_for_repo(repo) -> list[CopyTask]:
+    """Build the copy tasks for a ResticRepo's copy destinations.
+
+    Destinations whose ``source`` names a sibling destination copy from that
+    sibling; all others copy from the repository itself. The config factory
+    has already rejected unknown sources and cycles.
+
+    Returns:
+        list[CopyTask]: Tasks in config order, upstream tasks first.
+    """
+    by_name = {d.name: d for d in repo.copy_destinations if d.name}
+    tasks: dict[int, CopyTask] = {}
+
+    def task_for(dest: CopyDestination) -> CopyTask:
+        if id(dest) in tasks:
+            return tasks[id(dest)]
+        if dest.source is None:
+            task = CopyTask(
+                source_path=str(repo.repo_path),
+                source_password_file=repo.password_file,
+                dest=dest,
+            )
+        else:
+            upstream_dest = by_name[dest.source]
+            task = CopyTask(
+                source_path=str(upstream_dest.repo_path),
+                source_password_file=upstream_dest.password_file,
+                dest=dest,
+                upstream=task_for(upstream_dest),
+            )
+        tasks[id(dest)] = task
+        return task
+
+    for dest in repo.copy_destinations:
+        task_for(dest)
+    return list(tasks.values())
+
+
+def run_copy_graph(
+    tasks: list[CopyTask],
+    run_one: Callable[[CopyTask], bool],
+    max_parallel: int = 1,
+    limiter: BackendLimiter | None = None,
+) -> list[CopyTask]:
+    """Run copy tasks in dependency order, each physical pair once.
+
+    Tasks with the same ``key`` (same source and destination repository, e.g.
+    two volumes sharing a repository and its copy_to) are merged and run once.
+    A merged task waits for every upstream copy of its duplicates.
+
+    Args:
+        tasks: Tasks to run; every task's upstream must also be in the list.
+        run_one: Executes one task and returns True on success.
+        max_parallel: Maximum number of copies running at once. With 1, tasks
+            run one at a time in breadth-first config order.
+        limiter: Optional per-backend slot limiter.
+
+    Returns:
+        list[CopyTask]: Tasks (including duplicates) that failed or were
+        skipped because an upstream copy failed (empty if all succeeded).
+    """
+    limiter = limiter or BackendLimiter()
+    groups: dict[tuple, list[CopyTask]] = {}
+    for t in tasks:
+        groups.setdefault(t.key, []).append(t)
+    deps: dict[tuple, set] = {
+        key: {t.upstream.key for t in group if t.upstream is not None}
+        for key, group in groups.items()
+    }
+    children: dict[tuple, list] = {key: [] for key in groups}
+    for key, upstream_keys in deps.items():
+        for up in upstream_keys:
+            children[up].append(key)
+    waiting = {key: len(upstream_keys) for key, upstream_keys in deps.items()}
+    roots = [key for key, n in waiting.items() if n == 0]
+
+    failed_keys: set = set()
+
+    def execute(key) -> bool:
+        task = groups[key][0]
+        with limiter.slot(task.source_path, task.dest.repo_path):
+            return run_one(task)
+
+    def skip_downstream(key) -> None:
+        for child in children[key]:
+            if child in failed_keys:
+                continue
+            print(
+                f"⏭️  Skipping copy to {groups[child][0].dest.repo_path}: "
+                f"upstream copy to {groups[key][0].dest.repo_path} did not "
+                f"succeed.\n"
+            )
+            failed_keys.add(child)
+            skip_downstream(child)
+
+    def settle(key, ok: bool) -> list:
+        """Record a result; return the downstream keys now ready to run."""
+        if not ok:
+            failed_keys.add(key)
+            skip_downstream(key)
+            return []
+        ready = []
+        for child in children[key]:
+            waiting[child] -= 1
+            if waiting[child] == 0 and child not in failed_keys:
+                ready.append(child)
+        return ready
+
+    if max_parallel <= 1:
+        queue = deque(roots)
+        while queue:
+            key = queue.popleft()
+            queue.extend(settle(key, execute(key)))
+    else:
+        with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+            running = {pool.submit(execute, key): key for key in roots}
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    try:
+                        ok = future.result()
+                    except Exception as e:
+                        print(
+                            f"❌ Copy to {groups[key][0].dest.repo_path} "
+                            f"failed: {e}\n"
+                        )
+                        ok = False
+                    for child in settle(key, ok):
+                        running[pool.submit(execute, child)] = child
+
+    return [t for t in tasks if t.key in failed_keys]
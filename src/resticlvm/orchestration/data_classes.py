@@ -5,18 +5,48 @@ including token-to-config mappings and job execution logic.
 
 import importlib.resources as pkg_resources
 import os
+import socket
 import subprocess
 import sys
-from dataclasses import dataclass
+import tempfile
+from contextlib import ExitStack
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from resticlvm import scripts
+from resticlvm.orchestration.backup_config import (
+    ConcurrencySettings,
+    ExclusionSettings,
+    VolumeType,
+    is_local_repo,
+)
+from resticlvm.orchestration.catalog import (
+    Catalog,
+    SnapshotRecord,
+    parse_copy_output,
+)
+from resticlvm.orchestration.concurrency import BackendLimiter
+from resticlvm.orchestration.copy_graph import (
+    CopyTask,
+    copy_tasks_for_repo,
+    run_copy_graph,
+)
 from resticlvm.orchestration.credentials import (
     B2CredentialsError,
     load_b2_credentials,
     repo_uses_b2,
 )
+from resticlvm.orchestration.exclusions import exclusion_args, exclusion_dir
+from resticlvm.orchestration.file_index import Generation, update_index
+from resticlvm.orchestration.parents import (
+    record_backup_report,
+    recorded_parent,
+)
+from resticlvm.orchestration.performance import restic_env, restic_options
+from resticlvm.orchestration.restic_features import supports
+from resticlvm.orchestration.state import update_state
 from resticlvm.orchestration.terminal import preserved_terminal
+from resticlvm.orchestration.units import format_bytes, parse_size_bytes
 
 
 @dataclass
@@ -68,6 +98,9 @@ class BackupJob:
     category: str
     repositories: list
     dry_run: bool = False
+    concurrency: ConcurrencySettings = field(default_factory=ConcurrencySettings)
+    # None for volume types without a file tree (command streams).
+    exclusions: ExclusionSettings | None = field(default_factory=ExclusionSettings)
 
     def get_arg_entry(self, pair: TokenConfigKeyPair) -> list[str]:
         """Generate CLI arguments for a given token-config pair.
@@ -113,11 +146,63 @@ class BackupJob:
             args += ["-r", str(repo.repo_path)]
             args += ["-p", str(repo.password_file)]
 
+        # Performance profile tuning and recorded parents are per
+        # repository; once any repository has one, every -r gets a (possibly
+        # empty) value so the script can pair them up by position.
+        parents = self.recorded_parents()
+        if any(parents.values()):
+            for repo in self.repositories:
+                args += ["--repo-parent", parents[str(repo.repo_path)] or ""]
+        if any(r.performance for r in self.repositories):
+            for repo in self.repositories:
+                args += ["--repo-opts", " ".join(restic_options(
+                    repo.performance, repo.repo_path, command="backup"
+                ))]
+                args += ["--repo-env", " ".join(
+                    f"{k}={v}" for k, v in restic_env(repo.performance).items()
+                )]
+
         if self.dry_run:
             args.append("--dry-run")
 
         return args
 
+    @property
+    def job_key(self) -> str:
+        return f"{self.category}.{self.name}"
+
+    @property
+    def source_paths(self) -> list[str]:
+        """Paths the backup's snapshots contain."""
+        source = self.config.get("backup_source_path")
+        return [source] if source else []
+
+    @property
+    def snapshot_tags(self) -> list[str]:
+        """Tags rlvm adds to this job's snapshots (beyond exclusion tags)."""
+        return []
+
+    @property
+    def file_indexes(self) -> list[tuple[str, list[str]]]:
+        """(index key, source paths) of the file indexes this job feeds."""
+        if not self.config.get("file_index"):
+            return []
+        return [(self.job_key, self.source_paths)]
+
+    def recorded_parents(self) -> dict[str, str | None]:
+        """Recorded parent snapshot (or None) for each repository.
+
+        Command streams are read from stdin and have no useful parent.
+        """
+        if self.exclusions is None or not self.source_paths:
+            return {str(r.repo_path): None for r in self.repositories}
+        return {
+            str(r.repo_path): recorded_parent(
+                self.job_key, r.repo_path, self.source_paths
+            )
+            for r in self.repositories
+        }
+
     @property
     def script_path(self) -> Path:
         """Get the resolved filesystem path to the backup script.
@@ -193,22 +278,49 @@ class BackupJob:
                 )
 
         try:
-            cmd = self.cmd
-            if snapshot_mount is not None:
-                cmd = cmd + ["--snapshot-mount", snapshot_mount]
-
-            # ssh (spawned by restic for SFTP) can leave the terminal's
-            # foreground process group pointing at its dead group on failure,
-            # which makes later restic runs suppress their output; restore it
-            # afterward so subsequent jobs' output isn't lost (issue #57).
-            with preserved_terminal():
-                subprocess.run(
-                    args=cmd,
-                    check=True,
-                    stdout=sys.stdout,
-                    stderr=sys.stderr,
-                    env=env,
-                )
+            with ExitStack() as stack:
+                cmd = self.cmd
+                if self.exclusions is not None:
+                    # Exclusions are written once per job and applied to
+                    # every repo.
+                    excl_dir = stack.enter_context(exclusion_dir(
+                        self.config.get("exclude_paths", []), self.exclusions
+                    ))
+                    cmd = cmd + exclusion_args(excl_dir, self.exclusions)
+                is_stream = self.category == VolumeType.COMMAND.value
+                if is_stream:
+                    cmd = cmd + self._stream_args()
+                report = None
+                if not self.dry_run:
+                    report = Path(stack.enter_context(
+                        tempfile.TemporaryDirectory(prefix="rlvm-report-")
+                    )) / "report.tsv"
+                    cmd = cmd + ["--report", str(report)]
+                if snapshot_mount is not None:
+                    cmd = cmd + ["--snapshot-mount", snapshot_mount]
+
+                # ssh (spawned by restic for SFTP) can leave the terminal's
+                # foreground process group pointing at its dead group on
+                # failure, which makes later restic runs suppress their output;
+                # restore it afterward so subsequent jobs' output isn't lost
+                # (issue #57).
+                parents = self.recorded_parents()
+                try:
+                    with preserved_terminal():
+                        subprocess.run(
+                            args=cmd,
+                            check=True,
+                            stdout=sys.stdout,
+                            stderr=sys.stderr,
+                            env=env,
+                        )
+                finally:
+                    # Repositories that succeeded are recorded even if
+                    # another one failed.
+                    if report is not None and not is_stream:
+                        self._record_snapshots(report, parents, env)
+                if report is not None and is_stream:
+                    self._record_stream_report(report)
             print(f"✅ Backup [{self.category}.{self.name}] completed.\n")
 
             if defer_copies:
@@ -231,6 +343,8 @@ class BackupJob:
             print(f"❌ Command failed [{self.category}.{self.name}]: {e}")
         except FileNotFoundError as e:
             print(f"❌ Script not found [{self.category}.{self.name}]: {e}")
+        except ValueError as e:
+            print(f"❌ Exclusions [{self.category}.{self.name}]: {e}")
 
         return JobResult(
             category=self.category,
@@ -239,27 +353,101 @@ class BackupJob:
             failed_copies=[],
         )
 
+    def _record_snapshots(
+        self, report: Path, parents: dict[str, str | None], env: dict
+    ) -> None:
+        """Record reported snapshots as parents, in the catalog and in file
+        indexes."""
+        saved = record_backup_report(
+            self.job_key, report, self.source_paths, parents
+        )
+        catalog = Catalog()
+        hostname = socket.gethostname()
+        for repo, snapshot, started in saved:
+            catalog.add(repo, [SnapshotRecord(
+                short_id=snapshot,
+                time=started,
+                hostname=hostname,
+                paths=self.source_paths,
+                tags=self.snapshot_tags,
+            )])
+        if saved and self.file_indexes:
+            self._update_file_indexes(saved, env)
+
+    def _update_file_indexes(
+        self, saved: list[tuple[str, str, float]], env: dict
+    ) -> None:
+        """Add this backup to the file indexes, diffing in one repository
+        (preferably a local one)."""
+        generation = Generation(
+            time=min(started for _, _, started in saved),
+            snapshots={repo: snapshot for repo, snapshot, _ in saved},
+        )
+        repos = {str(r.repo_path): r for r in self.repositories}
+        source = next(
+            (repo for repo, _, _ in saved if is_local_repo(repo)), saved[0][0]
+        )
+        repo = repos[source]
+        env = {**env, **restic_env(repo.performance)}
+        for key, roots in self.file_indexes:
+            update_index(
+                key, roots, source, repo.password_file, env, generation
+            )
+
+    def _stream_args(self) -> list[str]:
+        """Extra backup_command.sh arguments for a command-stream volume.
+
+        Without --stdin-from-command (restic < 0.17) each repository cannot
+        run the command itself, so the single-run fan-out is used instead.
+        """
+        fan_out = bool(self.config.get("fan_out"))
+        if not fan_out and not supports("stdin_from_command"):
+            print(
+                "ℹ️  restic lacks --stdin-from-command; streaming one "
+                "command run to all repositories instead."
+            )
+            fan_out = True
+        return ["--fan-out", "true" if fan_out else "false"]
+
+    def _record_stream_report(self, report: Path) -> None:
+        """Print and record per-repository throughput of a command stream."""
+        if not report.exists():
+            return
+        records = {}
+        for line in report.read_text().splitlines():
+            try:
+                repo, seconds, size = line.split("\t")
+                seconds = float(seconds)
+                size_bytes = parse_size_bytes(size)
+            except ValueError:
+                continue
+            rate = int(size_bytes / seconds) if seconds > 0 else 0
+            print(
+                f"📊 Streamed {format_bytes(size_bytes)} to {repo} in "
+                f"{seconds:.1f}s ({format_bytes(rate)}/s)"
+            )
+            records[repo] = {
+                "bytes": size_bytes,
+                "seconds": round(seconds, 3),
+                "bytes_per_s": rate,
+            }
+        if records:
+            update_state("throughput", f"{self.category}.{self.name}", records)
+
     def run_deferred_copies(self) -> list:
         """Run copy operations that were deferred during run(defer_copies=True).
 
         Returns:
             list: Copy-destination repo_paths that failed (empty if all succeeded).
         """
-        env = os.environ.copy()
-        env.setdefault("SSH_AUTH_SOCK", "/root/.ssh/ssh-agent.sock")
-
-        if self._uses_b2():
-            try:
-                load_b2_credentials(env)
-            except B2CredentialsError as e:
-                print(f"❌ B2 credentials for copies [{self.category}.{self.name}]: {e}")
-                return [
-                    d.repo_path
-                    for r in self.repositories
-                    for d in (r.copy_destinations or [])
-                ]
+        return run_job_copies([self])[0]
 
-        return self._run_copy_operations(env)
+    def copy_tasks(self) -> list[CopyTask]:
+        """Copy tasks for every copy_to destination of this job's repositories."""
+        tasks = []
+        for repo in self.repositories:
+            tasks += copy_tasks_for_repo(repo)
+        return tasks
 
     def _run_copy_operations(self, env: dict) -> list:
         """Execute copy operations for repositories with copy_to destinations.
@@ -270,39 +458,115 @@ class BackupJob:
         Returns:
             list: Copy-destination repo_paths that failed (empty if all succeeded).
         """
-        failed_copies = []
-        for repo in self.repositories:
-            if not repo.copy_destinations:
-                continue
+        return _run_copy_tasks([self], env)[0]
 
-            for copy_dest in repo.copy_destinations:
-                print(f"🔄 Copying from {repo.repo_path} to {copy_dest.repo_path}...")
 
-                copy_script = pkg_resources.files(scripts) / "copy_repo.sh"
+def run_job_copies(jobs: list[BackupJob]) -> list[list]:
+    """Run the deferred copy operations of several jobs as one copy graph.
 
-                cmd = [
-                    "bash",
-                    str(copy_script),
-                    "-s", str(repo.repo_path),
-                    "-p", str(repo.password_file),
-                    "-d", str(copy_dest.repo_path),
-                    "-q", str(copy_dest.password_file),
-                ]
-                if self.dry_run:
-                    cmd.append("-n")
+    Copies run in dependency order (see copy_graph): a destination whose
+    ``source`` names another destination waits for that copy, and is skipped
+    if it fails. A source → destination pair shared by several jobs (volumes
+    backing up to the same repository with the same copy_to) runs once.
+    Independent copies run in parallel up to the ``[concurrency]`` limits.
 
-                try:
-                    # Copy targets can be remote (ssh); guard the terminal (#57).
-                    with preserved_terminal():
-                        subprocess.run(
-                            args=cmd,
-                            check=True,
-                            stdout=sys.stdout,
-                            stderr=sys.stderr,
-                            env=env,
-                        )
-                    print(f"✅ Copy to {copy_dest.repo_path} completed.\n")
-                except subprocess.CalledProcessError as e:
-                    print(f"❌ Copy to {copy_dest.repo_path} failed: {e}\n")
-                    failed_copies.append(copy_dest.repo_path)
-        return failed_copies
+    Returns:
+        list[list]: For each job, in order, the copy-destination repo_paths
+        that failed (empty if all succeeded).
+    """
+    env = os.environ.copy()
+    env.setdefault("SSH_AUTH_SOCK", "/root/.ssh/ssh-agent.sock")
+
+    if any(job._uses_b2() for job in jobs):
+        try:
+            load_b2_credentials(env)
+        except B2CredentialsError as e:
+            print(f"❌ B2 credentials for copies: {e}")
+            return [[t.dest.repo_path for t in job.copy_tasks()] for job in jobs]
+
+    return _run_copy_tasks(jobs, env)
+
+
+def _run_copy_tasks(jobs: list[BackupJob], env: dict) -> list[list]:
+    tasks_per_job = [job.copy_tasks() for job in jobs]
+    tasks = [t for job_tasks in tasks_per_job for t in job_tasks]
+    if not tasks:
+        return [[] for _ in jobs]
+
+    # All jobs of one run share dry_run and the [concurrency] settings.
+    dry_run = jobs[0].dry_run
+    concurrency = jobs[0].concurrency
+    failed = run_copy_graph(
+        tasks,
+        lambda task: _run_copy_task(task, env, dry_run),
+        max_parallel=concurrency.max_parallel,
+        limiter=BackendLimiter(concurrency.per_backend),
+    )
+    failed_keys = {t.key for t in failed}
+    return [
+        [t.dest.repo_path for t in job_tasks if t.key in failed_keys]
+        for job_tasks in tasks_per_job
+    ]
+
+
+def _run_copy_task(task: CopyTask, env: dict, dry_run: bool) -> bool:
+    """Run one copy (or mirror) script; return True on success."""
+    copy_dest = task.dest
+    if copy_dest.is_mirror:
+        print(f"🪞 Mirroring {task.source_path} to {copy_dest.repo_path}...")
+        # File-level replication: no decrypt/re-encrypt, so no
+        # passwords are needed.
+        cmd = [
+            "bash",
+            str(pkg_resources.files(scripts) / "mirror_repo.sh"),
+            "-s", str(task.source_path),
+            "-d", str(copy_dest.repo_path),
+        ]
+    else:
+        print(f"🔄 Copying from {task.source_path} to {copy_dest.repo_path}...")
+        cmd = [
+            "bash",
+            str(pkg_resources.files(scripts) / "copy_repo.sh"),
+            "-s", str(task.source_path),
+            "-p", str(task.source_password_file),
+            "-d", str(copy_dest.repo_path),
+            "-q", str(copy_dest.password_file),
+        ]
+        restic_opts = restic_options(
+            copy_dest.performance, task.source_path, copy_dest.repo_path,
+            command="copy",
+        )
+        if restic_opts:
+            cmd += ["-o", " ".join(restic_opts)]
+        env = {**env, **restic_env(copy_dest.performance)}
+    if dry_run:
+        cmd.append("-n")
+
+    with tempfile.TemporaryDirectory(prefix="rlvm-copy-") as tmp:
+        report = Path(tmp) / "copy.txt"
+        if not (dry_run or copy_dest.is_mirror):
+            cmd += ["--report", str(report)]
+        try:
+            # Copy targets can be remote (ssh); guard the terminal (#57).
+            with preserved_terminal():
+                subprocess.run(
+                    args=cmd,
+                    check=True,
+                    stdout=sys.stdout,
+                    stderr=sys.stderr,
+                    env=env,
+                )
+        except subprocess.CalledProcessError as e:
+            print(f"❌ Copy to {copy_dest.repo_path} failed: {e}\n")
+            return False
+
+        if not dry_run:
+            if copy_dest.is_mirror:
+                Catalog().mirror(task.source_path, copy_dest.repo_path)
+            elif report.exists():
+                Catalog().copy(
+                    task.source_path, copy_dest.repo_path,
+                    parse_copy_output(report.read_text()),
+                )
+    print(f"✅ Copy to {copy_dest.repo_path} completed.\n")
+    return True
@@ -7,9 +7,10 @@ for ResticLVM backup jobs.
 from resticlvm.orchestration.backup_config import VolumeType
 
 # Mapping of CLI tokens to configuration keys for standard path backups.
+# Exclusions are not passed as tokens; BackupJob writes them to a per-job
+# exclusion directory instead (see exclusions.py).
 STANDARD_PATH_TOKEN_KEY_MAP = {
     "-s": "backup_source_path",
-    "-e": "exclude_paths",
 }
 
 # Mapping of CLI tokens to configuration keys for logical volume backups.
@@ -18,7 +19,14 @@ LOGICAL_VOLUME_TOKEN_KEY_MAP = {
     "-l": "lv_name",
     "-z": "snapshot_size",
     "-s": "backup_source_path",
-    "-e": "exclude_paths",
+}
+
+# Mapping of CLI tokens to configuration keys for command-stream backups.
+# fan_out is not a token: BackupJob also enables it when the installed restic
+# lacks --stdin-from-command.
+COMMAND_TOKEN_KEY_MAP = {
+    "-c": "command",
+    "-f": "stdin_filename",
 }
 
 # Dispatch table mapping volume types to their corresponding
@@ -36,4 +44,8 @@ RESOURCE_DISPATCH = {
         "script_name": "backup_lv_nonroot.sh",
         "token_key_map": LOGICAL_VOLUME_TOKEN_KEY_MAP,
     },
+    VolumeType.COMMAND: {
+        "script_name": "backup_command.sh",
+        "token_key_map": COMMAND_TOKEN_KEY_MAP,
+    },
 }
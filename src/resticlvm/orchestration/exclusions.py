@@ -0,0 +1,79 @@
+"""Per-job restic exclusion files.
+
+Each backup job writes its exclusions once to a private directory, which the
+backup script applies to every repository:
+
+- ``exclude.txt``: the volume's ``exclude_paths`` followed by the contents of
+  its ``exclude_file`` entries, one pattern per line (restic
+  ``--exclude-file``). Unlike the old space-joined ``-e`` argument, this
+  handles paths that contain spaces.
+- ``iexclude.txt``: the volume's case-insensitive ``iexclude`` patterns
+  (restic ``--iexclude-file``).
+
+The scripts translate the directory's location for the lv_root chroot. The
+patterns themselves need no translation: lv_root restic sees the snapshot at
+``/``, and lv_nonroot restic sees it bind-mounted over the LV's real mount
+point.
+"""
+
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from resticlvm.orchestration.backup_config import ExclusionSettings
+
+EXCLUDE_FILE_NAME = "exclude.txt"
+IEXCLUDE_FILE_NAME = "iexclude.txt"
+
+
+def _exclude_lines(exclude_paths: list[str], settings: ExclusionSettings) -> list[str]:
+    lines = list(exclude_paths)
+    for path in settings.exclude_file:
+        try:
+            content = Path(path).read_text()
+        except OSError as e:
+            raise ValueError(f"cannot read exclude_file {path}: {e}") from None
+        lines.append(f"# from {path}")
+        lines += content.splitlines()
+    return lines
+
+
+def write_exclusion_dir(
+    directory: Path, exclude_paths: list[str], settings: ExclusionSettings
+) -> None:
+    """Write the exclusion files for one job into ``directory``.
+
+    Raises:
+        ValueError: If a configured ``exclude_file`` cannot be read.
+    """
+    (directory / EXCLUDE_FILE_NAME).write_text(
+        "".join(f"{line}\n" for line in _exclude_lines(exclude_paths, settings))
+    )
+    if settings.iexclude:
+        (directory / IEXCLUDE_FILE_NAME).write_text(
+            "".join(f"{p}\n" for p in settings.iexclude)
+        )
+
+
+@contextmanager
+def exclusion_dir(exclude_paths: list[str], settings: ExclusionSettings):
+    """Yield a temporary directory holding the job's exclusion files."""
+    directory = Path(tempfile.mkdtemp(prefix="rlvm-exclude-"))
+    try:
+        write_exclusion_dir(directory, exclude_paths, settings)
+        yield directory
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def exclusion_args(directory: Path, settings: ExclusionSettings) -> list[str]:
+    """Backup-script arguments that apply the exclusions in ``directory``."""
+    args = ["--exclude-dir", str(directory)]
+    if settings.exclude_caches:
+        args.append("--exclude-caches")
+    for name in settings.exclude_if_present:
+        args += ["--exclude-if-present", name]
+    if settings.exclude_larger_than is not None:
+        args += ["--exclude-larger-than", settings.exclude_larger_than]
+    return args
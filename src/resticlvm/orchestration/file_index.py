@@ -0,0 +1,399 @@
+"""Per-volume index of which snapshots contain which paths.
+
+``restic find`` walks every snapshot tree of a repository, which over B2 or
+SFTP takes very long. Volumes with ``file_index = true`` keep a local index
+instead (``index/<category>.<name>.idx`` in the state directory, see
+state.py) that ``rlvm find`` queries without touching any repository.
+
+Every successful backup adds one *generation*: its time and the snapshot it
+wrote to each repository. The index is updated from ``restic diff --json``
+between the previous generation's snapshot and the new one, in one
+repository (a local one if the volume has any). If there is no usable
+previous snapshot, the new snapshot is listed in full with
+``restic ls --json`` instead.
+
+For each path the index stores *versions*: ranges of generations during
+which the path existed unchanged. A path added in generation 3 and modified
+in generation 7 has the versions [3, 7) and [7, open).
+
+On-disk format (all integers little-endian; "varint" is LEB128)::
+
+    MAGIC
+    u32 metadata length, metadata (JSON: generations)
+    entries, sorted by path bytes, each:
+        varint shared prefix length with the previous path
+        varint suffix length, suffix bytes
+        varint version count, then per version:
+            varint first generation
+            varint end generation + 1 (0 while the path still exists)
+    u32 offset of every RESTART_INTERVAL-th entry (shared prefix is 0)
+    u32 restart offsets position, u32 restart count
+
+Queries memory-map the file and binary-search the restart points, so a path
+lookup decodes at most RESTART_INTERVAL entries. Updates rewrite the file
+atomically.
+
+Like the other state files, the index is advisory: failing to update it
+never fails a backup.
+"""
+
+import fnmatch
+import json
+import mmap
+import os
+import struct
+import subprocess
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from resticlvm.orchestration.state import state_dir
+
+INDEX_DIR = "index"
+MAGIC = b"RLVMIDX1"
+RESTART_INTERVAL = 64
+
+_U32 = struct.Struct("<I")
+_TRAILER = struct.Struct("<II")
+_GLOB_CHARS = "*?["
+
+# Changes reported by restic diff: added, removed, content or type changed.
+# Metadata-only changes ("U") do not start a new version.
+_ADDED = "+"
+_REMOVED = "-"
+_CHANGED = ("M", "T")
+
+
+@dataclass
+class Generation:
+    """One backup: its start time and the snapshot written to each repo."""
+
+    time: float
+    snapshots: dict[str, str] = field(default_factory=dict)
+
+
+def index_path(job_key: str) -> Path:
+    return state_dir() / INDEX_DIR / f"{job_key}.idx"
+
+
+# ─── Encoding ─────────────────────────────────────────────────────
+
+
+def _put_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(buf, pos: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _encode_path(path: str) -> bytes:
+    return path.encode("utf-8", "surrogateescape")
+
+
+def _decode_path(raw: bytes) -> str:
+    return raw.decode("utf-8", "surrogateescape")
+
+
+def write_index(
+    path: Path,
+    generations: list[Generation],
+    entries: dict[str, list[list[int | None]]],
+) -> None:
+    """Atomically write an index file.
+
+    ``entries`` maps each path to its versions, ``[first, end]`` generation
+    pairs with ``end`` exclusive, or None while the path still exists.
+    """
+    meta = json.dumps(
+        [{"time": g.time, "snapshots": g.snapshots} for g in generations]
+    ).encode()
+    out = bytearray(MAGIC)
+    out += _U32.pack(len(meta)) + meta
+
+    restarts = []
+    prev = b""
+    for i, key in enumerate(sorted(entries, key=_encode_path)):
+        raw = _encode_path(key)
+        shared = 0
+        if i % RESTART_INTERVAL == 0:
+            restarts.append(len(out))
+        else:
+            limit = min(len(prev), len(raw))
+            while shared < limit and prev[shared] == raw[shared]:
+                shared += 1
+        _put_varint(out, shared)
+        _put_varint(out, len(raw) - shared)
+        out += raw[shared:]
+        versions = entries[key]
+        _put_varint(out, len(versions))
+        for first, end in versions:
+            _put_varint(out, first)
+            _put_varint(out, 0 if end is None else end + 1)
+        prev = raw
+
+    restarts_at = len(out)
+    for offset in restarts:
+        out += _U32.pack(offset)
+    out += _TRAILER.pack(restarts_at, len(restarts))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    with os.fdopen(fd, "wb") as f:
+        f.write(out)
+    os.replace(tmp, path)
+
+
+# ─── Reading ──────────────────────────────────────────────────────
+
+
+class FileIndex:
+    """A memory-mapped index file (use as a context manager)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:  # empty file
+            self._file.close()
+            raise ValueError(f"{self.path}: not an index file") from e
+        if self._buf[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path}: not an index file")
+        pos = len(MAGIC)
+        (meta_len,) = _U32.unpack_from(self._buf, pos)
+        pos += _U32.size
+        self.generations = [
+            Generation(time=g["time"], snapshots=g["snapshots"])
+            for g in json.loads(self._buf[pos:pos + meta_len])
+        ]
+        self._entries_at = pos + meta_len
+        self._restarts_at, self._restart_count = _TRAILER.unpack_from(
+            self._buf, len(self._buf) - _TRAILER.size
+        )
+
+    def close(self) -> None:
+        self._buf.close()
+        self._file.close()
+
+    def __enter__(self) -> "FileIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _restart(self, i: int) -> int:
+        return _U32.unpack_from(self._buf, self._restarts_at + i * _U32.size)[0]
+
+    def _scan(self, pos: int):
+        """Yield (path bytes, versions) from ``pos`` to the end."""
+        buf = self._buf
+        prev = b""
+        while pos < self._restarts_at:
+            shared, pos = _get_varint(buf, pos)
+            length, pos = _get_varint(buf, pos)
+            raw = prev[:shared] + buf[pos:pos + length]
+            pos += length
+            count, pos = _get_varint(buf, pos)
+            versions = []
+            for _ in range(count):
+                first, pos = _get_varint(buf, pos)
+                end, pos = _get_varint(buf, pos)
+                versions.append([first, end - 1 if end else None])
+            yield raw, versions
+            prev = raw
+
+    def _seek(self, raw: bytes) -> int:
+        """Offset of the last restart point whose path is <= ``raw``."""
+        lo, hi = 0, self._restart_count - 1
+        best = self._restart(0) if self._restart_count else self._restarts_at
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            offset = self._restart(mid)
+            key, _ = next(self._scan(offset))
+            if key <= raw:
+                best = offset
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        return best
+
+    def entries(self):
+        """Yield (path, versions) for every indexed path."""
+        for raw, versions in self._scan(self._entries_at):
+            yield _decode_path(raw), versions
+
+    def lookup(self, path: str) -> list[list[int | None]] | None:
+        """Versions of ``path``, or None if it was never backed up."""
+        raw = _encode_path(path)
+        for key, versions in self._scan(self._seek(raw)):
+            if key == raw:
+                return versions
+            if key > raw:
+                return None
+        return None
+
+    def match(self, pattern: str):
+        """Yield (path, versions) for paths matching a glob ``pattern``.
+
+        Patterns containing ``/`` match the whole path (``*`` also matches
+        ``/``); others match the last path component, like ``restic find``.
+        """
+        if "/" not in pattern:
+            for path, versions in self.entries():
+                if fnmatch.fnmatchcase(path.rsplit("/", 1)[-1], pattern):
+                    yield path, versions
+            return
+        cut = min(
+            (i for i, c in enumerate(pattern) if c in _GLOB_CHARS),
+            default=len(pattern),
+        )
+        if cut == len(pattern):
+            versions = self.lookup(pattern)
+            if versions is not None:
+                yield pattern, versions
+            return
+        prefix = _encode_path(pattern[:cut])
+        for raw, versions in self._scan(self._seek(prefix)):
+            if raw < prefix:
+                continue
+            if not raw.startswith(prefix):
+                return
+            path = _decode_path(raw)
+            if fnmatch.fnmatchcase(path, pattern):
+                yield path, versions
+
+
+def load_entries(path: Path) -> tuple[list[Generation], dict]:
+    """Generations and all entries of an index file (empty if missing)."""
+    if not path.exists():
+        return [], {}
+    with FileIndex(path) as index:
+        return index.generations, dict(index.entries())
+
+
+# ─── Updating ─────────────────────────────────────────────────────
+
+
+def _under(path: str, roots: list[str]) -> bool:
+    for root in roots:
+        root = root.rstrip("/")
+        if not root or path == root or path.startswith(root + "/"):
+            return True
+    return False
+
+
+def apply_changes(
+    entries: dict, generation: int, changes: list[tuple[str, str]]
+) -> None:
+    """Apply restic diff ``(modifier, path)`` changes as ``generation``."""
+    for modifier, path in changes:
+        versions = entries.setdefault(path, [])
+        is_open = bool(versions) and versions[-1][1] is None
+        if modifier in (_REMOVED, *_CHANGED) and is_open:
+            versions[-1][1] = generation
+        if modifier in (_ADDED, *_CHANGED):
+            versions.append([generation, None])
+        if not versions:
+            del entries[path]
+
+
+def apply_listing(entries: dict, generation: int, paths: set[str]) -> None:
+    """Apply a full listing of the snapshot written as ``generation``."""
+    for path, versions in entries.items():
+        if versions[-1][1] is None and path not in paths:
+            versions[-1][1] = generation
+    for path in paths:
+        versions = entries.setdefault(path, [])
+        if not versions or versions[-1][1] is not None:
+            versions.append([generation, None])
+
+
+def _restic(repo, password_file, env, *args) -> list[dict]:
+    result = subprocess.run(
+        ["restic", "-r", str(repo), "--password-file", str(password_file),
+         "--no-lock", *args, "--json"],
+        check=True, capture_output=True, text=True, env=env,
+    )
+    messages = []
+    for line in result.stdout.splitlines():
+        line = line.strip()
+        if line.startswith("{"):
+            messages.append(json.loads(line))
+    return messages
+
+
+def restic_diff(repo, password_file, env, old: str, new: str) -> list[tuple[str, str]]:
+    """(modifier, path) changes between two snapshots of one repository."""
+    return [
+        (m["modifier"], m["path"].rstrip("/") or "/")
+        for m in _restic(repo, password_file, env, "diff", old, new)
+        if m.get("message_type") == "change"
+    ]
+
+
+def restic_ls(repo, password_file, env, snapshot: str) -> set[str]:
+    """Every path in a snapshot."""
+    return {
+        m["path"]
+        for m in _restic(repo, password_file, env, "ls", snapshot)
+        if "path" in m and m.get("struct_type", "node") == "node"
+    }
+
+
+def update_index(
+    job_key: str,
+    roots: list[str],
+    repo,
+    password_file,
+    env: dict,
+    generation: Generation,
+) -> None:
+    """Add ``generation`` to a volume's index from one repository.
+
+    Only paths under ``roots`` (the volume's source paths) are indexed, so
+    one grouped snapshot can feed each member's index.
+    """
+    path = index_path(job_key)
+    repo = str(repo)
+    snapshot = generation.snapshots[repo]
+    try:
+        generations, entries = load_entries(path)
+        if generations and generations[-1].snapshots.get(repo) == snapshot:
+            return  # already indexed
+        number = len(generations)
+        # A diff is only usable against the latest generation.
+        previous = generations[-1].snapshots.get(repo) if generations else None
+        changes = None
+        if previous is not None:
+            try:
+                changes = restic_diff(repo, password_file, env, previous, snapshot)
+            except subprocess.CalledProcessError:
+                changes = None  # previous snapshot forgotten: list in full
+        if changes is not None:
+            changes = [(m, p) for m, p in changes if _under(p, roots)]
+            apply_changes(entries, number, changes)
+            summary = f"{len(changes)} change(s)"
+        else:
+            listing = {
+                p for p in restic_ls(repo, password_file, env, snapshot)
+                if _under(p, roots)
+            }
+            apply_listing(entries, number, listing)
+            summary = f"{len(listing)} path(s)"
+        write_index(path, generations + [generation], entries)
+        print(f"🗂️  Indexed {summary} for {job_key} from {repo}")
+    except (OSError, ValueError, KeyError,
+            subprocess.CalledProcessError) as e:
+        print(f"⚠️  Could not update the file index of {job_key}: {e}")
@@ -0,0 +1,133 @@
+"""``rlvm find``: which snapshots contain a path, from the local file index.
+
+Searches the file indexes of volumes with ``file_index = true`` (see
+file_index.py) without contacting any repository. Each matching path is
+listed with its versions and, per version, the latest snapshot holding it
+in every repository and copy_to destination. Snapshots the catalog knows
+to be forgotten are left out (see catalog.py).
+"""
+
+import socket
+from datetime import datetime
+from pathlib import Path
+
+from resticlvm.orchestration.backup_config import (
+    BackupConfigFactory,
+    VolumeConfig,
+)
+from resticlvm.orchestration.catalog import TIME_TOLERANCE_S, Catalog
+from resticlvm.orchestration.config_loader import load_config
+from resticlvm.orchestration.file_index import (
+    FileIndex,
+    Generation,
+    index_path,
+)
+from resticlvm.orchestration.snapshots_runner import (
+    selected_volumes,
+    volume_destinations,
+)
+
+
+def _when(time: float) -> str:
+    return datetime.fromtimestamp(time).isoformat(sep=" ", timespec="minutes")
+
+
+def version_snapshots(
+    catalog: Catalog,
+    vol_name: str,
+    vol: VolumeConfig,
+    generations: list[Generation],
+    hostname: str,
+) -> list[tuple[str, str]]:
+    """(label, snapshot) of the latest snapshot per destination among
+    ``generations`` (oldest first)."""
+    found = []
+    for dest in volume_destinations(vol):
+        repo = str(dest.repo_path)
+        label = f"{dest.label} → {repo}" if dest.source else repo
+        if dest.source is None:
+            known = catalog.snapshot_ids(repo)
+            snapshot = next(
+                (g.snapshots[repo] for g in reversed(generations)
+                 if repo in g.snapshots
+                 and (known is None or g.snapshots[repo] in known)),
+                None,
+            )
+        else:
+            # Copies are matched by time, as in ``rlvm snapshots``.
+            copies = catalog.snapshots(
+                repo, hostname, [vol.backup_source_path], f"vol:{vol_name}"
+            )
+            snapshot = next(
+                (c.short_id for c in reversed(copies)
+                 if any(abs(c.time - g.time) <= TIME_TOLERANCE_S
+                        for g in generations)),
+                None,
+            )
+        if snapshot is not None:
+            found.append((label, snapshot))
+    return found
+
+
+def print_match(
+    catalog: Catalog,
+    vol_name: str,
+    vol: VolumeConfig,
+    index: FileIndex,
+    path: str,
+    versions: list[list[int | None]],
+    hostname: str,
+) -> None:
+    gens = index.generations
+    print(f"\n🔎 {path}  [{vol.volume_type.value}.{vol_name}]")
+    for number, (first, end) in enumerate(versions, start=1):
+        in_version = gens[first:end] if end is not None else gens[first:]
+        until = _when(gens[end].time) if end is not None else "present"
+        print(f"   version {number}: {_when(gens[first].time)} → {until} "
+              f"({len(in_version)} backup(s))")
+        snapshots = version_snapshots(
+            catalog, vol_name, vol, in_version, hostname
+        )
+        if not snapshots:
+            print("      (all snapshots forgotten)")
+        for label, snapshot in snapshots:
+            print(f"      {label}: {snapshot}")
+
+
+def run(args):
+    """Execute ``rlvm find`` from pre-parsed arguments."""
+    config = BackupConfigFactory(load_config(Path(args.config))).build()
+    volumes = {
+        name: vol
+        for name, vol in selected_volumes(
+            config, args.category, args.name
+        ).items()
+        if vol.file_index
+    }
+    if not volumes:
+        print("No matching volume has file_index = true.")
+        return
+
+    catalog = Catalog()
+    hostname = socket.gethostname()
+    pattern = args.pattern.rstrip("/") or "/"
+    shown = 0
+    for name, vol in volumes.items():
+        path = index_path(f"{vol.volume_type.value}.{name}")
+        if not path.exists():
+            print(f"ℹ️  [{vol.volume_type.value}.{name}] has no file index "
+                  f"yet; the next backup builds it.")
+            continue
+        with FileIndex(path) as index:
+            for match, versions in index.match(pattern):
+                if shown == args.limit:
+                    print(f"\n… more than {args.limit} match(es); "
+                          f"narrow the pattern or raise --limit.")
+                    return
+                print_match(
+                    catalog, name, vol, index, match, versions, hostname
+                )
+                shown += 1
+
+    if not shown:
+        print(f"No indexed path matches {args.pattern!r}.")
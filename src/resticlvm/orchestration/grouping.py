@@ -0,0 +1,215 @@
+"""Backing up several volumes with one restic invocation per repository.
+
+Every ``restic backup`` run opens the repository, loads its full index and
+writes a snapshot. For small volumes that share repositories (several
+data directories, or several LVs sent to the same repos) this overhead can
+exceed the backup itself. With ``[grouping] enabled = true`` such volumes
+are backed up together by backup_group.sh: one snapshot per repository that
+covers every member's source path and carries a ``vol:<name>`` tag per
+member.
+
+Volumes are only grouped when doing so cannot change what gets backed up:
+
+- Same consistency window: standard_path volumes group with standard_path
+  volumes (backed up live); lv_nonroot volumes with lv_nonroot volumes
+  (backed up from the batch snapshots). lv_root and command volumes are
+  never grouped.
+- Identical repositories: the same paths, password files and performance
+  profiles, in the same order.
+- Exclusions that apply to the whole run agree: the same exclude_file,
+  iexclude, exclude_caches, exclude_if_present and exclude_larger_than
+  settings, and the same unanchored ``exclude_paths`` patterns.
+- No member's source path overlaps another's, and no member's anchored
+  ``exclude_paths`` entry reaches into another member's source. Nested
+  sources such as ``/boot`` and ``/boot/efi`` overlap and are backed up
+  separately.
+
+Each member still gets its own JobResult, so the run summary reports
+per-volume outcomes.
+"""
+
+from dataclasses import dataclass, field
+
+from resticlvm.orchestration.data_classes import (
+    BackupJob,
+    JobResult,
+    run_job_copies,
+)
+
+GROUP_SCRIPT_NAME = "backup_group.sh"
+
+_GROUPABLE_CATEGORIES = ("standard_path", "lv_nonroot")
+_GLOB_CHARS = "*?["
+
+
+def _literal_prefix(pattern: str) -> str:
+    """The part of an anchored pattern before its first glob character."""
+    cut = min(
+        (i for i, c in enumerate(pattern) if c in _GLOB_CHARS),
+        default=len(pattern),
+    )
+    if cut == len(pattern):
+        return pattern.rstrip("/") or "/"
+    return pattern[:cut].rsplit("/", 1)[0] or "/"
+
+
+def _overlaps(a: str, b: str) -> bool:
+    """True if one of two absolute paths is, or lies under, the other."""
+    a = a.rstrip("/") or "/"
+    b = b.rstrip("/") or "/"
+    if a == b or a == "/" or b == "/":
+        return True
+    return a.startswith(b + "/") or b.startswith(a + "/")
+
+
+def _anchored_excludes(job: BackupJob) -> list[str]:
+    return [p for p in job.config.get("exclude_paths", []) if p.startswith("/")]
+
+
+def group_key(job: BackupJob) -> tuple | None:
+    """Jobs with equal keys may share a restic run; None if never grouped."""
+    if job.category not in _GROUPABLE_CATEGORIES or job.exclusions is None:
+        return None
+    excl = job.exclusions
+    return (
+        job.category,
+        tuple(
+            (str(r.repo_path), str(r.password_file), repr(r.performance))
+            for r in job.repositories
+        ),
+        tuple(str(p) for p in excl.exclude_file),
+        tuple(excl.iexclude),
+        excl.exclude_caches,
+        tuple(excl.exclude_if_present),
+        excl.exclude_larger_than,
+        frozenset(
+            p for p in job.config.get("exclude_paths", [])
+            if not p.startswith("/")
+        ),
+    )
+
+
+def _compatible(job: BackupJob, members: list[BackupJob]) -> bool:
+    """True if ``job``'s sources and excludes leave ``members`` untouched."""
+    source = job.config["backup_source_path"]
+    for other in members:
+        other_source = other.config["backup_source_path"]
+        if _overlaps(source, other_source):
+            return False
+        if any(
+            _overlaps(_literal_prefix(p), other_source)
+            for p in _anchored_excludes(job)
+        ):
+            return False
+        if any(
+            _overlaps(_literal_prefix(p), source)
+            for p in _anchored_excludes(other)
+        ):
+            return False
+    return True
+
+
+@dataclass
+class BackupGroupJob(BackupJob):
+    """Several compatible volumes backed up by one backup_group.sh run."""
+
+    members: list[BackupJob] = field(default_factory=list)
+    # Member name → pre-mounted snapshot (lv_nonroot members only).
+    snapshot_mounts: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_members(cls, members: list[BackupJob]) -> "BackupGroupJob":
+        first = members[0]
+        exclude_paths = []
+        for job in members:
+            for p in job.config.get("exclude_paths", []):
+                if p not in exclude_paths:
+                    exclude_paths.append(p)
+        return cls(
+            script_name=GROUP_SCRIPT_NAME,
+            script_token_config_key_pairs=[],
+            config={"exclude_paths": exclude_paths},
+            name="+".join(job.name for job in members),
+            category=first.category,
+            repositories=first.repositories,
+            dry_run=first.dry_run,
+            concurrency=first.concurrency,
+            exclusions=first.exclusions,
+            members=members,
+        )
+
+    @property
+    def source_paths(self) -> list[str]:
+        return [job.config["backup_source_path"] for job in self.members]
+
+    @property
+    def snapshot_tags(self) -> list[str]:
+        return [f"vol:{job.name}" for job in self.members]
+
+    @property
+    def file_indexes(self) -> list[tuple[str, list[str]]]:
+        return [ix for job in self.members for ix in job.file_indexes]
+
+    @property
+    def args_list(self) -> list[str]:
+        args = []
+        for job, tag in zip(self.members, self.snapshot_tags):
+            args += ["--group-source", job.config["backup_source_path"]]
+            args += ["--tag", tag]
+            mount = self.snapshot_mounts.get(job.name)
+            if mount is not None:
+                vg_lv = f"{job.config['vg_name']}/{job.config['lv_name']}"
+                args += ["--snapshot-bind", f"{vg_lv}:{mount}"]
+        return args + super().args_list
+
+    def run_members(
+        self,
+        snapshot_mounts: dict[str, str] | None = None,
+        defer_copies: bool = False,
+    ) -> list[JobResult]:
+        """Run the group's backup and return one JobResult per member.
+
+        Members share the backup's outcome. Copies (unless deferred) run per
+        member, since members may have different copy_to destinations; a
+        pair shared by several members is copied once (see copy_graph).
+        """
+        self.snapshot_mounts = dict(snapshot_mounts or {})
+        group_result = self.run(defer_copies=True)
+        failed_copies = [[] for _ in self.members]
+        if group_result.script_ok and not defer_copies:
+            failed_copies = run_job_copies(self.members)
+
+        results = []
+        for job, failed in zip(self.members, failed_copies):
+            mark = "✅" if group_result.script_ok else "❌"
+            print(f"  {mark} [{job.category}.{job.name}] (grouped)")
+            results.append(JobResult(
+                category=job.category,
+                name=job.name,
+                script_ok=group_result.script_ok,
+                failed_copies=failed,
+            ))
+        return results
+
+
+def group_jobs(jobs: list[BackupJob]) -> list[BackupJob]:
+    """Merge compatible jobs into BackupGroupJobs, keeping the first
+    member's position. Jobs that end up alone are returned unchanged."""
+    groups: list[list[BackupJob]] = []
+    by_key: dict[tuple, list[list[BackupJob]]] = {}
+    for job in jobs:
+        key = group_key(job)
+        if key is not None:
+            target = next(
+                (g for g in by_key.get(key, []) if _compatible(job, g)), None
+            )
+            if target is not None:
+                target.append(job)
+                continue
+        groups.append([job])
+        if key is not None:
+            by_key.setdefault(key, []).append(groups[-1])
+    return [
+        g[0] if len(g) == 1 else BackupGroupJob.from_members(g)
+        for g in groups
+    ]
@@ -0,0 +1,295 @@
+"""LVM layout manifest stored in the repositories with each backup run.
+
+Restoring a lost host first needs its volume groups, logical volumes and
+filesystems recreated. To make that mechanical, each ``rlvm backup`` run
+captures a manifest of the layout behind the configured LV volumes:
+
+- ``vgcfgbackup`` output and the physical volumes of each volume group;
+- the size, filesystem type, UUID, label and mount options of each logical
+  volume in those groups;
+- the mount source, filesystem and options of each ``standard_path`` volume;
+- the text of the config file used.
+
+The manifest is stored as a single-file snapshot (``/resticlvm-layout.json``,
+tag ``rlvm-layout``) in every repository of the run. It is stored before the
+backups run, so ``copy_to`` destinations receive it with the run's copies.
+The manifest is only stored again when the layout or config changes, which
+is tracked per repository in the ``layout`` state file. ``rlvm rebuild``
+(rebuild_runner.py) reads it back.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import subprocess
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from resticlvm.orchestration.backup_config import (
+    BackupConfig,
+    VolumeConfig,
+    VolumeType,
+)
+from resticlvm.orchestration.credentials import (
+    B2CredentialsError,
+    load_b2_credentials,
+    repo_uses_b2,
+)
+from resticlvm.orchestration.performance import restic_env, restic_options
+from resticlvm.orchestration.snapshots_runner import (
+    selected_volumes,
+    volume_destinations,
+)
+from resticlvm.orchestration.state import load_state, update_state
+
+LAYOUT_FILENAME = "resticlvm-layout.json"
+LAYOUT_TAG = "rlvm-layout"
+MANIFEST_FORMAT = 1
+STATE_NAME = "layout"
+
+_LV_TYPES = (VolumeType.LV_ROOT, VolumeType.LV_NONROOT)
+_VOLATILE_VGCFG_KEYS = (
+    "# Generated", "contents", "description", "creation_host",
+    "creation_time", "seqno",
+)
+
+
+# ─── Capture ──────────────────────────────────────────────────────
+
+
+def _run(cmd: list[str]) -> str:
+    return subprocess.run(
+        cmd, check=True, capture_output=True, text=True
+    ).stdout
+
+
+def _report(cmd: list[str], key: str) -> list[dict]:
+    """Rows of an LVM ``--reportformat json`` report."""
+    return json.loads(_run(cmd))["report"][0][key]
+
+
+def _blkid(device: str) -> dict[str, str]:
+    try:
+        out = _run(["blkid", "-o", "export", device])
+    except subprocess.CalledProcessError:
+        return {}  # no filesystem signature
+    return dict(line.split("=", 1) for line in out.splitlines() if "=" in line)
+
+
+def _findmnt(*args: str) -> dict | None:
+    try:
+        out = _run(["findmnt", "-J", "-o", "TARGET,SOURCE,FSTYPE,OPTIONS",
+                    *args])
+    except subprocess.CalledProcessError:
+        return None  # not mounted
+    filesystems = json.loads(out)["filesystems"]
+    return filesystems[0] if filesystems else None
+
+
+def _vgcfgbackup(vg_name: str) -> str:
+    with tempfile.TemporaryDirectory(prefix="rlvm-layout-") as tmp:
+        path = Path(tmp) / f"{vg_name}.vg"
+        _run(["vgcfgbackup", "-f", str(path), vg_name])
+        return path.read_text()
+
+
+def capture_layout(config: BackupConfig, config_text: str) -> dict:
+    """Describe the LVM layout and filesystems behind the configured volumes."""
+    lv_volumes = {
+        name: vol for name, vol in config.volumes.items()
+        if vol.volume_type in _LV_TYPES
+    }
+    vg_names = sorted({vol.vg_name for vol in lv_volumes.values()})
+    volume_of = {
+        (vol.vg_name, vol.lv_name): name for name, vol in lv_volumes.items()
+    }
+
+    vgs = {}
+    lvs = []
+    for vg_name in vg_names:
+        pvs = _report(
+            ["pvs", "--reportformat", "json", "--units", "b", "--nosuffix",
+             "-o", "pv_name,pv_uuid,pv_size", "--select", f"vg_name={vg_name}"],
+            "pv",
+        )
+        vgs[vg_name] = {
+            "pvs": [
+                {"name": pv["pv_name"], "uuid": pv["pv_uuid"],
+                 "size_bytes": int(pv["pv_size"])}
+                for pv in pvs
+            ],
+            "vgcfgbackup": _vgcfgbackup(vg_name),
+        }
+        for lv in _report(
+            ["lvs", "--reportformat", "json", "--units", "b", "--nosuffix",
+             "-o", "lv_name,lv_size,lv_attr", vg_name],
+            "lv",
+        ):
+            if lv["lv_attr"][:1] in ("s", "S"):
+                continue  # snapshots are not part of the layout
+            device = f"/dev/{vg_name}/{lv['lv_name']}"
+            fs = _blkid(device)
+            mount = _findmnt("--source", device)
+            lvs.append({
+                "vg": vg_name,
+                "lv": lv["lv_name"],
+                "size_bytes": int(lv["lv_size"]),
+                "fstype": fs.get("TYPE"),
+                "uuid": fs.get("UUID"),
+                "label": fs.get("LABEL"),
+                "mount_point": mount["target"] if mount else None,
+                "mount_options": mount["options"] if mount else None,
+                "volume": volume_of.get((vg_name, lv["lv_name"])),
+            })
+
+    mounts = []
+    for name, vol in config.volumes.items():
+        if vol.volume_type != VolumeType.STANDARD_PATH:
+            continue
+        mount = _findmnt("-T", vol.backup_source_path)
+        if mount is None:
+            continue
+        fs = _blkid(mount["source"])
+        mounts.append({
+            "volume": name,
+            "path": vol.backup_source_path,
+            "mount_point": mount["target"],
+            "source": mount["source"],
+            "fstype": mount["fstype"],
+            "uuid": fs.get("UUID"),
+            "label": fs.get("LABEL"),
+            "mount_options": mount["options"],
+        })
+
+    return {
+        "format": MANIFEST_FORMAT,
+        "hostname": socket.gethostname(),
+        "captured_at": datetime.now().isoformat(timespec="seconds"),
+        "vgs": vgs,
+        "lvs": lvs,
+        "mounts": mounts,
+        "config": config_text,
+    }
+
+
+def manifest_digest(manifest: dict) -> str:
+    """Hash of a manifest's content, ignoring when it was captured."""
+    content = {k: v for k, v in manifest.items() if k != "captured_at"}
+    # vgcfgbackup stamps its output with the time it was written, and every
+    # snapshot a backup creates bumps the metadata sequence number.
+    content["vgs"] = {
+        vg: {**info, "vgcfgbackup": "\n".join(
+            line for line in info["vgcfgbackup"].splitlines()
+            if not line.strip().startswith(_VOLATILE_VGCFG_KEYS)
+        )}
+        for vg, info in manifest["vgs"].items()
+    }
+    return hashlib.sha256(
+        json.dumps(content, sort_keys=True).encode()
+    ).hexdigest()
+
+
+# ─── Store and fetch ──────────────────────────────────────────────
+
+
+def layout_repositories(volumes: dict[str, VolumeConfig]) -> list:
+    """Each volume's own repositories, once (copies follow via copy_to)."""
+    repos = {}
+    for vol in volumes.values():
+        for dest in volume_destinations(vol):
+            if dest.source is None:
+                repos.setdefault(str(dest.repo_path), dest)
+    return list(repos.values())
+
+
+def store_layout(manifest: dict, repos: list, env: dict) -> list[str]:
+    """Store the manifest in every repository where it changed.
+
+    Returns:
+        list[str]: Repositories the manifest could not be stored in.
+    """
+    digest = manifest_digest(manifest)
+    stored = load_state(STATE_NAME)
+    payload = json.dumps(manifest, indent=2).encode()
+    failed = []
+    for dest in repos:
+        repo = str(dest.repo_path)
+        if stored.get(repo, {}).get("digest") == digest:
+            continue
+        cmd = [
+            "restic", "-r", repo, "--password-file", str(dest.password_file),
+            *restic_options(dest.performance, repo, command="backup"),
+            "backup", "--stdin", "--stdin-filename", LAYOUT_FILENAME,
+            "--tag", LAYOUT_TAG, "--quiet",
+        ]
+        result = subprocess.run(
+            cmd, input=payload, capture_output=True,
+            env={**env, **restic_env(dest.performance)},
+        )
+        if result.returncode != 0:
+            print(f"⚠️  Could not store the layout manifest in {repo}: "
+                  f"{result.stderr.decode(errors='replace').strip()}")
+            failed.append(repo)
+            continue
+        update_state(STATE_NAME, repo, {
+            "digest": digest, "stored_at": manifest["captured_at"],
+        })
+        print(f"🗺️  Stored layout manifest in {repo}")
+    return failed
+
+
+def fetch_layout(
+    repo: str, password_file: str, env: dict, host: str | None = None
+) -> dict:
+    """The latest layout manifest stored in ``repo``."""
+    cmd = [
+        "restic", "-r", repo, "--password-file", str(password_file),
+        "--no-lock", "dump", "--tag", LAYOUT_TAG,
+    ]
+    if host:
+        cmd += ["--host", host]
+    cmd += ["latest", f"/{LAYOUT_FILENAME}"]
+    result = subprocess.run(cmd, check=True, capture_output=True, env=env)
+    manifest = json.loads(result.stdout)
+    if manifest.get("format") != MANIFEST_FORMAT:
+        raise ValueError(
+            f"unsupported layout manifest format {manifest.get('format')!r}"
+        )
+    return manifest
+
+
+def record_layout(
+    config: BackupConfig,
+    config_path: Path,
+    category: str | None = None,
+    name: str | None = None,
+    dry_run: bool = False,
+) -> None:
+    """Capture the layout and store it in the selected volumes' repositories.
+
+    Failures are reported but never fail the backup run.
+    """
+    volumes = selected_volumes(config, category, name)
+    if not config.layout.enabled or not volumes:
+        return
+    repos = layout_repositories(volumes)
+    if dry_run:
+        print(f"[DRY RUN] Would store the layout manifest in "
+              f"{len(repos)} repository(ies) if it changed.")
+        return
+    try:
+        manifest = capture_layout(config, Path(config_path).read_text())
+    except (OSError, ValueError, KeyError, subprocess.CalledProcessError) as e:
+        print(f"⚠️  Could not capture the LVM layout: {e}")
+        return
+
+    env = os.environ.copy()
+    env.setdefault("SSH_AUTH_SOCK", "/root/.ssh/ssh-agent.sock")
+    if any(repo_uses_b2(d.repo_path) for d in repos):
+        try:
+            load_b2_credentials(env)
+        except B2CredentialsError as e:
+            print(f"⚠️  {e}")
+    store_layout(manifest, repos, env)
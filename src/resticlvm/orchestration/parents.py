@@ -0,0 +1,79 @@
+"""Explicit parent snapshots for restic backups.
+
+Without ``--parent``, restic picks a backup's parent by listing and loading
+the repository's snapshots to find the latest one with the same host and
+paths. On remote repositories with long retention that lookup adds
+noticeable latency before any data moves.
+
+rlvm instead records, per volume and repository, the snapshot each
+successful backup created (in the ``parents`` state file, see state.py) and
+passes it as ``--parent`` to the next backup of the same source paths. The
+backup scripts report which parent restic actually used; a mismatch is
+reported. If the recorded parent no longer exists (it was forgotten or
+pruned), the script retries once without ``--parent`` and restic falls back
+to its own lookup.
+
+Snapshot IDs are restic's short IDs as printed by ``restic backup``.
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+from resticlvm.orchestration.state import load_state, locked, save_state
+
+STATE_NAME = "parents"
+
+
+def recorded_parent(job_key: str, repo_path, paths: list[str]) -> str | None:
+    """The last snapshot of ``paths`` written to ``repo_path`` by this job."""
+    entry = load_state(STATE_NAME).get(job_key, {}).get(str(repo_path))
+    if not entry or entry.get("paths") != list(paths):
+        return None
+    return entry.get("snapshot")
+
+
+def record_backup_report(
+    job_key: str,
+    report: Path,
+    paths: list[str],
+    requested: dict[str, str | None],
+) -> list[tuple[str, str, float]]:
+    """Record the snapshots listed in a backup script's report.
+
+    Each report line is ``repo<TAB>snapshot<TAB>parent used<TAB>start
+    time``. ``requested`` maps each repository to the parent passed to
+    restic, if any.
+
+    Returns:
+        list[tuple[str, str, float]]: (repo, snapshot, start time as epoch
+        seconds) for every repository that reported a snapshot.
+    """
+    if not report.exists():
+        return []
+    saved = []
+    with locked(STATE_NAME):
+        data = load_state(STATE_NAME)
+        entries = data.setdefault(job_key, {})
+        now = datetime.now().isoformat(timespec="seconds")
+        for line in report.read_text().splitlines():
+            fields = line.split("\t")
+            if len(fields) != 4 or not fields[1]:
+                continue
+            repo, snapshot, used, started = fields
+            wanted = requested.get(repo)
+            if wanted and not (
+                used and (wanted.startswith(used) or used.startswith(wanted))
+            ):
+                print(
+                    f"⚠️  restic did not use the recorded parent {wanted} for "
+                    f"{repo} (used: {used or 'none'})."
+                )
+            entries[repo] = {
+                "snapshot": snapshot, "paths": list(paths), "time": now
+            }
+            try:
+                saved.append((repo, snapshot, float(started)))
+            except ValueError:
+                saved.append((repo, snapshot, datetime.now().timestamp()))
+        save_state(STATE_NAME, data)
+    return saved
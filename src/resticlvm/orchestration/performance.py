@@ -0,0 +1,134 @@
+"""Restic performance profiles.
+
+A ``[performance_profile.<name>]`` config section tunes how restic reads,
+packs and uploads data. Volumes, repositories and copy_to destinations
+reference a profile by name. Settings are layered: a repository's profile
+overrides its volume's, and a copy_to destination's profile overrides its
+repository's. Unset fields keep restic's defaults.
+
+The settings become restic options and environment variables:
+
+- ``compression``: ``--compression`` (auto, off, fastest, better, max).
+- ``pack_size``: ``--pack-size`` in MiB.
+- ``read_concurrency``: ``--read-concurrency`` (backups only).
+- ``connections``: ``-o <backend>.connections=N``, passed only to restic
+  runs that touch a repository on that backend.
+- ``gomaxprocs`` / ``gogc``: the Go runtime's ``GOMAXPROCS`` and ``GOGC``.
+
+Options the installed restic does not support are skipped with a warning
+(see restic_features).
+"""
+
+from dataclasses import dataclass, field, fields
+
+from resticlvm.orchestration import restic_features
+from resticlvm.orchestration.concurrency import backend_of
+
+COMPRESSION_MODES = ("auto", "off", "fastest", "better", "max")
+
+# restic commands a profile's options are rendered for.
+RESTIC_COMMANDS = ("backup", "copy", "prune", "check", "restore")
+
+_warned: set[str] = set()
+
+
+@dataclass
+class PerformanceProfile:
+    """Restic tuning settings; None (or empty) fields keep restic defaults."""
+
+    compression: str | None = None
+    pack_size: int | None = None
+    read_concurrency: int | None = None
+    connections: dict[str, int] = field(default_factory=dict)
+    gomaxprocs: int | None = None
+    gogc: str | None = None
+
+
+def merge_profiles(
+    base: PerformanceProfile | None, override: PerformanceProfile | None
+) -> PerformanceProfile | None:
+    """Layer ``override`` on top of ``base``; set fields of ``override`` win."""
+    if base is None:
+        return override
+    if override is None:
+        return base
+    merged = {}
+    for f in fields(PerformanceProfile):
+        value = getattr(override, f.name)
+        if f.name == "connections":
+            merged[f.name] = {**base.connections, **override.connections}
+        else:
+            merged[f.name] = value if value is not None else getattr(base, f.name)
+    return PerformanceProfile(**merged)
+
+
+def _supported(feature: str, option: str) -> bool:
+    if restic_features.supports(feature):
+        return True
+    if feature not in _warned:
+        _warned.add(feature)
+        print(
+            f"⚠️  The installed restic does not support {option}; "
+            f"skipping it."
+        )
+    return False
+
+
+def restic_options(
+    profile: PerformanceProfile | None, *repo_paths, command: str = "backup"
+) -> list[str]:
+    """Restic options for one ``command`` run touching ``repo_paths``.
+
+    Args:
+        profile: The effective profile, or None.
+        repo_paths: Every repository the restic run opens; connection limits
+            are only passed for their backends.
+        command: One of RESTIC_COMMANDS. ``--read-concurrency`` is only
+            rendered for ``backup``.
+
+    Returns:
+        list[str]: Options in a shell-safe form (profile values are
+        validated when the config is parsed).
+    """
+    if profile is None:
+        return []
+
+    opts = []
+    if profile.compression is not None:
+        feature = (
+            "compression_levels"
+            if profile.compression in ("fastest", "better")
+            else "compression"
+        )
+        if _supported(feature, f"--compression={profile.compression}"):
+            opts.append(f"--compression={profile.compression}")
+    if profile.pack_size is not None and _supported("pack_size", "--pack-size"):
+        opts.append(f"--pack-size={profile.pack_size}")
+    if (
+        command == "backup"
+        and profile.read_concurrency is not None
+        and _supported("read_concurrency", "--read-concurrency")
+    ):
+        opts.append(f"--read-concurrency={profile.read_concurrency}")
+
+    backends = sorted({backend_of(p) for p in repo_paths})
+    for backend in backends:
+        limit = profile.connections.get(backend)
+        if limit is None:
+            continue
+        option = f"{backend}.connections"
+        if _supported(option, f"-o {option}"):
+            opts += ["-o", f"{option}={limit}"]
+    return opts
+
+
+def restic_env(profile: PerformanceProfile | None) -> dict[str, str]:
+    """Go runtime environment variables for a restic run."""
+    if profile is None:
+        return {}
+    env = {}
+    if profile.gomaxprocs is not None:
+        env["GOMAXPROCS"] = str(profile.gomaxprocs)
+    if profile.gogc is not None:
+        env["GOGC"] = profile.gogc
+    return env
@@ -0,0 +1,170 @@
+"""Plans prune operations across every physical repository in a config.
+
+Each repository path is one physical restic repository. It can be the primary
+repository of several volumes, or the ``copy_to`` destination of several.
+The planner visits each repository once:
+
+- Primaries and copy destinations with their own ``prune_policy`` are both
+  pruned. Mirror destinations are not pruned; they follow their source
+  through a deletion sync.
+- Volumes sharing a repository write snapshots with different paths, and
+  ``restic forget --group-by host,paths`` keeps each group separately. The
+  policies of all references are merged, and the merged policy applies to
+  every group: no volume keeps fewer snapshots than its own policy asks
+  for, but a volume may keep more. Grouped backups (see grouping.py) write
+  snapshots that belong to several volumes, so per-group policies could
+  not be applied without one volume's policy deleting another's snapshots.
+- A repository's prune uses the performance profile of its first reference
+  that has one.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from resticlvm.orchestration.backup_config import BackupConfig, RepoConfig
+from resticlvm.orchestration.performance import (
+    PerformanceProfile,
+    merge_profiles,
+)
+from resticlvm.orchestration.restic_repo import (
+    CopyDestination,
+    ResticPruneKeepParams,
+    ResticRepo,
+)
+from resticlvm.orchestration.units import parse_size_bytes
+
+
+@dataclass
+class _RepoRef:
+    """One config reference to a physical repository."""
+
+    volume: str
+    password_file: Path
+    params: ResticPruneKeepParams
+    performance: PerformanceProfile | None = None
+
+
+def merge_prune_params(
+    repo_path: str, params: list[ResticPruneKeepParams]
+) -> ResticPruneKeepParams:
+    """Merge the policies of every reference to one repository.
+
+    Keep counts take the maximum, so every volume keeps at least what its own
+    policy asks for. ``prune_every_days`` and ``min_reclaimable`` take the
+    smallest value, so the most demanding policy wins. The repack limits
+    ``max_unused`` and ``max_repack_size`` are restic options for the whole
+    repository; if references disagree, the first one set is used.
+    """
+    first = params[0]
+    if len(params) == 1:
+        return first
+
+    def first_set(attr: str):
+        values = [getattr(p, attr) for p in params if getattr(p, attr) is not None]
+        if len(set(values)) > 1:
+            print(
+                f"⚠️  Prune policies for {repo_path} disagree on {attr} "
+                f"({', '.join(values)}); using {values[0]}."
+            )
+        return values[0] if values else None
+
+    reclaimable = [p.min_reclaimable for p in params]
+    min_reclaimable = None
+    if all(r is not None for r in reclaimable):
+        min_reclaimable = min(reclaimable, key=parse_size_bytes)
+
+    return ResticPruneKeepParams(
+        last=max(p.last for p in params),
+        daily=max(p.daily for p in params),
+        weekly=max(p.weekly for p in params),
+        monthly=max(p.monthly for p in params),
+        yearly=max(p.yearly for p in params),
+        max_unused=first_set("max_unused"),
+        max_repack_size=first_set("max_repack_size"),
+        min_reclaimable=min_reclaimable,
+        prune_every_days=min(p.prune_every_days for p in params),
+    )
+
+
+def _mirror_source_path(repo_cfg: RepoConfig, dest) -> str:
+    if dest.source is None:
+        return repo_cfg.repo_path
+    by_name = {d.name: d for d in repo_cfg.copy_destinations if d.name}
+    return by_name[dest.source].repo_path
+
+
+def plan_prune(
+    config: BackupConfig,
+    category: str | None = None,
+    name: str | None = None,
+) -> list[ResticRepo]:
+    """Return one ResticRepo per physical repository to prune.
+
+    ``category`` and ``name`` select which volumes' repositories are pruned.
+    A selected repository's policy still merges every volume that uses it,
+    because ``restic forget`` acts on the whole repository.
+
+    Returns:
+        list[ResticRepo]: Repositories in config order, each carrying the
+        merged policy and the mirrors that follow it.
+    """
+    refs: dict[str, list[_RepoRef]] = {}
+    mirrors: dict[str, list[CopyDestination]] = {}
+    selected: set[str] = set()
+    primaries: set[str] = set()
+
+    for vol_name, vol_cfg in config.volumes.items():
+        is_selected = (
+            (not category or vol_cfg.volume_type.value == category)
+            and (not name or vol_name == name)
+        )
+        for repo_cfg in vol_cfg.repositories:
+            primaries.add(str(repo_cfg.repo_path))
+            repo_profile = merge_profiles(
+                vol_cfg.performance_profile, repo_cfg.performance_profile
+            )
+            physical = [(repo_cfg.repo_path, repo_cfg.password_file,
+                         repo_cfg.prune_keep_params, repo_profile)]
+            for d in repo_cfg.copy_destinations:
+                if d.mode == "mirror":
+                    mirrors.setdefault(_mirror_source_path(repo_cfg, d), []).append(
+                        CopyDestination(
+                            repo_path=d.repo_path,
+                            password_file=d.password_file,
+                            prune_keep_params=None,
+                            mode=d.mode,
+                        )
+                    )
+                else:
+                    physical.append((
+                        d.repo_path, d.password_file, d.prune_keep_params,
+                        merge_profiles(repo_profile, d.performance_profile),
+                    ))
+            for path, password_file, params, profile in physical:
+                refs.setdefault(str(path), []).append(
+                    _RepoRef(vol_name, password_file, params, profile)
+                )
+                if is_selected:
+                    selected.add(str(path))
+
+    repos = []
+    for path, path_refs in refs.items():
+        if path not in selected:
+            continue
+        unique_mirrors = {str(m.repo_path): m for m in mirrors.get(path, [])}
+        repos.append(
+            ResticRepo(
+                # Copy destinations keep their string, as in backup_plan.py:
+                # Path() would collapse the "//" of rest:https://host/repo.
+                repo_path=Path(path) if path in primaries else path,
+                password_file=path_refs[0].password_file,
+                prune_keep_params=merge_prune_params(
+                    path, [r.params for r in path_refs]
+                ),
+                copy_destinations=list(unique_mirrors.values()),
+                performance=next(
+                    (r.performance for r in path_refs if r.performance), None
+                ),
+            )
+        )
+    return repos
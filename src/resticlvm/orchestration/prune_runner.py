@@ -10,9 +10,9 @@ from pathlib import Path
 
 from resticlvm import __version__
 from resticlvm.orchestration.backup_config import BackupConfigFactory
-from resticlvm.orchestration.backup_plan import _to_restic_repo
 from resticlvm.orchestration.config_loader import load_config
 from resticlvm.orchestration.privileges import ensure_running_as_root
+from resticlvm.orchestration.prune_plan import plan_prune
 
 
 def run(args):
@@ -25,14 +25,10 @@ def run(args):
     raw = load_config(config_path)
     config = BackupConfigFactory(raw).build()
 
-    for name, vol_cfg in config.volumes.items():
-        if args.category and vol_cfg.volume_type.value != args.category:
-            continue
-        if args.name and name != args.name:
-            continue
-        for repo_cfg in vol_cfg.repositories:
-            repo = _to_restic_repo(repo_cfg)
-            repo.prune(dry_run=args.dry_run)
+    # One forget/prune per physical repository, covering copy_to
+    # destinations too; see prune_plan.
+    for repo in plan_prune(config, category=args.category, name=args.name):
+        repo.prune(dry_run=args.dry_run)
 
 
 def main():
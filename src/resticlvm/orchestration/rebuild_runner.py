@@ -0,0 +1,241 @@
+"""``rlvm rebuild``: recreate a host's LVM layout and restore onto it.
+
+Reads a layout manifest (see layout.py), either from a repository or from a
+file, and then:
+
+1. Recreates each volume group on the blank devices given with ``--pv``
+   (rebuild_vg.sh). Physical volumes keep their UUIDs, so ``vgcfgrestore``
+   brings back every logical volume with its original size. Each LV is
+   formatted with its original filesystem type, UUID and label, so the
+   restored ``/etc/fstab`` still matches.
+2. Mounts the LV volumes and restores them all in parallel, from the
+   fastest replica of their latest snapshot (see restore_runner.py).
+
+The manifest's embedded config is used unless ``--config`` is given, so a
+rescue system needs no more than a repository and its password. Loop
+devices are fine for rehearsing a rebuild.
+"""
+
+import importlib.resources as pkg_resources
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from resticlvm import scripts
+from resticlvm.orchestration.backup_config import (
+    BackupConfigFactory,
+    VolumeType,
+)
+from resticlvm.orchestration.catalog import Catalog
+from resticlvm.orchestration.concurrency import BackendLimiter
+from resticlvm.orchestration.config_loader import load_config
+from resticlvm.orchestration.credentials import (
+    B2CredentialsError,
+    load_b2_credentials,
+    repo_uses_b2,
+)
+from resticlvm.orchestration.layout import fetch_layout
+from resticlvm.orchestration.restore_runner import (
+    RestoreResult,
+    plan_restores,
+    print_summary,
+    restore_volume,
+)
+from resticlvm.orchestration.snapshots_runner import (
+    refresh_catalog,
+    selected_volumes,
+    volume_destinations,
+)
+from resticlvm.orchestration.terminal import preserved_terminal
+
+
+def parse_pv_map(specs: list[str]) -> dict[str, str]:
+    """``OLD=NEW`` pairs (old PV name or UUID → new device)."""
+    pv_map = {}
+    for spec in specs or []:
+        old, sep, new = spec.partition("=")
+        if not sep or not old or not new:
+            raise ValueError(f"--pv expects OLD=NEW, got {spec!r}")
+        pv_map[old] = new
+    return pv_map
+
+
+def pv_assignments(vg_info: dict, pv_map: dict[str, str]) -> list[str]:
+    """``UUID=DEVICE`` for each of a volume group's physical volumes.
+
+    Raises:
+        ValueError: If a physical volume has no device, or a device is
+            given twice.
+    """
+    assigned = []
+    for pv in vg_info["pvs"]:
+        device = pv_map.get(pv["name"]) or pv_map.get(pv["uuid"])
+        if device is None:
+            raise ValueError(
+                f"no device given for physical volume {pv['name']} "
+                f"({pv['uuid']}); use --pv {pv['name']}=/dev/NEW"
+            )
+        assigned.append(f"{pv['uuid']}={device}")
+    devices = [a.split("=", 1)[1] for a in assigned]
+    if len(set(devices)) != len(devices):
+        raise ValueError("the same device is given for several physical volumes")
+    return assigned
+
+
+def filesystem_specs(manifest: dict, vg_name: str) -> list[str]:
+    """``LV=FSTYPE=UUID=LABEL`` for each formatted LV of a volume group."""
+    return [
+        f"{lv['lv']}={lv['fstype']}={lv['uuid'] or ''}={lv['label'] or ''}"
+        for lv in manifest["lvs"]
+        if lv["vg"] == vg_name and lv["fstype"]
+    ]
+
+
+def rebuild_vg(
+    vg_name: str, manifest: dict, pvs: list[str], dry_run: bool
+) -> None:
+    """Recreate one volume group and its filesystems."""
+    with tempfile.TemporaryDirectory(prefix="rlvm-rebuild-") as tmp:
+        vgcfg = Path(tmp) / f"{vg_name}.vg"
+        vgcfg.write_text(manifest["vgs"][vg_name]["vgcfgbackup"])
+        cmd = [
+            "bash", str(pkg_resources.files(scripts) / "rebuild_vg.sh"),
+            "-g", vg_name, "-c", str(vgcfg),
+        ]
+        for pv in pvs:
+            cmd += ["-p", pv]
+        for fs in filesystem_specs(manifest, vg_name):
+            cmd += ["-F", fs]
+        if dry_run:
+            cmd.append("-n")
+        with preserved_terminal():
+            subprocess.run(cmd, check=True, stdout=sys.stdout,
+                           stderr=sys.stderr)
+
+
+def _load_manifest(args, env: dict) -> dict:
+    if args.manifest:
+        return json.loads(Path(args.manifest).read_text())
+    if not (args.repo and args.password_file):
+        sys.exit("rlvm rebuild: give --manifest FILE, or --repo and "
+                 "--password-file")
+    try:
+        return fetch_layout(args.repo, args.password_file, env, args.host)
+    except (subprocess.CalledProcessError, ValueError) as e:
+        sys.exit(f"rlvm rebuild: could not read the layout manifest from "
+                 f"{args.repo}: {e}")
+
+
+def _restore_all(config, manifest, volumes, env, args) -> list[RestoreResult]:
+    catalog = Catalog()
+    refresh_catalog(catalog, config, volumes)
+    try:
+        plans = plan_restores(catalog, volumes, manifest["hostname"], env)
+    except ValueError as e:
+        sys.exit(f"rlvm rebuild: {e}")
+
+    mount_root = Path(tempfile.mkdtemp(
+        prefix=f"resticlvm-rebuild-{datetime.now():%Y%m%d_%H%M%S}-"
+    ))
+    limiter = BackendLimiter(config.concurrency.per_backend)
+
+    def task(item):
+        name, (vol, ranked) = item
+        device = f"/dev/{vol.vg_name}/{vol.lv_name}"
+        mount_point = mount_root / name
+        mount_point.mkdir()
+        try:
+            subprocess.run(["mount", device, str(mount_point)], check=True)
+        except (subprocess.CalledProcessError, OSError) as e:
+            # The other volumes still restore and are summarised.
+            print(f"❌ {name}: could not mount {device}: {e}")
+            mount_point.rmdir()
+            return RestoreResult(name, False, location=device)
+        try:
+            result = restore_volume(
+                name, vol, ranked, mount_point, env, limiter,
+                verify=args.verify, connections=args.connections,
+            )
+        finally:
+            subprocess.run(["umount", str(mount_point)], check=False)
+            mount_point.rmdir()
+        result.location = device
+        return result
+
+    print(f"\n🚀 Restoring {len(plans)} volume(s)...")
+    workers = max(1, config.concurrency.max_parallel)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(task, plans.items()))
+    mount_root.rmdir()
+    return results
+
+
+def run(args):
+    """Execute ``rlvm rebuild`` from pre-parsed arguments."""
+    env = os.environ.copy()
+    env.setdefault("SSH_AUTH_SOCK", "/root/.ssh/ssh-agent.sock")
+    if args.repo and repo_uses_b2(args.repo):
+        try:
+            load_b2_credentials(env)
+        except B2CredentialsError as e:
+            print(f"⚠️  {e}")
+
+    manifest = _load_manifest(args, env)
+    raw = (
+        load_config(Path(args.config)) if args.config
+        else tomllib.loads(manifest["config"])
+    )
+    config = BackupConfigFactory(raw).build()
+    try:
+        pv_map = parse_pv_map(args.pv)
+        assignments = {
+            vg: pv_assignments(info, pv_map)
+            for vg, info in manifest["vgs"].items()
+        }
+    except ValueError as e:
+        sys.exit(f"rlvm rebuild: {e}")
+
+    print(f"🗺️  Layout of {manifest['hostname']} captured "
+          f"{manifest['captured_at']}")
+    for vg, pvs in assignments.items():
+        rebuild_vg(vg, manifest, pvs, args.dry_run)
+    for mount in manifest["mounts"]:
+        print(f"ℹ️  {mount['volume']} ({mount['path']}) was on "
+              f"{mount['source']} ({mount['fstype']}, UUID {mount['uuid']}); "
+              f"recreate it by hand and use rlvm restore --target")
+
+    if args.no_restore:
+        return
+    volumes = {
+        name: vol
+        for name, vol in selected_volumes(config, args.category, args.name).items()
+        if vol.volume_type in (VolumeType.LV_ROOT, VolumeType.LV_NONROOT)
+        and vol.vg_name in manifest["vgs"]
+    }
+    if not volumes:
+        print("No LV volumes to restore.")
+        return
+    if args.dry_run:
+        for name, vol in volumes.items():
+            print(f"[DRY RUN] Would restore {name} onto "
+                  f"/dev/{vol.vg_name}/{vol.lv_name}")
+        return
+
+    all_repos = [str(d.repo_path) for v in volumes.values()
+                 for d in volume_destinations(v)]
+    if any(repo_uses_b2(r) for r in all_repos):
+        try:
+            load_b2_credentials(env)
+        except B2CredentialsError as e:
+            print(f"⚠️  {e}")
+
+    results = _restore_all(config, manifest, volumes, env, args)
+    print_summary(results)
+    if not all(r.ok for r in results):
+        sys.exit(1)
@@ -0,0 +1,90 @@
+"""Detects which optional restic features the installed restic supports.
+
+Performance profiles (see performance.py) can ask for options that older
+restic releases reject, for example ``--compression`` before 0.14. Passing
+such an option would fail every backup, so each option is checked against
+the installed restic's version first.
+
+``restic version`` is run at most once per rlvm process. Its result is also
+cached in the ``restic`` state file (see state.py), keyed by the binary's
+path, size and modification time, so it is only re-probed after restic is
+upgraded.
+"""
+
+import functools
+import os
+import re
+import shutil
+import subprocess
+
+from resticlvm.orchestration.state import load_state, save_state
+
+# Minimum restic version for each optional feature.
+FEATURE_MIN_VERSION: dict[str, tuple[int, int, int]] = {
+    "compression": (0, 14, 0),
+    "compression_levels": (0, 16, 0),  # "fastest" and "better"
+    "pack_size": (0, 14, 0),
+    "read_concurrency": (0, 15, 0),
+    "local.connections": (0, 15, 0),
+    "sftp.connections": (0, 15, 0),
+    "stdin_from_command": (0, 17, 0),
+    "restore_subfolder": (0, 17, 0),  # restore <snapshot>:<path>
+    "restore_delete": (0, 17, 0),  # restore --delete / --overwrite
+}
+
+_VERSION_RE = re.compile(r"restic (\d+)\.(\d+)\.(\d+)")
+
+
+def parse_restic_version(output: str) -> tuple[int, int, int] | None:
+    """Parse ``restic version`` output ("restic 0.16.4 compiled with ...")."""
+    m = _VERSION_RE.search(output)
+    return tuple(int(g) for g in m.groups()) if m else None
+
+
+def _binary_key(binary: str) -> str:
+    st = os.stat(binary)
+    return f"{binary}:{st.st_size}:{st.st_mtime_ns}"
+
+
+@functools.lru_cache(maxsize=None)
+def restic_version() -> tuple[int, int, int] | None:
+    """Return the installed restic's version, or None if it cannot be probed."""
+    binary = shutil.which("restic")
+    if binary is None:
+        return None
+    try:
+        key = _binary_key(binary)
+    except OSError:
+        return None
+
+    cached = load_state("restic")
+    if cached.get("binary") == key and cached.get("version"):
+        return parse_restic_version(f"restic {cached['version']}")
+
+    try:
+        result = subprocess.run(
+            [binary, "version"], capture_output=True, text=True, timeout=30,
+            check=True,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    version = parse_restic_version(result.stdout)
+    if version is not None:
+        save_state("restic", {
+            "binary": key,
+            "version": ".".join(str(v) for v in version),
+        })
+    return version
+
+
+def supports(feature: str) -> bool:
+    """True if the installed restic supports ``feature``.
+
+    Features not listed in FEATURE_MIN_VERSION are always supported. When
+    restic's version cannot be determined, no listed feature is assumed.
+    """
+    minimum = FEATURE_MIN_VERSION.get(feature)
+    if minimum is None:
+        return True
+    version = restic_version()
+    return version is not None and version >= minimum
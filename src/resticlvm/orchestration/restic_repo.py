@@ -5,106 +5,332 @@ and managing prune operations based on backup configurations.
 
 import importlib.resources as pkg_resources
 import os
+import re
 import subprocess
 import sys
-from dataclasses import dataclass
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from pathlib import Path
 
 from resticlvm import scripts
+from resticlvm.orchestration.catalog import Catalog, parse_forget_output
 from resticlvm.orchestration.credentials import (
     B2CredentialsError,
     load_b2_credentials,
     repo_uses_b2,
 )
+from resticlvm.orchestration.performance import (
+    PerformanceProfile,
+    restic_env,
+    restic_options,
+)
+from resticlvm.orchestration.state import load_state, update_state
 from resticlvm.orchestration.terminal import preserved_terminal
+from resticlvm.orchestration.units import format_bytes, parse_size_bytes
+
+
+_TOTAL_PRUNE_RE = re.compile(r"total prune:.*?/\s*([\d.]+\s*[KMGTP]?i?B)\s*$", re.MULTILINE)
+
+
+def parse_total_prune_bytes(output: str) -> int | None:
+    """Extract the "total prune" size from ``restic prune`` output.
+
+    restic prints e.g. ``total prune:  1234 blobs / 1.234 GiB`` both for real
+    runs and dry runs. Returns None if no such line is present.
+    """
+    m = _TOTAL_PRUNE_RE.search(output)
+    return parse_size_bytes(m.group(1)) if m else None
+
+
+def _now_iso() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+@dataclass
+class PruneReport:
+    """What a prune_repo.sh step reported."""
+
+    bytes_reclaimed: int | None
+    forgotten: list[str] = field(default_factory=list)
 
 
 @dataclass
 class ResticPruneKeepParams:
-    """Stores Restic prune retention parameters."""
+    """Stores Restic prune retention parameters.
+
+    The ``keep_*`` counts drive ``restic forget``, which runs on every prune.
+    The optional fields control the much more expensive ``restic prune``:
+
+    - ``max_unused`` / ``max_repack_size`` are passed through to restic to
+      bound how much data a prune may rewrite.
+    - ``prune_every_days`` runs the actual prune at most once per that many
+      days; other runs only forget (0 = every run).
+    - ``min_reclaimable`` skips the prune unless a dry-run estimate shows at
+      least that much reclaimable data.
+    """
 
     last: int
     daily: int
     weekly: int
     monthly: int
     yearly: int
+    max_unused: str | None = None
+    max_repack_size: str | None = None
+    min_reclaimable: str | None = None
+    prune_every_days: int = 0
 
 
 @dataclass
 class CopyDestination:
-    """Represents a destination repository for restic copy operations."""
+    """Represents a destination repository for restic copy operations.
+
+    ``mode`` is ``"copy"`` (``restic copy``) or ``"mirror"`` (file-level
+    replication via mirror_repo.sh; see backup_config.COPY_MODES). ``source``
+    names the sibling destination this one copies from, if any.
+    ``performance`` is the effective profile for copies into (and prunes of)
+    this destination.
+    """
 
     repo_path: str
     password_file: Path
-    prune_keep_params: ResticPruneKeepParams
+    prune_keep_params: ResticPruneKeepParams | None
+    mode: str = "copy"
+    name: str | None = None
+    source: str | None = None
+    performance: PerformanceProfile | None = None
+
+    @property
+    def is_mirror(self) -> bool:
+        return self.mode == "mirror"
 
 
 @dataclass
 class ResticRepo:
-    """Represents a Restic repository and associated pruning settings."""
+    """Represents a Restic repository and associated pruning settings.
+
+    ``performance`` is the repository's effective performance profile (its
+    volume's profile with the repository's own layered on top).
+    """
 
     repo_path: Path
     password_file: Path
     prune_keep_params: ResticPruneKeepParams
     copy_destinations: list['CopyDestination'] = None
+    performance: PerformanceProfile | None = None
 
     def __post_init__(self):
         """Initialize copy_destinations as empty list if None."""
         if self.copy_destinations is None:
             self.copy_destinations = []
 
-    def prune(self, dry_run: bool = False):
-        """Prune snapshots in the Restic repository.
+    def prune(self, dry_run: bool = False) -> bool:
+        """Forget old snapshots and, when worthwhile, prune unreferenced data.
+
+        ``restic forget`` runs every time. ``restic prune`` runs afterwards
+        unless the policy's ``prune_every_days`` cadence has not elapsed, or a
+        dry-run estimate shows less reclaimable data than ``min_reclaimable``.
+        The prune's duration and the bytes it reclaimed are recorded in the
+        ``prune`` state file (see state.py).
+
+        After a successful run, any mirror-mode copy destinations are brought
+        in line with a deletion sync so they drop the packs, indexes and
+        snapshots that were removed.
 
         Args:
             dry_run (bool, optional): If True, perform a dry-run without
                 actually deleting any snapshots. Defaults to False.
 
-        Raises:
-            subprocess.CalledProcessError: If the Restic prune command fails.
-            Exception: For unexpected errors during the prune operation.
+        Returns:
+            bool: True if the forget (and prune, if run) succeeded.
         """
-        script_path = pkg_resources.files(scripts) / "prune_repo.sh"
-
-        cmd = [
-            "bash",
-            str(script_path),
-            str(self.repo_path),
-            str(self.password_file),
-            str(self.prune_keep_params.last),
-            str(self.prune_keep_params.daily),
-            str(self.prune_keep_params.weekly),
-            str(self.prune_keep_params.monthly),
-            str(self.prune_keep_params.yearly),
-        ]
-        if dry_run:
-            cmd.append("--dry-run")
-
         print(f"▶️ Pruning repo {self.repo_path} (dry-run={dry_run})")
 
         env = os.environ.copy()
         env.setdefault('SSH_AUTH_SOCK', '/root/.ssh/ssh-agent.sock')
+        env.update(restic_env(self.performance))
 
         if repo_uses_b2(self.repo_path):
             try:
                 load_b2_credentials(env)
             except B2CredentialsError as e:
                 print(f"❌ B2 credentials for {self.repo_path}: {e}")
-                return
-
-        try:
-            # Pruning a remote repo runs ssh; guard the terminal (issue #57).
-            with preserved_terminal():
-                subprocess.run(
-                    cmd, check=True, stdout=sys.stdout, stderr=sys.stderr,
-                    env=env,
+                return False
+
+        forget = self._run_prune_script("forget", env, dry_run)
+        if forget is None:
+            return False
+        if not dry_run:
+            update_state("prune", str(self.repo_path), {"last_forget": _now_iso()})
+            Catalog().forget(self.repo_path, forget.forgotten)
+
+        if dry_run or self._prune_is_due(env):
+            started = time.monotonic()
+            reclaimed = self._run_prune_script("prune", env, dry_run)
+            if reclaimed is None:
+                return False
+            if not dry_run:
+                self._record_prune(time.monotonic() - started, reclaimed)
+
+        return self.sync_mirror_deletions(env, dry_run=dry_run)
+
+    def _prune_is_due(self, env: dict) -> bool:
+        """Decide whether this run should follow forget with a real prune."""
+        params = self.prune_keep_params
+        record = load_state("prune").get(str(self.repo_path), {})
+
+        if params.prune_every_days > 0 and "last_prune" in record:
+            elapsed = datetime.now() - datetime.fromisoformat(record["last_prune"])
+            if elapsed < timedelta(days=params.prune_every_days):
+                print(
+                    f"⏭️  Skipping prune of {self.repo_path}: last pruned "
+                    f"{elapsed.days} day(s) ago "
+                    f"(prune_every_days={params.prune_every_days}).\n"
                 )
-            print(f"✅ Prune completed for {self.repo_path}\n")
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Prune failed for {self.repo_path}: {e}")
-        except Exception as e:
+                return False
+
+        if params.min_reclaimable is None:
+            return True
+
+        print(f"🔎 Estimating reclaimable space in {self.repo_path}...")
+        estimate = self._run_prune_script("prune", env, dry_run=True)
+        if estimate is None:
+            # Prune anyway: if the repository is at fault, the prune fails
+            # too and is reported, instead of being skipped silently.
+            print("⚠️  The prune estimate failed; pruning anyway.")
+            return True
+        if estimate.bytes_reclaimed is None:
+            print("⚠️  Could not read the prune estimate; pruning anyway.")
+            return True
+
+        update_state(
+            "prune", str(self.repo_path),
+            {"last_estimate_bytes": estimate.bytes_reclaimed},
+        )
+        threshold = parse_size_bytes(params.min_reclaimable)
+        if estimate.bytes_reclaimed < threshold:
             print(
-                f"❌ Unexpected error during prune for {self.repo_path}: {e}"
+                f"⏭️  Skipping prune of {self.repo_path}: only "
+                f"{format_bytes(estimate.bytes_reclaimed)} reclaimable "
+                f"(min_reclaimable={params.min_reclaimable}).\n"
+            )
+            return False
+        return True
+
+    def _run_prune_script(
+        self, mode: str, env: dict, dry_run: bool
+    ) -> "PruneReport | None":
+        """Run one prune_repo.sh step; return its report, or None on failure."""
+        script_path = pkg_resources.files(scripts) / "prune_repo.sh"
+        params = self.prune_keep_params
+
+        with tempfile.TemporaryDirectory(prefix="rlvm-prune-") as tmp:
+            report_file = Path(tmp) / "report.txt"
+            cmd = [
+                "bash",
+                str(script_path),
+                str(self.repo_path),
+                str(self.password_file),
+                str(params.last),
+                str(params.daily),
+                str(params.weekly),
+                str(params.monthly),
+                str(params.yearly),
+                "--mode", mode,
+                "--report", str(report_file),
+            ]
+            restic_opts = restic_options(
+                self.performance, self.repo_path, command="prune"
             )
+            if restic_opts:
+                cmd += ["--restic-opts", " ".join(restic_opts)]
+            if mode == "prune":
+                if params.max_unused is not None:
+                    cmd += ["--max-unused", params.max_unused]
+                if params.max_repack_size is not None:
+                    cmd += ["--max-repack-size", params.max_repack_size]
+            if dry_run:
+                cmd.append("--dry-run")
+
+            try:
+                # Pruning a remote repo runs ssh; guard the terminal (issue #57).
+                with preserved_terminal():
+                    subprocess.run(
+                        cmd, check=True, stdout=sys.stdout, stderr=sys.stderr,
+                        env=env,
+                    )
+            except subprocess.CalledProcessError as e:
+                print(f"❌ {mode.capitalize()} failed for {self.repo_path}: {e}")
+                return None
+            except Exception as e:
+                print(
+                    f"❌ Unexpected error during {mode} for {self.repo_path}: {e}"
+                )
+                return None
+
+            output = report_file.read_text() if report_file.exists() else ""
+
+        print(f"✅ {mode.capitalize()} completed for {self.repo_path}\n")
+        return PruneReport(
+            bytes_reclaimed=parse_total_prune_bytes(output),
+            forgotten=parse_forget_output(output) if mode == "forget" else [],
+        )
+
+    def _record_prune(self, duration_s: float, report: "PruneReport") -> None:
+        record = load_state("prune").get(str(self.repo_path), {})
+        reclaimed = report.bytes_reclaimed
+        update_state("prune", str(self.repo_path), {
+            "last_prune": _now_iso(),
+            "last_prune_duration_s": round(duration_s, 1),
+            "last_bytes_reclaimed": reclaimed,
+            "total_bytes_reclaimed": (
+                record.get("total_bytes_reclaimed", 0) + (reclaimed or 0)
+            ),
+        })
+        reclaimed_str = format_bytes(reclaimed) if reclaimed is not None else "unknown"
+        print(
+            f"📊 Prune of {self.repo_path}: {duration_s:.1f}s, "
+            f"{reclaimed_str} reclaimed.\n"
+        )
+
+    def sync_mirror_deletions(self, env: dict, dry_run: bool = False) -> bool:
+        """Propagate prune deletions to every mirror-mode copy destination.
+
+        Returns:
+            bool: True if every mirror synced (or there were none).
+        """
+        ok = True
+        script_path = pkg_resources.files(scripts) / "mirror_repo.sh"
+        by_name = {d.name: d for d in self.copy_destinations if d.name}
+        for dest in self.copy_destinations:
+            if not dest.is_mirror:
+                continue
+            # A mirror fed by another destination follows that destination.
+            source = (
+                by_name[dest.source].repo_path if dest.source else self.repo_path
+            )
+            print(f"🪞 Syncing prune deletions to mirror {dest.repo_path}...")
+            cmd = [
+                "bash", str(script_path),
+                "-s", str(source),
+                "-d", str(dest.repo_path),
+                "--delete",
+            ]
+            if dry_run:
+                cmd.append("-n")
+            try:
+                with preserved_terminal():
+                    subprocess.run(
+                        cmd, check=True, stdout=sys.stdout, stderr=sys.stderr,
+                        env=env,
+                    )
+                if not dry_run:
+                    Catalog().mirror(source, dest.repo_path)
+                print(f"✅ Mirror {dest.repo_path} is in sync.\n")
+            except subprocess.CalledProcessError as e:
+                print(f"❌ Mirror deletion sync failed for {dest.repo_path}: {e}")
+                ok = False
+        return ok
 
 
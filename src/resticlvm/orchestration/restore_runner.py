@@ -0,0 +1,511 @@
+"""``rlvm restore``: restore volumes from the best available replica.
+
+A volume's snapshots usually exist in several places: its repositories and
+their copy_to destinations. ``rlvm restore`` picks the snapshot from the
+snapshot catalog (see catalog.py):
+
+- by default the latest one;
+- with ``--before`` the latest one taken at or before a given time, which is
+  the same point in time for every volume being restored;
+- with ``--snapshot`` an explicit ID.
+
+It then finds every replica that holds that snapshot.
+
+Each replica is probed before the restore. Probing times ``restic cat
+config`` (latency) and the download of one pack (throughput). A local
+repository that answers the probe is always used. Otherwise the replica
+with the best throughput is used, and the next one is tried if the restore
+fails.
+
+Volumes are restored in parallel within the ``[concurrency]`` limits. Each
+volume goes to its own directory under ``--target``, or, with ``--new-lv``,
+onto a freshly created logical volume next to the original
+(restore_lv_create.sh). The original volume is never overwritten. With
+``--verify``, restic reads every restored file back and compares it with
+the repository.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+
+import importlib.resources as pkg_resources
+
+from resticlvm import scripts
+from resticlvm.orchestration.backup_config import (
+    BackupConfigFactory,
+    VolumeConfig,
+    VolumeType,
+    is_local_repo,
+)
+from resticlvm.orchestration.catalog import (
+    TIME_TOLERANCE_S,
+    Catalog,
+    SnapshotRecord,
+)
+from resticlvm.orchestration.concurrency import BackendLimiter, backend_of
+from resticlvm.orchestration.config_loader import load_config
+from resticlvm.orchestration.credentials import (
+    B2CredentialsError,
+    load_b2_credentials,
+    repo_uses_b2,
+)
+from resticlvm.orchestration.performance import (
+    PerformanceProfile,
+    restic_env,
+    restic_options,
+)
+from resticlvm.orchestration.restic_features import supports
+from resticlvm.orchestration.snapshots_runner import (
+    Destination,
+    refresh_catalog,
+    selected_volumes,
+    volume_destinations,
+)
+from resticlvm.orchestration.units import format_bytes
+
+# Lines of restic output shown when a restore fails.
+_FAILURE_TAIL = 20
+
+
+@dataclass
+class Replica:
+    """One repository holding the snapshot being restored."""
+
+    dest: Destination
+    snapshot: str
+    latency_s: float | None = None
+    throughput: float | None = None  # bytes per second
+    error: str | None = None
+
+    @property
+    def repo_path(self) -> str:
+        return str(self.dest.repo_path)
+
+    @property
+    def is_local(self) -> bool:
+        return is_local_repo(self.repo_path)
+
+
+@dataclass
+class RestoreResult:
+    name: str
+    ok: bool
+    repo_path: str | None = None
+    snapshot: str | None = None
+    location: str | None = None
+    bytes_restored: int = 0
+    seconds: float = 0.0
+
+
+# ─── Choosing the snapshot ────────────────────────────────────────
+
+
+def choose_snapshot(
+    catalog: Catalog,
+    name: str,
+    vol: VolumeConfig,
+    hostname: str,
+    snapshot_id: str | None = None,
+    before: datetime | None = None,
+) -> tuple[SnapshotRecord | None, list[Replica]]:
+    """The snapshot to restore and every replica that holds it."""
+    paths = [vol.backup_source_path]
+    tag = f"vol:{name}"
+    dests = volume_destinations(vol)
+    rows = {
+        str(d.repo_path): catalog.snapshots(d.repo_path, hostname, paths, tag)
+        for d in dests
+    }
+
+    candidates = [r for records in rows.values() for r in records]
+    if snapshot_id is not None:
+        candidates = [
+            r for r in candidates
+            if r.short_id.startswith(snapshot_id)
+            or (r.id or "").startswith(snapshot_id)
+        ]
+    if before is not None:
+        candidates = [r for r in candidates if r.time <= before.timestamp()]
+    if not candidates:
+        return None, []
+    chosen = max(candidates, key=lambda r: r.time)
+
+    replicas = []
+    for dest in dests:
+        match = next(
+            (r for r in reversed(rows[str(dest.repo_path)])
+             if r.paths == chosen.paths
+             and abs(r.time - chosen.time) <= TIME_TOLERANCE_S),
+            None,
+        )
+        if match is not None:
+            replicas.append(Replica(dest, match.short_id))
+    return chosen, replicas
+
+
+# ─── Probing replicas ─────────────────────────────────────────────
+
+
+def _restic_cmd(dest: Destination, *args: str, profile=None) -> list[str]:
+    profile = profile if profile is not None else dest.performance
+    return [
+        "restic", "-r", str(dest.repo_path),
+        "--password-file", str(dest.password_file),
+        *restic_options(profile, dest.repo_path, command="restore"),
+        *args,
+    ]
+
+
+def probe(replica: Replica, env: dict) -> None:
+    """Measure a replica's latency and the throughput of one pack download."""
+    env = {**env, **restic_env(replica.dest.performance)}
+
+    def restic(*args):
+        return subprocess.run(
+            _restic_cmd(replica.dest, "--no-lock", *args),
+            check=True, capture_output=True, env=env, timeout=300,
+        )
+
+    try:
+        started = time.monotonic()
+        restic("cat", "config")
+        replica.latency_s = time.monotonic() - started
+
+        index_id = restic("list", "index").stdout.split()[0].decode()
+        index = json.loads(restic("cat", "index", index_id).stdout)
+        pack_id = index["packs"][0]["id"]
+        started = time.monotonic()
+        size = len(restic("cat", "pack", pack_id).stdout)
+        replica.throughput = size / max(time.monotonic() - started, 1e-3)
+    except (OSError, ValueError, KeyError, IndexError,
+            subprocess.SubprocessError) as e:
+        replica.error = str(e)
+
+
+def rank_replicas(replicas: list[Replica]) -> list[Replica]:
+    """Reachable replicas, best first: local, then by throughput."""
+    reachable = [r for r in replicas if r.error is None]
+    return sorted(
+        reachable,
+        key=lambda r: (
+            not r.is_local,
+            -(r.throughput or 0.0),
+            r.latency_s if r.latency_s is not None else float("inf"),
+        ),
+    )
+
+
+def _describe_replica(replica: Replica) -> str:
+    if replica.error is not None:
+        return "unreachable"
+    parts = []
+    if replica.latency_s is not None:
+        parts.append(f"{replica.latency_s * 1000:.0f} ms")
+    if replica.throughput is not None:
+        parts.append(f"{format_bytes(int(replica.throughput))}/s")
+    return ", ".join(parts) or "not measured"
+
+
+def plan_restores(
+    catalog: Catalog,
+    volumes: dict[str, VolumeConfig],
+    hostname: str,
+    env: dict,
+    snapshot_id: str | None = None,
+    before: datetime | None = None,
+) -> dict[str, tuple[VolumeConfig, list[Replica]]]:
+    """Choose each volume's snapshot and rank the replicas holding it.
+
+    Raises:
+        ValueError: If a volume has no matching snapshot or no reachable
+            replica.
+    """
+    plans = {}
+    for name, vol in volumes.items():
+        chosen, replicas = choose_snapshot(
+            catalog, name, vol, hostname, snapshot_id, before
+        )
+        if chosen is None:
+            raise ValueError(f"no matching snapshot of '{name}' in the "
+                             f"catalog (see rlvm snapshots)")
+        print(f"\n📦 {name}: snapshot from {chosen.local_time:%Y-%m-%d %H:%M}")
+        with ThreadPoolExecutor(max_workers=max(1, len(replicas))) as pool:
+            list(pool.map(lambda r: probe(r, env), replicas))
+        for replica in replicas:
+            print(f"   {replica.repo_path} ({replica.snapshot}): "
+                  f"{_describe_replica(replica)}")
+        ranked = rank_replicas(replicas)
+        if not ranked:
+            raise ValueError(f"no reachable replica holds '{name}'")
+        print(f"   → using {ranked[0].repo_path}")
+        plans[name] = (vol, ranked)
+    return plans
+
+
+# ─── Restoring ────────────────────────────────────────────────────
+
+
+def _tree_bytes(root: Path) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, filename)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _with_connections(
+    profile: PerformanceProfile | None, repo_path: str, connections: int | None
+) -> PerformanceProfile | None:
+    if connections is None:
+        return profile
+    base = profile or PerformanceProfile()
+    return replace(
+        base,
+        connections={**base.connections, backend_of(repo_path): connections},
+    )
+
+
+def restore_command(
+    replica: Replica,
+    source_path: str,
+    target: Path,
+    verify: bool,
+    connections: int | None = None,
+) -> list[str]:
+    """The ``restic restore`` command for one volume."""
+    profile = _with_connections(
+        replica.dest.performance, replica.repo_path, connections
+    )
+    if supports("restore_subfolder"):
+        args = ["restore", f"{replica.snapshot}:{source_path}"]
+    else:
+        # Older restic restores the full path below the target.
+        args = ["restore", replica.snapshot, "--include", source_path]
+    args += ["--target", str(target)]
+    if verify:
+        args.append("--verify")
+    return _restic_cmd(replica.dest, *args, profile=profile)
+
+
+class NewLogicalVolume:
+    """A fresh LV created, mounted and released around a restore."""
+
+    def __init__(self, vol: VolumeConfig, timestamp: str, dry_run: bool):
+        self.vol = vol
+        self.timestamp = timestamp
+        self.dry_run = dry_run
+        self.device = None
+        self.mount_point = None
+
+    def __enter__(self) -> Path:
+        script = str(pkg_resources.files(scripts) / "restore_lv_create.sh")
+        cmd = ["bash", script, "-g", self.vol.vg_name, "-l", self.vol.lv_name,
+               "-t", self.timestamp]
+        if self.dry_run:
+            cmd.append("-n")
+        result = subprocess.run(
+            cmd, check=True, stdout=subprocess.PIPE, stderr=sys.stderr,
+            text=True,
+        )
+        kv = dict(
+            line.split("=", 1) for line in result.stdout.splitlines()
+            if "=" in line
+        )
+        self.device = kv["RESTORE_DEVICE"]
+        self.mount_point = kv["RESTORE_MOUNT_POINT"]
+        return Path(self.mount_point)
+
+    def __exit__(self, *exc) -> None:
+        if self.dry_run or self.mount_point is None:
+            return
+        subprocess.run(["umount", self.mount_point], check=False)
+        try:
+            os.rmdir(self.mount_point)
+            os.rmdir(os.path.dirname(self.mount_point))
+        except OSError:
+            pass
+
+
+def restore_volume(
+    name: str,
+    vol: VolumeConfig,
+    replicas: list[Replica],
+    target: Path,
+    env: dict,
+    limiter: BackendLimiter,
+    verify: bool = False,
+    connections: int | None = None,
+) -> RestoreResult:
+    """Restore one volume into ``target``, falling back across replicas."""
+    target.mkdir(parents=True, exist_ok=True)
+    for replica in replicas:
+        cmd = restore_command(
+            replica, vol.backup_source_path, target, verify, connections
+        )
+        print(f"⏳ Restoring {name} from {replica.repo_path} "
+              f"({replica.snapshot}) to {target}...")
+        started = time.monotonic()
+        with limiter.slot(replica.repo_path):
+            result = subprocess.run(
+                cmd, capture_output=True, text=True,
+                env={**env, **restic_env(replica.dest.performance)},
+            )
+        seconds = time.monotonic() - started
+        if result.returncode == 0:
+            restored = _tree_bytes(target)
+            print(f"✅ Restored {name}: {format_bytes(restored)} in "
+                  f"{seconds:.0f}s ({format_bytes(int(restored / max(seconds, 1e-3)))}/s)"
+                  f"{', verified' if verify else ''}")
+            return RestoreResult(
+                name, True, replica.repo_path, replica.snapshot,
+                str(target), restored, seconds,
+            )
+        print(f"❌ Restore of {name} from {replica.repo_path} failed:")
+        for line in (result.stdout + result.stderr).splitlines()[-_FAILURE_TAIL:]:
+            print(f"     {line}")
+    return RestoreResult(name, False)
+
+
+def print_summary(results: list[RestoreResult]) -> None:
+    print("\n📊 Restore summary:")
+    for r in results:
+        if r.ok:
+            rate = format_bytes(int(r.bytes_restored / max(r.seconds, 1e-3)))
+            print(f"  ✅ {r.name}: {format_bytes(r.bytes_restored)} from "
+                  f"{r.repo_path} ({r.snapshot}) in {r.seconds:.0f}s, "
+                  f"{rate}/s → {r.location}")
+        else:
+            print(f"  ❌ {r.name}: restore failed")
+
+
+# ─── Entry point ──────────────────────────────────────────────────
+
+
+def _volumes(config, args) -> dict[str, VolumeConfig]:
+    if args.volumes:
+        unknown = [v for v in args.volumes if v not in config.volumes]
+        if unknown:
+            sys.exit(f"rlvm restore: unknown volume(s): {', '.join(unknown)}")
+        return {
+            name: vol
+            for name, vol in selected_volumes(config, args.category, None).items()
+            if name in args.volumes
+        }
+    if not (args.category or args.name):
+        sys.exit("rlvm restore: name the volume(s) to restore, or use "
+                 "--category / --name")
+    return selected_volumes(config, args.category, args.name)
+
+
+def _parse_before(value: str | None) -> datetime | None:
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        sys.exit(f"rlvm restore: --before must be a date/time such as "
+                 f"'2026-03-01 12:00', got {value!r}")
+
+
+def run(args):
+    """Execute ``rlvm restore`` from pre-parsed arguments."""
+    if bool(args.target) == bool(args.new_lv):
+        sys.exit("rlvm restore: give exactly one of --target DIR or --new-lv")
+    config = BackupConfigFactory(load_config(Path(args.config))).build()
+    volumes = _volumes(config, args)
+    if not volumes:
+        sys.exit("rlvm restore: no matching volumes")
+    if args.snapshot and len(volumes) > 1:
+        sys.exit("rlvm restore: --snapshot selects one volume's snapshot; "
+                 "use --before to restore several volumes")
+    if args.new_lv:
+        not_lv = [
+            n for n, v in volumes.items()
+            if v.volume_type not in (VolumeType.LV_ROOT, VolumeType.LV_NONROOT)
+        ]
+        if not_lv:
+            sys.exit(f"rlvm restore: --new-lv needs LV volumes; "
+                     f"not LVs: {', '.join(not_lv)}")
+    else:
+        target_root = Path(args.target)
+        for name in volumes:
+            target = target_root / name
+            if target.exists() and any(target.iterdir()):
+                sys.exit(f"rlvm restore: {target} is not empty")
+    before = _parse_before(args.before)
+
+    catalog = Catalog()
+    refresh_catalog(catalog, config, volumes, dry_run=args.dry_run)
+
+    env = os.environ.copy()
+    env.setdefault("SSH_AUTH_SOCK", "/root/.ssh/ssh-agent.sock")
+    all_repos = [str(d.repo_path) for v in volumes.values()
+                 for d in volume_destinations(v)]
+    if any(repo_uses_b2(r) for r in all_repos):
+        try:
+            load_b2_credentials(env)
+        except B2CredentialsError as e:
+            print(f"⚠️  {e}")
+
+    try:
+        plans = plan_restores(
+            catalog, volumes, socket.gethostname(), env,
+            snapshot_id=args.snapshot, before=before,
+        )
+    except ValueError as e:
+        sys.exit(f"rlvm restore: {e}")
+
+    if args.dry_run:
+        for name, (vol, ranked) in plans.items():
+            where = (
+                f"a new LV in {vol.vg_name}" if args.new_lv
+                else str(Path(args.target) / name)
+            )
+            print(f"[DRY RUN] Would restore {name} from "
+                  f"{ranked[0].repo_path} to {where}")
+        return
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    limiter = BackendLimiter(config.concurrency.per_backend)
+
+    def task(item):
+        name, (vol, ranked) = item
+        if not args.new_lv:
+            return restore_volume(
+                name, vol, ranked, Path(args.target) / name, env, limiter,
+                verify=args.verify, connections=args.connections,
+            )
+        # A volume whose LV cannot be created or mounted fails on its own;
+        # the others still restore and are summarised.
+        try:
+            lv = NewLogicalVolume(vol, timestamp, dry_run=False)
+            with lv as mount_point:
+                result = restore_volume(
+                    name, vol, ranked, mount_point, env, limiter,
+                    verify=args.verify, connections=args.connections,
+                )
+        except (subprocess.CalledProcessError, KeyError, OSError) as e:
+            print(f"❌ {name}: restore into a new LV failed: {e}")
+            return RestoreResult(name, False)
+        result.location = lv.device
+        return result
+
+    print(f"\n🚀 Restoring {len(plans)} volume(s)...")
+    workers = max(1, config.concurrency.max_parallel)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(task, plans.items()))
+
+    print_summary(results)
+    if not all(r.ok for r in results):
+        sys.exit(1)
@@ -0,0 +1,250 @@
+"""Retained LVM snapshots kept as local rollback points.
+
+A volume with ``retain_snapshots = K`` keeps the snapshot of each
+successful backup instead of removing it at teardown. The snapshot is
+renamed to ``<lv>_rlvm_keep_<timestamp>`` in the volume's VG, and
+``rlvm rollback`` can merge it back into the origin or copy files out of
+it. That takes seconds instead of a restic download.
+
+Retained snapshots are not free, so after each run they are rotated,
+oldest first:
+
+- Invalid snapshots (a classic snapshot whose COW area filled up) are
+  removed.
+- At most K are kept per origin. Thin snapshots are preferred: they cost
+  nothing up front and do not slow down writes to the origin. Every classic
+  snapshot copies each first write to the origin into its COW area, so only
+  ``retain_max_classic_per_origin`` classic snapshots are kept per origin.
+- If a thin pool's data usage is above ``retain_thin_pool_max_percent``,
+  only the newest retained snapshot per origin in that pool is kept.
+- The space held by all retained snapshots stays within ``retain_budget``.
+- Each VG keeps enough free space for the next run's snapshots plus
+  ``min_vg_free_after_snapshots``, so a retained snapshot never makes the
+  next backup fail its pre-flight check.
+"""
+
+import json
+import subprocess
+from dataclasses import dataclass
+from datetime import datetime
+
+from resticlvm.orchestration.units import format_bytes
+
+KEEP_MARKER = "_rlvm_keep_"
+_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+
+@dataclass
+class RetainedSnapshot:
+    """One retained snapshot LV."""
+
+    vg: str
+    name: str
+    origin: str
+    size_bytes: int  # COW area (classic) or mapped data (thin)
+    thin: bool = False
+    pool: str | None = None
+    invalid: bool = False
+
+    @property
+    def time(self) -> datetime:
+        return datetime.strptime(
+            self.name.rpartition(KEEP_MARKER)[2], _TIMESTAMP_FORMAT
+        )
+
+    @property
+    def device(self) -> str:
+        return f"/dev/{self.vg}/{self.name}"
+
+
+def retained_name(lv_name: str, timestamp: str) -> str:
+    """The name a retained snapshot of ``lv_name`` is renamed to."""
+    return f"{lv_name}{KEEP_MARKER}{timestamp}"
+
+
+def is_retained_name(name: str) -> bool:
+    try:
+        datetime.strptime(name.rpartition(KEEP_MARKER)[2], _TIMESTAMP_FORMAT)
+    except ValueError:
+        return False
+    return KEEP_MARKER in name
+
+
+def _lvs_report(*args: str) -> list[dict]:
+    result = subprocess.run(
+        ["lvs", "--reportformat", "json", "--units", "b", "--nosuffix", *args],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(result.stdout)["report"][0]["lv"]
+
+
+def _percent(value: str) -> float:
+    return float(value) if value else 0.0
+
+
+def list_retained(vg_names: list[str]) -> list[RetainedSnapshot]:
+    """All retained snapshots in the given VGs, oldest first."""
+    if not vg_names:
+        return []
+    rows = _lvs_report(
+        "-o", "vg_name,lv_name,origin,lv_size,data_percent,segtype,"
+              "pool_lv,lv_attr",
+        *vg_names,
+    )
+    snaps = []
+    for row in rows:
+        if not row["origin"] or not is_retained_name(row["lv_name"]):
+            continue
+        thin = row["segtype"] == "thin"
+        size = int(row["lv_size"])
+        attr = row["lv_attr"]
+        snaps.append(RetainedSnapshot(
+            vg=row["vg_name"],
+            name=row["lv_name"],
+            origin=row["origin"],
+            size_bytes=int(size * _percent(row["data_percent"]) / 100) if thin else size,
+            thin=thin,
+            pool=row["pool_lv"] or None,
+            invalid=attr[:1] == "S" or attr[4:5] == "I",
+        ))
+    return sorted(snaps, key=lambda s: s.time)
+
+
+def thin_pool_usage(vg_names: list[str]) -> dict[tuple[str, str], float]:
+    """Data usage (percent) of each thin pool in the given VGs."""
+    if not vg_names:
+        return {}
+    rows = _lvs_report(
+        "-o", "vg_name,lv_name,data_percent", "-S", "segtype=thin-pool",
+        *vg_names,
+    )
+    return {
+        (row["vg_name"], row["lv_name"]): _percent(row["data_percent"])
+        for row in rows
+    }
+
+
+def query_vg_free(vg_name: str) -> int:
+    result = subprocess.run(
+        ["vgs", "--noheadings", "--nosuffix", "--units", "b",
+         "-o", "vg_free", vg_name],
+        check=True, capture_output=True, text=True,
+    )
+    return int(result.stdout.strip())
+
+
+def plan_rotation(
+    snaps: list[RetainedSnapshot],
+    keep: dict[tuple[str, str], int],
+    max_classic_per_origin: int,
+    budget_bytes: int | None,
+    vg_free: dict[str, int],
+    vg_needed: dict[str, int],
+    pool_usage: dict[tuple[str, str], float],
+    pool_max_percent: float,
+) -> list[RetainedSnapshot]:
+    """Choose which retained snapshots to remove.
+
+    Args:
+        snaps: Retained snapshots of the origins being rotated.
+        keep: The number to keep per ``(vg, origin)``.
+        max_classic_per_origin: Classic snapshots kept per origin.
+        budget_bytes: Total space retained snapshots may hold, if capped.
+        vg_free: Current free bytes per VG.
+        vg_needed: Free bytes each VG needs for the next run's snapshots.
+        pool_usage: Data usage (percent) per ``(vg, pool)``.
+        pool_max_percent: Pool usage above which thin snapshots are trimmed.
+
+    Returns:
+        list[RetainedSnapshot]: The snapshots to remove, oldest first.
+    """
+    remove: list[RetainedSnapshot] = []
+    kept: list[RetainedSnapshot] = []
+    by_origin: dict[tuple[str, str], list[RetainedSnapshot]] = {}
+    for snap in snaps:
+        if snap.invalid:
+            remove.append(snap)
+        else:
+            by_origin.setdefault((snap.vg, snap.origin), []).append(snap)
+
+    for key, origin_snaps in by_origin.items():
+        limit = keep.get(key, 0)
+        pool_full = any(
+            pool_usage.get((s.vg, s.pool), 0.0) > pool_max_percent
+            for s in origin_snaps if s.thin
+        )
+        if pool_full:
+            limit = min(limit, 1)
+        classic = 0
+        for snap in sorted(origin_snaps, key=lambda s: s.time, reverse=True):
+            if limit <= 0 or (not snap.thin and classic >= max_classic_per_origin):
+                remove.append(snap)
+                continue
+            limit -= 1
+            classic += not snap.thin
+            kept.append(snap)
+
+    kept.sort(key=lambda s: s.time)
+    if budget_bytes is not None:
+        while kept and sum(s.size_bytes for s in kept) > budget_bytes:
+            remove.append(kept.pop(0))
+
+    free = dict(vg_free)
+    for snap in remove:
+        if not snap.thin:
+            free[snap.vg] = free.get(snap.vg, 0) + snap.size_bytes
+    for vg, needed in vg_needed.items():
+        for snap in [s for s in kept if s.vg == vg and not s.thin]:
+            if free.get(vg, 0) >= needed:
+                break
+            kept.remove(snap)
+            remove.append(snap)
+            free[vg] = free.get(vg, 0) + snap.size_bytes
+
+    return sorted(remove, key=lambda s: s.time)
+
+
+def remove_snapshot(snap: RetainedSnapshot) -> bool:
+    result = subprocess.run(
+        ["lvremove", "-f", snap.device], capture_output=True, text=True,
+    )
+    return result.returncode == 0
+
+
+def rotate(
+    keep: dict[tuple[str, str], int],
+    vg_needed: dict[str, int],
+    max_classic_per_origin: int = 1,
+    budget_bytes: int | None = None,
+    pool_max_percent: float = 80,
+) -> None:
+    """Remove the retained snapshots that fall outside the retention limits.
+
+    Only the origins in ``keep`` are rotated; an origin with a limit of 0
+    loses all its retained snapshots.
+    """
+    vgs = sorted({vg for vg, _ in keep})
+    try:
+        snaps = [s for s in list_retained(vgs) if (s.vg, s.origin) in keep]
+        if not snaps:
+            return
+        plan = plan_rotation(
+            snaps, keep, max_classic_per_origin, budget_bytes,
+            vg_free={vg: query_vg_free(vg) for vg in vgs},
+            vg_needed=vg_needed,
+            pool_usage=thin_pool_usage(vgs),
+            pool_max_percent=pool_max_percent,
+        )
+    except (subprocess.CalledProcessError, OSError, ValueError, KeyError) as e:
+        print(f"⚠️  Could not rotate retained snapshots: {e}")
+        return
+
+    for snap in plan:
+        reason = "invalid" if snap.invalid else format_bytes(snap.size_bytes)
+        if remove_snapshot(snap):
+            print(f"🗑️  Removed retained snapshot {snap.vg}/{snap.name} ({reason})")
+        else:
+            print(f"⚠️  Could not remove retained snapshot {snap.vg}/{snap.name}")
+    kept = len(snaps) - len(plan)
+    if kept:
+        print(f"📌 {kept} retained snapshot(s) available for rlvm rollback.")
@@ -0,0 +1,164 @@
+"""``rlvm rollback``: restore a volume from a retained LVM snapshot.
+
+Retained snapshots (see retention.py) are the fastest restore source there
+is: nothing is downloaded. Two ways to use one:
+
+- ``--merge`` merges the snapshot back into its origin with
+  ``lvconvert --merge``, returning the whole volume to the snapshot's
+  state. If the volume is in use, LVM completes the merge the next time it
+  is activated (for the root volume, at the next reboot).
+- ``--path`` copies the given paths out of the snapshot back into the
+  live filesystem, or into ``--target``. The rest of the volume is left
+  alone and the snapshot is kept.
+
+With neither, the volume's retained snapshots are listed.
+"""
+
+import importlib.resources as pkg_resources
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from resticlvm import scripts
+from resticlvm.orchestration.backup_config import (
+    BackupConfigFactory,
+    VolumeConfig,
+    VolumeType,
+)
+from resticlvm.orchestration.config_loader import load_config
+from resticlvm.orchestration.retention import RetainedSnapshot, list_retained
+from resticlvm.orchestration.terminal import preserved_terminal
+from resticlvm.orchestration.units import format_bytes
+
+
+def choose_retained(
+    snaps: list[RetainedSnapshot], name: str | None = None
+) -> RetainedSnapshot:
+    """The snapshot called ``name``, else the newest valid one.
+
+    Raises:
+        ValueError: If there is no such snapshot, or it is invalid.
+    """
+    if name is not None:
+        match = [s for s in snaps if s.name == name]
+        if not match:
+            raise ValueError(f"no retained snapshot named {name}")
+        if match[0].invalid:
+            raise ValueError(f"{name} is invalid (its COW area filled up)")
+        return match[0]
+    valid = [s for s in snaps if not s.invalid]
+    if not valid:
+        raise ValueError("no valid retained snapshots")
+    return max(valid, key=lambda s: s.time)
+
+
+def print_retained(volume: str, snaps: list[RetainedSnapshot]) -> None:
+    if not snaps:
+        print(f"No retained snapshots for {volume}.")
+        return
+    print(f"Retained snapshots for {volume}:")
+    for snap in sorted(snaps, key=lambda s: s.time, reverse=True):
+        kind = "thin" if snap.thin else "classic"
+        state = "  INVALID" if snap.invalid else ""
+        print(f"  {snap.name:40s} {snap.time:%Y-%m-%d %H:%M:%S}  {kind:7s} "
+              f"{format_bytes(snap.size_bytes):>10s}{state}")
+
+
+def live_mount_point(vol: VolumeConfig) -> str | None:
+    result = subprocess.run(
+        ["findmnt", "-n", "-o", "TARGET", "--first-only",
+         f"/dev/{vol.vg_name}/{vol.lv_name}"],
+        capture_output=True, text=True,
+    )
+    return result.stdout.strip() or None
+
+
+def rollback_command(
+    snap: RetainedSnapshot,
+    merge: bool,
+    paths: list[str],
+    dest: str | None,
+    dry_run: bool,
+) -> list[str]:
+    script = str(pkg_resources.files(scripts) / "rollback_lv.sh")
+    cmd = [
+        "bash", script, "-g", snap.vg, "-s", snap.name,
+        "-t", datetime.now().strftime("%Y%m%d_%H%M%S"),
+    ]
+    if merge:
+        cmd.append("-M")
+    else:
+        for path in paths:
+            cmd += ["-p", path]
+        cmd += ["-d", dest]
+    if dry_run:
+        cmd.append("-n")
+    return cmd
+
+
+def _confirm(prompt: str) -> bool:
+    try:
+        return input(f"{prompt} [y/N] ").strip().lower() in ("y", "yes")
+    except EOFError:
+        return False
+
+
+def run(args):
+    """Execute ``rlvm rollback`` from pre-parsed arguments."""
+    config = BackupConfigFactory(load_config(Path(args.config))).build()
+    vol = config.volumes.get(args.volume)
+    if vol is None:
+        sys.exit(f"rlvm rollback: unknown volume: {args.volume}")
+    if vol.volume_type not in (VolumeType.LV_ROOT, VolumeType.LV_NONROOT):
+        sys.exit(f"rlvm rollback: {args.volume} is not an LV volume")
+    if args.merge and (args.path or args.target):
+        sys.exit("rlvm rollback: --merge replaces the whole volume; "
+                 "it cannot be combined with --path or --target")
+
+    try:
+        snaps = [s for s in list_retained([vol.vg_name])
+                 if s.origin == vol.lv_name]
+    except (subprocess.CalledProcessError, OSError, ValueError) as e:
+        sys.exit(f"rlvm rollback: could not list snapshots: {e}")
+
+    if args.list or not (args.merge or args.path):
+        print_retained(args.volume, snaps)
+        return
+
+    try:
+        snap = choose_retained(snaps, args.snapshot)
+    except ValueError as e:
+        sys.exit(f"rlvm rollback: {e}")
+
+    dest = None
+    if args.merge:
+        action = (f"Merge {snap.name} into /dev/{vol.vg_name}/{vol.lv_name}, "
+                  f"discarding every change made since "
+                  f"{snap.time:%Y-%m-%d %H:%M:%S}?")
+    else:
+        dest = args.target or live_mount_point(vol)
+        if dest is None:
+            sys.exit(f"rlvm rollback: /dev/{vol.vg_name}/{vol.lv_name} is "
+                     f"not mounted; give --target")
+        action = (f"Overwrite {', '.join(args.path)} under {dest} with the "
+                  f"versions from {snap.time:%Y-%m-%d %H:%M:%S}?")
+
+    if not (args.yes or args.dry_run or _confirm(action)):
+        sys.exit("rlvm rollback: aborted")
+
+    cmd = rollback_command(snap, args.merge, args.path or [], dest, args.dry_run)
+    try:
+        with preserved_terminal():
+            subprocess.run(cmd, check=True, stdout=sys.stdout, stderr=sys.stderr)
+    except subprocess.CalledProcessError:
+        sys.exit(f"rlvm rollback: rollback from {snap.name} failed")
+
+    if args.dry_run:
+        return
+    if args.merge:
+        print(f"✅ {snap.name} is merging into {vol.lv_name}. If the volume "
+              f"is in use, the merge completes when it is next activated "
+              f"(for the root volume, after a reboot).")
+    else:
+        print(f"✅ Restored {len(args.path)} path(s) from {snap.name}.")
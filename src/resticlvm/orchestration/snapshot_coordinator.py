@@ -2,21 +2,53 @@
 
 Creates all LVM snapshots before any backup runs, reducing the cross-LV
 time delta from minutes to milliseconds. Manages the full lifecycle:
-pre-flight VG space check, batch creation, COW usage reporting, and
-idempotent teardown.
+pre-flight VG space check, batch creation, mounting, COW usage reporting,
+and idempotent teardown.
+
+Snapshots are created in a tight loop and only mounted afterwards, so the
+cross-LV window is just the lvcreate calls; mounting, including the
+filesystem's journal replay on the snapshot, happens outside it. Each
+snapshot is mounted lazily by ``get_mount_point()``, just before its job
+runs, so a backup waits for its own mount and no other. Snapshots marked with ``retain()`` are kept as
+rollback points instead of being removed (see retention.py).
+
+Snapshots are mounted with the ``readonly`` mount profile by default (see
+snapshot_mount.sh): read-only, without atime updates or journal replay, and
+for lv_root with a tmpfs-backed overlay for the chroot, so that mounting and
+reading a snapshot do not fill its COW area. The COW report separates what
+mounting consumed from what the origin's writes during the backup did.
+Classic snapshots get their configured chunk size, and their COW area is
+placed on a PV away from the origin's disks where the VG has one (see
+snapshot_geometry.py).
+
+Volumes that share an LV (same ``vg_name``/``lv_name``, different
+``backup_source_path``) share one snapshot: it is created, reserved in the
+VG and mounted once. ``release()`` drops a volume's claim on it, and the
+snapshot is torn down as soon as no volume still needs it, rather than at
+the end of the run.
+
+Every snapshot is journaled before it is created and forgotten once it is
+torn down (see snapshot_journal.py), so that ``rlvm cleanup`` can release
+whatever a killed run left behind.
 """
 
 import atexit
+import dataclasses
 import importlib.resources as pkg_resources
-import re
 import signal
 import subprocess
 import sys
+import time
 from dataclasses import dataclass
 from datetime import datetime
 
 from resticlvm import scripts
+from resticlvm.orchestration import snapshot_journal
 from resticlvm.orchestration.data_classes import BackupJob
+from resticlvm.orchestration.retention import retained_name, rotate
+from resticlvm.orchestration.snapshot_geometry import plan_placement
+from resticlvm.orchestration.units import format_bytes
+from resticlvm.orchestration.units import parse_size_bytes as _parse_size_bytes
 
 
 @dataclass
@@ -29,17 +61,7 @@ class SnapshotInfo:
     mount_point: str
     mount_base: str
     snapshot_size: str
-
-
-_SIZE_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*([KMGTP]?)(?:i?B)?$", re.IGNORECASE)
-_MULTIPLIERS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4, "P": 1024**5}
-
-
-def _parse_size_bytes(size_str: str) -> int:
-    m = _SIZE_RE.match(size_str.strip())
-    if not m:
-        raise ValueError(f"Cannot parse size: {size_str!r}")
-    return int(float(m.group(1)) * _MULTIPLIERS[m.group(2).upper()])
+    thin: bool = False
 
 
 class SnapshotCoordinator:
@@ -61,12 +83,41 @@ class SnapshotCoordinator:
         dry_run: bool = False,
         min_vg_free_after_snapshots: str = "1G",
         snapshot_cow_warn_percent: int = 70,
+        mount_profile: str = "readonly",
+        snapshot_readonly_lv: bool = False,
+        separate_cow_pv: bool = True,
+        retain_budget: str | None = None,
+        retain_max_classic_per_origin: int = 1,
+        retain_thin_pool_max_percent: int = 80,
+        rotation_needs: dict[str, int] | None = None,
     ):
         self._lv_jobs = lv_jobs
+        # One snapshot per origin LV, named after the volumes sharing it.
+        self._units, self._unit_of = self._group_by_origin(lv_jobs)
+        self._pending: dict[str, set[str]] = {
+            unit.name: {j.name for j in lv_jobs if self._unit_of[j.name] == unit.name}
+            for unit in self._units
+        }
         self._dry_run = dry_run
         self._min_free = min_vg_free_after_snapshots
         self._cow_warn_pct = snapshot_cow_warn_percent
+        self._mount_profile = mount_profile
+        self._readonly_lv = snapshot_readonly_lv
+        self._separate_cow_pv = separate_cow_pv
+        self._cow_pvs: dict[str, list[str]] = {}
+        self._retain_budget = retain_budget
+        self._retain_max_classic = retain_max_classic_per_origin
+        self._retain_pool_max_pct = retain_thin_pool_max_percent
+        # Snapshot bytes per VG that rotation keeps free besides the margin;
+        # by default this run's own snapshots (see snapshot_waves.py).
+        self._rotation_needs = rotation_needs
         self._snapshots: dict[str, SnapshotInfo] = {}
+        self._retained: set[str] = set()
+        self._mounted: set[str] = set()
+        self._cow_after_mount: dict[str, float | None] = {}
+        # Snapshots released before teardown_all, with their final COW usage.
+        self._released: dict[str, tuple[SnapshotInfo, float | None]] = {}
+        self._latencies: dict[str, float] = {}
         self._timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self._original_sigint = None
         self._original_sigterm = None
@@ -80,6 +131,8 @@ class SnapshotCoordinator:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.report_cow_usage()
         self.teardown_all()
+        if exc_type is None:
+            self.rotate_retained()
         self._restore_signal_handlers()
         atexit.unregister(self.teardown_all)
         return False
@@ -87,15 +140,23 @@ class SnapshotCoordinator:
     # ─── Public API ───────────────────────────────────────────────
 
     def create_all(self) -> None:
-        """Create and mount snapshots for all LV volumes.
+        """Create (but do not mount) snapshots for all LV volumes.
 
         Runs a pre-flight VG space check, then creates snapshots one by one.
         If any snapshot fails to create, tears down all previously created
         snapshots and raises.
         """
         self._preflight_vg_space_check()
-
-        for job in self._lv_jobs:
+        self._cow_pvs = self._plan_cow_placement()
+        started = time.monotonic()
+
+        for job in self._units:
+            planned = self._planned_info(job)
+            if not self._dry_run:
+                snapshot_journal.record(
+                    planned.snap_name, planned.vg_name, planned.snap_name,
+                    planned.mount_point, planned.mount_base,
+                )
             try:
                 info = self._create_one(job)
                 self._snapshots[job.name] = info
@@ -105,38 +166,120 @@ class SnapshotCoordinator:
                     f"tearing down {len(self._snapshots)} previously created snapshot(s).",
                     file=sys.stderr,
                 )
+                if not self._dry_run:
+                    # Release whatever was created before the failure.
+                    self._teardown_one(planned)
                 self.teardown_all()
                 raise
 
+        if self._snapshots and not self._dry_run:
+            print(f"📸 Created {len(self._snapshots)} snapshot(s) in "
+                  f"{time.monotonic() - started:.2f}s.")
+
     def teardown_all(self) -> None:
         """Tear down all active snapshots. Idempotent."""
-        if self._torn_down or not self._snapshots:
+        if self._torn_down:
             return
 
-        names = list(reversed(self._snapshots.keys()))
-        for name in names:
-            info = self._snapshots[name]
-            self._teardown_one(info)
+        for name in list(reversed(self._snapshots.keys())):
+            self._teardown_timed(name)
 
-        self._snapshots.clear()
         self._torn_down = True
+        if self._latencies and not self._dry_run:
+            self._report_teardown_latency(self._latencies)
+
+    def release(self, volume_name: str) -> None:
+        """Drop this volume's claim on its snapshot.
+
+        The snapshot is torn down once no volume sharing it still needs it.
+        """
+        unit = self._unit_of.get(volume_name)
+        if unit is None:
+            return
+        self._pending[unit].discard(volume_name)
+        if self._pending[unit] or unit not in self._snapshots or self._torn_down:
+            return
+        info = self._snapshots[unit]
+        pct = None if self._dry_run else self._query_cow_percent(info)
+        self._released[unit] = (info, pct)
+        self._teardown_timed(unit)
+
+    def retain(self, volume_name: str) -> None:
+        """Keep this volume's snapshot as a rollback point at teardown."""
+        unit = self._unit_of.get(volume_name)
+        if unit in self._snapshots:
+            self._retained.add(unit)
+
+    def rotate_retained(self) -> None:
+        """Trim retained snapshots to the configured limits (retention.py)."""
+        retaining = [j for j in self._units if j.config.get("retain_snapshots")]
+        if self._dry_run or not retaining:
+            return
+        margin = _parse_size_bytes(self._min_free)
+        vg_needed: dict[str, int] = {}
+        if self._rotation_needs is not None:
+            for job in self._units:
+                vg = job.config["vg_name"]
+                vg_needed[vg] = margin + self._rotation_needs.get(vg, 0)
+        else:
+            for job in self._units:
+                vg = job.config["vg_name"]
+                vg_needed[vg] = vg_needed.get(vg, margin) + _parse_size_bytes(
+                    str(job.config["snapshot_size"])
+                )
+        rotate(
+            {
+                (j.config["vg_name"], j.config["lv_name"]): j.config["retain_snapshots"]
+                for j in retaining
+            },
+            vg_needed,
+            max_classic_per_origin=self._retain_max_classic,
+            budget_bytes=(
+                _parse_size_bytes(self._retain_budget)
+                if self._retain_budget else None
+            ),
+            pool_max_percent=self._retain_pool_max_pct,
+        )
 
     def get_mount_point(self, volume_name: str) -> str:
-        """Return the snapshot mount point for a volume."""
-        return self._snapshots[volume_name].mount_point
+        """Mount the volume's snapshot if needed and return its mount point.
+
+        Raises:
+            subprocess.CalledProcessError: If the snapshot could not be
+                mounted.
+        """
+        unit = self._unit_of[volume_name]
+        info = self._snapshots[unit]
+        if unit not in self._mounted:
+            self._mount_one(info)
+            self._mounted.add(unit)
+            if not self._dry_run:
+                self._cow_after_mount[unit] = self._query_cow_percent(info)
+        return info.mount_point
 
     def has(self, volume_name: str) -> bool:
         """True if a snapshot exists for this volume name."""
-        return volume_name in self._snapshots
+        return self._unit_of.get(volume_name) in self._snapshots
 
     def report_cow_usage(self) -> None:
-        """Query and print COW utilization for each active snapshot."""
-        if self._dry_run or not self._snapshots:
+        """Print COW utilization for each snapshot of this run.
+
+        Active snapshots are queried; released ones report their usage at
+        release.
+        """
+        if self._dry_run or not (self._snapshots or self._released):
             return
 
         print("\n📊 Snapshot COW usage:")
-        for name, info in self._snapshots.items():
-            pct = self._query_cow_percent(info)
+        for unit in self._units:
+            name = unit.name
+            if name in self._snapshots:
+                info = self._snapshots[name]
+                pct = self._query_cow_percent(info)
+            elif name in self._released:
+                info, pct = self._released[name]
+            else:
+                continue
             if pct is None:
                 print(f"  {name:20s} ({info.snapshot_size} allocated):  unavailable")
                 continue
@@ -144,7 +287,12 @@ class SnapshotCoordinator:
             alloc_bytes = _parse_size_bytes(info.snapshot_size)
             used_bytes = int(alloc_bytes * pct / 100)
             used_str = self._format_bytes(used_bytes)
-            print(f"  {name:20s} ({info.snapshot_size} allocated):  {pct:5.1f}%  ({used_str} used)")
+            at_mount = self._cow_after_mount.get(name)
+            split = (
+                f"; {at_mount:.1f}% after mount, {pct - at_mount:.1f}% since"
+                if at_mount is not None else ""
+            )
+            print(f"  {name:20s} ({info.snapshot_size} allocated):  {pct:5.1f}%  ({used_str} used{split})")
 
             if pct >= self._cow_warn_pct:
                 print(
@@ -155,6 +303,78 @@ class SnapshotCoordinator:
 
     # ─── Internal ─────────────────────────────────────────────────
 
+    @staticmethod
+    def _group_by_origin(
+        lv_jobs: list[BackupJob],
+    ) -> tuple[list[BackupJob], dict[str, str]]:
+        """One job per origin LV, standing for every volume on it.
+
+        Returns:
+            tuple: The per-origin jobs, in first-use order, and the name of
+            the per-origin job each volume belongs to. A job shared by
+            several volumes is named ``a+b``; its snapshot is as large as
+            the largest ``snapshot_size`` among them.
+        """
+        by_origin: dict[tuple[str, str], list[BackupJob]] = {}
+        for job in lv_jobs:
+            key = (job.config["vg_name"], job.config["lv_name"])
+            by_origin.setdefault(key, []).append(job)
+
+        units, unit_of = [], {}
+        for jobs in by_origin.values():
+            unit = jobs[0]
+            if len(jobs) > 1:
+                config = dict(unit.config)
+                config["snapshot_size"] = max(
+                    (str(j.config["snapshot_size"]) for j in jobs),
+                    key=_parse_size_bytes,
+                )
+                for key in ("retain_snapshots", "snapshot_chunksize", "snapshot_pvs"):
+                    config.pop(key, None)
+                    values = [j.config[key] for j in jobs if j.config.get(key)]
+                    if values:
+                        config[key] = (
+                            max(values) if key == "retain_snapshots" else values[0]
+                        )
+                unit = dataclasses.replace(
+                    unit,
+                    name="+".join(j.name for j in jobs),
+                    category=(
+                        "lv_root" if any(j.category == "lv_root" for j in jobs)
+                        else unit.category
+                    ),
+                    config=config,
+                )
+            units.append(unit)
+            unit_of.update({j.name: unit.name for j in jobs})
+        return units, unit_of
+
+    def _teardown_timed(self, name: str) -> None:
+        info = self._snapshots.pop(name)
+        started = time.monotonic()
+        self._teardown_one(info)
+        self._latencies[name] = time.monotonic() - started
+
+    @staticmethod
+    def _report_teardown_latency(latencies: dict[str, float]) -> None:
+        total = sum(latencies.values())
+        per_snapshot = ", ".join(f"{n} {s:.2f}s" for n, s in latencies.items())
+        print(f"⏱️  Snapshot teardown: {total:.2f}s ({per_snapshot})")
+
+    def _planned_info(self, job: BackupJob) -> SnapshotInfo:
+        """The names snapshot_create.sh derives for this job's snapshot."""
+        vg, lv = job.config["vg_name"], job.config["lv_name"]
+        snap_name = f"{vg}_{lv}_snapshot_{self._timestamp}"
+        mount_base = f"/tmp/resticlvm-{self._timestamp}"
+        return SnapshotInfo(
+            volume_name=job.name,
+            vg_name=vg,
+            snap_name=snap_name,
+            mount_point=f"{mount_base}/{snap_name}",
+            mount_base=mount_base,
+            snapshot_size=str(job.config["snapshot_size"]),
+        )
+
     def _create_one(self, job: BackupJob) -> SnapshotInfo:
         script = str(pkg_resources.files(scripts) / "snapshot_create.sh")
         cmd = [
@@ -163,7 +383,14 @@ class SnapshotCoordinator:
             "-l", job.config["lv_name"],
             "-z", str(job.config["snapshot_size"]),
             "-t", self._timestamp,
+            "-N",
         ]
+        if job.config.get("retain_snapshots"):
+            cmd.append("-T")
+        if job.config.get("snapshot_chunksize"):
+            cmd += ["-c", job.config["snapshot_chunksize"]]
+        for pv in self._cow_pvs.get(job.name, []):
+            cmd += ["-P", pv]
         if self._dry_run:
             cmd.append("-n")
 
@@ -173,6 +400,30 @@ class SnapshotCoordinator:
 
         return self._parse_create_output(job, result.stdout)
 
+    def _mount_one(self, info: SnapshotInfo) -> None:
+        script = str(pkg_resources.files(scripts) / "snapshot_mount.sh")
+        cmd = [
+            "bash", script,
+            "-g", info.vg_name,
+            "-s", info.snap_name,
+            "-m", info.mount_point,
+            "-p", self._mount_profile,
+        ]
+        job = next(j for j in self._units if j.name == info.volume_name)
+        if job.category == "lv_root":
+            # The lv_root backup chroots into the snapshot and writes to it.
+            cmd.append("-o")
+        if self._readonly_lv:
+            cmd.append("-r")
+        if self._dry_run:
+            cmd.append("-n")
+        try:
+            subprocess.run(cmd, check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as e:
+            print(f"❌ Could not mount snapshot {info.snap_name}: "
+                  f"{(e.stderr or e.stdout or '').strip()}", file=sys.stderr)
+            raise
+
     def _parse_create_output(self, job: BackupJob, stdout: str) -> SnapshotInfo:
         kv = {}
         for line in stdout.strip().splitlines():
@@ -187,6 +438,7 @@ class SnapshotCoordinator:
             mount_point=kv["SNAPSHOT_MOUNT_POINT"],
             mount_base=kv["MOUNT_BASE"],
             snapshot_size=str(job.config["snapshot_size"]),
+            thin=kv.get("SNAP_TYPE") == "thin",
         )
 
     def _teardown_one(self, info: SnapshotInfo) -> None:
@@ -198,6 +450,12 @@ class SnapshotCoordinator:
             "-m", info.mount_point,
             "-b", info.mount_base,
         ]
+        if info.volume_name in self._retained:
+            lv_name = next(
+                j.config["lv_name"] for j in self._units
+                if j.name == info.volume_name
+            )
+            cmd += ["-k", retained_name(lv_name, self._timestamp)]
         if self._dry_run:
             cmd.append("-n")
 
@@ -207,13 +465,35 @@ class SnapshotCoordinator:
             )
         except Exception as e:
             print(f"⚠️  Teardown error for {info.volume_name}: {e}", file=sys.stderr)
+            return
+        if not self._dry_run:
+            snapshot_journal.forget(info.snap_name)
+
+    def _plan_cow_placement(self) -> dict[str, list[str]]:
+        """COW PVs per job: configured ones, else PVs off the origin's disks."""
+        placement = {
+            j.name: list(j.config["snapshot_pvs"])
+            for j in self._units if j.config.get("snapshot_pvs")
+        }
+        if self._dry_run or not self._separate_cow_pv:
+            return placement
+        auto = plan_placement([
+            (j.name, j.config["vg_name"], j.config["lv_name"],
+             _parse_size_bytes(str(j.config["snapshot_size"])))
+            for j in self._units if j.name not in placement
+        ])
+        for name, pvs in auto.items():
+            print(f"💽 {name}: COW area on {', '.join(pvs)}, "
+                  f"off its origin's disks")
+        placement.update(auto)
+        return placement
 
     def _preflight_vg_space_check(self) -> None:
         if self._dry_run:
             return
 
         by_vg: dict[str, list[BackupJob]] = {}
-        for job in self._lv_jobs:
+        for job in self._units:
             vg = job.config["vg_name"]
             by_vg.setdefault(vg, []).append(job)
 
@@ -287,8 +567,4 @@ class SnapshotCoordinator:
 
     @staticmethod
     def _format_bytes(n: int) -> str:
-        for unit in ("B", "K", "M", "G", "T"):
-            if abs(n) < 1024:
-                return f"{n:.1f}{unit}" if n != int(n) else f"{n}{unit}"
-            n /= 1024
-        return f"{n:.1f}P"
+        return format_bytes(n)
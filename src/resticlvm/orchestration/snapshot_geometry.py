@@ -0,0 +1,159 @@
+"""Chunk size and physical placement of classic snapshots' COW areas.
+
+While a classic snapshot exists, the first write to each chunk of its
+origin copies that chunk into the snapshot's COW area before the write
+completes. By default LVM uses 4 KiB chunks and puts the COW area wherever
+it finds room, often on the same disk as the origin, so every such write
+costs a second seek on the disk that is already serving it.
+
+- ``snapshot_chunksize`` sets the chunk size per volume (``lvcreate
+  --chunksize``). Larger chunks mean fewer, bigger copies.
+- ``snapshot_pvs`` names the PVs the COW area may use.
+- Otherwise, unless ``[snapshot_settings] separate_cow_pv = false``, each
+  snapshot is placed on a PV of its VG that sits on other disks than its
+  origin and has room for it, if there is one.
+
+``rlvm bench-snapshot`` (see snapshot_bench.py) measures which chunk size
+suits a host.
+"""
+
+import json
+import subprocess
+from dataclasses import dataclass
+
+from resticlvm.orchestration.units import parse_size_bytes
+
+# Chunk sizes lvcreate accepts for classic snapshots.
+CHUNK_MIN = 4 * 1024
+CHUNK_MAX = 512 * 1024
+
+
+def parse_chunksize(value: str) -> int:
+    """Bytes in a snapshot chunk size such as ``"64K"``.
+
+    Raises:
+        ValueError: If it is not a power of two from 4K to 512K.
+    """
+    size = parse_size_bytes(str(value))
+    if not CHUNK_MIN <= size <= CHUNK_MAX or size & (size - 1):
+        raise ValueError(
+            f"snapshot chunk size must be a power of two from 4K to 512K, "
+            f"got {value!r}"
+        )
+    return size
+
+
+@dataclass
+class PhysicalVolume:
+    """A PV of a VG, with the disks it sits on."""
+
+    name: str
+    free: int
+    disks: frozenset[str]
+
+
+def place_snapshots(
+    requests: list[tuple[str, int, frozenset[str]]],
+    pvs: list[PhysicalVolume],
+) -> dict[str, list[str]]:
+    """Choose a PV for each snapshot's COW area, away from its origin.
+
+    Args:
+        requests: ``(key, size, origin disks)`` per snapshot, in creation
+            order.
+        pvs: The VG's PVs.
+
+    Returns:
+        dict: The PVs to pass to lvcreate, per key. Snapshots with no PV off
+        their origin's disks that has room are left out, for LVM to place.
+    """
+    free = {pv.name: pv.free for pv in pvs}
+    placement: dict[str, list[str]] = {}
+    for key, size, origin_disks in requests:
+        candidates = [
+            pv for pv in pvs
+            if pv.disks and not pv.disks & origin_disks and free[pv.name] >= size
+        ]
+        if not candidates:
+            continue
+        best = max(candidates, key=lambda pv: free[pv.name])
+        free[best.name] -= size
+        placement[key] = [best.name]
+    return placement
+
+
+def _disks_of(device: str) -> frozenset[str]:
+    """The whole disks under a block device (partition, dm, md...)."""
+    result = subprocess.run(
+        ["lsblk", "-s", "-n", "-r", "-o", "NAME,TYPE", device],
+        check=True, capture_output=True, text=True,
+    )
+    return frozenset(
+        name for name, _, kind in
+        (line.partition(" ") for line in result.stdout.splitlines())
+        if kind.strip() == "disk"
+    )
+
+
+def list_pvs(vg_name: str) -> list[PhysicalVolume]:
+    result = subprocess.run(
+        ["pvs", "--reportformat", "json", "--units", "b", "--nosuffix",
+         "-o", "pv_name,pv_free", "-S", f"vg_name={vg_name}"],
+        check=True, capture_output=True, text=True,
+    )
+    return [
+        PhysicalVolume(
+            name=row["pv_name"],
+            free=int(row["pv_free"]),
+            disks=_disks_of(row["pv_name"]),
+        )
+        for row in json.loads(result.stdout)["report"][0]["pv"]
+    ]
+
+
+def origin_pvs(vg_name: str, lv_name: str) -> list[str]:
+    """The PVs an LV's extents are on."""
+    result = subprocess.run(
+        ["lvs", "--reportformat", "json", "-o", "devices",
+         f"{vg_name}/{lv_name}"],
+        check=True, capture_output=True, text=True,
+    )
+    devices = []
+    for row in json.loads(result.stdout)["report"][0]["lv"]:
+        for device in row["devices"].split(","):
+            name = device.partition("(")[0].strip()
+            if name and name not in devices:
+                devices.append(name)
+    return devices
+
+
+def plan_placement(
+    requests: list[tuple[str, str, str, int]],
+) -> dict[str, list[str]]:
+    """Choose COW PVs for ``(key, vg, lv, size)`` snapshots, per VG.
+
+    Best-effort: a VG that cannot be inspected is left to LVM.
+    """
+    by_vg: dict[str, list[tuple[str, str, int]]] = {}
+    for key, vg, lv, size in requests:
+        by_vg.setdefault(vg, []).append((key, lv, size))
+
+    placement: dict[str, list[str]] = {}
+    for vg, vg_requests in by_vg.items():
+        try:
+            pvs = list_pvs(vg)
+            if len(pvs) < 2:
+                continue
+            disks = {pv.name: pv.disks for pv in pvs}
+            placement.update(place_snapshots(
+                [
+                    (key, size, frozenset().union(
+                        *(disks.get(pv, frozenset()) for pv in origin_pvs(vg, lv))
+                    ))
+                    for key, lv, size in vg_requests
+                ],
+                pvs,
+            ))
+        except (subprocess.CalledProcessError, OSError, ValueError, KeyError) as e:
+            print(f"⚠️  Could not plan snapshot placement in VG {vg}: {e}")
+    return placement
@@ -0,0 +1,79 @@
+"""Journal of the LVM snapshots and mounts an rlvm run holds.
+
+SnapshotCoordinator records each snapshot, with its mount point, in the
+``snapshot_journal`` state file *before* creating it, and drops the record
+once the snapshot is torn down. A run killed with ``kill -9``, by the OOM
+killer or by a power loss therefore leaves a record of exactly what it
+held. ``rlvm cleanup`` (see cleanup_runner.py) releases it later.
+
+Each record names the process that wrote it and the boot it ran in, so a
+record whose process is gone, or that predates a reboot, is known to be
+stale. Several rlvm processes may update the journal at once; updates are
+serialised with a lock file next to it.
+"""
+
+import os
+from datetime import datetime
+
+from resticlvm.orchestration.state import load_state, locked, save_state
+
+STATE_NAME = "snapshot_journal"
+
+_BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+
+
+def boot_id() -> str | None:
+    try:
+        with open(_BOOT_ID_PATH) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def entry_alive(entry: dict) -> bool:
+    """True if the process that wrote ``entry`` is still running."""
+    if entry.get("boot_id") != boot_id():
+        return False
+    pid = entry.get("pid")
+    return isinstance(pid, int) and pid_alive(pid)
+
+
+def load_journal() -> dict:
+    """All journal records, keyed by snapshot (or mount) name."""
+    return load_state(STATE_NAME)
+
+
+def record(key: str, vg_name: str | None, snap_name: str | None,
+           mount_point: str, mount_base: str) -> None:
+    """Journal a snapshot and its mount point before they are created."""
+    with locked(STATE_NAME):
+        journal = load_state(STATE_NAME)
+        journal[key] = {
+            "vg_name": vg_name,
+            "snap_name": snap_name,
+            "mount_point": mount_point,
+            "mount_base": mount_base,
+            "pid": os.getpid(),
+            "boot_id": boot_id(),
+            "created": datetime.now().isoformat(timespec="seconds"),
+        }
+        save_state(STATE_NAME, journal)
+
+
+def forget(*keys: str) -> None:
+    """Drop released records from the journal."""
+    with locked(STATE_NAME):
+        journal = load_state(STATE_NAME)
+        dropped = [key for key in keys if journal.pop(key, None) is not None]
+        if dropped:
+            save_state(STATE_NAME, journal)
@@ -0,0 +1,206 @@
+"""Backing up LV volumes in waves when the VGs cannot hold every snapshot.
+
+By default every LV snapshot of a run is taken at once, so that all
+volumes capture the same moment. That needs room in each VG for all of
+them, plus ``min_vg_free_after_snapshots``. Where there is less, the LV
+volumes are split into waves that each fit. A wave's snapshots are
+created, backed up and released before the next wave starts.
+
+Volumes that must still be captured together declare the same
+``consistency_group``; a group is never split across waves. Volumes on the
+same LV share a snapshot (see snapshot_coordinator.py) and so always share
+a wave. Any other volume is a group of its own.
+
+Groups are placed in config order, each into the first wave with room for
+it. Nothing changes when everything fits at once. A group with
+``retain_snapshots`` keeps its snapshot after its wave (see retention.py),
+so its space is also charged to every later wave.
+
+After each wave, retained snapshots are rotated so that the rest of the
+run, and each group of the next run, still fits (``rotation_needs``).
+"""
+
+import subprocess
+from dataclasses import dataclass, field
+
+from resticlvm.orchestration.data_classes import BackupJob
+from resticlvm.orchestration.retention import query_vg_free
+from resticlvm.orchestration.units import format_bytes, parse_size_bytes
+
+
+@dataclass
+class ConsistencyGroup:
+    """LV volumes whose snapshots must be taken together."""
+
+    name: str
+    jobs: list[BackupJob] = field(default_factory=list)
+
+    def needs(self) -> dict[str, int]:
+        """Bytes of snapshot space needed per VG, once per origin LV."""
+        sizes: dict[tuple[str, str], int] = {}
+        for job in self.jobs:
+            origin = (job.config["vg_name"], job.config["lv_name"])
+            size = parse_size_bytes(str(job.config["snapshot_size"]))
+            sizes[origin] = max(sizes.get(origin, 0), size)
+        needs: dict[str, int] = {}
+        for (vg, _), size in sizes.items():
+            needs[vg] = needs.get(vg, 0) + size
+        return needs
+
+    @property
+    def retains(self) -> bool:
+        return any(j.config.get("retain_snapshots") for j in self.jobs)
+
+
+def _largest(needs: list[dict[str, int]]) -> dict[str, int]:
+    """The largest need per VG."""
+    largest: dict[str, int] = {}
+    for need in needs:
+        for vg, size in need.items():
+            largest[vg] = max(largest.get(vg, 0), size)
+    return largest
+
+
+def consistency_groups(lv_jobs: list[BackupJob]) -> list[ConsistencyGroup]:
+    """Gather LV jobs into consistency groups, in config order.
+
+    Jobs are joined by their ``consistency_group`` and by their origin LV;
+    a job linked both ways merges the two groups.
+    """
+    parent = list(range(len(lv_jobs)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    first_by_key: dict[tuple, int] = {}
+    for i, job in enumerate(lv_jobs):
+        keys = [("lv", job.config["vg_name"], job.config["lv_name"])]
+        if job.config.get("consistency_group"):
+            keys.append(("group", job.config["consistency_group"]))
+        for key in keys:
+            if key in first_by_key:
+                parent[find(i)] = find(first_by_key[key])
+            else:
+                first_by_key[key] = i
+
+    groups: dict[int, ConsistencyGroup] = {}
+    for i, job in enumerate(lv_jobs):
+        group = groups.setdefault(find(i), ConsistencyGroup(
+            name=job.config.get("consistency_group") or job.name
+        ))
+        group.jobs.append(job)
+    return list(groups.values())
+
+
+def plan_waves(
+    groups: list[ConsistencyGroup], budget: dict[str, int]
+) -> list[list[ConsistencyGroup]]:
+    """Pack consistency groups into waves that fit the VG budget.
+
+    Args:
+        groups: The consistency groups, in config order.
+        budget: Bytes available for snapshots per VG.
+
+    Returns:
+        list: The waves, each a list of groups. A single wave if every
+        group fits at once.
+
+    Raises:
+        ValueError: If a group does not fit on its own.
+    """
+    waves: list[list[ConsistencyGroup]] = []
+    used: list[dict[str, int]] = []  # snapshots of the wave, and retained ones
+    for group in groups:
+        needs = group.needs()
+        for vg, size in needs.items():
+            if size > budget.get(vg, 0):
+                raise ValueError(
+                    f"consistency group '{group.name}' needs "
+                    f"{format_bytes(size)} of snapshot space in VG '{vg}', "
+                    f"but only {format_bytes(max(budget.get(vg, 0), 0))} "
+                    f"is available"
+                )
+
+        def fits(i: int) -> bool:
+            # A retained snapshot also occupies every later wave.
+            later = used[i:] if group.retains else used[i:i + 1]
+            return all(
+                w.get(vg, 0) + size <= budget[vg]
+                for w in later for vg, size in needs.items()
+            )
+
+        index = next((i for i in range(len(waves)) if fits(i)), None)
+        if index is None:
+            # Even if earlier retained snapshots leave too little room, a
+            # new wave is possible: rotation frees them first.
+            carried: dict[str, int] = {}
+            for wave in waves:
+                for earlier in wave:
+                    if earlier.retains:
+                        for vg, size in earlier.needs().items():
+                            carried[vg] = carried.get(vg, 0) + size
+            waves.append([])
+            used.append(carried)
+            index = len(waves) - 1
+        waves[index].append(group)
+        for w in used[index:] if group.retains else [used[index]]:
+            for vg, size in needs.items():
+                w[vg] = w.get(vg, 0) + size
+    return waves
+
+
+def snapshot_waves(
+    lv_jobs: list[BackupJob], min_vg_free_after_snapshots: str
+) -> list[list[BackupJob]]:
+    """Split LV jobs into waves whose snapshots fit the VGs' free space.
+
+    Returns the jobs as a single wave when everything fits, and also when
+    the VGs cannot be queried or a group does not fit even on its own; the
+    coordinator's pre-flight check then reports the shortfall.
+    """
+    groups = consistency_groups(lv_jobs)
+    if len(groups) < 2:
+        return [lv_jobs]
+    margin = parse_size_bytes(min_vg_free_after_snapshots)
+    vgs = sorted({j.config["vg_name"] for j in lv_jobs})
+    try:
+        budget = {vg: query_vg_free(vg) - margin for vg in vgs}
+        waves = plan_waves(groups, budget)
+    except (subprocess.CalledProcessError, OSError, ValueError) as e:
+        if isinstance(e, ValueError):
+            print(f"⚠️  Cannot split snapshots into waves: {e}")
+        return [lv_jobs]
+    if len(waves) == 1:
+        return [lv_jobs]
+
+    print(f"🌊 Not every snapshot fits in the VGs at once; backing up LV "
+          f"volumes in {len(waves)} waves:")
+    for i, wave in enumerate(waves, 1):
+        names = ", ".join(j.name for group in wave for j in group.jobs)
+        print(f"  {i}. {names}")
+    order = {id(j): i for i, j in enumerate(lv_jobs)}
+    return [
+        sorted((j for group in wave for j in group.jobs), key=lambda j: order[id(j)])
+        for wave in waves
+    ]
+
+
+def rotation_needs(waves: list[list[BackupJob]]) -> list[dict[str, int] | None]:
+    """Snapshot space each wave's rotation must leave free, per VG.
+
+    After a wave, retained snapshots are rotated until every later wave, and
+    every consistency group on its own (for the next run), fits. A single
+    wave keeps the coordinator's default: its own snapshots.
+    """
+    if len(waves) < 2:
+        return [None] * len(waves)
+    wave_needs = [ConsistencyGroup("", wave).needs() for wave in waves]
+    group_needs = [
+        g.needs() for g in consistency_groups([j for w in waves for j in w])
+    ]
+    return [
+        _largest(wave_needs[i + 1:] + group_needs) for i in range(len(waves))
+    ]
@@ -0,0 +1,233 @@
+"""``rlvm snapshots``: latest snapshot of each volume on every destination.
+
+Answers from the local snapshot catalog (see catalog.py). Repositories whose
+last full listing is older than ``[catalog] reconcile_every_hours`` are
+listed again first (in parallel, with ``--no-lock``), unless ``--cached``.
+``--refresh`` lists every repository.
+
+For each copy_to destination the output also shows the replication gap: how
+many of the volume's snapshots in the destination's source have no
+counterpart in the destination. Volumes with a standby (see standby.py)
+also show its last refresh and how far it lags behind its backup.
+"""
+
+import os
+import socket
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from resticlvm.orchestration.backup_config import (
+    BackupConfig,
+    BackupConfigFactory,
+    VolumeConfig,
+)
+from resticlvm.orchestration.catalog import Catalog, SnapshotRecord, reconcile
+from resticlvm.orchestration.config_loader import load_config
+from resticlvm.orchestration.credentials import (
+    B2CredentialsError,
+    load_b2_credentials,
+    repo_uses_b2,
+)
+from resticlvm.orchestration.performance import (
+    PerformanceProfile,
+    merge_profiles,
+)
+from resticlvm.orchestration.standby import STATE_NAME as STANDBY_STATE
+from resticlvm.orchestration.state import load_state
+
+
+@dataclass
+class Destination:
+    """A repository holding a volume's snapshots, and where it copies from."""
+
+    repo_path: str
+    password_file: Path
+    source: str | None = None  # None for the volume's own repositories
+    label: str = ""
+    performance: PerformanceProfile | None = None
+
+
+def volume_destinations(vol: VolumeConfig) -> list[Destination]:
+    """The volume's repositories followed by each one's copy_to entries."""
+    dests = []
+    for repo in vol.repositories:
+        repo_profile = merge_profiles(
+            vol.performance_profile, repo.performance_profile
+        )
+        dests.append(Destination(
+            repo.repo_path, repo.password_file, performance=repo_profile
+        ))
+        by_name = {d.name: d for d in repo.copy_destinations if d.name}
+        for dest in repo.copy_destinations:
+            upstream = by_name.get(dest.source) if dest.source else None
+            source = upstream.repo_path if upstream else repo.repo_path
+            # A mirror shares its source's keys.
+            password = (
+                repo.password_file if dest.mode == "mirror"
+                else dest.password_file
+            )
+            dests.append(Destination(
+                dest.repo_path, password, source=source,
+                label="mirror" if dest.mode == "mirror" else "copy",
+                performance=merge_profiles(
+                    repo_profile, dest.performance_profile
+                ),
+            ))
+    return dests
+
+
+def selected_volumes(
+    config: BackupConfig, category: str | None, name: str | None
+) -> dict[str, VolumeConfig]:
+    """Volumes matching the --category / --name filters."""
+    return {
+        vol_name: vol for vol_name, vol in config.volumes.items()
+        if (category is None or vol.volume_type.value == category)
+        and (name is None or vol_name == name)
+    }
+
+
+def stale_repos(
+    catalog: Catalog, repos: list[str], max_age_hours: int
+) -> list[str]:
+    """Repositories never listed, or listed more than ``max_age_hours`` ago."""
+    now = datetime.now().timestamp()
+    stale = []
+    for repo in repos:
+        reconciled = catalog.reconciled_at(repo)
+        if reconciled is None or now - reconciled > max_age_hours * 3600:
+            stale.append(repo)
+    return stale
+
+
+def _age(record: SnapshotRecord) -> str:
+    seconds = max(0, datetime.now().timestamp() - record.time)
+    if seconds < 3600:
+        return f"{int(seconds // 60)}m ago"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)}h ago"
+    return f"{int(seconds // 86400)}d ago"
+
+
+def print_volume(
+    catalog: Catalog, name: str, vol: VolumeConfig, hostname: str,
+    show_gaps: bool = False,
+) -> int:
+    """Print one volume's latest snapshot per destination.
+
+    Returns:
+        int: Total number of snapshots missing from copy destinations.
+    """
+    paths = [vol.backup_source_path]
+    tag = f"vol:{name}"
+    print(f"\n📦 [{vol.volume_type.value}.{name}] {vol.backup_source_path}")
+    total_missing = 0
+    for dest in volume_destinations(vol):
+        snaps = catalog.snapshots(dest.repo_path, hostname, paths, tag)
+        prefix = f"  {dest.label} → " if dest.source else "  "
+        if snaps:
+            latest = snaps[-1]
+            status = (
+                f"{latest.short_id}  "
+                f"{latest.local_time.isoformat(sep=' ', timespec='minutes')}"
+                f"  ({_age(latest)}, {len(snaps)} snapshot(s))"
+            )
+        else:
+            status = "no snapshots"
+        print(f"{prefix}{dest.repo_path}: {status}")
+
+        if dest.source is None:
+            continue
+        missing = catalog.missing(
+            dest.source, dest.repo_path, hostname, paths, tag
+        )
+        total_missing += len(missing)
+        if missing:
+            print(f"      ⚠️  missing {len(missing)} snapshot(s) "
+                  f"from {dest.source}")
+            if show_gaps:
+                for snap in missing:
+                    print(f"        - {snap.short_id}  "
+                          f"{snap.local_time.isoformat(sep=' ', timespec='minutes')}")
+
+    standby = load_state(STANDBY_STATE).get(f"{vol.volume_type.value}.{name}")
+    if standby:
+        lag = standby.get("lag_seconds")
+        lag_note = f", {lag // 60} min behind its backup" if lag is not None else ""
+        print(f"  standby → {standby['target']}: {standby['snapshot']}  "
+              f"refreshed {standby['refreshed_at'].replace('T', ' ')[:16]} "
+              f"in {standby['seconds']:.0f}s{lag_note}")
+    return total_missing
+
+
+def _repo_targets(volumes: dict[str, VolumeConfig]) -> dict[str, Path]:
+    targets = {}
+    for vol in volumes.values():
+        for dest in volume_destinations(vol):
+            targets.setdefault(str(dest.repo_path), dest.password_file)
+    return targets
+
+
+def refresh_catalog(
+    catalog: Catalog,
+    config: BackupConfig,
+    volumes: dict[str, VolumeConfig],
+    refresh_all: bool = False,
+    dry_run: bool = False,
+) -> None:
+    """List the volumes' repositories whose catalog entries are stale (or
+    all of them with ``refresh_all``)."""
+    targets = _repo_targets(volumes)
+    to_list = list(targets) if refresh_all else stale_repos(
+        catalog, list(targets), config.catalog.reconcile_every_hours
+    )
+    if not to_list:
+        return
+    if dry_run:
+        print(f"[DRY RUN] Would list snapshots of {len(to_list)} "
+              f"repository(ies).")
+        return
+
+    env = os.environ.copy()
+    env.setdefault("SSH_AUTH_SOCK", "/root/.ssh/ssh-agent.sock")
+    if any(repo_uses_b2(r) for r in to_list):
+        try:
+            load_b2_credentials(env)
+        except B2CredentialsError as e:
+            print(f"⚠️  {e}")
+    reconcile(
+        catalog,
+        {repo: targets[repo] for repo in to_list},
+        env,
+        max_parallel=config.concurrency.max_parallel,
+        per_backend=config.concurrency.per_backend,
+    )
+
+
+def run(args):
+    """Execute ``rlvm snapshots`` from pre-parsed arguments."""
+    config = BackupConfigFactory(load_config(Path(args.config))).build()
+    volumes = selected_volumes(config, args.category, args.name)
+    if not volumes:
+        print("No matching volumes.")
+        return
+
+    catalog = Catalog()
+    if not args.cached:
+        refresh_catalog(
+            catalog, config, volumes, refresh_all=args.refresh,
+            dry_run=args.dry_run,
+        )
+
+    hostname = socket.gethostname()
+    total_missing = 0
+    for name, vol in volumes.items():
+        total_missing += print_volume(
+            catalog, name, vol, hostname, show_gaps=args.gaps
+        )
+
+    if total_missing:
+        print(f"\n⚠️  {total_missing} snapshot(s) not yet replicated.")
+    else:
+        print("\n✅ All copy destinations are up to date.")
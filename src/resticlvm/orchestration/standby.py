@@ -0,0 +1,200 @@
+"""Warm standby copies refreshed from each new backup.
+
+A volume with a ``standby`` target keeps a ready-to-mount copy of its
+latest snapshot, either in a directory or on a separate LV in the volume's
+VG. After a backup run, once the LVM snapshots are torn down and the copies
+have run, each standby is refreshed from the snapshot the run just created:
+
+- It is restored from a local repository if the volume has one.
+- It is restored with ``restic restore --overwrite if-changed --delete``, so
+  only changed files are written and files that no longer exist are removed.
+  A standby is therefore at most one backup run behind.
+- The restore runs under ``nice`` and ``ionice -c 3`` so that it yields to
+  everything else on the host.
+
+The last refresh is recorded per volume in the ``standby`` state file. This
+covers the snapshot, how long the refresh took, and the lag (the time from
+the backup to the end of the refresh). ``rlvm snapshots`` shows it. This
+needs restic 0.17 or later; on older versions standbys are skipped with a
+warning.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from resticlvm.orchestration.backup_config import is_local_repo
+from resticlvm.orchestration.credentials import (
+    B2CredentialsError,
+    load_b2_credentials,
+    repo_uses_b2,
+)
+from resticlvm.orchestration.data_classes import BackupJob
+from resticlvm.orchestration.parents import STATE_NAME as PARENTS_STATE
+from resticlvm.orchestration.performance import restic_env, restic_options
+from resticlvm.orchestration.restic_features import supports
+from resticlvm.orchestration.state import load_state, update_state
+from resticlvm.orchestration.terminal import preserved_terminal
+
+STATE_NAME = "standby"
+
+# Run standby restores at the lowest CPU and I/O priority.
+LOW_PRIORITY = ["nice", "-n", "19", "ionice", "-c", "3"]
+
+
+@dataclass
+class StandbySource:
+    """The snapshot a standby is refreshed from."""
+
+    repo: object  # ResticRepo
+    snapshot: str
+    backup_time: str | None = None
+
+
+def _recorded_entries(job: BackupJob) -> dict:
+    """The latest recorded snapshot per repository holding this job's path.
+
+    A grouped backup (see grouping.py) is recorded under the group's key,
+    e.g. ``lv_nonroot.home+srv``, with every member's path.
+    """
+    source = job.config["backup_source_path"]
+    latest = {}
+    for key, entries in load_state(PARENTS_STATE).items():
+        category, _, names = key.partition(".")
+        if category != job.category or job.name not in names.split("+"):
+            continue
+        for repo, entry in entries.items():
+            if source not in entry.get("paths", []):
+                continue
+            if repo not in latest or entry.get("time", "") > latest[repo].get("time", ""):
+                latest[repo] = entry
+    return latest
+
+
+def standby_source(job: BackupJob) -> StandbySource | None:
+    """The job's latest recorded snapshot, from a local repository if any."""
+    entries = _recorded_entries(job)
+    candidates = [
+        StandbySource(repo, entries[str(repo.repo_path)]["snapshot"],
+                      entries[str(repo.repo_path)].get("time"))
+        for repo in job.repositories
+        if str(repo.repo_path) in entries
+    ]
+    local = [c for c in candidates if is_local_repo(c.repo.repo_path)]
+    return (local or candidates or [None])[0]
+
+
+def describe_target(standby: dict) -> str:
+    if standby.get("lv_name"):
+        return f"/dev/{standby['vg_name']}/{standby['lv_name']}"
+    return standby["path"]
+
+
+def restore_command(source: StandbySource, source_path: str, target) -> list[str]:
+    repo = source.repo
+    return [
+        *LOW_PRIORITY,
+        "restic", "-r", str(repo.repo_path),
+        "--password-file", str(repo.password_file),
+        *restic_options(repo.performance, repo.repo_path, command="restore"),
+        "restore", f"{source.snapshot}:{source_path}",
+        "--target", str(target),
+        "--overwrite", "if-changed",
+        "--delete",
+    ]
+
+
+def _restore(cmd: list[str], env: dict) -> None:
+    with preserved_terminal():
+        subprocess.run(cmd, check=True, stdout=sys.stdout, stderr=sys.stderr,
+                       env=env)
+
+
+def refresh_standby(job: BackupJob, env: dict) -> bool:
+    """Bring one job's standby up to its latest snapshot.
+
+    Returns:
+        bool: False if the refresh failed.
+    """
+    standby = job.config["standby"]
+    label = f"[{job.category}.{job.name}]"
+    target = describe_target(standby)
+    source = standby_source(job)
+    if source is None:
+        print(f"⚠️  Standby {label}: no recorded snapshot to refresh from.")
+        return False
+    record = load_state(STATE_NAME).get(job.job_key, {})
+    if record.get("snapshot") == source.snapshot and record.get("target") == target:
+        print(f"🛌 Standby {label} is up to date ({source.snapshot}).")
+        return True
+
+    source_path = job.config["backup_source_path"]
+    if job.dry_run:
+        print(f"[DRY RUN] Would refresh standby {label} at {target} from "
+              f"{source.repo.repo_path} ({source.snapshot})")
+        return True
+
+    print(f"🛌 Refreshing standby {label} at {target} from "
+          f"{source.repo.repo_path} ({source.snapshot})...")
+    env = {**env, **restic_env(source.repo.performance)}
+    started = time.monotonic()
+    try:
+        if repo_uses_b2(source.repo.repo_path):
+            load_b2_credentials(env)
+        if standby.get("lv_name"):
+            with tempfile.TemporaryDirectory(prefix="resticlvm-standby-") as mnt:
+                subprocess.run(["mount", target, mnt], check=True)
+                try:
+                    _restore(restore_command(source, source_path, mnt), env)
+                finally:
+                    subprocess.run(["umount", mnt], check=False)
+        else:
+            os.makedirs(target, exist_ok=True)
+            _restore(restore_command(source, source_path, target), env)
+    except (subprocess.CalledProcessError, OSError, B2CredentialsError) as e:
+        print(f"❌ Standby {label} refresh failed: {e}")
+        return False
+
+    seconds = time.monotonic() - started
+    now = datetime.now()
+    lag = (
+        (now - datetime.fromisoformat(source.backup_time)).total_seconds()
+        if source.backup_time else None
+    )
+    update_state(STATE_NAME, job.job_key, {
+        "target": target,
+        "repo": str(source.repo.repo_path),
+        "snapshot": source.snapshot,
+        "backup_time": source.backup_time,
+        "refreshed_at": now.isoformat(timespec="seconds"),
+        "seconds": round(seconds, 1),
+        "lag_seconds": round(lag) if lag is not None else None,
+    })
+    lag_note = f", {lag / 60:.0f} min behind the backup" if lag is not None else ""
+    print(f"✅ Standby {label} refreshed to {source.snapshot} in "
+          f"{seconds:.0f}s{lag_note}.")
+    return True
+
+
+def refresh_standbys(jobs: list[BackupJob]) -> list[str]:
+    """Refresh the standbys of the given (successfully backed-up) jobs, one
+    at a time.
+
+    Returns:
+        list[str]: ``category.name`` of each job whose refresh failed.
+    """
+    jobs = [j for j in jobs if j.config.get("standby")]
+    if not jobs:
+        return []
+    if not supports("restore_delete"):
+        print("⚠️  Standby refresh needs restic 0.17 or later "
+              "(restore --delete); skipping standbys.")
+        return [j.job_key for j in jobs]
+
+    env = os.environ.copy()
+    env.setdefault("SSH_AUTH_SOCK", "/root/.ssh/ssh-agent.sock")
+    return [j.job_key for j in jobs if not refresh_standby(j, env)]
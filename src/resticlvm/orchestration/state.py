@@ -0,0 +1,81 @@
+"""Persistent run state kept between rlvm invocations.
+
+Some decisions depend on what earlier runs did, for example when a repository
+was last pruned. That state lives in small JSON files under
+``/var/lib/resticlvm``. Set ``RESTICLVM_STATE_DIR`` to use another directory.
+Files are replaced atomically, so an interrupted run never leaves a
+half-written file behind. Read-modify-write updates are serialised with a
+lock file next to the state file, across threads and processes.
+"""
+
+import fcntl
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+DEFAULT_STATE_DIR = Path("/var/lib/resticlvm")
+
+
+def state_dir() -> Path:
+    """Return the directory holding rlvm state files."""
+    return Path(os.environ.get("RESTICLVM_STATE_DIR", DEFAULT_STATE_DIR))
+
+
+def load_state(name: str) -> dict:
+    """Load the state file ``<state_dir>/<name>.json``.
+
+    A missing or unreadable file yields an empty dict; state is advisory and
+    must never prevent a backup or prune from running.
+    """
+    path = state_dir() / f"{name}.json"
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_state(name: str, data: dict) -> None:
+    """Atomically write ``data`` to ``<state_dir>/<name>.json``.
+
+    Failures are reported as warnings rather than raised.
+    """
+    directory = state_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{name}.")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp, directory / f"{name}.json")
+    except OSError as e:
+        print(f"⚠️  Could not save state {name!r} in {directory}: {e}")
+
+
+@contextmanager
+def locked(name: str):
+    """Hold the lock of state file ``name`` while updating it."""
+    directory = state_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        lock = open(directory / f".{name}.lock", "a")
+    except OSError:
+        # State is advisory: never block a run on it.
+        yield
+        return
+    # flock locks belong to the open file, so threads of one process that
+    # each open the lock file also exclude each other.
+    with lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def update_state(name: str, key: str, record: dict) -> None:
+    """Merge ``record`` into the entry ``key`` of state file ``name``."""
+    with locked(name):
+        data = load_state(name)
+        data.setdefault(key, {}).update(record)
+        save_state(name, data)
@@ -0,0 +1,270 @@
+"""Backup throttling that holds the origin volumes' I/O latency.
+
+While a backup reads a snapshot, the applications on its origin volume
+compete with it for the same disks, and each first write to a chunk of a
+classic snapshot's origin is also copied into the COW area. With a
+``[throttle] latency_slo_ms`` set, a controller watches the origin devices
+while each wave of LV volumes is backed up:
+
+- Every ``interval_ms``, the average I/O latency and queue depth of each
+  watched device are read from ``/sys/class/block/<dev>/stat``. These are
+  the devices of the LV volumes being backed up, or ``[throttle] devices``.
+- restic may run for a share (the duty cycle) of each interval and is
+  paused with SIGSTOP for the rest. The share is halved while the slowest
+  device is over the SLO and grows by a tenth of the interval while it is
+  comfortably below, never under ``min_duty_percent``.
+- When the wave is done, the controller reports how often the SLO was
+  missed and how much backup throughput it traded for it, from restic's
+  own read counters.
+
+Reads of a snapshot's unchanged chunks go to the origin's underlying
+device, not to the origin LV, so the origin's latency reflects the
+applications' I/O only.
+"""
+
+import os
+import signal
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+
+from resticlvm.orchestration.backup_config import ThrottleSettings
+from resticlvm.orchestration.data_classes import BackupJob
+from resticlvm.orchestration.units import format_bytes
+
+# Latency below this share of the SLO lets restic run longer.
+_HEADROOM = 0.8
+_STEP = 0.1
+
+_PROC = Path("/proc")
+_SYS_BLOCK = Path("/sys/class/block")
+
+
+@dataclass
+class DiskStat:
+    """Cumulative counters of a block device (Documentation/block/stat)."""
+
+    ios: int
+    ticks_ms: int
+    queue_ms: int
+
+
+def parse_disk_stat(text: str) -> DiskStat:
+    """Read completed I/Os, time spent on them and weighted queue time."""
+    f = [int(v) for v in text.split()]
+    return DiskStat(ios=f[0] + f[4], ticks_ms=f[3] + f[7], queue_ms=f[10])
+
+
+def interval_stats(
+    before: DiskStat, after: DiskStat, seconds: float
+) -> tuple[float, float]:
+    """Average latency (ms per I/O) and queue depth between two samples."""
+    ios = after.ios - before.ios
+    latency = (after.ticks_ms - before.ticks_ms) / ios if ios > 0 else 0.0
+    if seconds <= 0:
+        return latency, 0.0
+    return latency, (after.queue_ms - before.queue_ms) / (seconds * 1000)
+
+
+class DutyCycle:
+    """The share of each interval restic may run for."""
+
+    def __init__(self, slo_ms: float, min_duty: float):
+        self.slo_ms = slo_ms
+        self.min_duty = min_duty
+        self.duty = 1.0
+
+    def update(self, latency_ms: float) -> float:
+        if latency_ms > self.slo_ms:
+            self.duty = max(self.min_duty, self.duty / 2)
+        elif latency_ms < self.slo_ms * _HEADROOM:
+            self.duty = min(1.0, self.duty + _STEP)
+        return self.duty
+
+
+@dataclass
+class ThrottleReport:
+    """What the controller observed and cost over one wave."""
+
+    slo_ms: float
+    intervals: int = 0
+    over_slo: int = 0
+    max_latency_ms: float = 0.0
+    max_queue_depth: float = 0.0
+    elapsed: float = 0.0
+    paused: float = 0.0
+    read_bytes: int = 0
+
+    def add(self, latency_ms: float, depth: float) -> None:
+        self.intervals += 1
+        self.over_slo += latency_ms > self.slo_ms
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def lines(self) -> list[str]:
+        lines = [
+            f"origin latency over {self.slo_ms:g} ms in {self.over_slo} of "
+            f"{self.intervals} interval(s) (worst {self.max_latency_ms:.1f} "
+            f"ms, queue depth up to {self.max_queue_depth:.1f})"
+        ]
+        if self.elapsed <= 0:
+            return lines
+        share = self.paused / self.elapsed
+        lines.append(
+            f"restic paused {self.paused:.0f}s of {self.elapsed:.0f}s "
+            f"({share:.0%})"
+        )
+        running = self.elapsed - self.paused
+        if self.read_bytes and running > 0:
+            full = self.read_bytes / running
+            held = self.read_bytes / self.elapsed
+            lines.append(
+                f"read {format_bytes(self.read_bytes)} at "
+                f"{format_bytes(int(held))}/s, vs {format_bytes(int(full))}/s "
+                f"unpaused: {format_bytes(int(full - held))}/s traded"
+            )
+        return lines
+
+
+def _stat_path(device: str) -> Path:
+    return _SYS_BLOCK / os.path.basename(os.path.realpath(device)) / "stat"
+
+
+def _restic_pids() -> list[int]:
+    """restic processes started, through the backup scripts, by this one."""
+    children, names = {}, {}
+    for entry in _PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # The name is parenthesised and may itself contain spaces.
+        name, _, rest = stat[stat.index("(") + 1:].rpartition(")")
+        children.setdefault(int(rest.split()[1]), []).append(int(entry.name))
+        names[int(entry.name)] = name
+    found, todo = [], [os.getpid()]
+    while todo:
+        pid = todo.pop()
+        if names.get(pid) == "restic":
+            found.append(pid)
+        todo.extend(children.get(pid, []))
+    return found
+
+
+def _read_bytes(pid: int) -> int | None:
+    try:
+        for line in (_PROC / str(pid) / "io").read_text().splitlines():
+            if line.startswith("read_bytes:"):
+                return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _signal_all(pids, sig) -> None:
+    for pid in pids:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+
+class LatencyThrottle:
+    """Context manager that paces restic to hold the devices' latency SLO."""
+
+    def __init__(self, devices: list[str], settings: ThrottleSettings):
+        self._paths = {}
+        for device in devices:
+            path = _stat_path(device)
+            if path.exists():
+                self._paths[device] = path
+            else:
+                print(f"⚠️  Throttle: no I/O statistics for {device}; not "
+                      f"watching it.")
+        self._interval = settings.interval_ms / 1000
+        self._duty = DutyCycle(
+            settings.latency_slo_ms, settings.min_duty_percent / 100
+        )
+        self.report = ThrottleReport(slo_ms=settings.latency_slo_ms)
+        self._stop = threading.Event()
+        self._thread = None
+        self._seen_bytes: dict[int, int] = {}
+
+    def __enter__(self):
+        if self._paths:
+            self._thread = threading.Thread(
+                target=self._loop, name="rlvm-throttle", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._thread is None:
+            return False
+        self._stop.set()
+        self._thread.join()
+        print("🐢 Throttle: " + "; ".join(self.report.lines()))
+        return False
+
+    def _sample(self) -> dict[str, DiskStat]:
+        stats = {}
+        for device, path in self._paths.items():
+            try:
+                stats[device] = parse_disk_stat(path.read_text())
+            except (OSError, ValueError, IndexError):
+                pass
+        return stats
+
+    def _count_reads(self, pids) -> None:
+        for pid in pids:
+            count = _read_bytes(pid)
+            if count is not None:
+                self.report.read_bytes += count - self._seen_bytes.get(pid, 0)
+                self._seen_bytes[pid] = count
+
+    def _loop(self) -> None:
+        before, started = self._sample(), time.monotonic()
+        while not self._stop.is_set():
+            run_for = self._interval * self._duty.duty
+            if self._stop.wait(run_for):
+                break
+            pids = _restic_pids()
+            self._count_reads(pids)
+            if pids and run_for < self._interval:
+                _signal_all(pids, signal.SIGSTOP)
+                paused_at = time.monotonic()
+                try:
+                    self._stop.wait(self._interval - run_for)
+                finally:
+                    _signal_all(pids, signal.SIGCONT)
+                    self.report.paused += time.monotonic() - paused_at
+
+            after, now = self._sample(), time.monotonic()
+            worst_latency, worst_depth = 0.0, 0.0
+            for device, stat in after.items():
+                if device in before:
+                    latency, depth = interval_stats(
+                        before[device], stat, now - started
+                    )
+                    worst_latency = max(worst_latency, latency)
+                    worst_depth = max(worst_depth, depth)
+            self.report.add(worst_latency, worst_depth)
+            self.report.elapsed += now - started
+            self._duty.update(worst_latency)
+            before, started = after, now
+
+
+def latency_throttle(
+    settings: ThrottleSettings, lv_jobs: list[BackupJob], dry_run: bool
+):
+    """A LatencyThrottle for a wave of LV jobs, or a no-op when disabled."""
+    if settings.latency_slo_ms is None or dry_run:
+        return nullcontext()
+    devices = settings.devices or list(dict.fromkeys(
+        f"/dev/{j.config['vg_name']}/{j.config['lv_name']}" for j in lv_jobs
+    ))
+    return LatencyThrottle(devices, settings)
@@ -0,0 +1,585 @@
+"""Empirical restic tuning for one volume (``rlvm tune``).
+
+``rlvm tune --name <volume>`` measures which performance profile (see
+performance.py) suits a volume's data:
+
+1. LV volumes are snapshotted, as for a backup; other volumes are read in
+   place.
+2. A sample of the volume's files is drawn. Files are picked in a
+   deterministic pseudo-random order, so the sample spreads over the whole
+   tree rather than one corner of it.
+3. Trial backups of the sample run into fresh scratch repositories, one per
+   combination of compression, pack size and read concurrency. Combinations
+   that change one setting from the baseline run first, so a short budget
+   still covers every setting.
+4. With ``--backends``, the best local settings are then tried against a
+   scratch repository next to each remote repository of the volume, across
+   a range of connection counts.
+
+Each trial reports throughput, CPU time, peak memory and stored size. No
+trial starts once the time budget cannot cover it. The best combination is
+printed, and saved, as a ``[performance_profile]`` config snippet.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import secrets
+import shlex
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from resticlvm.orchestration.backup_config import VolumeConfig, VolumeType
+from resticlvm.orchestration.backup_plan import BackupPlan
+from resticlvm.orchestration.concurrency import backend_of
+from resticlvm.orchestration.credentials import (
+    B2CredentialsError,
+    load_b2_credentials,
+    repo_uses_b2,
+)
+from resticlvm.orchestration.performance import (
+    PerformanceProfile,
+    restic_options,
+)
+from resticlvm.orchestration.rollback_runner import live_mount_point
+from resticlvm.orchestration.snapshot_coordinator import SnapshotCoordinator
+from resticlvm.orchestration.state import state_dir
+from resticlvm.orchestration.terminal import preserved_terminal
+from resticlvm.orchestration.units import format_bytes, parse_size_bytes
+
+DEFAULT_COMPRESSIONS = ("auto", "max", "off")
+DEFAULT_PACK_SIZES = (16, 64)
+DEFAULT_READ_CONCURRENCIES = (2, 4, 8)
+DEFAULT_CONNECTIONS = (2, 5, 10)
+PREFERENCES = ("balanced", "speed", "size")
+
+# "balanced" picks the fastest trial within this factor of the smallest.
+_BALANCED_SIZE_SLACK = 1.10
+
+# Never sampled when tuning a whole root filesystem.
+_ROOT_SKIP_DIRS = ("proc", "sys", "dev", "run", "tmp")
+
+
+@dataclass(frozen=True)
+class Trial:
+    """One combination of settings to measure."""
+
+    compression: str
+    pack_size: int
+    read_concurrency: int
+    connections: int | None = None
+
+    def profile(self, backend: str | None = None) -> PerformanceProfile:
+        connections = {}
+        if backend is not None and self.connections is not None:
+            connections[backend] = self.connections
+        return PerformanceProfile(
+            compression=self.compression,
+            pack_size=self.pack_size,
+            read_concurrency=self.read_concurrency,
+            connections=connections,
+        )
+
+
+@dataclass
+class TrialResult:
+    """What one trial backup measured."""
+
+    trial: Trial
+    target: str
+    seconds: float
+    bytes_read: int
+    stored_bytes: int | None
+    cpu_seconds: float
+    max_rss_kib: int
+
+    @property
+    def throughput(self) -> float:
+        """Bytes of sample backed up per second."""
+        return self.bytes_read / self.seconds if self.seconds > 0 else 0.0
+
+
+def trial_grid(
+    compressions=DEFAULT_COMPRESSIONS,
+    pack_sizes=DEFAULT_PACK_SIZES,
+    read_concurrencies=DEFAULT_READ_CONCURRENCIES,
+) -> list[Trial]:
+    """Every combination, ordered by how many settings differ from the first.
+
+    The first value of each setting is the baseline; trials that vary one
+    setting at a time come before combinations.
+    """
+    baseline = (compressions[0], pack_sizes[0], read_concurrencies[0])
+    combos = itertools.product(compressions, pack_sizes, read_concurrencies)
+    ordered = sorted(
+        combos, key=lambda c: sum(a != b for a, b in zip(c, baseline))
+    )
+    return [Trial(*c) for c in ordered]
+
+
+def _sample_key(path: str) -> bytes:
+    return hashlib.blake2b(path.encode(), digest_size=8).digest()
+
+
+def sample_files(
+    root: str,
+    sample_bytes: int,
+    exclude: set[str] = frozenset(),
+    max_scanned: int = 200_000,
+) -> tuple[list[str], int]:
+    """Pick regular files under ``root`` totalling about ``sample_bytes``.
+
+    At most ``max_scanned`` files are considered. Directories listed in
+    ``exclude`` (host paths) are skipped.
+
+    Returns:
+        tuple[list[str], int]: The sampled paths and their total size.
+    """
+    root = os.path.abspath(root)
+    skip = {os.path.normpath(p) for p in exclude}
+    candidates = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [
+            d for d in dirnames if os.path.join(dirpath, d) not in skip
+        ]
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            try:
+                st = os.lstat(path)
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode) and st.st_size > 0:
+                candidates.append((path, st.st_size))
+        if len(candidates) >= max_scanned:
+            break
+
+    candidates.sort(key=lambda c: _sample_key(c[0]))
+    picked, total = [], 0
+    for path, size in candidates:
+        if total >= sample_bytes:
+            break
+        picked.append(path)
+        total += size
+    return picked, total
+
+
+def choose_best(
+    results: list[TrialResult], prefer: str = "balanced"
+) -> TrialResult | None:
+    """Pick the winning trial.
+
+    ``speed`` takes the highest throughput and ``size`` the smallest stored
+    size. ``balanced`` takes the fastest trial whose stored size is within
+    10% of the smallest.
+    """
+    if not results:
+        return None
+    if prefer == "speed":
+        return max(results, key=lambda r: r.throughput)
+    sized = [r for r in results if r.stored_bytes is not None] or results
+    smallest = min(r.stored_bytes or 0 for r in sized)
+    if prefer == "size":
+        return min(sized, key=lambda r: (r.stored_bytes or 0, -r.throughput))
+    within = [
+        r for r in sized
+        if (r.stored_bytes or 0) <= smallest * _BALANCED_SIZE_SLACK
+    ]
+    return max(within, key=lambda r: r.throughput)
+
+
+def profile_snippet(
+    volume: str,
+    best: TrialResult,
+    connections: dict[str, int],
+    sample_bytes: int,
+) -> str:
+    """Render the winning settings as a ``[performance_profile]`` section."""
+    stored = (
+        format_bytes(best.stored_bytes) if best.stored_bytes is not None
+        else "unknown"
+    )
+    lines = [
+        f"# Suggested by `rlvm tune` for volume '{volume}' on "
+        f"{datetime.now():%Y-%m-%d}: {format_bytes(int(best.throughput))}/s, "
+        f"{stored} stored for a {format_bytes(sample_bytes)} sample.",
+        f"# Reference it with performance_profile = \"{volume}-tuned\".",
+        f"[performance_profile.{volume}-tuned]",
+        f"compression = \"{best.trial.compression}\"",
+        f"pack_size = {best.trial.pack_size}",
+        f"read_concurrency = {best.trial.read_concurrency}",
+    ]
+    if connections:
+        pairs = ", ".join(f"{k} = {v}" for k, v in sorted(connections.items()))
+        lines.append(f"connections = {{ {pairs} }}")
+    return "\n".join(lines) + "\n"
+
+
+def _run_measured(cmd: list[str], env: dict) -> tuple[int, float, object, str]:
+    """Run ``cmd``; return (exit code, seconds, rusage, stderr tail)."""
+    with tempfile.TemporaryFile(mode="w+") as err:
+        started = time.monotonic()
+        proc = subprocess.Popen(
+            cmd, stdout=subprocess.DEVNULL, stderr=err, env=env
+        )
+        # wait4 gives this child's own CPU time and peak RSS.
+        _, status, usage = os.wait4(proc.pid, 0)
+        seconds = time.monotonic() - started
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        err.seek(0)
+        tail = "".join(err.readlines()[-5:])
+    return proc.returncode, seconds, usage, tail
+
+
+class TrialRunner:
+    """Runs trial backups of a fixed file sample."""
+
+    def __init__(self, files_from: Path, sample_bytes: int, env: dict):
+        self._files_from = files_from
+        self._sample_bytes = sample_bytes
+        self._env = env
+        self._password_file = files_from.parent / "password"
+        self._password_file.write_text(secrets.token_hex(16))
+        self._password_file.chmod(0o600)
+
+    def _restic(self, repo: str, *args: str) -> list[str]:
+        return [
+            "restic", "-r", repo,
+            "--password-file", str(self._password_file), *args,
+        ]
+
+    def _stored_bytes(self, repo: str) -> int | None:
+        try:
+            result = subprocess.run(
+                self._restic(repo, "stats", "--mode", "raw-data", "--json"),
+                capture_output=True, text=True, check=True, env=self._env,
+            )
+            return int(json.loads(result.stdout)["total_size"])
+        except (subprocess.CalledProcessError, ValueError, KeyError):
+            return None
+
+    def run(self, trial: Trial, repo: str) -> TrialResult | None:
+        """Initialise ``repo`` and back the sample up into it once."""
+        init = subprocess.run(
+            self._restic(repo, "init"),
+            capture_output=True, text=True, env=self._env,
+        )
+        if init.returncode != 0:
+            print(f"❌ Could not create scratch repository {repo}: "
+                  f"{init.stderr.strip()}")
+            return None
+
+        options = restic_options(
+            trial.profile(backend_of(repo)), repo, command="backup"
+        )
+        cmd = self._restic(
+            repo, *options, "backup", "--quiet",
+            "--files-from-verbatim", str(self._files_from),
+        )
+        code, seconds, usage, err = _run_measured(cmd, self._env)
+        if code != 0:
+            print(f"❌ Trial backup failed ({_describe(trial)}): {err.strip()}")
+            return None
+
+        return TrialResult(
+            trial=trial,
+            target=repo,
+            seconds=seconds,
+            bytes_read=self._sample_bytes,
+            stored_bytes=self._stored_bytes(repo),
+            cpu_seconds=usage.ru_utime + usage.ru_stime,
+            max_rss_kib=usage.ru_maxrss,
+        )
+
+
+def _describe(trial: Trial) -> str:
+    text = (
+        f"compression={trial.compression} pack_size={trial.pack_size} "
+        f"read_concurrency={trial.read_concurrency}"
+    )
+    if trial.connections is not None:
+        text += f" connections={trial.connections}"
+    return text
+
+
+def _print_results(title: str, results: list[TrialResult]) -> None:
+    print(f"\n📊 {title}")
+    print(f"  {'compression':<11} {'pack':>4} {'read':>4} {'conn':>4} "
+          f"{'time':>7} {'rate':>9} {'cpu':>7} {'rss':>7} {'stored':>8}")
+    for r in results:
+        t = r.trial
+        stored = format_bytes(r.stored_bytes) if r.stored_bytes is not None else "?"
+        print(
+            f"  {t.compression:<11} {t.pack_size:>4} {t.read_concurrency:>4} "
+            f"{t.connections if t.connections is not None else '-':>4} "
+            f"{r.seconds:>6.1f}s {format_bytes(int(r.throughput)) + '/s':>9} "
+            f"{r.cpu_seconds:>6.1f}s "
+            f"{format_bytes(r.max_rss_kib * 1024):>7} {stored:>8}"
+        )
+
+
+class _Budget:
+    """Wall-clock budget; a trial only starts if the last one would fit."""
+
+    def __init__(self, seconds: float):
+        self._deadline = time.monotonic() + seconds
+        self._last = 0.0
+
+    def allows_another(self) -> bool:
+        return time.monotonic() + self._last <= self._deadline
+
+    def record(self, seconds: float) -> None:
+        self._last = max(self._last, seconds)
+
+
+def _host_path(
+    vol: VolumeConfig, mount: str | None, path: str, lv_mount: str | None = None
+) -> str | None:
+    """Where ``path`` (as a backup sees it) lives on the host during tuning.
+
+    ``mount`` is the snapshot's mount point. For lv_nonroot volumes,
+    ``lv_mount`` is where the LV itself is mounted; the backup source may be
+    a directory below it. It defaults to ``backup_source_path``.
+    """
+    if vol.volume_type == VolumeType.STANDARD_PATH:
+        return path
+    if vol.volume_type == VolumeType.LV_ROOT:
+        return os.path.join(mount, path.lstrip("/"))
+    base = (lv_mount or vol.backup_source_path).rstrip("/")
+    if path == base or path.startswith(base + "/"):
+        return mount + path[len(base):]
+    return None
+
+
+def _backup_env(vol: VolumeConfig) -> dict:
+    env = os.environ.copy()
+    env.setdefault("SSH_AUTH_SOCK", "/root/.ssh/ssh-agent.sock")
+    if any(repo_uses_b2(r.repo_path) for r in vol.repositories):
+        try:
+            load_b2_credentials(env)
+        except B2CredentialsError as e:
+            print(f"⚠️  B2 credentials unavailable, skipping B2 trials: {e}")
+    return env
+
+
+def tune_volume(
+    name: str,
+    vol: VolumeConfig,
+    mount: str | None,
+    sample_bytes: int,
+    budget_s: float,
+    backends: bool,
+    prefer: str,
+    scratch_root: str | None = None,
+    lv_mount: str | None = None,
+) -> str | None:
+    """Sample the volume at ``mount`` (None = in place) and run the trials.
+
+    ``lv_mount`` is the live mount point of an lv_nonroot volume's LV.
+
+    Returns:
+        str | None: The suggested profile snippet, or None if no trial ran.
+    """
+    budget = _Budget(budget_s)
+    root = _host_path(vol, mount, vol.backup_source_path, lv_mount)
+    exclude_paths = list(vol.exclude_paths)
+    if vol.backup_source_path == "/":
+        exclude_paths += [f"/{d}" for d in _ROOT_SKIP_DIRS]
+    exclude = {
+        p for p in (_host_path(vol, mount, e, lv_mount) for e in exclude_paths)
+        if p
+    }
+    print(f"🔎 Sampling about {format_bytes(sample_bytes)} from {root}...")
+    files, total = sample_files(root, sample_bytes, exclude)
+    if not files:
+        print(f"❌ No files to sample under {root}.")
+        return None
+    print(f"   {len(files)} file(s), {format_bytes(total)}.")
+
+    env = _backup_env(vol)
+    work = Path(tempfile.mkdtemp(prefix="rlvm-tune-", dir=scratch_root))
+    try:
+        files_from = work / "files.txt"
+        files_from.write_text("".join(f"{f}\n" for f in files))
+        runner = TrialRunner(files_from, total, env)
+
+        local_results = []
+        seen_options = set()
+        grid = trial_grid()
+        for i, trial in enumerate(grid, 1):
+            key = tuple(restic_options(trial.profile(), "local"))
+            if key in seen_options:
+                continue  # collapsed by the installed restic's features
+            seen_options.add(key)
+            if not budget.allows_another():
+                print(f"⏱️  Time budget reached after {len(local_results)} "
+                      f"of {len(grid)} local trial(s).")
+                break
+            print(f"▶️  Local trial {i}/{len(grid)}: {_describe(trial)}")
+            repo = work / f"repo-{i}"
+            result = runner.run(trial, str(repo))
+            shutil.rmtree(repo, ignore_errors=True)
+            if result is not None:
+                budget.record(result.seconds)
+                local_results.append(result)
+
+        best = choose_best(local_results, prefer)
+        if best is None:
+            print("❌ No trial completed.")
+            return None
+        _print_results("Local trials", local_results)
+
+        connections = {}
+        if backends:
+            connections = _tune_backends(vol, runner, best.trial, budget, env)
+
+        return profile_snippet(name, best, connections, total)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def _tune_backends(
+    vol, runner, best_local: Trial, budget, env: dict
+) -> dict[str, int]:
+    """Try connection counts against each remote backend of the volume.
+
+    Scratch repositories are removed afterwards where the backend allows
+    (see remove_scratch); the others are listed.
+    """
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    leftovers = []
+    connections = {}
+    remotes = {}
+    for repo in vol.repositories:
+        backend = backend_of(repo.repo_path)
+        if backend != "local":
+            remotes.setdefault(backend, str(repo.repo_path).rstrip("/"))
+
+    for backend, repo_path in remotes.items():
+        results = []
+        for n in DEFAULT_CONNECTIONS:
+            if not budget.allows_another():
+                print("⏱️  Time budget reached; stopping backend trials.")
+                break
+            trial = Trial(
+                best_local.compression, best_local.pack_size,
+                best_local.read_concurrency, connections=n,
+            )
+            scratch = f"{repo_path}-rlvm-tune-{stamp}-{n}"
+            print(f"▶️  {backend} trial: {_describe(trial)} → {scratch}")
+            leftovers.append(scratch)
+            result = runner.run(trial, scratch)
+            if result is not None:
+                budget.record(result.seconds)
+                results.append(result)
+        if results:
+            _print_results(f"{backend} trials", results)
+            connections[backend] = choose_best(
+                results, "speed"
+            ).trial.connections
+
+    leftovers = [p for p in leftovers if not remove_scratch(p, env)]
+    if leftovers:
+        print("\n🧹 Scratch repositories were left on remote backends; "
+              "remove them when done:")
+        for path in leftovers:
+            print(f"  {path}")
+    return connections
+
+
+def remove_scratch(repo_path: str, env: dict) -> bool:
+    """Delete a scratch repository on an sftp or rclone backend.
+
+    Returns:
+        bool: True if it was removed. Other backends (s3, b2, rest, ...)
+        are left for the user.
+    """
+    if "-rlvm-tune-" not in repo_path:
+        return False
+    backend = backend_of(repo_path)
+    rest = repo_path[len(backend) + 1:]
+    if backend == "sftp" and not rest.startswith("//"):
+        host, _, path = rest.partition(":")
+        cmd = ["ssh", host, f"rm -rf -- {shlex.quote(path)}"]
+    elif backend == "rclone":
+        cmd = ["rclone", "purge", rest]
+    else:
+        return False
+    with preserved_terminal():
+        result = subprocess.run(cmd, capture_output=True, text=True, env=env)
+    return result.returncode == 0
+
+
+def run(args):
+    """Execute ``rlvm tune`` from pre-parsed arguments."""
+    if not args.name:
+        sys.exit("rlvm tune: --name is required")
+    if args.prefer not in PREFERENCES:
+        sys.exit(f"rlvm tune: --prefer must be one of {', '.join(PREFERENCES)}")
+    try:
+        sample_bytes = parse_size_bytes(args.sample_size)
+    except ValueError as e:
+        sys.exit(f"rlvm tune: {e}")
+
+    plan = BackupPlan(Path(args.config))
+    vol = plan.config.volumes.get(args.name)
+    if vol is None:
+        sys.exit(f"rlvm tune: no volume named '{args.name}' in {args.config}")
+    if vol.volume_type == VolumeType.COMMAND:
+        sys.exit(f"rlvm tune: '{args.name}' is a command volume; only file "
+                 f"trees can be sampled")
+
+    if args.dry_run:
+        print(f"[DRY RUN] Would sample {format_bytes(sample_bytes)} of "
+              f"'{args.name}' and run up to {len(trial_grid())} local "
+              f"trial(s) within {args.budget} minute(s).")
+        return
+
+    tune_args = dict(
+        sample_bytes=sample_bytes,
+        budget_s=args.budget * 60,
+        backends=args.backends,
+        prefer=args.prefer,
+        scratch_root=args.scratch_dir,
+    )
+    if vol.volume_type == VolumeType.STANDARD_PATH:
+        snippet = tune_volume(args.name, vol, None, **tune_args)
+    else:
+        if vol.volume_type == VolumeType.LV_NONROOT:
+            lv_mount = live_mount_point(vol)
+            if lv_mount is None:
+                sys.exit(f"rlvm tune: /dev/{vol.vg_name}/{vol.lv_name} is "
+                         f"not mounted")
+            tune_args["lv_mount"] = lv_mount
+        job = next(j for j in plan.backup_jobs if j.name == args.name)
+        settings = plan.snapshot_settings
+        with SnapshotCoordinator(
+            [job],
+            min_vg_free_after_snapshots=settings.min_vg_free_after_snapshots,
+            snapshot_cow_warn_percent=settings.snapshot_cow_warn_percent,
+            mount_profile=settings.mount_profile,
+            snapshot_readonly_lv=settings.snapshot_readonly_lv,
+            separate_cow_pv=settings.separate_cow_pv,
+        ) as coord:
+            coord.create_all()
+            snippet = tune_volume(
+                args.name, vol, coord.get_mount_point(args.name), **tune_args
+            )
+
+    if snippet is None:
+        sys.exit(1)
+    output = (
+        Path(args.output) if args.output
+        else state_dir() / f"tune-{args.name}.toml"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(snippet)
+    print(f"\n✅ Suggested profile (saved to {output}):\n")
+    print(snippet)
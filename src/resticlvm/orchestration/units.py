@@ -0,0 +1,27 @@
+"""Byte-size parsing and formatting shared by the orchestration modules."""
+
+import re
+
+_SIZE_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*([KMGTP]?)(?:i?B)?$", re.IGNORECASE)
+_MULTIPLIERS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4, "P": 1024**5}
+
+
+def parse_size_bytes(size_str: str) -> int:
+    """Parse an LVM/restic-style size ("30G", "512M", "1.5 GiB") into bytes.
+
+    Raises:
+        ValueError: If the string is not a recognised size.
+    """
+    m = _SIZE_RE.match(size_str.strip())
+    if not m:
+        raise ValueError(f"Cannot parse size: {size_str!r}")
+    return int(float(m.group(1)) * _MULTIPLIERS[m.group(2).upper()])
+
+
+def format_bytes(n: int) -> str:
+    """Format a byte count compactly ("512M", "1.5G")."""
+    for unit in ("B", "K", "M", "G", "T"):
+        if abs(n) < 1024:
+            return f"{n:.1f}{unit}" if n != int(n) else f"{n}{unit}"
+        n /= 1024
+    return f"{n:.1f}P"
@@ -0,0 +1,208 @@
+#!/bin/bash
+
+# Back up the output of a command (e.g. a database dump) using Restic, without
+# writing it to disk first.
+#
+# Arguments:
+#   -c  Shell command whose stdout is backed up (run with `sh -c`).
+#   -f  File name the stream is stored under in the snapshot.
+#   -r  Path to the Restic repository.
+#   -p  Path to the Restic password file.
+#   --fan-out true|false
+#       false (default): each repository runs the command itself through
+#         `restic backup --stdin-from-command`; restic discards the snapshot
+#         if the command exits non-zero.
+#       true: the command runs once and its output is streamed to every
+#         repository (`restic backup --stdin`). If the command exits non-zero,
+#         the snapshots it produced are forgotten again.
+#   --repo-opts OPTS, --repo-env VARS
+#       (Optional) Extra restic options and Go runtime variables for the
+#       repository at the same position (performance profiles).
+#   --report FILE  (Optional) Append "repo<TAB>seconds<TAB>bytes" per
+#                  successful repository.
+#   --dry-run  (Optional) Show actions without executing them.
+#
+# Usage:
+#   This script is intended to be called internally by the ResticLVM tool.
+#
+# Requirements:
+#   - Must be run with root privileges (direct root or via sudo).
+#   - Restic must be installed and available in PATH (0.17+ unless fan-out).
+#
+# Exit codes:
+#   0  Success
+#   1  Any fatal error
+
+set -euo pipefail
+
+# shellcheck disable=SC1091
+source "$(dirname "$0")/backup_helpers.sh"
+
+# ─── Require Running as Root ─────────────────────────────────────
+root_check
+
+# ─── Default Values ──────────────────────────────────────────────
+STREAM_COMMAND=""
+STDIN_FILENAME=""
+RESTIC_REPOS=()
+RESTIC_PASSWORD_FILES=()
+RESTIC_REPO_OPTS=()
+RESTIC_REPO_ENVS=()
+RESTIC_REPO_PARENTS=()
+FAN_OUT=false
+REPORT_FILE="/dev/null"
+DRY_RUN=false
+
+# ─── Parse and Validate Arguments ─────────────────────────────────
+parse_arguments usage_command "command stdin-filename fan-out restic-repo password-file dry-run" "$@"
+
+validate_args usage_command STREAM_COMMAND STDIN_FILENAME
+
+if [ ${#RESTIC_REPOS[@]} -eq 0 ]; then
+    echo "❌ Error: At least one --restic-repo is required"
+    usage_command
+fi
+
+if [ ${#RESTIC_REPOS[@]} -ne ${#RESTIC_PASSWORD_FILES[@]} ]; then
+    echo "❌ Error: Number of repos (${#RESTIC_REPOS[@]}) must match number of password files (${#RESTIC_PASSWORD_FILES[@]})"
+    usage_command
+fi
+
+validate_repo_options usage_command
+
+# ─── Display Configuration ───────────────────────────────────────
+display_config "Command Backup Configuration" \
+    STREAM_COMMAND STDIN_FILENAME FAN_OUT DRY_RUN
+
+echo "Repositories: ${#RESTIC_REPOS[@]}"
+for i in "${!RESTIC_REPOS[@]}"; do
+    echo "  $((i+1)). ${RESTIC_REPOS[$i]}"
+done
+
+display_dry_run_message "$DRY_RUN"
+
+QUOTED_FILENAME=$(printf '%q' "$STDIN_FILENAME")
+QUOTED_COMMAND=$(printf '%q' "$STREAM_COMMAND")
+# Tags this run's snapshots so a failed fan-out can find and forget them.
+RUN_TAG="rlvm-run:$(date +%Y%m%d_%H%M%S)-$$"
+
+# Base restic command for repository $1.
+restic_base() {
+    local i="$1"
+    local env="${RESTIC_REPO_ENVS[$i]:-}"
+    echo "${env:+$env }restic -r ${RESTIC_REPOS[$i]} --password-file=${RESTIC_PASSWORD_FILES[$i]}"
+}
+
+elapsed_since() {
+    awk -v s="$1" -v e="$EPOCHREALTIME" 'BEGIN { printf "%.3f", e - s }'
+}
+
+# Forget every snapshot this run wrote to repository $1.
+forget_run_snapshots() {
+    local i="$1"
+    local ids
+    ids=$(eval "$(restic_base "$i") snapshots --tag $RUN_TAG --json" |
+        grep -o '"id":"[0-9a-f]*"' | cut -d'"' -f4) || true
+    if [ -n "$ids" ]; then
+        # shellcheck disable=SC2086
+        eval "$(restic_base "$i") forget $ids" || true
+    fi
+}
+
+FAILED_REPOS=()
+
+# ─── Per-Repository Mode ──────────────────────────────────────────
+run_per_repo() {
+    local i start log bytes
+    log=$(mktemp)
+    for i in "${!RESTIC_REPOS[@]}"; do
+        echo ""
+        echo "▶️  Repository $((i+1))/${#RESTIC_REPOS[@]}: ${RESTIC_REPOS[$i]}"
+
+        local cmd
+        cmd="$(restic_base "$i") backup ${RESTIC_REPO_OPTS[$i]:-}"
+        cmd+=" --tag $RUN_TAG --stdin-from-command"
+        cmd+=" --stdin-filename $QUOTED_FILENAME -- sh -c $QUOTED_COMMAND"
+
+        start=$EPOCHREALTIME
+        if run_or_echo "$DRY_RUN" "$cmd" | tee "$log"; then
+            bytes=$(sed -n 's/^processed [0-9]* files\{0,1\}, \(.*\) in .*/\1/p' "$log")
+            printf '%s\t%s\t%s\n' "${RESTIC_REPOS[$i]}" "$(elapsed_since "$start")" \
+                "${bytes:-0}" >>"$REPORT_FILE"
+            echo "✅ Repository backup succeeded: ${RESTIC_REPOS[$i]}"
+        else
+            echo "❌ Repository backup failed: ${RESTIC_REPOS[$i]}"
+            FAILED_REPOS+=("${RESTIC_REPOS[$i]}")
+        fi
+        restore_terminal_foreground
+    done
+    rm -f "$log"
+}
+
+# ─── Fan-Out Mode ─────────────────────────────────────────────────
+run_fan_out() {
+    local i work start cmd_status bytes
+    local pids=() fifos=() statuses=()
+
+    if [ "$DRY_RUN" = true ]; then
+        echo -e "${DRY_RUN_PREFIX} sh -c $QUOTED_COMMAND | tee to ${#RESTIC_REPOS[@]} repository(ies):"
+        for i in "${!RESTIC_REPOS[@]}"; do
+            echo -e "${DRY_RUN_PREFIX}   $(restic_base "$i") backup ${RESTIC_REPO_OPTS[$i]:-} --tag $RUN_TAG --stdin --stdin-filename $QUOTED_FILENAME"
+        done
+        return 0
+    fi
+
+    work=$(mktemp -d)
+    for i in "${!RESTIC_REPOS[@]}"; do
+        mkfifo "$work/in$i"
+        fifos+=("$work/in$i")
+        (
+            eval "$(restic_base "$i") backup ${RESTIC_REPO_OPTS[$i]:-}" \
+                "--tag $RUN_TAG --stdin --stdin-filename $QUOTED_FILENAME" \
+                <"$work/in$i"
+        ) >"$work/out$i" 2>&1 &
+        pids+=($!)
+    done
+
+    echo "🚀 Streaming command output to ${#RESTIC_REPOS[@]} repository(ies)..."
+    start=$EPOCHREALTIME
+    # tee -p keeps feeding the other repositories if one restic exits early.
+    set +e
+    sh -c "$STREAM_COMMAND" | tee -p "${fifos[@]}" | wc -c >"$work/bytes"
+    cmd_status=${PIPESTATUS[0]}
+    for i in "${!pids[@]}"; do
+        wait "${pids[$i]}"
+        statuses+=($?)
+    done
+    set -e
+    bytes=$(cat "$work/bytes")
+
+    for i in "${!RESTIC_REPOS[@]}"; do
+        echo ""
+        echo "▶️  Repository $((i+1))/${#RESTIC_REPOS[@]}: ${RESTIC_REPOS[$i]}"
+        cat "$work/out$i"
+        if [ "$cmd_status" -ne 0 ]; then
+            [ "${statuses[$i]}" -eq 0 ] && forget_run_snapshots "$i"
+            echo "❌ Command exited with status $cmd_status; snapshot discarded: ${RESTIC_REPOS[$i]}"
+            FAILED_REPOS+=("${RESTIC_REPOS[$i]}")
+        elif [ "${statuses[$i]}" -ne 0 ]; then
+            echo "❌ Repository backup failed: ${RESTIC_REPOS[$i]}"
+            FAILED_REPOS+=("${RESTIC_REPOS[$i]}")
+        else
+            printf '%s\t%s\t%s\n' "${RESTIC_REPOS[$i]}" "$(elapsed_since "$start")" \
+                "$bytes" >>"$REPORT_FILE"
+            echo "✅ Repository backup succeeded: ${RESTIC_REPOS[$i]}"
+        fi
+    done
+    rm -rf "$work"
+    restore_terminal_foreground
+}
+
+if [ "$FAN_OUT" = true ]; then
+    run_fan_out
+else
+    run_per_repo
+fi
+
+# ─── Done ─────────────────────────────────────────────────────────
+report_repo_outcomes "${#RESTIC_REPOS[@]}" ${FAILED_REPOS[@]+"${FAILED_REPOS[@]}"} || exit 1
@@ -0,0 +1,194 @@
+#!/bin/bash
+
+# Back up several volumes that share the same repositories with a single
+# restic invocation per repository, so each repository's index is loaded and
+# a snapshot written once for the whole group.
+#
+# Arguments:
+#   --group-source  Path to back up (repeatable, one per grouped volume).
+#   --snapshot-bind VG/LV:MOUNT
+#                   (Optional, repeatable) Pre-mounted snapshot of an
+#                   lv_nonroot volume (batch mode). It is bind-mounted over
+#                   the LV's real mount point inside a private mount
+#                   namespace, as backup_lv_nonroot.sh does.
+#   --tag TAG       (Optional, repeatable) Extra snapshot tag (vol:<name>).
+#   -r  Path to the Restic repository.
+#   -p  Path to the Restic password file.
+#   --exclude-dir  (Optional) Generated exclusion directory holding every
+#                  member's exclusions; see lib/exclusions.sh.
+#   --exclude-caches, --exclude-if-present NAME, --exclude-larger-than SIZE
+#                  (Optional) Passed through to restic.
+#   --repo-opts OPTS, --repo-env VARS
+#                  (Optional) Extra restic options and Go runtime variables
+#                  for the repository at the same position.
+#   --repo-parent ID
+#                  (Optional) Recorded parent snapshot for the repository at
+#                  the same position, passed as --parent (see parents.py).
+#   --report FILE  (Optional) Append "repo<TAB>snapshot<TAB>parent used<TAB>
+#                  start time" per successful repository.
+#   --dry-run  (Optional) Show actions without executing them.
+#
+# Usage:
+#   This script is intended to be called internally by the ResticLVM tool.
+#
+# Requirements:
+#   - Must be run with root privileges (direct root or via sudo).
+#   - Restic must be installed and available in PATH.
+#
+# Exit codes:
+#   0  Success
+#   1  Any fatal error
+
+set -euo pipefail
+
+# shellcheck disable=SC1091
+source "$(dirname "$0")/backup_helpers.sh"
+
+# ─── Require Running as Root ─────────────────────────────────────
+root_check
+
+# ─── Default Values ──────────────────────────────────────────────
+BACKUP_SOURCES=()
+SNAPSHOT_BINDS=()
+RESTIC_EXTRA_TAGS=()
+RESTIC_REPOS=()
+RESTIC_PASSWORD_FILES=()
+RESTIC_REPO_OPTS=()
+RESTIC_REPO_ENVS=()
+RESTIC_REPO_PARENTS=()
+EXCLUDE_PATHS=""
+EXCLUDE_DIR=""
+EXCLUDE_CACHES=false
+EXCLUDE_IF_PRESENT=()
+EXCLUDE_LARGER_THAN=""
+REPORT_FILE="/dev/null"
+DRY_RUN=false
+
+# ─── Parse and Validate Arguments ─────────────────────────────────
+parse_arguments usage_group "group-source snapshot-bind tag restic-repo password-file dry-run" "$@"
+
+if [ ${#BACKUP_SOURCES[@]} -eq 0 ]; then
+    echo "❌ Error: At least one --group-source is required"
+    usage_group
+fi
+
+if [ ${#RESTIC_REPOS[@]} -eq 0 ]; then
+    echo "❌ Error: At least one --restic-repo is required"
+    usage_group
+fi
+
+if [ ${#RESTIC_REPOS[@]} -ne ${#RESTIC_PASSWORD_FILES[@]} ]; then
+    echo "❌ Error: Number of repos (${#RESTIC_REPOS[@]}) must match number of password files (${#RESTIC_PASSWORD_FILES[@]})"
+    usage_group
+fi
+
+validate_repo_options usage_group
+
+# ─── Pre-checks ───────────────────────────────────────────────────
+# Resolve each snapshot's LV mount point; sources are checked against the
+# live tree, which the snapshots are bind-mounted over.
+BIND_CMDS=()
+BIND_SNAPSHOTS=()
+BIND_LV_MOUNTS=()
+for bind in ${SNAPSHOT_BINDS[@]+"${SNAPSHOT_BINDS[@]}"}; do
+    LV_DEVICE_PATH="/dev/${bind%%:*}"
+    SNAPSHOT_MOUNT_POINT="${bind#*:}"
+    check_device_path "$LV_DEVICE_PATH"
+    LV_MOUNT_POINT=$(check_mount_point "$LV_DEVICE_PATH")
+    BIND_CMDS+=("mount --bind $SNAPSHOT_MOUNT_POINT $LV_MOUNT_POINT")
+    BIND_SNAPSHOTS+=("$SNAPSHOT_MOUNT_POINT")
+    BIND_LV_MOUNTS+=("$LV_MOUNT_POINT")
+done
+
+QUOTED_SOURCES=()
+for src in "${BACKUP_SOURCES[@]}"; do
+    check_if_path_exists "$src"
+    QUOTED_SOURCES+=("$(printf '%q' "$src")")
+done
+
+# ─── Display Configuration ───────────────────────────────────────
+display_config "Grouped Backup Configuration" EXCLUDE_DIR DRY_RUN
+
+echo "Sources: ${#BACKUP_SOURCES[@]}"
+for src in "${BACKUP_SOURCES[@]}"; do
+    echo "  - $src"
+done
+for i in "${!BIND_SNAPSHOTS[@]}"; do
+    echo "  snapshot ${BIND_SNAPSHOTS[$i]} → ${BIND_LV_MOUNTS[$i]}"
+done
+
+echo "Repositories: ${#RESTIC_REPOS[@]}"
+for i in "${!RESTIC_REPOS[@]}"; do
+    echo "  $((i+1)). ${RESTIC_REPOS[$i]}"
+    REPO_TUNING="${RESTIC_REPO_ENVS[$i]:-} ${RESTIC_REPO_OPTS[$i]:-}"
+    if [[ -n "${REPO_TUNING// /}" ]]; then
+        echo "     tuning: ${REPO_TUNING# }"
+    fi
+done
+
+display_dry_run_message "$DRY_RUN"
+
+# ─── Build Exclude Arguments (Once) ───────────────────────────────
+EXCLUDE_ARGS=()
+populate_exclusion_args EXCLUDE_ARGS "$EXCLUDE_DIR"
+
+RESTIC_TAGS=()
+populate_restic_tags_from_exclusions RESTIC_TAGS
+for tag in ${RESTIC_EXTRA_TAGS[@]+"${RESTIC_EXTRA_TAGS[@]}"}; do
+    RESTIC_TAGS+=("--tag=$(printf '%q' "$tag")")
+done
+
+if [ ${#BIND_SNAPSHOTS[@]} -eq 0 ]; then
+    report_excluded_bytes "" ""
+else
+    for i in "${!BIND_SNAPSHOTS[@]}"; do
+        report_excluded_bytes "${BIND_SNAPSHOTS[$i]}" "${BIND_LV_MOUNTS[$i]}"
+    done
+fi
+
+# ─── Loop Over Repositories ───────────────────────────────────────
+echo "🚀 Backing up ${#BACKUP_SOURCES[@]} source(s) to ${#RESTIC_REPOS[@]} repository(ies)..."
+
+FAILED_REPOS=()
+for i in "${!RESTIC_REPOS[@]}"; do
+    RESTIC_REPO="${RESTIC_REPOS[$i]}"
+    RESTIC_PASSWORD_FILE="${RESTIC_PASSWORD_FILES[$i]}"
+    REPO_OPTS="${RESTIC_REPO_OPTS[$i]:-}"
+    REPO_ENV="${RESTIC_REPO_ENVS[$i]:-}"
+    REPO_PARENT="${RESTIC_REPO_PARENTS[$i]:-}"
+
+    echo ""
+    echo "▶️  Repository $((i+1))/${#RESTIC_REPOS[@]}: $RESTIC_REPO"
+
+    RESTIC_INNER="${REPO_ENV:+$REPO_ENV }restic -r $RESTIC_REPO"
+    RESTIC_INNER+=" --password-file=$RESTIC_PASSWORD_FILE"
+    RESTIC_INNER+=" backup ${QUOTED_SOURCES[*]}"
+    RESTIC_INNER+=" $REPO_OPTS${REPO_PARENT:+ --parent=$REPO_PARENT}"
+    RESTIC_INNER+=" ${EXCLUDE_ARGS[*]}"
+    RESTIC_INNER+=" ${RESTIC_TAGS[*]}"
+    RESTIC_INNER+=" --verbose"
+
+    if [ ${#BIND_CMDS[@]} -eq 0 ]; then
+        RESTIC_CMD="$RESTIC_INNER"
+    else
+        # Same namespace trick as backup_lv_nonroot.sh: restic records the
+        # LVs' real paths instead of the snapshot mount points.
+        BINDS=$(printf '%s && ' "${BIND_CMDS[@]}")
+        RESTIC_CMD="unshare --mount sh -c '${BINDS}${RESTIC_INNER}'"
+    fi
+
+    # A failure must not prevent the remaining repositories from being
+    # attempted (issue #46).
+    if run_restic_backup "$DRY_RUN" "$RESTIC_REPO" "$REPO_PARENT" "$RESTIC_CMD"; then
+        echo "✅ Repository backup succeeded: $RESTIC_REPO"
+    else
+        echo "❌ Repository backup failed: $RESTIC_REPO"
+        FAILED_REPOS+=("$RESTIC_REPO")
+    fi
+
+    # Restore the terminal's foreground group after remote repos (issue #72).
+    restore_terminal_foreground
+done
+
+# ─── Done ─────────────────────────────────────────────────────────
+report_repo_outcomes "${#RESTIC_REPOS[@]}" ${FAILED_REPOS[@]+"${FAILED_REPOS[@]}"} || exit 1
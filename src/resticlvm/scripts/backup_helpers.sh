@@ -21,6 +21,7 @@
 source "$(dirname "$0")/lib/arg_handlers.sh"
 source "$(dirname "$0")/lib/command_builders.sh"
 source "$(dirname "$0")/lib/command_runners.sh"
+source "$(dirname "$0")/lib/exclusions.sh"
 source "$(dirname "$0")/lib/lv_snapshots.sh"
 source "$(dirname "$0")/lib/message_display.sh"
 source "$(dirname "$0")/lib/mounts.sh"
@@ -11,8 +11,21 @@
 #   -r  Path to the Restic repository.
 #   -p  Path to the Restic password file.
 #   -s  Path to backup source directory inside LV (e.g., "/data").
-#   -e  (Optional) Comma-separated list of paths to exclude.
+#   -e  (Optional) Space-separated list of paths to exclude.
+#   --exclude-dir  (Optional) Generated exclusion directory; see
+#                  lib/exclusions.sh. Patterns use the LV's real paths.
+#   --exclude-caches, --exclude-if-present NAME, --exclude-larger-than SIZE
+#                  (Optional) Passed through to restic.
 #   --snapshot-mount  (Optional) Path to pre-mounted snapshot (batch mode).
+#   --repo-opts OPTS, --repo-env VARS
+#                  (Optional) Extra restic options and Go runtime variables
+#                  for the repository at the same position (performance
+#                  profiles); given once per -r when used.
+#   --repo-parent ID
+#                  (Optional) Recorded parent snapshot for the repository at
+#                  the same position, passed as --parent (see parents.py).
+#   --report FILE  (Optional) Append "repo<TAB>snapshot<TAB>parent used<TAB>
+#                  start time" per successful repository.
 #   --dry-run  (Optional) Show actions without executing them.
 #
 # Usage:
@@ -41,8 +54,16 @@ LV_NAME=""
 SNAPSHOT_SIZE=""
 RESTIC_REPOS=()
 RESTIC_PASSWORD_FILES=()
+RESTIC_REPO_OPTS=()
+RESTIC_REPO_ENVS=()
+RESTIC_REPO_PARENTS=()
 BACKUP_SOURCE_PATH=""
 EXCLUDE_PATHS=""
+EXCLUDE_DIR=""
+EXCLUDE_CACHES=false
+EXCLUDE_IF_PRESENT=()
+EXCLUDE_LARGER_THAN=""
+REPORT_FILE="/dev/null"
 DRY_RUN=false
 SNAPSHOT_MOUNT=""
 
@@ -63,6 +84,8 @@ if [ ${#RESTIC_REPOS[@]} -ne ${#RESTIC_PASSWORD_FILES[@]} ]; then
     usage_lv_nonroot
 fi
 
+validate_repo_options usage_lv_nonroot
+
 # ─── Snapshot Mode ────────────────────────────────────────────────
 # When --snapshot-mount is provided, use a pre-mounted snapshot managed by the
 # Python SnapshotCoordinator (batch mode, issue #84). Otherwise, create and
@@ -91,11 +114,15 @@ fi
 # ─── Display Configuration ───────────────────────────────────────
 display_config "LVM Snapshot Backup Configuration" \
     VG_NAME LV_NAME SNAPSHOT_SIZE SNAPSHOT_MOUNT_POINT \
-    EXCLUDE_PATHS BACKUP_SOURCE_PATH DRY_RUN
+    EXCLUDE_PATHS EXCLUDE_DIR BACKUP_SOURCE_PATH DRY_RUN
 
 echo "Repositories: ${#RESTIC_REPOS[@]}"
 for i in "${!RESTIC_REPOS[@]}"; do
     echo "  $((i+1)). ${RESTIC_REPOS[$i]}"
+    REPO_TUNING="${RESTIC_REPO_ENVS[$i]:-} ${RESTIC_REPO_OPTS[$i]:-}"
+    if [[ -n "${REPO_TUNING// /}" ]]; then
+        echo "     tuning: ${REPO_TUNING# }"
+    fi
 done
 
 display_dry_run_message "$DRY_RUN"
@@ -113,8 +140,15 @@ fi
 EXCLUDE_ARGS=()
 populate_exclude_paths EXCLUDE_ARGS "$EXCLUDE_PATHS"
 
+# restic runs with the snapshot bind-mounted over the LV's real mount point,
+# so the exclusion files and their patterns need no translation.
+populate_exclusion_args EXCLUDE_ARGS "$EXCLUDE_DIR"
+
 RESTIC_TAGS=()
 populate_restic_tags RESTIC_TAGS "$EXCLUDE_PATHS"
+populate_restic_tags_from_exclusions RESTIC_TAGS
+
+report_excluded_bytes "$SNAPSHOT_MOUNT_POINT" "$LV_MOUNT_POINT"
 
 # ─── Loop Over Repositories ───────────────────────────────────────
 echo "🚀 Backing up to ${#RESTIC_REPOS[@]} repository(ies)..."
@@ -123,6 +157,9 @@ FAILED_REPOS=()
 for i in "${!RESTIC_REPOS[@]}"; do
     RESTIC_REPO="${RESTIC_REPOS[$i]}"
     RESTIC_PASSWORD_FILE="${RESTIC_PASSWORD_FILES[$i]}"
+    REPO_OPTS="${RESTIC_REPO_OPTS[$i]:-}"
+    REPO_ENV="${RESTIC_REPO_ENVS[$i]:-}"
+    REPO_PARENT="${RESTIC_REPO_PARENTS[$i]:-}"
 
     echo ""
     echo "▶️  Repository $((i+1))/${#RESTIC_REPOS[@]}: $RESTIC_REPO"
@@ -131,9 +168,10 @@ for i in "${!RESTIC_REPOS[@]}"; do
     # the snapshot over the original LV mount point — restic then records the
     # real source path (e.g. /data/git) instead of the temp mount path.
     RESTIC_INNER="mount --bind $SNAPSHOT_MOUNT_POINT $LV_MOUNT_POINT"
-    RESTIC_INNER+=" && restic -r $RESTIC_REPO"
+    RESTIC_INNER+=" && ${REPO_ENV:+$REPO_ENV }restic -r $RESTIC_REPO"
     RESTIC_INNER+=" --password-file=$RESTIC_PASSWORD_FILE"
     RESTIC_INNER+=" backup $BACKUP_SOURCE_PATH"
+    RESTIC_INNER+=" $REPO_OPTS${REPO_PARENT:+ --parent=$REPO_PARENT}"
     RESTIC_INNER+=" ${EXCLUDE_ARGS[*]}"
     RESTIC_INNER+=" ${RESTIC_TAGS[*]}"
     RESTIC_INNER+=" --verbose"
@@ -142,7 +180,7 @@ for i in "${!RESTIC_REPOS[@]}"; do
 
     # Execute backup for this repo. A failure must not prevent the remaining
     # repositories from being attempted (issue #46).
-    if run_or_echo "$DRY_RUN" "$RESTIC_CMD"; then
+    if run_restic_backup "$DRY_RUN" "$RESTIC_REPO" "$REPO_PARENT" "$RESTIC_CMD"; then
         echo "✅ Repository backup succeeded: $RESTIC_REPO"
     else
         echo "❌ Repository backup failed: $RESTIC_REPO"
@@ -11,8 +11,21 @@
 #   -r  Path to the Restic repository.
 #   -p  Path to the Restic password file.
 #   -s  (Optional) Path to backup source inside LV (default: "/").
-#   -e  (Optional) Comma-separated list of paths to exclude.
+#   -e  (Optional) Space-separated list of paths to exclude.
+#   --exclude-dir  (Optional) Generated exclusion directory; see
+#                  lib/exclusions.sh. It is bind-mounted into the chroot.
+#   --exclude-caches, --exclude-if-present NAME, --exclude-larger-than SIZE
+#                  (Optional) Passed through to restic.
 #   --snapshot-mount  (Optional) Path to pre-mounted snapshot (batch mode).
+#   --repo-opts OPTS, --repo-env VARS
+#                  (Optional) Extra restic options and Go runtime variables
+#                  for the repository at the same position (performance
+#                  profiles); given once per -r when used.
+#   --repo-parent ID
+#                  (Optional) Recorded parent snapshot for the repository at
+#                  the same position, passed as --parent (see parents.py).
+#   --report FILE  (Optional) Append "repo<TAB>snapshot<TAB>parent used<TAB>
+#                  start time" per successful repository.
 #   --dry-run  (Optional) Show actions without executing them.
 #
 # Usage:
@@ -41,16 +54,31 @@ LV_NAME=""
 SNAPSHOT_SIZE=""
 RESTIC_REPOS=()
 RESTIC_PASSWORD_FILES=()
+RESTIC_REPO_OPTS=()
+RESTIC_REPO_ENVS=()
+RESTIC_REPO_PARENTS=()
 BACKUP_SOURCE_PATH="/" # Inside chroot
-EXCLUDE_PATHS="/dev /media /mnt /proc /run /sys /tmp /var/tmp /var/lib/libvirt/images"
+# Applied only when neither -e nor --exclude-dir is given.
+DEFAULT_EXCLUDE_PATHS="/dev /media /mnt /proc /run /sys /tmp /var/tmp /var/lib/libvirt/images"
+EXCLUDE_PATHS=""
+EXCLUDE_DIR=""
+EXCLUDE_CACHES=false
+EXCLUDE_IF_PRESENT=()
+EXCLUDE_LARGER_THAN=""
+REPORT_FILE="/dev/null"
 DRY_RUN=false
 SNAPSHOT_MOUNT=""
 
 CHROOT_REPO_PATH="/.restic_repo"
+CHROOT_EXCLUDE_PATH="/.restic_excludes"
 
 # ─── Parse and Validate Arguments ─────────────────────────────────
 parse_for_lv usage_lv_root "$@"
 
+if [[ -z "$EXCLUDE_PATHS" && -z "$EXCLUDE_DIR" ]]; then
+    EXCLUDE_PATHS="$DEFAULT_EXCLUDE_PATHS"
+fi
+
 # Validate basic LVM args
 validate_args usage_lv_root VG_NAME LV_NAME SNAPSHOT_SIZE
 
@@ -65,6 +93,8 @@ if [ ${#RESTIC_REPOS[@]} -ne ${#RESTIC_PASSWORD_FILES[@]} ]; then
     usage_lv_root
 fi
 
+validate_repo_options usage_lv_root
+
 # ─── Snapshot Mode ────────────────────────────────────────────────
 # When --snapshot-mount is provided, use a pre-mounted snapshot managed by the
 # Python SnapshotCoordinator (batch mode, issue #84). Otherwise, create and
@@ -95,11 +125,15 @@ fi
 # ─── Display Configuration ───────────────────────────────────────
 display_config "LVM Snapshot Backup Configuration" \
     VG_NAME LV_NAME SNAPSHOT_SIZE SNAPSHOT_MOUNT_POINT \
-    EXCLUDE_PATHS BACKUP_SOURCE_PATH DRY_RUN
+    EXCLUDE_PATHS EXCLUDE_DIR BACKUP_SOURCE_PATH DRY_RUN
 
 echo "Repositories: ${#RESTIC_REPOS[@]}"
 for i in "${!RESTIC_REPOS[@]}"; do
     echo "  $((i+1)). ${RESTIC_REPOS[$i]}"
+    REPO_TUNING="${RESTIC_REPO_ENVS[$i]:-} ${RESTIC_REPO_OPTS[$i]:-}"
+    if [[ -n "${REPO_TUNING// /}" ]]; then
+        echo "     tuning: ${REPO_TUNING# }"
+    fi
 done
 
 display_dry_run_message "$DRY_RUN"
@@ -116,14 +150,23 @@ fi
 # ─── Prepare Chroot Environment ───────────────────────────────────
 bind_chroot_essentials_to_mounted_snapshot "$DRY_RUN" "$SNAPSHOT_MOUNT_POINT"
 
+# The exclusion directory lives on the host; make it visible in the chroot.
+if [[ -n "$EXCLUDE_DIR" ]]; then
+    bind_exclude_dir_to_mounted_snapshot "$DRY_RUN" "$SNAPSHOT_MOUNT_POINT" "$EXCLUDE_DIR" "$CHROOT_EXCLUDE_PATH"
+fi
+
 # ─── Build Exclude Arguments (Once) ───────────────────────────────
-EXCLUDE_PATHS="$CHROOT_REPO_PATH $EXCLUDE_PATHS"
+EXCLUDE_PATHS="$CHROOT_REPO_PATH $CHROOT_EXCLUDE_PATH $EXCLUDE_PATHS"
 
 EXCLUDE_ARGS=()
 populate_exclude_paths EXCLUDE_ARGS "$EXCLUDE_PATHS"
+populate_exclusion_args EXCLUDE_ARGS "$CHROOT_EXCLUDE_PATH"
 
 RESTIC_TAGS=()
 populate_restic_tags RESTIC_TAGS "$EXCLUDE_PATHS"
+populate_restic_tags_from_exclusions RESTIC_TAGS
+
+report_excluded_bytes "$SNAPSHOT_MOUNT_POINT" ""
 
 # ─── Loop Over Repositories ───────────────────────────────────────
 echo "🚀 Backing up to ${#RESTIC_REPOS[@]} repository(ies)..."
@@ -132,6 +175,9 @@ FAILED_REPOS=()
 for i in "${!RESTIC_REPOS[@]}"; do
     RESTIC_REPO="${RESTIC_REPOS[$i]}"
     RESTIC_PASSWORD_FILE="${RESTIC_PASSWORD_FILES[$i]}"
+    REPO_OPTS="${RESTIC_REPO_OPTS[$i]:-}"
+    REPO_ENV="${RESTIC_REPO_ENVS[$i]:-}"
+    REPO_PARENT="${RESTIC_REPO_PARENTS[$i]:-}"
 
     echo ""
     echo "▶️  Repository $((i+1))/${#RESTIC_REPOS[@]}: $RESTIC_REPO"
@@ -155,16 +201,17 @@ for i in "${!RESTIC_REPOS[@]}"; do
     fi
 
     # Build Restic command for this repo
-    RESTIC_CMD="export RESTIC_PASSWORD_FILE=$RESTIC_PASSWORD_FILE && restic"
+    RESTIC_CMD="export RESTIC_PASSWORD_FILE=$RESTIC_PASSWORD_FILE && ${REPO_ENV:+$REPO_ENV }restic"
     RESTIC_CMD+=" ${EXCLUDE_ARGS[*]}"
     RESTIC_CMD+=" ${RESTIC_TAGS[*]}"
     RESTIC_CMD+=" -r $EFFECTIVE_REPO"
     RESTIC_CMD+=" backup $BACKUP_SOURCE_PATH"
+    RESTIC_CMD+=" $REPO_OPTS${REPO_PARENT:+ --parent=$REPO_PARENT}"
     RESTIC_CMD+=" --verbose"
 
     # Execute backup for this repo. A failure must not prevent the remaining
     # repositories from being attempted (issue #46).
-    if run_in_chroot_or_echo "$DRY_RUN" "$SNAPSHOT_MOUNT_POINT" "$RESTIC_CMD"; then
+    if run_restic_backup "$DRY_RUN" "$RESTIC_REPO" "$REPO_PARENT" "$RESTIC_CMD" "$SNAPSHOT_MOUNT_POINT"; then
         echo "✅ Repository backup succeeded: $RESTIC_REPO"
     else
         echo "❌ Repository backup failed: $RESTIC_REPO"
@@ -184,6 +231,9 @@ done
 
 # ─── Cleanup ──────────────────────────────────────────────────────
 # Unmount chroot essentials once after all repos are done
+if [[ -n "$EXCLUDE_DIR" ]]; then
+    run_or_echo "$DRY_RUN" "umount \"$SNAPSHOT_MOUNT_POINT$CHROOT_EXCLUDE_PATH\""
+fi
 unmount_chroot_essentials "$DRY_RUN" "$SNAPSHOT_MOUNT_POINT"
 
 if [[ "$MANAGED_SNAPSHOT" == true ]]; then
@@ -6,7 +6,20 @@
 #   -r  Path to the Restic repository.
 #   -p  Path to the Restic password file.
 #   -s  Path to the backup source directory.
-#   -e  (Optional) Comma-separated list of paths to exclude.
+#   -e  (Optional) Space-separated list of paths to exclude.
+#   --exclude-dir  (Optional) Generated exclusion directory (exclude.txt,
+#                  iexclude.txt); see lib/exclusions.sh.
+#   --exclude-caches, --exclude-if-present NAME, --exclude-larger-than SIZE
+#                  (Optional) Passed through to restic.
+#   --repo-opts OPTS, --repo-env VARS
+#                  (Optional) Extra restic options and Go runtime variables
+#                  for the repository at the same position (performance
+#                  profiles); given once per -r when used.
+#   --repo-parent ID
+#                  (Optional) Recorded parent snapshot for the repository at
+#                  the same position, passed as --parent (see parents.py).
+#   --report FILE  (Optional) Append "repo<TAB>snapshot<TAB>parent used<TAB>
+#                  start time" per successful repository.
 #   --dry-run  (Optional) Show actions without executing them.
 #
 # Usage:
@@ -32,7 +45,15 @@ root_check
 BACKUP_SOURCE_PATH=""
 RESTIC_REPOS=()
 RESTIC_PASSWORD_FILES=()
+RESTIC_REPO_OPTS=()
+RESTIC_REPO_ENVS=()
+RESTIC_REPO_PARENTS=()
 EXCLUDE_PATHS=""
+EXCLUDE_DIR=""
+EXCLUDE_CACHES=false
+EXCLUDE_IF_PRESENT=()
+EXCLUDE_LARGER_THAN=""
+REPORT_FILE="/dev/null"
 DRY_RUN=false
 
 # ─── Parse and Validate Arguments ─────────────────────────────────
@@ -52,16 +73,22 @@ if [ ${#RESTIC_REPOS[@]} -ne ${#RESTIC_PASSWORD_FILES[@]} ]; then
     usage_path
 fi
 
+validate_repo_options usage_path
+
 # ─── Pre-checks ───────────────────────────────────────────────────
 check_if_path_exists "$BACKUP_SOURCE_PATH"
 
 # ─── Display Configuration ───────────────────────────────────────
 display_config "Backup Configuration" \
-    BACKUP_SOURCE_PATH EXCLUDE_PATHS DRY_RUN
+    BACKUP_SOURCE_PATH EXCLUDE_PATHS EXCLUDE_DIR DRY_RUN
 
 echo "Repositories: ${#RESTIC_REPOS[@]}"
 for i in "${!RESTIC_REPOS[@]}"; do
     echo "  $((i+1)). ${RESTIC_REPOS[$i]}"
+    REPO_TUNING="${RESTIC_REPO_ENVS[$i]:-} ${RESTIC_REPO_OPTS[$i]:-}"
+    if [[ -n "${REPO_TUNING// /}" ]]; then
+        echo "     tuning: ${REPO_TUNING# }"
+    fi
 done
 
 display_dry_run_message "$DRY_RUN"
@@ -70,8 +97,13 @@ display_dry_run_message "$DRY_RUN"
 EXCLUDE_ARGS=()
 populate_exclude_paths EXCLUDE_ARGS "$EXCLUDE_PATHS"
 
+populate_exclusion_args EXCLUDE_ARGS "$EXCLUDE_DIR"
+
 RESTIC_TAGS=()
 populate_restic_tags RESTIC_TAGS "$EXCLUDE_PATHS"
+populate_restic_tags_from_exclusions RESTIC_TAGS
+
+report_excluded_bytes "" ""
 
 # ─── Loop Over Repositories ───────────────────────────────────────
 echo "🚀 Backing up to ${#RESTIC_REPOS[@]} repository(ies)..."
@@ -80,20 +112,24 @@ FAILED_REPOS=()
 for i in "${!RESTIC_REPOS[@]}"; do
     RESTIC_REPO="${RESTIC_REPOS[$i]}"
     RESTIC_PASSWORD_FILE="${RESTIC_PASSWORD_FILES[$i]}"
+    REPO_OPTS="${RESTIC_REPO_OPTS[$i]:-}"
+    REPO_ENV="${RESTIC_REPO_ENVS[$i]:-}"
+    REPO_PARENT="${RESTIC_REPO_PARENTS[$i]:-}"
 
     echo ""
     echo "▶️  Repository $((i+1))/${#RESTIC_REPOS[@]}: $RESTIC_REPO"
 
     # Build Restic command for this repo
-    RESTIC_CMD="restic -r $RESTIC_REPO --password-file=$RESTIC_PASSWORD_FILE"
+    RESTIC_CMD="${REPO_ENV:+$REPO_ENV }restic -r $RESTIC_REPO --password-file=$RESTIC_PASSWORD_FILE"
     RESTIC_CMD+=" ${EXCLUDE_ARGS[*]}"
     RESTIC_CMD+=" ${RESTIC_TAGS[*]}"
     RESTIC_CMD+=" backup $BACKUP_SOURCE_PATH"
+    RESTIC_CMD+=" $REPO_OPTS${REPO_PARENT:+ --parent=$REPO_PARENT}"
     RESTIC_CMD+=" --verbose"
 
     # Execute backup for this repo. A failure must not prevent the remaining
     # repositories from being attempted (issue #46).
-    if run_or_echo "$DRY_RUN" "$RESTIC_CMD"; then
+    if run_restic_backup "$DRY_RUN" "$RESTIC_REPO" "$REPO_PARENT" "$RESTIC_CMD"; then
         echo "✅ Repository backup succeeded: $RESTIC_REPO"
     else
         echo "❌ Repository backup failed: $RESTIC_REPO"
@@ -7,6 +7,10 @@
 #   -p  Source repository password file.
 #   -d  Destination repository path.
 #   -q  Destination repository password file.
+#   -o  (Optional) Space-separated extra restic options from the
+#       destination's performance profile.
+#   --report FILE  (Optional) Save restic's copy output, from which the
+#       copied snapshot IDs are read (see catalog.py).
 #   -n  (Optional) Dry run mode.
 #
 # Usage:
@@ -33,19 +37,23 @@ SOURCE_REPO=""
 SOURCE_PASSWORD_FILE=""
 DEST_REPO=""
 DEST_PASSWORD_FILE=""
+RESTIC_OPTS_STR=""
+REPORT_FILE="/dev/null"
 DRY_RUN=false
 
 # ─── Usage Function ──────────────────────────────────────────────
 usage() {
     cat <<EOF
 Usage:
-$(basename "$0") -s SOURCE_REPO -p SOURCE_PASS -d DEST_REPO -q DEST_PASS [-n]
+$(basename "$0") -s SOURCE_REPO -p SOURCE_PASS -d DEST_REPO -q DEST_PASS [-o OPTS] [-n]
 
 Options:
   -s, --source-repo          Source Restic repository path
   -p, --source-password      Source repository password file
   -d, --dest-repo            Destination Restic repository path
   -q, --dest-password        Destination repository password file
+  -o, --restic-opts          Extra restic options (space-separated)
+  --report                   Save restic's copy output to FILE
   -n, --dry-run              Dry run mode (preview only)
   -h, --help                 Display this message and exit
 
@@ -75,6 +83,14 @@ while [[ $# -gt 0 ]]; do
             DEST_PASSWORD_FILE="$2"
             shift 2
             ;;
+        -o|--restic-opts)
+            RESTIC_OPTS_STR="$2"
+            shift 2
+            ;;
+        --report)
+            REPORT_FILE="$2"
+            shift 2
+            ;;
         -n|--dry-run)
             DRY_RUN=true
             shift
@@ -106,11 +122,15 @@ if [ ! -f "$DEST_PASSWORD_FILE" ]; then
     exit 1
 fi
 
+RESTIC_OPTS=()
+read -r -a RESTIC_OPTS <<<"$RESTIC_OPTS_STR"
+
 # ─── Display Configuration ───────────────────────────────────────
 echo ""
 echo "🔄 Restic Copy Configuration"
 echo "  SOURCE-REPO:           $SOURCE_REPO"
 echo "  DEST-REPO:             $DEST_REPO"
+echo "  RESTIC-OPTS:           ${RESTIC_OPTS_STR:-(defaults)}"
 echo "  DRY-RUN:               $DRY_RUN"
 echo ""
 
@@ -122,12 +142,13 @@ echo ""
 
 if [ "$DRY_RUN" = true ]; then
     echo "[DRY RUN] Would execute:"
-    echo "  restic -r $DEST_REPO --password-file $DEST_PASSWORD_FILE \\"
+    echo "  restic -r $DEST_REPO --password-file $DEST_PASSWORD_FILE $RESTIC_OPTS_STR \\"
     echo "    copy --from-repo $SOURCE_REPO --from-password-file $SOURCE_PASSWORD_FILE"
 else
     restic -r "$DEST_REPO" --password-file "$DEST_PASSWORD_FILE" \
+        ${RESTIC_OPTS[@]+"${RESTIC_OPTS[@]}"} \
         copy --from-repo "$SOURCE_REPO" --from-password-file "$SOURCE_PASSWORD_FILE" \
-        --verbose
+        --verbose | tee "$REPORT_FILE"
 fi
 
 echo ""
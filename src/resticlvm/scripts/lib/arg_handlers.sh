@@ -57,14 +57,100 @@ parse_arguments() {
             RESTIC_PASSWORD_FILES+=("$2")
             shift 2
             ;;
+        --repo-opts)
+            RESTIC_REPO_OPTS+=("$2")
+            shift 2
+            ;;
+        --repo-env)
+            RESTIC_REPO_ENVS+=("$2")
+            shift 2
+            ;;
+        --repo-parent)
+            RESTIC_REPO_PARENTS+=("$2")
+            shift 2
+            ;;
+        -c | --command)
+            if [[ "$allowed_flags" == *"command"* ]]; then
+                STREAM_COMMAND="$2"
+                shift 2
+            else
+                echo "❌ Unexpected option: $1"
+                "$usage_function"
+            fi
+            ;;
+        -f | --stdin-filename)
+            if [[ "$allowed_flags" == *"stdin-filename"* ]]; then
+                STDIN_FILENAME="$2"
+                shift 2
+            else
+                echo "❌ Unexpected option: $1"
+                "$usage_function"
+            fi
+            ;;
+        --fan-out)
+            if [[ "$allowed_flags" == *"fan-out"* ]]; then
+                FAN_OUT="$2"
+                shift 2
+            else
+                echo "❌ Unexpected option: $1"
+                "$usage_function"
+            fi
+            ;;
+        --report)
+            REPORT_FILE="$2"
+            shift 2
+            ;;
         -s | --backup-source)
             BACKUP_SOURCE_PATH="$2"
             shift 2
             ;;
+        --group-source)
+            if [[ "$allowed_flags" == *"group-source"* ]]; then
+                BACKUP_SOURCES+=("$2")
+                shift 2
+            else
+                echo "❌ Unexpected option: $1"
+                "$usage_function"
+            fi
+            ;;
+        --snapshot-bind)
+            if [[ "$allowed_flags" == *"snapshot-bind"* ]]; then
+                SNAPSHOT_BINDS+=("$2")
+                shift 2
+            else
+                echo "❌ Unexpected option: $1"
+                "$usage_function"
+            fi
+            ;;
+        --tag)
+            if [[ "$allowed_flags" == *"tag"* ]]; then
+                RESTIC_EXTRA_TAGS+=("$2")
+                shift 2
+            else
+                echo "❌ Unexpected option: $1"
+                "$usage_function"
+            fi
+            ;;
         -e | --exclude-paths)
             EXCLUDE_PATHS="$2"
             shift 2
             ;;
+        --exclude-dir)
+            EXCLUDE_DIR="$2"
+            shift 2
+            ;;
+        --exclude-caches)
+            EXCLUDE_CACHES=true
+            shift
+            ;;
+        --exclude-if-present)
+            EXCLUDE_IF_PRESENT+=("$2")
+            shift 2
+            ;;
+        --exclude-larger-than)
+            EXCLUDE_LARGER_THAN="$2"
+            shift 2
+            ;;
         --snapshot-mount)
             if [[ "$allowed_flags" == *"snapshot-mount"* ]]; then
                 SNAPSHOT_MOUNT="$2"
@@ -108,6 +194,22 @@ parse_for_lv() {
     parse_arguments "$usage_function" "$allowed_flags" "$@"
 }
 
+# Validate that per-repository --repo-opts / --repo-env / --repo-parent
+# values, if given, line up one-to-one with the --restic-repo values.
+validate_repo_options() {
+    local usage_function="$1"
+    local name count
+    for name in RESTIC_REPO_OPTS RESTIC_REPO_ENVS RESTIC_REPO_PARENTS; do
+        declare -n values=$name
+        count=${#values[@]}
+        if [ "$count" -ne 0 ] && [ "$count" -ne ${#RESTIC_REPOS[@]} ]; then
+            echo "❌ Error: Number of repos (${#RESTIC_REPOS[@]}) must match number of $name values ($count)"
+            "$usage_function"
+        fi
+        unset -n values
+    done
+}
+
 # Validate that all required environment variables are set.
 validate_args() {
     local usage_function="$1"
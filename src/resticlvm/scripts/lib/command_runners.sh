@@ -41,6 +41,56 @@ run_in_chroot_or_echo() {
     fi
 }
 
+_run_backup_cmd() {
+    local dry_run="$1" chroot_mount="$2" cmd="$3"
+    if [ -n "$chroot_mount" ]; then
+        run_in_chroot_or_echo "$dry_run" "$chroot_mount" "$cmd"
+    else
+        run_or_echo "$dry_run" "$cmd"
+    fi
+}
+
+# Run one repository's `restic backup` command and report its snapshot.
+#   $1  dry-run flag
+#   $2  repository (as given with -r)
+#   $3  recorded parent snapshot passed with --parent in $4 ("" if none)
+#   $4  the command (must include --verbose)
+#   $5  (Optional) snapshot mount point to chroot into before running
+# If restic fails without ever loading the recorded parent (it was forgotten
+# or pruned), the command is retried once without --parent. On success,
+# "repo<TAB>snapshot<TAB>parent used<TAB>start time (epoch)" is appended to
+# $REPORT_FILE.
+run_restic_backup() {
+    local dry_run="$1" repo="$2" parent="$3" cmd="$4" chroot_mount="${5:-}"
+    local log status snapshot used started
+
+    if [ "$dry_run" = true ]; then
+        _run_backup_cmd "$dry_run" "$chroot_mount" "$cmd"
+        return 0
+    fi
+
+    log=$(mktemp)
+    started=$(date +%s)
+    set +e
+    _run_backup_cmd "$dry_run" "$chroot_mount" "$cmd" | tee "$log"
+    status=${PIPESTATUS[0]}
+    if [ "$status" -ne 0 ] && [ -n "$parent" ] &&
+        ! grep -q '^using parent snapshot' "$log"; then
+        echo "⚠️  Recorded parent snapshot $parent is unusable; retrying without --parent."
+        _run_backup_cmd "$dry_run" "$chroot_mount" "${cmd//--parent=$parent/}" | tee "$log"
+        status=${PIPESTATUS[0]}
+    fi
+    set -e
+
+    if [ "$status" -eq 0 ]; then
+        snapshot=$(sed -n 's/^snapshot \([0-9a-f]*\) saved.*/\1/p' "$log" | tail -n 1)
+        used=$(sed -n 's/^using parent snapshot \([0-9a-f]*\).*/\1/p' "$log" | head -n 1)
+        printf '%s\t%s\t%s\t%s\n' "$repo" "$snapshot" "$used" "$started" >>"$REPORT_FILE"
+    fi
+    rm -f "$log"
+    return "$status"
+}
+
 # Restore the controlling terminal's foreground process group to this script's
 # own group. restic's ssh (for a remote repo) can take over the terminal's
 # foreground group to show a prompt and, on failure, not restore it — which
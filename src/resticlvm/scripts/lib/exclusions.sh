@@ -0,0 +1,100 @@
+#!/bin/bash
+
+# Provides functions to apply a job's generated exclusion directory (written
+# by the ResticLVM Python layer) and to report how much data it excludes.
+#
+# The directory holds:
+#   exclude.txt   one restic exclude pattern per line (--exclude-file)
+#   iexclude.txt  case-insensitive patterns (--iexclude-file), if any
+#
+# Relies on these globals, set by parse_arguments:
+#   EXCLUDE_DIR, EXCLUDE_CACHES, EXCLUDE_IF_PRESENT (array), EXCLUDE_LARGER_THAN
+#
+# Usage:
+#   Intended to be sourced by other scripts within the ResticLVM tool.
+#
+# Exit codes:
+#   N/A (helper functions only).
+
+# Populate restic exclusion flags from the exclusion directory and options.
+#   $1  name of the array to append to
+#   $2  exclusion directory as restic will see it (differs inside a chroot)
+populate_exclusion_args() {
+    declare -n exclusion_args=$1
+    local restic_view_dir=$2
+
+    if [ -n "$EXCLUDE_DIR" ]; then
+        if [ -s "$EXCLUDE_DIR/exclude.txt" ]; then
+            exclusion_args+=("--exclude-file=$(printf '%q' "$restic_view_dir/exclude.txt")")
+        fi
+        if [ -s "$EXCLUDE_DIR/iexclude.txt" ]; then
+            exclusion_args+=("--iexclude-file=$(printf '%q' "$restic_view_dir/iexclude.txt")")
+        fi
+    fi
+    if [ "$EXCLUDE_CACHES" = true ]; then
+        exclusion_args+=("--exclude-caches")
+    fi
+    local name
+    for name in ${EXCLUDE_IF_PRESENT[@]+"${EXCLUDE_IF_PRESENT[@]}"}; do
+        exclusion_args+=("--exclude-if-present=$(printf '%q' "$name")")
+    done
+    if [ -n "$EXCLUDE_LARGER_THAN" ]; then
+        exclusion_args+=("--exclude-larger-than=$EXCLUDE_LARGER_THAN")
+    fi
+}
+
+# Print the absolute, glob-free paths listed in exclude.txt (one per line).
+# Comments and patterns are skipped; only these can be measured or tagged.
+_literal_excluded_paths() {
+    [ -n "$EXCLUDE_DIR" ] && [ -f "$EXCLUDE_DIR/exclude.txt" ] || return 0
+    local line
+    while IFS= read -r line || [ -n "$line" ]; do
+        [[ "$line" == /* ]] || continue
+        [[ "$line" == *[\*\?\[]* ]] && continue
+        printf '%s\n' "$line"
+    done <"$EXCLUDE_DIR/exclude.txt"
+}
+
+# Populate --tag=excl:<path> flags for the literal paths in exclude.txt.
+populate_restic_tags_from_exclusions() {
+    local -n exclusion_tags=$1
+    local path
+    while IFS= read -r path; do
+        exclusion_tags+=("--tag=$(printf '%q' "excl:$path")")
+    done < <(_literal_excluded_paths)
+}
+
+# Report the size of each literal excluded path and the total, in bytes.
+#   $1  prefix where the backed-up tree is visible on the host ("" for a plain
+#       path backup, the snapshot mount point for LV backups)
+#   $2  path prefix to strip before adding $1 (the LV mount point for
+#       lv_nonroot, "" otherwise)
+# Only paths that exist (and, when $2 is set, lie under it) are measured;
+# `du -x` stays on the snapshot's own filesystem so chroot bind mounts (/dev,
+# /proc, ...) are not counted.
+report_excluded_bytes() {
+    local host_prefix="$1"
+    local strip_prefix="$2"
+    local path host_path bytes total=0 count=0
+
+    while IFS= read -r path; do
+        if [ -n "$strip_prefix" ] && [ "$strip_prefix" != / ] &&
+            [[ "$path" != "$strip_prefix" && "$path" != "$strip_prefix"/* ]]; then
+            continue
+        fi
+        host_path="${host_prefix}${path#"$strip_prefix"}"
+        [ -e "$host_path" ] || continue
+        bytes=$(du -sxb -- "$host_path" 2>/dev/null | cut -f1) || continue
+        [ -n "$bytes" ] || continue
+        if [ "$count" -eq 0 ]; then
+            echo "📉 Excluded paths (not scanned or uploaded):"
+        fi
+        printf '  %-40s %15s bytes\n' "$path" "$bytes"
+        total=$((total + bytes))
+        count=$((count + 1))
+    done < <(_literal_excluded_paths)
+
+    if [ "$count" -gt 0 ]; then
+        printf '  %-40s %15s bytes\n' "TOTAL" "$total"
+    fi
+}
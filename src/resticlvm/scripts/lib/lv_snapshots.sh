@@ -13,7 +13,8 @@
 # Exit codes:
 #   Non-zero if any snapshot operation fails (unless in dry-run mode).
 
-# Create an LVM snapshot for a given logical volume.
+# Create an LVM snapshot for a given logical volume. Optionally with a COW
+# chunk size ($6) and restricted to the PVs that follow it.
 create_snapshot() {
     echo "📸 Creating LVM snapshot..."
     local dry_run=$1
@@ -21,8 +22,27 @@ create_snapshot() {
     local snap_name=$3
     local vg_name=$4
     local lv_name=$5
+    local chunksize=${6:-}
+    local pvs=("${@:7}")
+    local options=""
 
-    run_or_echo "$dry_run" "lvcreate --size $snapshot_size --snapshot --name $snap_name /dev/$vg_name/$lv_name"
+    if [[ -n "$chunksize" ]]; then
+        options=" --chunksize $chunksize"
+    fi
+    run_or_echo "$dry_run" "lvcreate --size $snapshot_size --snapshot$options --name $snap_name /dev/$vg_name/$lv_name${pvs[*]:+ ${pvs[*]}}"
+}
+
+# Create a thin snapshot of a thin logical volume. It takes no space up
+# front and is activated despite LVM's activation-skip default for thin
+# snapshots.
+create_thin_snapshot() {
+    echo "📸 Creating thin LVM snapshot..."
+    local dry_run=$1
+    local snap_name=$2
+    local vg_name=$3
+    local lv_name=$4
+
+    run_or_echo "$dry_run" "lvcreate --snapshot --setactivationskip n --name $snap_name $vg_name/$lv_name"
 }
 
 # Mount an LVM snapshot read-only at a given mount point.
@@ -37,6 +57,78 @@ mount_snapshot() {
     run_or_echo "$dry_run" "mount /dev/$vg_name/$snap_name \"$snapshot_mount_point\" || { echo '❌ Failed to mount snapshot'; exit 1; }"
 }
 
+# ─── Read-only snapshot mounts ────────────────────────────────────
+#
+# Anything written to a classic snapshot lands in its COW area, next to the
+# origin's own changes: atime updates and, on journaling filesystems, the
+# replay of the journal at mount time. lvcreate freezes the origin's
+# filesystem while it takes the snapshot, so the snapshot is consistent and
+# its journal holds nothing the backup needs. It can be mounted without
+# replaying it. XFS also refuses to mount a second filesystem with the
+# origin's UUID unless told not to check.
+
+# Print the mount options that keep a mount of the filesystem on $1 from
+# writing to it.
+snapshot_mount_options() {
+    local device="$1"
+    local fstype
+    fstype=$(blkid -o value -s TYPE "$device" 2>/dev/null || true)
+    case "$fstype" in
+    ext3 | ext4) echo "ro,noatime,noload" ;;
+    xfs) echo "ro,noatime,norecovery,nouuid" ;;
+    btrfs) echo "ro,noatime,nologreplay" ;;
+    *) echo "ro,noatime" ;;
+    esac
+}
+
+# Mount an LVM snapshot read-only with snapshot_mount_options. Falls back to
+# a plain read-only mount if the kernel rejects the options. With
+# readonly_lv=true, the snapshot LV is first activated read-only, so nothing
+# can write to it at all.
+mount_snapshot_readonly() {
+    local dry_run=$1
+    local snapshot_mount_point=$2
+    local vg_name=$3
+    local snap_name=$4
+    local readonly_lv=${5:-false}
+    local device="/dev/$vg_name/$snap_name"
+    local options
+
+    if [[ "$readonly_lv" == true ]]; then
+        echo "🔒 Activating snapshot read-only..."
+        run_or_echo "$dry_run" "lvchange --permission r $vg_name/$snap_name"
+    fi
+
+    options=$(snapshot_mount_options "$device")
+    echo "📂 Mounting snapshot read-only ($options)..."
+    run_or_echo "$dry_run" "mkdir -p \"$snapshot_mount_point\""
+    run_or_echo "$dry_run" "mount -o $options $device \"$snapshot_mount_point\" || mount -o ro $device \"$snapshot_mount_point\" || { echo '❌ Failed to mount snapshot'; exit 1; }"
+}
+
+# Mount an LVM snapshot read-only and stack a writable overlay on top of it
+# at the mount point, for backups that chroot into the snapshot (lv_root).
+# The chroot's own writes (bind mount points, restic's temporary files and
+# cache updates) go to a tmpfs instead of the COW area. The snapshot itself is
+# mounted at "<mount point>.lower" and the tmpfs at "<mount point>.upper";
+# both are released by cleanup_snapshot_resources.
+mount_snapshot_overlay() {
+    local dry_run=$1
+    local snapshot_mount_point=$2
+    local vg_name=$3
+    local snap_name=$4
+    local readonly_lv=${5:-false}
+    local lower="$snapshot_mount_point.lower"
+    local upper="$snapshot_mount_point.upper"
+
+    mount_snapshot_readonly "$dry_run" "$lower" "$vg_name" "$snap_name" "$readonly_lv"
+
+    echo "🪟 Stacking a writable overlay on the snapshot for the chroot..."
+    run_or_echo "$dry_run" "mkdir -p \"$upper\" \"$snapshot_mount_point\""
+    run_or_echo "$dry_run" "mount -t tmpfs -o mode=0755 rlvm-overlay \"$upper\""
+    run_or_echo "$dry_run" "mkdir -p \"$upper/data\" \"$upper/work\""
+    run_or_echo "$dry_run" "mount -t overlay overlay -o lowerdir=\"$lower\",upperdir=\"$upper/data\",workdir=\"$upper/work\" \"$snapshot_mount_point\""
+}
+
 # Unmount and remove an LVM snapshot and its mount point.
 clean_up_snapshot() {
     local dry_run="$1"
@@ -71,57 +163,84 @@ generate_mount_base() {
 # Idempotent, best-effort teardown of a snapshot and everything mounted under
 # it. Safe to call when nothing (or only part) of it was created, and safe to
 # call more than once. Every step is guarded and ignores its own errors, so it
-# never masks the caller's exit code. Uses the discover-and-tear-down approach:
-# it finds whatever is mounted under the snapshot rather than tracking binds.
+# never masks the caller's exit code.
+#
+# Teardown waits on events rather than sleeping: the whole bind tree under the
+# snapshot is unmounted in one `umount -R` pass, with a lazy (MNT_DETACH)
+# unmount only as the fallback for a busy tree. The snapshot LV is removed as
+# soon as udev has processed the events of the unmount, and if it is still
+# held, the next attempt waits for a change to the mount table
+# (/proc/self/mountinfo) instead of a fixed delay. The time taken is printed.
+
+# Seconds an LV may stay busy after its unmount before teardown gives up.
+SNAPSHOT_RELEASE_TIMEOUT=${SNAPSHOT_RELEASE_TIMEOUT:-10}
+
+# Wait until udev has processed all queued events, e.g. the change events of
+# an unmount, which briefly hold the device open. Returns at once when idle.
+_settle_udev() {
+    command -v udevadm >/dev/null 2>&1 \
+        && udevadm settle --timeout="$1" >/dev/null 2>&1 || true
+}
+
+# Wait until the mount table changes, or at most $1 milliseconds.
+_wait_for_mount_change() {
+    findmnt --poll --first-only --timeout "$1" >/dev/null 2>&1 || true
+}
+
+_now() {
+    if [ -n "${EPOCHREALTIME:-}" ]; then
+        echo "${EPOCHREALTIME/,/.}"
+    else
+        date +%s.%N
+    fi
+}
+
 cleanup_snapshot_resources() {
     local snapshot_mount_point="$1"
     local mount_base="$2"
     local vg_name="$3"
     local snap_name="$4"
+    local started
+    started=$(_now)
 
-    if [ -n "$snapshot_mount_point" ]; then
-        # Unmount anything bound under the snapshot (chroot binds + the per-repo
-        # bind), deepest path first so parents unmount last. umount -l is the
-        # fallback for a still-busy target.
-        local target
-        while IFS= read -r target; do
-            [ "$target" = "$snapshot_mount_point" ] && continue
-            umount "$target" 2>/dev/null \
-                || umount -l "$target" 2>/dev/null || true
-        done < <(findmnt -rn -o TARGET 2>/dev/null \
-            | awk -v base="$snapshot_mount_point/" 'index($0, base) == 1' \
-            | awk '{ print length, $0 }' | sort -rn | cut -d' ' -f2-)
-
-        # Unmount the snapshot itself. Prefer a real unmount (retried briefly)
-        # over a lazy one: a lazy detach can leave the device transiently busy
-        # and then race the lvremove below.
-        if mountpoint -q "$snapshot_mount_point" 2>/dev/null; then
-            local u=0
-            until umount "$snapshot_mount_point" 2>/dev/null; do
-                u=$((u + 1))
-                if [ "$u" -ge 5 ]; then
-                    umount -l "$snapshot_mount_point" 2>/dev/null || true
-                    break
-                fi
-                sleep 0.3
-            done
+    # Unmount the snapshot and the chroot binds and per-repo bind under it,
+    # deepest first, in one pass. Lazily detach whatever is still busy.
+    if [ -n "$snapshot_mount_point" ] \
+        && mountpoint -q "$snapshot_mount_point" 2>/dev/null; then
+        if ! umount -R "$snapshot_mount_point" 2>/dev/null; then
+            echo "⚠️  $snapshot_mount_point is busy — detaching it lazily." >&2
+            umount -R -l "$snapshot_mount_point" 2>/dev/null || true
         fi
     fi
 
+    # Release the read-only snapshot mount and tmpfs under an overlay mount
+    # (see mount_snapshot_overlay).
+    if [ -n "$snapshot_mount_point" ]; then
+        local part
+        for part in "$snapshot_mount_point.lower" "$snapshot_mount_point.upper"; do
+            if mountpoint -q "$part" 2>/dev/null \
+                && ! umount -R "$part" 2>/dev/null; then
+                umount -R -l "$part" 2>/dev/null || true
+            fi
+            if [ -d "$part" ]; then
+                rmdir "$part" 2>/dev/null || true
+            fi
+        done
+    fi
+
     # Remove the snapshot LV by its exact, timestamped name (never a glob),
-    # regardless of whether the unmounts above fully succeeded. After a process
-    # (e.g. restic) has read the mounted snapshot, the device can stay briefly
-    # busy once unmounted, so let udev settle and retry lvremove for a few
-    # seconds rather than giving up after one attempt.
+    # regardless of whether the unmounts above fully succeeded.
     if [ -n "$vg_name" ] && [ -n "$snap_name" ] \
         && lvs "/dev/$vg_name/$snap_name" >/dev/null 2>&1; then
-        command -v udevadm >/dev/null 2>&1 && udevadm settle >/dev/null 2>&1 || true
-        local r=0
-        while lvs "/dev/$vg_name/$snap_name" >/dev/null 2>&1; do
-            lvremove -f "/dev/$vg_name/$snap_name" >/dev/null 2>&1 && break
-            r=$((r + 1))
-            [ "$r" -ge 10 ] && break
-            sleep 0.3
+        local deadline=$((SECONDS + SNAPSHOT_RELEASE_TIMEOUT))
+        _settle_udev "$SNAPSHOT_RELEASE_TIMEOUT"
+        until lvremove -f "/dev/$vg_name/$snap_name" >/dev/null 2>&1; do
+            if [ "$SECONDS" -ge "$deadline" ]; then
+                echo "⚠️  /dev/$vg_name/$snap_name is still in use — not removed." >&2
+                break
+            fi
+            _wait_for_mount_change 500
+            _settle_udev "$SNAPSHOT_RELEASE_TIMEOUT"
         done
     fi
 
@@ -142,6 +261,8 @@ cleanup_snapshot_resources() {
         done
         rmdir "$mount_base" 2>/dev/null || true
     fi
+
+    TEARDOWN_SECONDS=$(awk -v a="$started" -v b="$(_now)" 'BEGIN { printf "%.2f", b - a }')
 }
 
 # EXIT/signal trap handler. Preserves the original exit code, disarms itself to
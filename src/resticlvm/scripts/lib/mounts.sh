@@ -96,6 +96,20 @@ bind_repo_to_mounted_snapshot() {
     run_or_echo "$dry_run" "mount --make-private $snapshot_mount_point/$chroot_repo_full"
 }
 
+# Bind-mount the job's generated exclusion directory into the snapshot so
+# restic can read the exclusion files inside the chroot.
+bind_exclude_dir_to_mounted_snapshot() {
+    local dry_run="$1"
+    local snapshot_mount_point="$2"
+    local exclude_dir="$3"
+    local chroot_exclude_path="$4"
+
+    echo "🪝 Binding exclusion files into chroot at $chroot_exclude_path..."
+    run_or_echo "$dry_run" "mkdir -p \"$snapshot_mount_point$chroot_exclude_path\""
+    run_or_echo "$dry_run" "mount --bind \"$exclude_dir\" \"$snapshot_mount_point$chroot_exclude_path\""
+    run_or_echo "$dry_run" "mount --make-private \"$snapshot_mount_point$chroot_exclude_path\""
+}
+
 # Bind /dev, /proc, and /sys into the snapshot to enable minimal chroot.
 # Also bind SSH agent socket directory if it exists (needed for SFTP repos).
 bind_chroot_essentials_to_mounted_snapshot() {
@@ -18,6 +18,10 @@ usage_path() {
     echo "  -p, --password-file    Path to password file"
     echo "  -s, --backup-source    Path to back up"
     echo "  -e, --exclude-paths    Space-separated paths to exclude"
+    echo "  --exclude-dir          Generated exclusion directory (exclude.txt, iexclude.txt)"
+    echo "  --exclude-caches       Skip directories containing CACHEDIR.TAG"
+    echo "  --exclude-if-present   Skip directories containing this file (repeatable)"
+    echo "  --exclude-larger-than  Skip files larger than SIZE (e.g. 2G)"
     echo "  -n, --dry-run          Dry run mode (preview only)"
     echo "  -h, --help             Display this message and exit"
     exit 1
@@ -33,7 +37,11 @@ usage_lv_root() {
     echo "  -z, --snap-size        Snapshot size (e.g., 1G)"
     echo "  -r, --restic-repo      Restic repository path"
     echo "  -p, --password-file    Path to password file"
-    echo "  -e, --exclude-paths    Space-separated paths to exclude (default: /dev /media /mnt /proc /run /sys /tmp /var/tmp /var/lib/libvirt/images)"
+    echo "  -e, --exclude-paths    Space-separated paths to exclude (default without -e/--exclude-dir: /dev /media /mnt /proc /run /sys /tmp /var/tmp /var/lib/libvirt/images)"
+    echo "  --exclude-dir          Generated exclusion directory (exclude.txt, iexclude.txt)"
+    echo "  --exclude-caches       Skip directories containing CACHEDIR.TAG"
+    echo "  --exclude-if-present   Skip directories containing this file (repeatable)"
+    echo "  --exclude-larger-than  Skip files larger than SIZE (e.g. 2G)"
     echo "  -s, --backup-source    Path inside snapshot to back up (default: /)"
     echo "  --snapshot-mount       Use pre-mounted snapshot at PATH (batch mode, skip create/teardown)"
     echo "  -n, --dry-run          Dry run mode (preview only)"
@@ -52,9 +60,48 @@ usage_lv_nonroot() {
     echo "  -r, --restic-repo      Restic repository path"
     echo "  -p, --password-file    Path to password file"
     echo "  -e, --exclude-paths    Space-separated paths to exclude"
+    echo "  --exclude-dir          Generated exclusion directory (exclude.txt, iexclude.txt)"
+    echo "  --exclude-caches       Skip directories containing CACHEDIR.TAG"
+    echo "  --exclude-if-present   Skip directories containing this file (repeatable)"
+    echo "  --exclude-larger-than  Skip files larger than SIZE (e.g. 2G)"
     echo "  -s, --backup-source    Path inside snapshot to back up"
     echo "  --snapshot-mount       Use pre-mounted snapshot at PATH (batch mode, skip create/teardown)"
     echo "  -n, --dry-run          Dry run mode (preview only)"
     echo "  -h, --help             Display this message and exit"
     exit 1
 }
+
+usage_command() {
+    echo "Usage:"
+    echo "$0 -c COMMAND -f STDIN_FILENAME -r REPO -p PASSFILE [--fan-out true|false] [-n]"
+    echo ""
+    echo "Options:"
+    echo "  -c, --command          Shell command whose stdout is backed up"
+    echo "  -f, --stdin-filename   File name the stream is stored under"
+    echo "  -r, --restic-repo      Restic repository path"
+    echo "  -p, --password-file    Path to password file"
+    echo "  --fan-out              true: run the command once and stream it to every repo"
+    echo "  --report               Append per-repo throughput (repo, seconds, bytes) to FILE"
+    echo "  -n, --dry-run          Dry run mode (preview only)"
+    echo "  -h, --help             Display this message and exit"
+    exit 1
+}
+
+usage_group() {
+    echo "Usage:"
+    echo "$0 --group-source SRC [--group-source SRC ...] -r REPO -p PASSFILE [--snapshot-bind VG/LV:MOUNT ...] [-n]"
+    echo ""
+    echo "Options:"
+    echo "  --group-source         Path to back up (repeatable)"
+    echo "  --snapshot-bind        Pre-mounted snapshot VG/LV:MOUNT bound over the LV (repeatable)"
+    echo "  --tag                  Extra snapshot tag (repeatable)"
+    echo "  -r, --restic-repo      Restic repository path"
+    echo "  -p, --password-file    Path to password file"
+    echo "  --exclude-dir          Generated exclusion directory (exclude.txt, iexclude.txt)"
+    echo "  --exclude-caches       Skip directories containing CACHEDIR.TAG"
+    echo "  --exclude-if-present   Skip directories containing this file (repeatable)"
+    echo "  --exclude-larger-than  Skip files larger than SIZE (e.g. 2G)"
+    echo "  -n, --dry-run          Dry run mode (preview only)"
+    echo "  -h, --help             Display this message and exit"
+    exit 1
+}
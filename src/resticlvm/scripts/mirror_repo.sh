@@ -0,0 +1,249 @@
+#!/bin/bash
+
+# Mirror a local Restic repository to a destination at the file level.
+#
+# Unlike copy_repo.sh (`restic copy`, which decrypts and re-encrypts every
+# blob), this transfers the repository's files unchanged, so it costs almost
+# no CPU. The destination must therefore be a byte-for-byte mirror of the
+# source: same repository ID and keys. A destination whose `config` file
+# differs from the source's is refused.
+#
+# Repository files are content-addressed and never modified in place, so only
+# files missing at the destination are transferred. Directories are pushed in
+# an order that keeps the mirror readable at every step:
+#
+#   config, keys/  →  data/  →  index/  →  snapshots/
+#
+# (packs exist before any index references them; indexes exist before any
+# snapshot needs them). With --delete, files removed from the source by a
+# prune are then deleted in the reverse order: snapshots/ → index/ → data/.
+#
+# Arguments:
+#   -s  Source repository path (must be a local directory).
+#   -d  Destination: a local path, sftp:user@host:/path, or rclone:remote:path.
+#   --delete  (Optional) Also delete files no longer present in the source.
+#   -n  (Optional) Dry run mode.
+#
+# Usage:
+#   This script is intended to be called internally by the ResticLVM tool.
+#
+# Requirements:
+#   - Must be run with root privileges (direct root or via sudo).
+#   - rsync (local and sftp destinations; sftp hosts must also provide rsync)
+#     or rclone (rclone: destinations) must be available in PATH.
+#
+# Exit codes:
+#   0  Success
+#   1  Any fatal error
+
+set -euo pipefail
+
+# shellcheck disable=SC1091
+source "$(dirname "$0")/backup_helpers.sh"
+
+# ─── Require Running as Root ─────────────────────────────────────
+root_check
+
+# ─── Default Values ──────────────────────────────────────────────
+SOURCE_REPO=""
+DEST_REPO=""
+SYNC_DELETIONS=false
+DRY_RUN=false
+
+# ─── Usage Function ──────────────────────────────────────────────
+usage() {
+    cat <<EOF
+Usage:
+$(basename "$0") -s SOURCE_REPO -d DEST_REPO [--delete] [-n]
+
+Options:
+  -s, --source-repo          Source Restic repository (local path)
+  -d, --dest-repo            Destination (local path, sftp:user@host:/path,
+                             or rclone:remote:path)
+      --delete               Delete destination files removed from the source
+  -n, --dry-run              Dry run mode (preview only)
+  -h, --help                 Display this message and exit
+
+Example:
+  $(basename "$0") -s /srv/backup/root -d sftp:user@host:/backups/root
+EOF
+    exit 1
+}
+
+# ─── Parse Arguments ─────────────────────────────────────────────
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        -s|--source-repo)
+            SOURCE_REPO="$2"
+            shift 2
+            ;;
+        -d|--dest-repo)
+            DEST_REPO="$2"
+            shift 2
+            ;;
+        --delete)
+            SYNC_DELETIONS=true
+            shift
+            ;;
+        -n|--dry-run)
+            DRY_RUN=true
+            shift
+            ;;
+        -h|--help)
+            usage
+            ;;
+        *)
+            echo "❌ Unexpected option: $1"
+            usage
+            ;;
+    esac
+done
+
+# ─── Validate Arguments ──────────────────────────────────────────
+if [ -z "$SOURCE_REPO" ] || [ -z "$DEST_REPO" ]; then
+    echo "❌ Error: Source and destination repositories are required"
+    usage
+fi
+
+SOURCE_REPO="${SOURCE_REPO%/}"
+if [ ! -f "$SOURCE_REPO/config" ]; then
+    echo "❌ Error: $SOURCE_REPO is not a local Restic repository (no config file)"
+    exit 1
+fi
+
+# ─── Resolve Destination Backend ─────────────────────────────────
+# BACKEND is one of local / sftp / rclone. For sftp, SSH_HOST and DEST_PATH
+# are split out of sftp:user@host:/path; rsync addresses it as host:path.
+SSH_HOST=""
+case "$DEST_REPO" in
+    sftp:*)
+        BACKEND=sftp
+        rest="${DEST_REPO#sftp:}"
+        if [[ "$rest" == //* || "$rest" != *:* ]]; then
+            echo "❌ Error: mirror mode needs the sftp:user@host:/path form, got $DEST_REPO"
+            exit 1
+        fi
+        SSH_HOST="${rest%%:*}"
+        DEST_PATH="${rest#*:}"
+        RSYNC_TARGET="$SSH_HOST:$DEST_PATH"
+        ;;
+    rclone:*)
+        BACKEND=rclone
+        DEST_PATH="${DEST_REPO#rclone:}"
+        ;;
+    *)
+        if is_remote_repo "$DEST_REPO"; then
+            echo "❌ Error: mirror mode does not support destination $DEST_REPO"
+            exit 1
+        fi
+        BACKEND=local
+        DEST_PATH="${DEST_REPO%/}"
+        RSYNC_TARGET="$DEST_PATH"
+        ;;
+esac
+
+# ─── Backend Primitives ──────────────────────────────────────────
+
+# True if the destination already holds a repository config file.
+dest_has_config() {
+    case "$BACKEND" in
+        local) [ -e "$DEST_PATH/config" ] ;;
+        sftp) ssh "$SSH_HOST" test -e "'$DEST_PATH/config'" ;;
+        rclone) [ -n "$(rclone lsf "$DEST_PATH/config" 2>/dev/null)" ] ;;
+    esac
+}
+
+# True if the destination config is byte-identical to the source config,
+# i.e. both sides are the same repository (same ID, same keys).
+dest_config_matches() {
+    case "$BACKEND" in
+        local) cmp -s "$SOURCE_REPO/config" "$DEST_PATH/config" ;;
+        sftp) ssh "$SSH_HOST" cat "'$DEST_PATH/config'" | cmp -s - "$SOURCE_REPO/config" ;;
+        rclone) rclone cat "$DEST_PATH/config" | cmp -s - "$SOURCE_REPO/config" ;;
+    esac
+}
+
+# Create the destination root directory (no-op for rclone remotes).
+ensure_dest_root() {
+    case "$BACKEND" in
+        local) run_or_echo "$DRY_RUN" "mkdir -p \"$DEST_PATH\"" ;;
+        sftp) run_or_echo "$DRY_RUN" "ssh \"$SSH_HOST\" mkdir -p \"'$DEST_PATH'\"" ;;
+        rclone) : ;;
+    esac
+}
+
+# Transfer files under $1 that the destination does not have yet. Existing
+# files are never rewritten (repository files are immutable).
+push_new() {
+    local entry="$1"
+    [ -e "$SOURCE_REPO/$entry" ] || return 0
+    echo "  ⇢ $entry"
+    if [ "$BACKEND" = rclone ]; then
+        if [ -d "$SOURCE_REPO/$entry" ]; then
+            run_or_echo "$DRY_RUN" "rclone copy --ignore-existing \"$SOURCE_REPO/$entry\" \"$DEST_PATH/$entry\""
+        else
+            run_or_echo "$DRY_RUN" "rclone copyto --ignore-existing \"$SOURCE_REPO/$entry\" \"$DEST_PATH/$entry\""
+        fi
+    elif [ -d "$SOURCE_REPO/$entry" ]; then
+        run_or_echo "$DRY_RUN" "rsync -a --ignore-existing \"$SOURCE_REPO/$entry/\" \"$RSYNC_TARGET/$entry/\""
+    else
+        run_or_echo "$DRY_RUN" "rsync -a --ignore-existing \"$SOURCE_REPO/$entry\" \"$RSYNC_TARGET/$entry\""
+    fi
+}
+
+# Delete destination files under directory $1 that the source no longer has,
+# without transferring anything.
+delete_removed() {
+    local dir="$1"
+    [ -d "$SOURCE_REPO/$dir" ] || return 0
+    echo "  ✂ $dir"
+    if [ "$BACKEND" = rclone ]; then
+        # Everything new was pushed already, so sync only deletes here.
+        run_or_echo "$DRY_RUN" "rclone sync \"$SOURCE_REPO/$dir\" \"$DEST_PATH/$dir\""
+    else
+        run_or_echo "$DRY_RUN" "rsync -r --delete --existing --ignore-existing \"$SOURCE_REPO/$dir/\" \"$RSYNC_TARGET/$dir/\""
+    fi
+}
+
+# ─── Display Configuration ───────────────────────────────────────
+echo ""
+echo "🪞 Restic Mirror Configuration"
+echo "  SOURCE-REPO:           $SOURCE_REPO"
+echo "  DEST-REPO:             $DEST_REPO"
+echo "  BACKEND:               $BACKEND"
+echo "  SYNC-DELETIONS:        $SYNC_DELETIONS"
+echo "  DRY-RUN:               $DRY_RUN"
+echo ""
+
+display_dry_run_message "$DRY_RUN"
+
+# ─── Verify Mirror Identity ──────────────────────────────────────
+if dest_has_config; then
+    if ! dest_config_matches; then
+        echo "❌ Error: $DEST_REPO is a different repository than $SOURCE_REPO"
+        echo "   → Mirror mode needs an identical repository (same ID and keys)."
+        echo "   → Use the default copy mode for independent repositories."
+        exit 1
+    fi
+    echo "✅ Destination is a mirror of the source repository."
+else
+    echo "🆕 Destination has no repository yet — creating a new mirror."
+    ensure_dest_root
+fi
+
+# ─── Transfer New Files ──────────────────────────────────────────
+echo "🚀 Transferring new repository files..."
+for entry in config keys data index snapshots; do
+    push_new "$entry"
+done
+
+# ─── Sync Deletions ──────────────────────────────────────────────
+if [ "$SYNC_DELETIONS" = true ]; then
+    echo "🧹 Deleting files removed from the source..."
+    for dir in snapshots index data; do
+        delete_removed "$dir"
+    done
+fi
+
+echo ""
+echo "✅ Mirror completed successfully (or would have, in dry-run mode)."
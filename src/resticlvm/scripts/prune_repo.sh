@@ -1,7 +1,11 @@
 #!/bin/bash
 
-# Prunes old snapshots from a specified Restic repository according to
-# provided retention settings.
+# Forgets old snapshots in, or prunes unreferenced data from, a specified
+# Restic repository.
+#
+# `restic forget` only deletes snapshot files and is cheap. `restic prune`
+# rewrites packs and can be slow and costly on remote backends, so the two
+# steps run separately: the caller decides when a prune is worthwhile.
 #
 # Arguments:
 #   $1  Path to the Restic repository.
@@ -12,6 +16,16 @@
 #   $6  Number of monthly snapshots to keep.
 #   $7  Number of yearly snapshots to keep.
 #
+# Options (after the positional arguments):
+#   --mode forget|prune      Step to run (default: forget).
+#   --max-unused LIMIT       Passed to `restic prune --max-unused`.
+#   --max-repack-size SIZE   Passed to `restic prune --max-repack-size`.
+#   --report FILE            Also write restic's output to FILE.
+#   --restic-opts "OPTS"     Space-separated extra restic options from the
+#                            repository's performance profile.
+#   --dry-run                Preview only (restic --dry-run). A prune dry run
+#                            prints restic's estimate of reclaimable space.
+#
 # Usage:
 #   This script is intended to be called internally by the ResticLVM tool.
 #
@@ -32,16 +46,87 @@ KEEP_DAILY="$4"
 KEEP_WEEKLY="$5"
 KEEP_MONTHLY="$6"
 KEEP_YEARLY="$7"
+shift 7
+
+MODE="forget"
+MAX_UNUSED=""
+MAX_REPACK_SIZE=""
+REPORT_FILE="/dev/null"
+RESTIC_OPTS_STR=""
+DRY_RUN=false
+
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        --mode)
+            MODE="$2"
+            shift 2
+            ;;
+        --max-unused)
+            MAX_UNUSED="$2"
+            shift 2
+            ;;
+        --max-repack-size)
+            MAX_REPACK_SIZE="$2"
+            shift 2
+            ;;
+        --report)
+            REPORT_FILE="$2"
+            shift 2
+            ;;
+        --restic-opts)
+            RESTIC_OPTS_STR="$2"
+            shift 2
+            ;;
+        --dry-run)
+            DRY_RUN=true
+            shift
+            ;;
+        *)
+            echo "❌ Unexpected option: $1"
+            exit 1
+            ;;
+    esac
+done
 
-echo "🧹 Starting prune for repo: $RESTIC_REPO"
+RESTIC_OPTS=()
+read -r -a RESTIC_OPTS <<<"$RESTIC_OPTS_STR"
 
-# Run Restic prune operation with specified retention settings
-restic -r "$RESTIC_REPO" --password-file="$PASSWORD_FILE" forget --prune \
-    --keep-last="$KEEP_LAST" \
-    --keep-daily="$KEEP_DAILY" \
-    --keep-weekly="$KEEP_WEEKLY" \
-    --keep-monthly="$KEEP_MONTHLY" \
-    --keep-yearly="$KEEP_YEARLY" \
-    --keep-tag protected
+DRY_RUN_ARGS=()
+if [ "$DRY_RUN" = true ]; then
+    DRY_RUN_ARGS=(--dry-run)
+fi
 
-echo "✅ Prune completed for $RESTIC_REPO"
+case "$MODE" in
+    forget)
+        echo "🧹 Forgetting old snapshots in repo: $RESTIC_REPO"
+        restic -r "$RESTIC_REPO" --password-file="$PASSWORD_FILE" \
+            ${RESTIC_OPTS[@]+"${RESTIC_OPTS[@]}"} forget \
+            "${DRY_RUN_ARGS[@]}" \
+            --keep-last="$KEEP_LAST" \
+            --keep-daily="$KEEP_DAILY" \
+            --keep-weekly="$KEEP_WEEKLY" \
+            --keep-monthly="$KEEP_MONTHLY" \
+            --keep-yearly="$KEEP_YEARLY" \
+            --keep-tag protected \
+            --group-by host,paths | tee "$REPORT_FILE"
+        echo "✅ Forget completed for $RESTIC_REPO"
+        ;;
+    prune)
+        PRUNE_ARGS=("${DRY_RUN_ARGS[@]}")
+        if [ -n "$MAX_UNUSED" ]; then
+            PRUNE_ARGS+=(--max-unused "$MAX_UNUSED")
+        fi
+        if [ -n "$MAX_REPACK_SIZE" ]; then
+            PRUNE_ARGS+=(--max-repack-size "$MAX_REPACK_SIZE")
+        fi
+        echo "🧹 Pruning unreferenced data in repo: $RESTIC_REPO"
+        restic -r "$RESTIC_REPO" --password-file="$PASSWORD_FILE" \
+            ${RESTIC_OPTS[@]+"${RESTIC_OPTS[@]}"} prune \
+            "${PRUNE_ARGS[@]}" | tee "$REPORT_FILE"
+        echo "✅ Prune completed for $RESTIC_REPO"
+        ;;
+    *)
+        echo "❌ Unknown mode: $MODE (expected forget or prune)"
+        exit 1
+        ;;
+esac
@@ -0,0 +1,139 @@
+#!/bin/bash
+
+# Recreate a volume group and its filesystems on blank disks.
+#
+# The volume group is restored from a vgcfgbackup file (as stored in the
+# layout manifest): each physical volume is recreated with its original UUID
+# on the given device, the metadata is restored with vgcfgrestore, and each
+# logical volume is formatted with its original filesystem type, UUID and
+# label. Intended to be called by `rlvm rebuild`.
+#
+# Arguments:
+#   -g  Volume group name.
+#   -c  vgcfgbackup file of the volume group.
+#   -p  PV_UUID=DEVICE (repeatable): device to recreate a physical volume on.
+#   -F  LV=FSTYPE=UUID=LABEL (repeatable): filesystem to create on an LV.
+#       UUID and LABEL may be empty.
+#   -n  (Optional) Dry-run mode.
+#
+# Exit codes:
+#   0  Success
+#   1  Any fatal error
+
+set -euo pipefail
+
+SCRIPT_DIR="$(dirname "$0")"
+
+# shellcheck disable=SC1091
+source "$SCRIPT_DIR/lib/command_runners.sh"
+# shellcheck disable=SC1091
+source "$SCRIPT_DIR/lib/pre_checks.sh"
+
+# ─── Require Running as Root ─────────────────────────────────────
+root_check
+
+# ─── Parse Arguments ─────────────────────────────────────────────
+VG_NAME=""
+VGCFG_FILE=""
+PV_SPECS=()
+FS_SPECS=()
+DRY_RUN=false
+
+usage() {
+    echo "Usage: $0 -g VG -c VGCFG_FILE -p PV_UUID=DEVICE... [-F LV=FSTYPE=UUID=LABEL...] [-n]"
+    exit 1
+}
+
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+    -g | --vg-name)
+        VG_NAME="$2"
+        shift 2
+        ;;
+    -c | --vgcfg-file)
+        VGCFG_FILE="$2"
+        shift 2
+        ;;
+    -p | --pv)
+        PV_SPECS+=("$2")
+        shift 2
+        ;;
+    -F | --filesystem)
+        FS_SPECS+=("$2")
+        shift 2
+        ;;
+    -n | --dry-run)
+        DRY_RUN=true
+        shift
+        ;;
+    *)
+        echo "❌ Unknown option: $1"
+        usage
+        ;;
+    esac
+done
+
+if [[ -z "$VG_NAME" || -z "$VGCFG_FILE" || ${#PV_SPECS[@]} -eq 0 ]]; then
+    echo "❌ Error: -g, -c, and at least one -p are required"
+    usage
+fi
+
+# ─── Pre-checks ───────────────────────────────────────────────────
+if [[ ! -f "$VGCFG_FILE" ]]; then
+    echo "❌ Error: $VGCFG_FILE not found"
+    exit 1
+fi
+if vgs "$VG_NAME" &>/dev/null; then
+    echo "❌ Error: volume group $VG_NAME already exists"
+    exit 1
+fi
+for spec in "${PV_SPECS[@]}"; do
+    device="${spec#*=}"
+    if [[ ! -b "$device" ]]; then
+        echo "❌ Error: $device is not a block device"
+        exit 1
+    fi
+    # blkid -p exits 2 when the device carries no signature.
+    if blkid -p "$device" &>/dev/null; then
+        echo "❌ Error: $device is not blank (clear it with wipefs first)"
+        exit 1
+    fi
+done
+
+# ─── Recreate Physical Volumes and Volume Group ──────────────────
+echo "🧱 Recreating volume group $VG_NAME..."
+for spec in "${PV_SPECS[@]}"; do
+    uuid="${spec%%=*}"
+    device="${spec#*=}"
+    run_or_echo "$DRY_RUN" "pvcreate --uuid $uuid --restorefile \"$VGCFG_FILE\" $device"
+done
+run_or_echo "$DRY_RUN" "vgcfgrestore -f \"$VGCFG_FILE\" $VG_NAME"
+run_or_echo "$DRY_RUN" "vgchange -ay $VG_NAME"
+
+# ─── Create Filesystems ───────────────────────────────────────────
+for spec in "${FS_SPECS[@]}"; do
+    IFS='=' read -r lv fstype uuid label <<<"$spec"
+    device="/dev/$VG_NAME/$lv"
+    case "$fstype" in
+    ext2 | ext3 | ext4)
+        cmd="mkfs -t $fstype -F${uuid:+ -U $uuid}${label:+ -L \"$label\"} $device"
+        ;;
+    xfs)
+        cmd="mkfs.xfs -f${uuid:+ -m uuid=$uuid}${label:+ -L \"$label\"} $device"
+        ;;
+    btrfs)
+        cmd="mkfs.btrfs -f${uuid:+ -U $uuid}${label:+ -L \"$label\"} $device"
+        ;;
+    swap)
+        cmd="mkswap${uuid:+ -U $uuid}${label:+ -L \"$label\"} $device"
+        ;;
+    *)
+        echo "⚠️  Original UUID/label not reproduced for $fstype on $device"
+        cmd="mkfs -t $fstype $device"
+        ;;
+    esac
+    echo "🆕 Creating $fstype on $device..."
+    run_or_echo "$DRY_RUN" "$cmd"
+done
+
+echo "✅ Volume group $VG_NAME rebuilt."
@@ -0,0 +1,122 @@
+#!/bin/bash
+
+# Create, format and mount a fresh logical volume to restore a volume into.
+#
+# The new LV is created next to the original one, named
+# <LV>_restore_<TIMESTAMP>, with the original's size and filesystem type
+# unless given. The original LV is never touched. Intended to be called by
+# `rlvm restore --new-lv`, which unmounts the LV again once the restore is
+# done and leaves it in place for the administrator to swap in.
+#
+# Arguments:
+#   -g  Volume group name.
+#   -l  Name of the original logical volume.
+#   -t  Timestamp (YYYYmmdd_HHMMSS) used in the LV and mount point names.
+#   -z  (Optional) Size of the new LV (default: the original's size).
+#   -f  (Optional) Filesystem type (default: the original's, else ext4).
+#   -n  (Optional) Dry-run mode.
+#
+# Output (stdout, machine-parseable):
+#   RESTORE_DEVICE=/dev/VG/LV_restore_TIMESTAMP
+#   RESTORE_MOUNT_POINT=/tmp/resticlvm-restore-TIMESTAMP/LV_restore_TIMESTAMP
+#   FS_TYPE=ext4
+#
+# Exit codes:
+#   0  Success
+#   1  Any fatal error
+
+set -euo pipefail
+
+SCRIPT_DIR="$(dirname "$0")"
+
+# shellcheck disable=SC1091
+source "$SCRIPT_DIR/lib/command_runners.sh"
+# shellcheck disable=SC1091
+source "$SCRIPT_DIR/lib/pre_checks.sh"
+
+# ─── Require Running as Root ─────────────────────────────────────
+root_check
+
+# ─── Parse Arguments ─────────────────────────────────────────────
+VG_NAME=""
+LV_NAME=""
+TIMESTAMP=""
+LV_SIZE=""
+FS_TYPE=""
+DRY_RUN=false
+
+usage() {
+    echo "Usage: $0 -g VG -l LV -t TIMESTAMP [-z SIZE] [-f FSTYPE] [-n]" >&2
+    exit 1
+}
+
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+    -g | --vg-name)
+        VG_NAME="$2"
+        shift 2
+        ;;
+    -l | --lv-name)
+        LV_NAME="$2"
+        shift 2
+        ;;
+    -t | --timestamp)
+        TIMESTAMP="$2"
+        shift 2
+        ;;
+    -z | --size)
+        LV_SIZE="$2"
+        shift 2
+        ;;
+    -f | --fs-type)
+        FS_TYPE="$2"
+        shift 2
+        ;;
+    -n | --dry-run)
+        DRY_RUN=true
+        shift
+        ;;
+    *)
+        echo "❌ Unknown option: $1" >&2
+        usage
+        ;;
+    esac
+done
+
+if [[ -z "$VG_NAME" || -z "$LV_NAME" || -z "$TIMESTAMP" ]]; then
+    echo "❌ Error: -g, -l, and -t are required" >&2
+    usage
+fi
+
+# ─── Derived Variables ───────────────────────────────────────────
+LV_DEVICE_PATH="/dev/$VG_NAME/$LV_NAME"
+RESTORE_LV_NAME="${LV_NAME}_restore_${TIMESTAMP}"
+RESTORE_DEVICE="/dev/$VG_NAME/$RESTORE_LV_NAME"
+RESTORE_MOUNT_POINT="/tmp/resticlvm-restore-${TIMESTAMP}/${RESTORE_LV_NAME}"
+
+# ─── Pre-checks ───────────────────────────────────────────────────
+check_device_path "$LV_DEVICE_PATH"
+if [[ -e "$RESTORE_DEVICE" ]]; then
+    echo "❌ Error: $RESTORE_DEVICE already exists" >&2
+    exit 1
+fi
+
+if [[ -z "$LV_SIZE" ]]; then
+    LV_SIZE="$(lvs --noheadings --nosuffix --units b -o lv_size "$LV_DEVICE_PATH" | tr -d ' ')B"
+fi
+if [[ -z "$FS_TYPE" ]]; then
+    FS_TYPE=$(blkid -o value -s TYPE "$LV_DEVICE_PATH" 2>/dev/null || true)
+    FS_TYPE="${FS_TYPE:-ext4}"
+fi
+
+# ─── Create, Format and Mount ─────────────────────────────────────
+echo "🆕 Creating $RESTORE_DEVICE ($LV_SIZE, $FS_TYPE)..." >&2
+run_or_echo "$DRY_RUN" "lvcreate --yes --size $LV_SIZE --name $RESTORE_LV_NAME $VG_NAME" >&2
+run_or_echo "$DRY_RUN" "mkfs -t $FS_TYPE $RESTORE_DEVICE" >&2
+run_or_echo "$DRY_RUN" "mkdir -p \"$RESTORE_MOUNT_POINT\"" >&2
+run_or_echo "$DRY_RUN" "mount $RESTORE_DEVICE \"$RESTORE_MOUNT_POINT\"" >&2
+
+# ─── Output (machine-parseable) ──────────────────────────────────
+echo "RESTORE_DEVICE=$RESTORE_DEVICE"
+echo "RESTORE_MOUNT_POINT=$RESTORE_MOUNT_POINT"
+echo "FS_TYPE=$FS_TYPE"
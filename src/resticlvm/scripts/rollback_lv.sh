@@ -0,0 +1,142 @@
+#!/bin/bash
+
+# Roll a logical volume back to a retained snapshot.
+#
+# Two modes:
+#   merge     `lvconvert --merge` the snapshot into its origin. The whole
+#             volume returns to the snapshot's state and the snapshot is
+#             consumed. If the origin is in use (e.g. the mounted root
+#             filesystem), LVM defers the merge until the origin is next
+#             activated, normally at the next reboot.
+#   copy-out  Mount the snapshot read-only and rsync the given paths back
+#             into the live filesystem (or into a target directory). Only
+#             those paths change and the snapshot is kept.
+#
+# Intended to be called by `rlvm rollback`.
+#
+# Arguments:
+#   -g  Volume group name.
+#   -s  Name of the retained snapshot LV.
+#   -M  Merge mode.
+#   -p  (copy-out, repeatable) Path to copy out, relative to the volume root.
+#   -d  (copy-out) Directory to copy into: the volume's live mount point or
+#       another target.
+#   -t  Timestamp (YYYYmmdd_HHMMSS) used in the temporary mount point name.
+#   -n  (Optional) Dry-run mode.
+#
+# Exit codes:
+#   0  Success
+#   1  Any fatal error
+
+set -euo pipefail
+
+SCRIPT_DIR="$(dirname "$0")"
+
+# shellcheck disable=SC1091
+source "$SCRIPT_DIR/lib/command_runners.sh"
+# shellcheck disable=SC1091
+source "$SCRIPT_DIR/lib/pre_checks.sh"
+# shellcheck disable=SC1091
+source "$SCRIPT_DIR/lib/lv_snapshots.sh"
+
+# ─── Require Running as Root ─────────────────────────────────────
+root_check
+
+# ─── Parse Arguments ─────────────────────────────────────────────
+VG_NAME=""
+SNAP_NAME=""
+MERGE=false
+PATHS=()
+DEST_DIR=""
+TIMESTAMP=""
+DRY_RUN=false
+
+usage() {
+    echo "Usage: $0 -g VG -s SNAP -t TIMESTAMP (-M | -p PATH... -d DIR) [-n]" >&2
+    exit 1
+}
+
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+    -g | --vg-name)
+        VG_NAME="$2"
+        shift 2
+        ;;
+    -s | --snap-name)
+        SNAP_NAME="$2"
+        shift 2
+        ;;
+    -M | --merge)
+        MERGE=true
+        shift
+        ;;
+    -p | --path)
+        PATHS+=("$2")
+        shift 2
+        ;;
+    -d | --dest)
+        DEST_DIR="$2"
+        shift 2
+        ;;
+    -t | --timestamp)
+        TIMESTAMP="$2"
+        shift 2
+        ;;
+    -n | --dry-run)
+        DRY_RUN=true
+        shift
+        ;;
+    *)
+        echo "❌ Unknown option: $1" >&2
+        usage
+        ;;
+    esac
+done
+
+if [[ -z "$VG_NAME" || -z "$SNAP_NAME" || -z "$TIMESTAMP" ]]; then
+    echo "❌ Error: -g, -s, and -t are required" >&2
+    usage
+fi
+if [[ "$MERGE" == false && (-z "$DEST_DIR" || ${#PATHS[@]} -eq 0) ]]; then
+    echo "❌ Error: copy-out needs -d and at least one -p" >&2
+    usage
+fi
+
+SNAP_DEVICE="/dev/$VG_NAME/$SNAP_NAME"
+check_device_path "$SNAP_DEVICE"
+
+# ─── Merge ────────────────────────────────────────────────────────
+if [[ "$MERGE" == true ]]; then
+    echo "⏪ Merging $SNAP_NAME into its origin..."
+    run_or_echo "$DRY_RUN" "lvconvert --merge $SNAP_DEVICE"
+    exit 0
+fi
+
+# ─── Copy Out ─────────────────────────────────────────────────────
+MOUNT_BASE="/tmp/resticlvm-rollback-${TIMESTAMP}"
+SNAPSHOT_MOUNT_POINT="$MOUNT_BASE/$SNAP_NAME"
+
+if [[ "$DRY_RUN" != true ]]; then
+    trap 'cleanup_snapshot_resources "$SNAPSHOT_MOUNT_POINT" "$MOUNT_BASE" "" ""' EXIT
+fi
+# Same read-only options as backups (nouuid/norecovery on XFS, noload on
+# ext3/4): the origin is usually mounted, and the snapshot must not change.
+mount_snapshot_readonly "$DRY_RUN" "$SNAPSHOT_MOUNT_POINT" "$VG_NAME" "$SNAP_NAME"
+
+for path in "${PATHS[@]}"; do
+    rel="${path#/}"
+    src="$SNAPSHOT_MOUNT_POINT/$rel"
+    dest="$DEST_DIR/$rel"
+    if [[ "$DRY_RUN" != true && ! -e "$src" ]]; then
+        echo "❌ Error: $path does not exist in $SNAP_NAME" >&2
+        exit 1
+    fi
+    echo "⏪ Restoring /$rel from $SNAP_NAME..."
+    if [[ "$DRY_RUN" == true || -d "$src" ]]; then
+        run_or_echo "$DRY_RUN" "mkdir -p \"$dest\""
+        run_or_echo "$DRY_RUN" "rsync -aHAX --delete \"$src/\" \"$dest/\""
+    else
+        run_or_echo "$DRY_RUN" "mkdir -p \"$(dirname "$dest")\""
+        run_or_echo "$DRY_RUN" "rsync -aHAX \"$src\" \"$dest\""
+    fi
+done
@@ -1,6 +1,7 @@
 #!/bin/bash
 
-# Create and mount a single LVM snapshot for batch snapshot coordination.
+# Create (and by default mount) a single LVM snapshot for batch snapshot
+# coordination.
 #
 # This script is the "create" half of the snapshot lifecycle, intended to be
 # called by the Python SnapshotCoordinator. It does NOT install a cleanup
@@ -11,6 +12,11 @@
 #   -l  Logical volume name.
 #   -z  Snapshot size (e.g., "5G").
 #   -t  (Optional) Batch timestamp (YYYYmmdd_HHMMSS). If omitted, generates one.
+#   -T  (Optional) Create a thin snapshot (no -z size) if the LV is thin.
+#   -c  (Optional) COW chunk size of a classic snapshot (e.g. "64K").
+#   -P  (Optional, repeatable) PV to allocate a classic snapshot's COW area on.
+#   -N  (Optional) Do not mount the snapshot; snapshot_mount.sh mounts it
+#       later at the SNAPSHOT_MOUNT_POINT printed below.
 #   -n  (Optional) Dry-run mode.
 #
 # Output (stdout, machine-parseable):
@@ -18,6 +24,7 @@
 #   SNAPSHOT_MOUNT_POINT=/tmp/resticlvm-TIMESTAMP/SNAP_NAME
 #   MOUNT_BASE=/tmp/resticlvm-TIMESTAMP
 #   SNAP_NAME=vg_lv_snapshot_TIMESTAMP
+#   SNAP_TYPE=classic|thin
 #
 # Exit codes:
 #   0  Success
@@ -42,6 +49,10 @@ VG_NAME=""
 LV_NAME=""
 SNAPSHOT_SIZE=""
 BATCH_TIMESTAMP=""
+THIN_IF_POSSIBLE=false
+NO_MOUNT=false
+CHUNKSIZE=""
+COW_PVS=()
 DRY_RUN=false
 
 while [[ $# -gt 0 ]]; do
@@ -62,13 +73,29 @@ while [[ $# -gt 0 ]]; do
         BATCH_TIMESTAMP="$2"
         shift 2
         ;;
+    -T | --thin-if-possible)
+        THIN_IF_POSSIBLE=true
+        shift
+        ;;
+    -c | --chunksize)
+        CHUNKSIZE="$2"
+        shift 2
+        ;;
+    -P | --pv)
+        COW_PVS+=("$2")
+        shift 2
+        ;;
+    -N | --no-mount)
+        NO_MOUNT=true
+        shift
+        ;;
     -n | --dry-run)
         DRY_RUN=true
         shift
         ;;
     *)
         echo "❌ Unknown option: $1" >&2
-        echo "Usage: $0 -g VG -l LV -z SIZE [-t TIMESTAMP] [-n]" >&2
+        echo "Usage: $0 -g VG -l LV -z SIZE [-t TIMESTAMP] [-T] [-c CHUNKSIZE] [-P PV]... [-N] [-n]" >&2
         exit 1
         ;;
     esac
@@ -77,7 +104,7 @@ done
 # ─── Validate ─────────────────────────────────────────────────────
 if [[ -z "$VG_NAME" || -z "$LV_NAME" || -z "$SNAPSHOT_SIZE" ]]; then
     echo "❌ Error: -g, -l, and -z are required" >&2
-    echo "Usage: $0 -g VG -l LV -z SIZE [-t TIMESTAMP] [-n]" >&2
+    echo "Usage: $0 -g VG -l LV -z SIZE [-t TIMESTAMP] [-T] [-c CHUNKSIZE] [-P PV]... [-N] [-n]" >&2
     exit 1
 fi
 
@@ -98,11 +125,24 @@ check_device_path "$LV_DEVICE_PATH"
 confirm_not_yet_exist_snapshot_mount_point "$SNAPSHOT_MOUNT_POINT"
 
 # ─── Create and Mount ────────────────────────────────────────────
-create_snapshot "$DRY_RUN" "$SNAPSHOT_SIZE" "$SNAP_NAME" "$VG_NAME" "$LV_NAME"
-mount_snapshot "$DRY_RUN" "$SNAPSHOT_MOUNT_POINT" "$VG_NAME" "$SNAP_NAME"
+SNAP_TYPE=classic
+if [[ "$THIN_IF_POSSIBLE" == true ]] \
+    && [[ "$(lvs --noheadings -o segtype "$LV_DEVICE_PATH" 2>/dev/null | tr -d ' ')" == thin ]]; then
+    SNAP_TYPE=thin
+fi
+if [[ "$SNAP_TYPE" == thin ]]; then
+    create_thin_snapshot "$DRY_RUN" "$SNAP_NAME" "$VG_NAME" "$LV_NAME"
+else
+    create_snapshot "$DRY_RUN" "$SNAPSHOT_SIZE" "$SNAP_NAME" "$VG_NAME" "$LV_NAME" \
+        "$CHUNKSIZE" ${COW_PVS[@]+"${COW_PVS[@]}"}
+fi
+if [[ "$NO_MOUNT" != true ]]; then
+    mount_snapshot "$DRY_RUN" "$SNAPSHOT_MOUNT_POINT" "$VG_NAME" "$SNAP_NAME"
+fi
 
 # ─── Output (machine-parseable) ──────────────────────────────────
 echo "SNAPSHOT_DEVICE=$LV_DEVICE_PATH"
 echo "SNAPSHOT_MOUNT_POINT=$SNAPSHOT_MOUNT_POINT"
 echo "MOUNT_BASE=$MOUNT_BASE"
 echo "SNAP_NAME=$SNAP_NAME"
+echo "SNAP_TYPE=$SNAP_TYPE"
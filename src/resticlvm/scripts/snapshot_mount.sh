@@ -0,0 +1,106 @@
+#!/bin/bash
+
+# Mount an LVM snapshot created by `snapshot_create.sh -N`.
+#
+# SnapshotCoordinator creates every snapshot first and mounts them afterwards,
+# so that mounting stays out of the window in which the snapshots are taken.
+# Teardown is left to snapshot_teardown.sh.
+#
+# By default the snapshot is mounted read-only with options that keep the
+# mount from writing to its COW area (see mount_snapshot_readonly in
+# lib/lv_snapshots.sh). Backups that chroot into the snapshot get a writable
+# overlay on top of it (-o).
+#
+# Arguments:
+#   -g  Volume group name.
+#   -s  Snapshot name (the LV name of the snapshot).
+#   -m  Mount point to create and mount the snapshot at.
+#   -p  (Optional) Mount profile: "readonly" (default) or "legacy", a plain
+#       read-write mount that replays the journal and updates atimes.
+#   -o  (Optional) Stack a writable overlay on the read-only mount, for a
+#       chroot. Ignored with the legacy profile.
+#   -r  (Optional) Activate the snapshot LV read-only before mounting it.
+#   -n  (Optional) Dry-run mode.
+#
+# Exit codes:
+#   0  Success
+#   1  Any fatal error
+
+set -euo pipefail
+
+SCRIPT_DIR="$(dirname "$0")"
+
+# shellcheck disable=SC1091
+source "$SCRIPT_DIR/lib/command_runners.sh"
+# shellcheck disable=SC1091
+source "$SCRIPT_DIR/lib/lv_snapshots.sh"
+
+# ─── Parse Arguments ─────────────────────────────────────────────
+VG_NAME=""
+SNAP_NAME=""
+SNAPSHOT_MOUNT_POINT=""
+PROFILE="readonly"
+OVERLAY=false
+READONLY_LV=false
+DRY_RUN=false
+
+usage() {
+    echo "Usage: $0 -g VG -s SNAP_NAME -m MOUNT_POINT [-p readonly|legacy] [-o] [-r] [-n]" >&2
+    exit 1
+}
+
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+    -g | --vg-name)
+        VG_NAME="$2"
+        shift 2
+        ;;
+    -s | --snap-name)
+        SNAP_NAME="$2"
+        shift 2
+        ;;
+    -m | --mount-point)
+        SNAPSHOT_MOUNT_POINT="$2"
+        shift 2
+        ;;
+    -p | --profile)
+        PROFILE="$2"
+        shift 2
+        ;;
+    -o | --overlay)
+        OVERLAY=true
+        shift
+        ;;
+    -r | --readonly-lv)
+        READONLY_LV=true
+        shift
+        ;;
+    -n | --dry-run)
+        DRY_RUN=true
+        shift
+        ;;
+    *)
+        echo "❌ Unknown option: $1" >&2
+        usage
+        ;;
+    esac
+done
+
+# ─── Validate ─────────────────────────────────────────────────────
+if [[ -z "$VG_NAME" || -z "$SNAP_NAME" || -z "$SNAPSHOT_MOUNT_POINT" ]]; then
+    echo "❌ Error: -g, -s, and -m are required" >&2
+    usage
+fi
+if [[ "$PROFILE" != readonly && "$PROFILE" != legacy ]]; then
+    echo "❌ Error: unknown mount profile: $PROFILE" >&2
+    usage
+fi
+
+# ─── Mount ────────────────────────────────────────────────────────
+if [[ "$PROFILE" == legacy ]]; then
+    mount_snapshot "$DRY_RUN" "$SNAPSHOT_MOUNT_POINT" "$VG_NAME" "$SNAP_NAME"
+elif [[ "$OVERLAY" == true ]]; then
+    mount_snapshot_overlay "$DRY_RUN" "$SNAPSHOT_MOUNT_POINT" "$VG_NAME" "$SNAP_NAME" "$READONLY_LV"
+else
+    mount_snapshot_readonly "$DRY_RUN" "$SNAPSHOT_MOUNT_POINT" "$VG_NAME" "$SNAP_NAME" "$READONLY_LV"
+fi
@@ -8,9 +8,14 @@
 #
 # Arguments:
 #   -g  Volume group name.
-#   -s  Snapshot name (the LV name of the snapshot).
+#   -s  Snapshot name (the LV name of the snapshot). -g and -s may both be
+#       left out to release only the mounts and directories (rlvm cleanup).
 #   -m  Snapshot mount point.
 #   -b  Mount base directory (parent of the mount point).
+#   -k  (Optional) Keep the snapshot LV, renamed to this name, as a rollback
+#       point. Only the mounts and directories are cleaned up. If the rename
+#       fails the snapshot is removed as usual. A snapshot activated
+#       read-only is made writable again first.
 #   -n  (Optional) Dry-run mode.
 #
 # Exit codes:
@@ -31,6 +36,7 @@ VG_NAME=""
 SNAP_NAME=""
 SNAPSHOT_MOUNT_POINT=""
 MOUNT_BASE=""
+KEEP_NAME=""
 DRY_RUN=false
 
 while [[ $# -gt 0 ]]; do
@@ -51,30 +57,52 @@ while [[ $# -gt 0 ]]; do
         MOUNT_BASE="$2"
         shift 2
         ;;
+    -k | --keep-as)
+        KEEP_NAME="$2"
+        shift 2
+        ;;
     -n | --dry-run)
         DRY_RUN=true
         shift
         ;;
     *)
         echo "❌ Unknown option: $1" >&2
-        echo "Usage: $0 -g VG -s SNAP_NAME -m MOUNT_POINT -b MOUNT_BASE [-n]" >&2
+        echo "Usage: $0 [-g VG -s SNAP_NAME] -m MOUNT_POINT -b MOUNT_BASE [-k KEEP_NAME] [-n]" >&2
         exit 1
         ;;
     esac
 done
 
 # ─── Validate ─────────────────────────────────────────────────────
-if [[ -z "$VG_NAME" || -z "$SNAP_NAME" || -z "$SNAPSHOT_MOUNT_POINT" || -z "$MOUNT_BASE" ]]; then
-    echo "❌ Error: -g, -s, -m, and -b are required" >&2
-    echo "Usage: $0 -g VG -s SNAP_NAME -m MOUNT_POINT -b MOUNT_BASE [-n]" >&2
+if [[ -z "$SNAPSHOT_MOUNT_POINT" || -z "$MOUNT_BASE" ]] \
+    || [[ -z "$VG_NAME" && -n "$SNAP_NAME" ]] || [[ -n "$VG_NAME" && -z "$SNAP_NAME" ]]; then
+    echo "❌ Error: -m and -b are required, and -g and -s go together" >&2
+    echo "Usage: $0 [-g VG -s SNAP_NAME] -m MOUNT_POINT -b MOUNT_BASE [-k KEEP_NAME] [-n]" >&2
     exit 1
 fi
 
 # ─── Teardown ─────────────────────────────────────────────────────
 if [ "$DRY_RUN" = true ]; then
-    echo -e "${DRY_RUN_PREFIX} cleanup_snapshot_resources \"$SNAPSHOT_MOUNT_POINT\" \"$MOUNT_BASE\" \"$VG_NAME\" \"$SNAP_NAME\""
+    if [ -n "$KEEP_NAME" ]; then
+        echo -e "${DRY_RUN_PREFIX} cleanup_snapshot_resources \"$SNAPSHOT_MOUNT_POINT\" \"$MOUNT_BASE\" \"\" \"\""
+        echo -e "${DRY_RUN_PREFIX} lvrename $VG_NAME $SNAP_NAME $KEEP_NAME"
+    else
+        echo -e "${DRY_RUN_PREFIX} cleanup_snapshot_resources \"$SNAPSHOT_MOUNT_POINT\" \"$MOUNT_BASE\" \"$VG_NAME\" \"$SNAP_NAME\""
+    fi
+elif [ -n "$KEEP_NAME" ]; then
+    echo "🧹 Unmounting snapshot $SNAP_NAME..."
+    cleanup_snapshot_resources "$SNAPSHOT_MOUNT_POINT" "$MOUNT_BASE" "" ""
+    # A snapshot mounted with -r was activated read-only; a rollback point
+    # has to stay mergeable.
+    lvchange --permission rw "$VG_NAME/$SNAP_NAME" >/dev/null 2>&1 || true
+    if lvrename "$VG_NAME" "$SNAP_NAME" "$KEEP_NAME" >/dev/null 2>&1; then
+        echo "📌 Kept snapshot as $VG_NAME/$KEEP_NAME for rollback (unmounted in ${TEARDOWN_SECONDS}s)."
+    else
+        echo "⚠️  Could not rename $SNAP_NAME to $KEEP_NAME — removing it." >&2
+        cleanup_snapshot_resources "" "" "$VG_NAME" "$SNAP_NAME"
+    fi
 else
-    echo "🧹 Tearing down snapshot $SNAP_NAME..."
+    echo "🧹 Tearing down snapshot ${SNAP_NAME:-$SNAPSHOT_MOUNT_POINT}..."
     cleanup_snapshot_resources "$SNAPSHOT_MOUNT_POINT" "$MOUNT_BASE" "$VG_NAME" "$SNAP_NAME"
-    echo "✅ Snapshot $SNAP_NAME teardown complete."
+    echo "✅ Snapshot ${SNAP_NAME:-$SNAPSHOT_MOUNT_POINT} teardown complete in ${TEARDOWN_SECONDS}s."
 fi
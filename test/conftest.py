@@ -0,0 +1,9 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_state_dir(tmp_path, monkeypatch):
+    """Keep rlvm state files out of /var/lib/resticlvm during tests."""
+    monkeypatch.setenv("RESTICLVM_STATE_DIR", str(tmp_path / "state"))
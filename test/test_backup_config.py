@@ -1,5 +1,7 @@
 """Tests for the backup_config module."""
 
+from pathlib import Path
+
 import pytest
 
 from resticlvm.orchestration.backup_config import (
@@ -338,3 +340,497 @@ def test_snapshot_settings_partial():
     cfg = BackupConfigFactory(raw).build()
     assert cfg.snapshot_settings.min_vg_free_after_snapshots == "1G"
     assert cfg.snapshot_settings.snapshot_cow_warn_percent == 50
+
+
+def test_snapshot_geometry():
+    """snapshot_chunksize and snapshot_pvs are validated per LV volume."""
+    raw = _minimal_config()
+    raw["volume"]["root"] = {
+        "volume_type": "lv_root",
+        "vg_name": "vg0",
+        "lv_name": "root",
+        "snapshot_size": "2G",
+        "backup_source_path": "/",
+        "snapshot_chunksize": "64K",
+        "snapshot_pvs": "/dev/sdb1",
+        "repositories": raw["volume"]["boot"]["repositories"],
+    }
+    cfg = BackupConfigFactory(raw).build()
+    assert cfg.volumes["root"].snapshot_chunksize == "64K"
+    assert cfg.volumes["root"].snapshot_pvs == ["/dev/sdb1"]
+    assert cfg.snapshot_settings.separate_cow_pv is True
+
+    raw["volume"]["root"]["snapshot_chunksize"] = "1M"
+    with pytest.raises(ValueError, match="chunk size"):
+        BackupConfigFactory(raw).build()
+
+    raw["volume"]["boot"]["snapshot_pvs"] = ["/dev/sdb1"]
+    raw["volume"]["root"]["snapshot_chunksize"] = "64K"
+    with pytest.raises(ValueError, match="snapshot_pvs needs an LV"):
+        BackupConfigFactory(raw).build()
+
+
+def test_consistency_group():
+    """consistency_group is a non-empty name, for LV volumes only."""
+    raw = _minimal_config()
+    raw["volume"]["root"] = {
+        "volume_type": "lv_root",
+        "vg_name": "vg0",
+        "lv_name": "root",
+        "snapshot_size": "2G",
+        "backup_source_path": "/",
+        "consistency_group": "system",
+        "repositories": raw["volume"]["boot"]["repositories"],
+    }
+    cfg = BackupConfigFactory(raw).build()
+    assert cfg.volumes["root"].consistency_group == "system"
+    assert cfg.volumes["boot"].consistency_group is None
+
+    raw["volume"]["root"]["consistency_group"] = ""
+    with pytest.raises(ValueError, match="non-empty"):
+        BackupConfigFactory(raw).build()
+
+    raw["volume"]["root"]["consistency_group"] = "system"
+    raw["volume"]["boot"]["consistency_group"] = "system"
+    with pytest.raises(ValueError, match="consistency_group needs an LV"):
+        BackupConfigFactory(raw).build()
+
+
+def test_snapshot_mount_profile():
+    """Snapshots mount read-only by default; unknown profiles are rejected."""
+    raw = _minimal_config()
+    cfg = BackupConfigFactory(raw).build()
+    assert cfg.snapshot_settings.mount_profile == "readonly"
+    assert cfg.snapshot_settings.snapshot_readonly_lv is False
+
+    raw["snapshot_settings"] = {"mount_profile": "legacy", "snapshot_readonly_lv": True}
+    cfg = BackupConfigFactory(raw).build()
+    assert cfg.snapshot_settings.mount_profile == "legacy"
+    assert cfg.snapshot_settings.snapshot_readonly_lv is True
+
+    raw["snapshot_settings"] = {"mount_profile": "rw"}
+    with pytest.raises(ValueError, match="mount_profile"):
+        BackupConfigFactory(raw).build()
+
+
+# ─── copy_to mirror mode ──────────────────────────────────────────
+
+
+def _config_with_copy_to(copy_entry, repo_path="/srv/backup/boot"):
+    raw = _minimal_config()
+    raw["volume"]["boot"]["repositories"][0]["repo_path"] = repo_path
+    raw["volume"]["boot"]["repositories"][0]["copy_to"] = [copy_entry]
+    return raw
+
+
+def test_copy_dest_defaults_to_copy_mode():
+    raw = _config_with_copy_to({
+        "repo": "sftp:host:/backup/boot",
+        "password_file": "/tmp/pw.txt",
+        "prune_policy": "standard",
+    })
+    dest = BackupConfigFactory(raw).build().volumes["boot"].repositories[0].copy_destinations[0]
+    assert dest.mode == "copy"
+
+
+def test_mirror_mode_parsed_without_prune_policy():
+    """Mirror destinations follow the source, so prune_policy is optional."""
+    raw = _config_with_copy_to({
+        "repo": "sftp:user@host:/backup/boot",
+        "password_file": "/tmp/pw.txt",
+        "mode": "mirror",
+    })
+    dest = BackupConfigFactory(raw).build().volumes["boot"].repositories[0].copy_destinations[0]
+    assert dest.mode == "mirror"
+    assert dest.prune_keep_params is None
+
+
+def test_unknown_copy_mode_raises():
+    raw = _config_with_copy_to({
+        "repo": "sftp:host:/backup/boot",
+        "password_file": "/tmp/pw.txt",
+        "prune_policy": "standard",
+        "mode": "rsync",
+    })
+    with pytest.raises(ValueError, match="unknown mode"):
+        BackupConfigFactory(raw).build()
+
+
+def test_mirror_mode_requires_local_source():
+    raw = _config_with_copy_to(
+        {
+            "repo": "/srv/mirror/boot",
+            "password_file": "/tmp/pw.txt",
+            "mode": "mirror",
+        },
+        repo_path="sftp:host:/backup/boot",
+    )
+    with pytest.raises(ValueError, match="local source"):
+        BackupConfigFactory(raw).build()
+
+
+def test_mirror_mode_rejects_unsupported_destination():
+    raw = _config_with_copy_to({
+        "repo": "s3:s3.example.com/bucket/boot",
+        "password_file": "/tmp/pw.txt",
+        "mode": "mirror",
+    })
+    with pytest.raises(ValueError, match="mirror mode supports"):
+        BackupConfigFactory(raw).build()
+
+
+# ─── copy_to topology (source = another destination) ─────────────
+
+
+def _config_with_copy_chain(entries):
+    raw = _minimal_config()
+    raw["volume"]["boot"]["repositories"][0]["copy_to"] = entries
+    return raw
+
+
+def test_copy_dest_source_parsed():
+    raw = _config_with_copy_chain([
+        {"name": "nas", "repo": "/mnt/nas/boot",
+         "password_file": "/tmp/pw.txt", "prune_policy": "standard"},
+        {"name": "b2", "source": "nas", "repo": "s3:s3.example.com/b/boot",
+         "password_file": "/tmp/pw.txt", "prune_policy": "standard"},
+    ])
+    dests = BackupConfigFactory(raw).build().volumes["boot"].repositories[0].copy_destinations
+    assert dests[0].name == "nas"
+    assert dests[0].source is None
+    assert dests[1].source == "nas"
+
+
+def test_copy_dest_unknown_source_raises():
+    raw = _config_with_copy_chain([
+        {"repo": "/mnt/nas/boot", "source": "missing",
+         "password_file": "/tmp/pw.txt", "prune_policy": "standard"},
+    ])
+    with pytest.raises(ValueError, match="does not name"):
+        BackupConfigFactory(raw).build()
+
+
+def test_copy_dest_cycle_raises():
+    raw = _config_with_copy_chain([
+        {"name": "a", "source": "b", "repo": "/mnt/a",
+         "password_file": "/tmp/pw.txt", "prune_policy": "standard"},
+        {"name": "b", "source": "a", "repo": "/mnt/b",
+         "password_file": "/tmp/pw.txt", "prune_policy": "standard"},
+    ])
+    with pytest.raises(ValueError, match="cycle"):
+        BackupConfigFactory(raw).build()
+
+
+def test_copy_dest_duplicate_name_raises():
+    raw = _config_with_copy_chain([
+        {"name": "a", "repo": "/mnt/a",
+         "password_file": "/tmp/pw.txt", "prune_policy": "standard"},
+        {"name": "a", "repo": "/mnt/b",
+         "password_file": "/tmp/pw.txt", "prune_policy": "standard"},
+    ])
+    with pytest.raises(ValueError, match="duplicate"):
+        BackupConfigFactory(raw).build()
+
+
+def test_mirror_from_remote_destination_raises():
+    """A mirror's source must be local, including when it is a destination."""
+    raw = _config_with_copy_chain([
+        {"name": "remote", "repo": "sftp:host:/backup/boot",
+         "password_file": "/tmp/pw.txt", "prune_policy": "standard"},
+        {"source": "remote", "repo": "/mnt/mirror", "mode": "mirror",
+         "password_file": "/tmp/pw.txt"},
+    ])
+    with pytest.raises(ValueError, match="local source"):
+        BackupConfigFactory(raw).build()
+
+
+def test_concurrency_defaults_to_sequential():
+    cfg = BackupConfigFactory(_minimal_config()).build()
+    assert cfg.concurrency.max_parallel == 1
+    assert cfg.concurrency.per_backend == {}
+
+
+def test_concurrency_section_parsed():
+    raw = _minimal_config()
+    raw["concurrency"] = {"max_parallel": 4, "per_backend": {"sftp": 1}}
+    cfg = BackupConfigFactory(raw).build()
+    assert cfg.concurrency.max_parallel == 4
+    assert cfg.concurrency.per_backend == {"sftp": 1}
+
+
+# ─── Prune policy repack / cadence settings ───────────────────────
+
+
+def test_prune_policy_defaults_leave_repack_unbounded():
+    params = BackupConfigFactory(_minimal_config()).build().prune_policies["standard"]
+    assert params.max_unused is None
+    assert params.max_repack_size is None
+    assert params.min_reclaimable is None
+    assert params.prune_every_days == 0
+
+
+def test_prune_policy_repack_settings_parsed():
+    raw = _minimal_config()
+    raw["prune_policy"]["standard"] = dict(
+        STANDARD_POLICY,
+        max_unused="10%",
+        max_repack_size="2G",
+        min_reclaimable="500M",
+        prune_every_days=7,
+    )
+    params = BackupConfigFactory(raw).build().prune_policies["standard"]
+    assert params.max_unused == "10%"
+    assert params.max_repack_size == "2G"
+    assert params.min_reclaimable == "500M"
+    assert params.prune_every_days == 7
+
+
+def test_prune_policy_bad_size_raises():
+    raw = _minimal_config()
+    raw["prune_policy"]["standard"] = dict(STANDARD_POLICY, min_reclaimable="lots")
+    with pytest.raises(ValueError, match="min_reclaimable"):
+        BackupConfigFactory(raw).build()
+
+
+# ─── Volume exclusion settings ────────────────────────────────────
+
+
+def test_exclusion_settings_default_to_none():
+    excl = BackupConfigFactory(_minimal_config()).build().volumes["boot"].exclusions
+    assert excl.exclude_file == []
+    assert excl.exclude_caches is False
+    assert excl.exclude_if_present == []
+    assert excl.exclude_larger_than is None
+    assert excl.iexclude == []
+
+
+def test_exclusion_settings_parsed():
+    raw = _minimal_config()
+    raw["volume"]["boot"].update({
+        "exclude_file": "/etc/resticlvm/boot.exclude",
+        "exclude_caches": True,
+        "exclude_if_present": [".nobackup"],
+        "exclude_larger_than": "2G",
+        "iexclude": ["*.ISO"],
+    })
+    excl = BackupConfigFactory(raw).build().volumes["boot"].exclusions
+    assert excl.exclude_file == [Path("/etc/resticlvm/boot.exclude")]
+    assert excl.exclude_caches is True
+    assert excl.exclude_if_present == [".nobackup"]
+    assert excl.exclude_larger_than == "2G"
+    assert excl.iexclude == ["*.ISO"]
+
+
+def test_bad_exclude_larger_than_raises():
+    raw = _minimal_config()
+    raw["volume"]["boot"]["exclude_larger_than"] = "2 GiB"
+    with pytest.raises(ValueError, match="exclude_larger_than"):
+        BackupConfigFactory(raw).build()
+
+
+def test_performance_profile_parsed_and_referenced():
+    raw = _minimal_config()
+    raw["performance_profile"] = {
+        "bulk": {
+            "compression": "max",
+            "pack_size": 64,
+            "read_concurrency": 4,
+            "connections": {"sftp": 8},
+            "gomaxprocs": 2,
+            "gogc": 200,
+        }
+    }
+    raw["volume"]["boot"]["performance_profile"] = "bulk"
+    raw["volume"]["boot"]["repositories"][0]["performance_profile"] = "bulk"
+    cfg = BackupConfigFactory(raw).build()
+
+    profile = cfg.performance_profiles["bulk"]
+    assert profile.compression == "max"
+    assert profile.pack_size == 64
+    assert profile.read_concurrency == 4
+    assert profile.connections == {"sftp": 8}
+    assert profile.gomaxprocs == 2
+    assert profile.gogc == "200"
+    assert cfg.volumes["boot"].performance_profile is profile
+    assert cfg.volumes["boot"].repositories[0].performance_profile is profile
+
+
+def test_performance_profile_defaults_to_none():
+    vol = BackupConfigFactory(_minimal_config()).build().volumes["boot"]
+    assert vol.performance_profile is None
+    assert vol.repositories[0].performance_profile is None
+
+
+def test_unknown_performance_profile_raises():
+    raw = _minimal_config()
+    raw["volume"]["boot"]["performance_profile"] = "missing"
+    with pytest.raises(ValueError, match="Performance profile 'missing'"):
+        BackupConfigFactory(raw).build()
+
+
+@pytest.mark.parametrize("settings,match", [
+    ({"compression": "extreme"}, "compression"),
+    ({"pack_size": 256}, "pack_size"),
+    ({"read_concurrency": 0}, "read_concurrency"),
+    ({"connections": {"s3": "many"}}, "connections.s3"),
+    ({"gogc": "fast"}, "gogc"),
+])
+def test_bad_performance_profile_raises(settings, match):
+    raw = _minimal_config()
+    raw["performance_profile"] = {"bad": settings}
+    with pytest.raises(ValueError, match=match):
+        BackupConfigFactory(raw).build()
+
+
+def test_command_volume_parsed():
+    raw = _minimal_config()
+    raw["volume"]["pg"] = {
+        "volume_type": "command",
+        "command": "pg_dumpall -U postgres",
+        "stdin_filename": "pg.sql",
+        "fan_out": True,
+        "repositories": raw["volume"]["boot"]["repositories"],
+    }
+    vol = BackupConfigFactory(raw).build().volumes["pg"]
+
+    assert vol.volume_type == VolumeType.COMMAND
+    assert vol.command == "pg_dumpall -U postgres"
+    assert vol.stdin_filename == "pg.sql"
+    assert vol.fan_out is True
+    assert vol.backup_source_path == "/pg.sql"
+
+
+def test_command_volume_defaults():
+    raw = _minimal_config()
+    raw["volume"]["pg"] = {
+        "volume_type": "command",
+        "command": "pg_dumpall",
+        "repositories": [],
+    }
+    vol = BackupConfigFactory(raw).build().volumes["pg"]
+
+    assert vol.stdin_filename == "pg"
+    assert vol.fan_out is False
+
+
+def test_grouping_disabled_by_default():
+    cfg = BackupConfigFactory(_minimal_config()).build()
+    assert cfg.grouping.enabled is False
+
+
+def test_grouping_enabled():
+    raw = _minimal_config()
+    raw["grouping"] = {"enabled": True}
+    assert BackupConfigFactory(raw).build().grouping.enabled is True
+
+
+def test_catalog_reconcile_interval():
+    raw = _minimal_config()
+    assert BackupConfigFactory(raw).build().catalog.reconcile_every_hours == 24
+    raw["catalog"] = {"reconcile_every_hours": 6}
+    assert BackupConfigFactory(raw).build().catalog.reconcile_every_hours == 6
+
+
+def test_catalog_rejects_negative_interval():
+    raw = _minimal_config()
+    raw["catalog"] = {"reconcile_every_hours": -1}
+    with pytest.raises(ValueError, match="reconcile_every_hours"):
+        BackupConfigFactory(raw).build()
+
+
+def test_layout_manifest_enabled_by_default():
+    raw = _minimal_config()
+    assert BackupConfigFactory(raw).build().layout.enabled is True
+    raw["layout"] = {"enabled": False}
+    assert BackupConfigFactory(raw).build().layout.enabled is False
+
+
+def test_standby_path_or_lv():
+    raw = _minimal_config()
+    raw["volume"]["boot"]["standby"] = "/srv/standby/boot"
+    standby = BackupConfigFactory(raw).build().volumes["boot"].standby
+    assert (standby.path, standby.lv_name) == ("/srv/standby/boot", None)
+
+    raw["volume"]["boot"].update(
+        volume_type="lv_nonroot", vg_name="vg0", lv_name="boot",
+        snapshot_size="1G", standby={"lv_name": "boot_standby"},
+    )
+    standby = BackupConfigFactory(raw).build().volumes["boot"].standby
+    assert (standby.path, standby.lv_name) == (None, "boot_standby")
+
+
+@pytest.mark.parametrize("standby, match", [
+    ("/boot/standby", "overlaps"),
+    ("/", "absolute directory"),
+    ({"path": "/srv/a", "lv_name": "x"}, "exactly one"),
+    ({"lv_name": "boot_standby"}, "needs an LV volume"),
+])
+def test_standby_rejects_unsafe_targets(standby, match):
+    raw = _minimal_config()
+    raw["volume"]["boot"]["standby"] = standby
+    with pytest.raises(ValueError, match=match):
+        BackupConfigFactory(raw).build()
+
+
+def test_file_index_rejected_for_command_volumes():
+    raw = _minimal_config()
+    raw["volume"]["boot"]["file_index"] = True
+    assert BackupConfigFactory(raw).build().volumes["boot"].file_index is True
+    raw["volume"]["boot"].update(volume_type="command", command="pg_dumpall")
+    with pytest.raises(ValueError, match="file_index"):
+        BackupConfigFactory(raw).build()
+
+
+def test_check_settings():
+    raw = _minimal_config()
+    assert BackupConfigFactory(raw).build().check.subsets == 30
+    raw["check"] = {"subsets": 12, "max_read_bytes": "20G", "max_minutes": 90}
+    check = BackupConfigFactory(raw).build().check
+    assert (check.subsets, check.max_read_bytes, check.max_minutes) == (
+        12, "20G", 90
+    )
+    raw["check"] = {"subsets": 0}
+    with pytest.raises(ValueError, match="subsets"):
+        BackupConfigFactory(raw).build()
+
+
+def test_throttle_settings():
+    """[throttle] is off by default; its values are validated."""
+    raw = _minimal_config()
+    cfg = BackupConfigFactory(raw).build()
+    assert cfg.throttle.latency_slo_ms is None
+
+    raw["throttle"] = {"latency_slo_ms": 20, "devices": "/dev/vg0/db"}
+    cfg = BackupConfigFactory(raw).build()
+    assert cfg.throttle.latency_slo_ms == 20.0
+    assert cfg.throttle.devices == ["/dev/vg0/db"]
+    assert cfg.throttle.min_duty_percent == 10
+
+    raw["throttle"] = {"latency_slo_ms": 20, "min_duty_percent": 0}
+    with pytest.raises(ValueError, match="min_duty_percent"):
+        BackupConfigFactory(raw).build()
+
+    raw["throttle"] = {"latency_slo_ms": -1}
+    with pytest.raises(ValueError, match="latency_slo_ms"):
+        BackupConfigFactory(raw).build()
+
+
+def test_retained_snapshots():
+    raw = _minimal_config()
+    raw["volume"]["boot"].update(
+        volume_type="lv_nonroot", vg_name="vg0", lv_name="boot",
+        snapshot_size="1G", retain_snapshots=3,
+    )
+    raw["snapshot_settings"] = {"retain_budget": "20G"}
+    config = BackupConfigFactory(raw).build()
+    assert config.volumes["boot"].retain_snapshots == 3
+    assert config.snapshot_settings.retain_budget == "20G"
+    assert config.snapshot_settings.retain_max_classic_per_origin == 1
+
+    raw["snapshot_settings"] = {"retain_budget": "lots"}
+    with pytest.raises(ValueError, match="retain_budget"):
+        BackupConfigFactory(raw).build()
+    raw["snapshot_settings"] = {}
+    raw["volume"]["boot"]["retain_snapshots"] = -1
+    with pytest.raises(ValueError, match="retain_snapshots"):
+        BackupConfigFactory(raw).build()
@@ -235,3 +235,48 @@ def test_backup_plan_repos_have_correct_prune_params(temp_config_file):
 
     boot_job = next(j for j in jobs if j.name == "boot")
     assert boot_job.repositories[0].prune_keep_params.last == 5
+
+
+def test_backup_plan_layers_performance_profiles(tmp_path):
+    """Volume → repository → copy_to profiles are layered per repository."""
+    config_path = tmp_path / "config.toml"
+    config_path.write_text("""
+[prune_policy.minimal]
+keep_last = 3
+keep_daily = 7
+keep_weekly = 4
+keep_monthly = 6
+keep_yearly = 1
+
+[performance_profile.base]
+compression = "auto"
+gogc = 50
+
+[performance_profile.remote]
+compression = "max"
+connections = { sftp = 4 }
+
+[volume.home]
+volume_type = "standard_path"
+backup_source_path = "/home"
+performance_profile = "base"
+
+[[volume.home.repositories]]
+repo_path = "/backup/home"
+password_file = "/tmp/pass.txt"
+prune_policy = "minimal"
+
+[[volume.home.repositories.copy_to]]
+repo = "sftp:nas:/backup/home"
+password_file = "/tmp/pass.txt"
+prune_policy = "minimal"
+performance_profile = "remote"
+""")
+    repo = BackupPlan(config_path=config_path).backup_jobs[0].repositories[0]
+
+    assert repo.performance.compression == "auto"
+    assert repo.performance.gogc == "50"
+    dest = repo.copy_destinations[0]
+    assert dest.performance.compression == "max"
+    assert dest.performance.gogc == "50"
+    assert dest.performance.connections == {"sftp": 4}
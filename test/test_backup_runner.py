@@ -10,12 +10,24 @@ from resticlvm.orchestration.backup_runner import BackupJobRunner
 from resticlvm.orchestration.data_classes import JobResult
 
 
-def _fake_job(category, name, result):
+@pytest.fixture(autouse=True)
+def run_job_copies():
+    """Stub the combined copy phase with each fake job's run_deferred_copies()."""
+    with mock.patch(
+        "resticlvm.orchestration.backup_runner.run_job_copies",
+        side_effect=lambda jobs: [j.run_deferred_copies() for j in jobs],
+    ) as m:
+        yield m
+
+
+def _fake_job(category, name, result, failed_copies=None):
     """A stand-in BackupJob whose run() returns a preset JobResult."""
     job = mock.Mock()
     job.category = category
     job.name = name
+    job.config = {}
     job.run.return_value = result
+    job.run_deferred_copies.return_value = failed_copies or []
     return job
 
 
@@ -55,8 +67,8 @@ def test_run_all_counts_copy_failure_as_job_failure():
     """A job whose backup succeeded but a copy failed counts as a failure."""
     job = _fake_job(
         "standard_path", "a",
-        JobResult("standard_path", "a", script_ok=True,
-                  failed_copies=["/srv/backup/remote"]),
+        JobResult("standard_path", "a", script_ok=True, failed_copies=[]),
+        failed_copies=["/srv/backup/remote"],
     )
 
     assert BackupJobRunner([job]).run_all() == 1
@@ -120,6 +132,8 @@ def test_run_all_respects_category_and_name_filters():
 def _run_with_failure_count(monkeypatch, failure_count):
     """Invoke run() with mocked deps and a forced run_all failure count."""
     monkeypatch.setattr(backup_runner, "BackupPlan", mock.Mock())
+    monkeypatch.setattr(backup_runner, "record_layout", mock.Mock())
+    monkeypatch.setattr(backup_runner, "sweep", mock.Mock())
     monkeypatch.setattr(
         BackupJobRunner, "run_all",
         lambda self, category=None, name=None: failure_count,
@@ -297,3 +311,84 @@ def test_snapshot_settings_passed_to_coordinator(MockCoord):
     call_kwargs = MockCoord.call_args.kwargs
     assert call_kwargs["min_vg_free_after_snapshots"] == "5G"
     assert call_kwargs["snapshot_cow_warn_percent"] == 80
+
+
+# ─── Combined copy phase ──────────────────────────────────────────
+
+
+def test_copies_run_once_for_all_successful_jobs(run_job_copies):
+    """Copies of every successful job run in a single deduplicated phase."""
+    ok_a = _fake_job("standard_path", "a",
+                     JobResult("standard_path", "a", script_ok=True, failed_copies=[]))
+    bad = _fake_job("standard_path", "b",
+                    JobResult("standard_path", "b", script_ok=False, failed_copies=[]))
+    ok_c = _fake_job("standard_path", "c",
+                     JobResult("standard_path", "c", script_ok=True, failed_copies=[]))
+
+    BackupJobRunner([ok_a, bad, ok_c]).run_all()
+
+    run_job_copies.assert_called_once_with([ok_a, ok_c])
+    ok_a.run.assert_called_once_with(defer_copies=True)
+
+
+def test_run_all_reports_grouped_members_individually():
+    """With grouping on, a group's members are reported as separate jobs."""
+    a_result = JobResult("standard_path", "a", script_ok=True, failed_copies=[])
+    b_result = JobResult("standard_path", "b", script_ok=False, failed_copies=[])
+    a = _fake_job("standard_path", "a", a_result)
+    b = _fake_job("standard_path", "b", b_result)
+    group = mock.Mock(spec=backup_runner.BackupGroupJob)
+    group.members = [a, b]
+    group.run_members.return_value = [a_result, b_result]
+
+    with mock.patch.object(backup_runner, "group_jobs", return_value=[group]):
+        failure_count = BackupJobRunner([a, b], grouping=True).run_all()
+
+    assert failure_count == 1
+    group.run_members.assert_called_once_with(defer_copies=True)
+    a.run.assert_not_called()
+
+
+@mock.patch("resticlvm.orchestration.backup_runner.snapshot_waves")
+@mock.patch("resticlvm.orchestration.backup_runner.SnapshotCoordinator")
+def test_lv_waves_each_get_a_coordinator(MockCoord, mock_waves):
+    """Each snapshot wave is created, backed up and released in turn; a wave
+    that no longer fits fails its own jobs only."""
+    coord = MockCoord.return_value
+    coord.__enter__ = mock.Mock(return_value=coord)
+    coord.__exit__ = mock.Mock(return_value=False)
+    coord.get_mount_point.return_value = "/tmp/snap"
+    coord.create_all.side_effect = [None, RuntimeError("Insufficient free space")]
+
+    first = _fake_lv_job("root", JobResult("lv_root", "root", True, []))
+    second = _fake_lv_job("data", JobResult("lv_root", "data", True, []))
+    mock_waves.return_value = [[first], [second]]
+
+    failures = BackupJobRunner([first, second]).run_all()
+
+    assert [c.args[0] for c in MockCoord.call_args_list] == [[first], [second]]
+    first.run.assert_called_once()
+    second.run.assert_not_called()
+    assert failures == 1
+
+
+@mock.patch("resticlvm.orchestration.backup_runner.snapshot_waves")
+@mock.patch("resticlvm.orchestration.backup_runner.SnapshotCoordinator")
+def test_waves_rotate_retained_snapshots_for_later_waves(MockCoord, mock_waves):
+    """Each wave's coordinator rotates for the rest of the run, not itself."""
+    coord = MockCoord.return_value
+    coord.__enter__ = mock.Mock(return_value=coord)
+    coord.__exit__ = mock.Mock(return_value=False)
+    coord.get_mount_point.return_value = "/tmp/snap"
+
+    first = _fake_lv_job("root", JobResult("lv_root", "root", True, []))
+    first.config["retain_snapshots"] = 1
+    first.config["snapshot_size"] = "5G"
+    second = _fake_lv_job("data", JobResult("lv_root", "data", True, []))
+    mock_waves.return_value = [[first], [second]]
+
+    BackupJobRunner([first, second]).run_all()
+
+    needs = [c.kwargs["rotation_needs"] for c in MockCoord.call_args_list]
+    assert needs == [{"vg0": 10 * 1024**3}, {"vg0": 10 * 1024**3}]
+    coord.retain.assert_called_once_with("root")
@@ -0,0 +1,154 @@
+"""Tests for the catalog module."""
+
+import json
+import subprocess
+from unittest import mock
+
+from resticlvm.orchestration.catalog import (
+    Catalog,
+    SnapshotRecord,
+    parse_copy_output,
+    parse_forget_output,
+    reconcile,
+)
+
+COPY_OUTPUT = """\
+snapshot 1111aaaa of [/boot] at 2026-01-02 03:00:00 by [host]
+  copy started, this may take a while...
+snapshot 9999ffff saved
+
+snapshot 2222bbbb of [/boot] at 2026-01-03 03:00:00 by [host]
+skipping snapshot 2222bbbb, was already copied to snapshot 8888eeee
+"""
+
+FORGET_OUTPUT = """\
+Applying Policy: keep 1 latest snapshots
+keep 1 snapshots:
+ID        Time                 Host        Tags        Reasons        Paths
+-----------------------------------------------------------------------------
+3333cccc  2026-01-03 03:00:00  host                    last snapshot  /boot
+-----------------------------------------------------------------------------
+1 snapshots
+
+remove 2 snapshots:
+ID        Time                 Host        Tags        Paths
+------------------------------------------------------------
+1111aaaa  2026-01-01 03:00:00  host                    /boot
+2222bbbb  2026-01-02 03:00:00  host                    /boot
+------------------------------------------------------------
+2 snapshots
+"""
+
+
+def _snap(short_id, time, paths=("/boot",), tags=()):
+    return SnapshotRecord(
+        short_id=short_id, time=time, hostname="host",
+        paths=list(paths), tags=list(tags),
+    )
+
+
+def test_parse_copy_output_pairs_only_saved_snapshots():
+    assert parse_copy_output(COPY_OUTPUT) == [("1111aaaa", "9999ffff")]
+
+
+def test_parse_forget_output_lists_removed_only():
+    assert parse_forget_output(FORGET_OUTPUT) == ["1111aaaa", "2222bbbb"]
+
+
+def test_copy_forget_and_missing():
+    catalog = Catalog()
+    catalog.add("/srv/a", [_snap("1111aaaa", 1000.0), _snap("2222bbbb", 2000.0)])
+    catalog.copy("/srv/a", "/mnt/nas", [("1111aaaa", "9999ffff")])
+
+    copied = catalog.snapshots("/mnt/nas", "host", ["/boot"])
+    assert [(s.short_id, s.time) for s in copied] == [("9999ffff", 1000.0)]
+    missing = catalog.missing("/srv/a", "/mnt/nas", "host", ["/boot"])
+    assert [s.short_id for s in missing] == ["2222bbbb"]
+
+    catalog.forget("/srv/a", ["1111aaaa"])
+    assert [s.short_id for s in catalog.snapshots("/srv/a", "host", ["/boot"])] == [
+        "2222bbbb"
+    ]
+
+
+def test_missing_tolerates_approximate_backup_times():
+    catalog = Catalog()
+    # Backup rows carry restic's start time; a listing has the real time.
+    catalog.add("/srv/a", [_snap("1111aaaa", 1000.0)])
+    catalog.add("/mnt/nas", [_snap("9999ffff", 1030.0)])
+
+    assert catalog.missing("/srv/a", "/mnt/nas", "host", ["/boot"]) == []
+
+
+def test_grouped_snapshots_match_by_volume_tag():
+    catalog = Catalog()
+    catalog.add("/srv/a", [
+        _snap("1111aaaa", 1000.0, paths=["/boot", "/boot/efi"],
+              tags=["vol:boot", "vol:efi"]),
+    ])
+
+    assert catalog.snapshots("/srv/a", "host", ["/boot"]) == []
+    assert len(catalog.snapshots("/srv/a", "host", ["/boot"], "vol:boot")) == 1
+    assert catalog.snapshots("/srv/a", "host", ["/boot"], "vol:root") == []
+
+
+def test_volume_tag_underscore_is_not_a_wildcard():
+    catalog = Catalog()
+    catalog.add("/srv/a", [
+        _snap("1111aaaa", 1000.0, paths=["/var/log", "/srv"],
+              tags=["vol:varXlog", "vol:srv"]),
+        _snap("2222bbbb", 2000.0, paths=["/var/log", "/home"],
+              tags=["vol:var_log", "vol:home"]),
+    ])
+
+    found = catalog.snapshots("/srv/a", "host", ["/var/log"], "vol:var_log")
+    assert [s.short_id for s in found] == ["2222bbbb"]
+
+
+def test_mirror_replaces_destination_rows():
+    catalog = Catalog()
+    catalog.add("/srv/a", [_snap("1111aaaa", 1000.0)])
+    catalog.add("sftp:nas:/mirror", [_snap("0000dead", 10.0)])
+
+    catalog.mirror("/srv/a", "sftp:nas:/mirror")
+
+    rows = catalog.snapshots("sftp:nas:/mirror", "host", ["/boot"])
+    assert [s.short_id for s in rows] == ["1111aaaa"]
+
+
+def test_unwritable_catalog_only_warns(tmp_path, capsys):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+
+    Catalog(blocker / "catalog.db").add("/srv/a", [_snap("1111aaaa", 1.0)])
+
+    assert "Could not update the snapshot catalog" in capsys.readouterr().out
+
+
+@mock.patch("resticlvm.orchestration.catalog.subprocess.run")
+def test_reconcile_replaces_rows_and_reports_failures(mock_run):
+    listing = [{
+        "id": "4444dddd" + "0" * 56, "short_id": "4444dddd",
+        "time": "2026-01-04T03:00:00.123456789+01:00",
+        "hostname": "host", "paths": ["/boot"],
+    }]
+
+    def run(cmd, **kwargs):
+        if cmd[2] == "sftp:down:/repo":
+            raise subprocess.CalledProcessError(1, cmd)
+        assert "--no-lock" in cmd
+        return subprocess.CompletedProcess(cmd, 0, stdout=json.dumps(listing))
+
+    mock_run.side_effect = run
+    catalog = Catalog()
+    catalog.add("/srv/a", [_snap("1111aaaa", 1000.0)])
+
+    failed = reconcile(
+        catalog, {"/srv/a": "/pw", "sftp:down:/repo": "/pw"}, env={}
+    )
+
+    assert failed == ["sftp:down:/repo"]
+    rows = catalog.snapshots("/srv/a", "host", ["/boot"])
+    assert [s.short_id for s in rows] == ["4444dddd"]
+    assert catalog.reconciled_at("/srv/a") is not None
+    assert catalog.reconciled_at("sftp:down:/repo") is None
@@ -0,0 +1,165 @@
+"""Tests for the check_runner module."""
+
+import json
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+from resticlvm.orchestration.backup_config import (
+    BackupConfigFactory,
+    CheckSettings,
+)
+from resticlvm.orchestration.check_runner import (
+    CheckTarget,
+    ReadBudget,
+    check_repo,
+    due_subsets,
+    plan_check,
+)
+from resticlvm.orchestration.state import load_state
+
+NOW = datetime(2026, 3, 1, 12, 0)
+SETTINGS = CheckSettings(read_data_every_days=30, subsets=30)
+
+
+def test_first_run_starts_cycle_with_first_subset():
+    record, due = due_subsets({}, SETTINGS, NOW)
+    assert due == [1]
+    assert record["cycle_start"] == NOW.isoformat(timespec="seconds")
+
+
+def test_due_subsets_catch_up_with_schedule():
+    start = (NOW - timedelta(days=10)).isoformat()
+    _, due = due_subsets(
+        {"cycle_start": start, "next_subset": 4, "subsets": 30}, SETTINGS, NOW
+    )
+    assert due == list(range(4, 12))
+
+
+def test_finished_cycle_waits_for_period_then_restarts():
+    record = {"cycle_start": (NOW - timedelta(days=20)).isoformat(),
+              "next_subset": 31, "subsets": 30}
+    assert due_subsets(record, SETTINGS, NOW)[1] == []
+
+    record["cycle_start"] = (NOW - timedelta(days=31)).isoformat()
+    new, due = due_subsets(record, SETTINGS, NOW)
+    assert due == [1]
+    assert new["next_subset"] == 1
+
+
+def test_read_data_disabled():
+    settings = CheckSettings(read_data_every_days=0)
+    assert due_subsets({}, settings, NOW)[1] == []
+
+
+def _restic(fail_subset=None, total_size=3000):
+    def run(cmd, **kwargs):
+        if "stats" in cmd:
+            return subprocess.CompletedProcess(
+                cmd, 0, stdout=json.dumps({"total_size": total_size}), stderr=""
+            )
+        failed = fail_subset is not None and f"--read-data-subset={fail_subset}/3" in cmd
+        return subprocess.CompletedProcess(
+            cmd, 1 if failed else 0,
+            stdout="Fatal: repository contains errors" if failed else "no errors were found",
+            stderr="",
+        )
+    return run
+
+
+def _checks(mock_run):
+    return [c.args[0][c.args[0].index("check"):] for c in mock_run.call_args_list
+            if "check" in c.args[0]]
+
+
+@mock.patch("resticlvm.orchestration.check_runner.subprocess.run")
+def test_byte_budget_limits_slices_and_position_persists(mock_run):
+    mock_run.side_effect = _restic()
+    settings = CheckSettings(read_data_every_days=1, subsets=3)
+    target = CheckTarget("/srv/a", Path("/pw"))
+    with mock.patch("resticlvm.orchestration.check_runner.datetime") as dt:
+        dt.now.return_value = NOW
+        dt.fromisoformat = datetime.fromisoformat
+        check_repo(target, settings, ReadBudget(None, None), {})
+        dt.now.return_value = NOW + timedelta(days=2)
+        # Each slice is ~1000 bytes; only two fit.
+        result = check_repo(target, settings, ReadBudget(2000, None), {})
+
+    assert result.ok and result.subsets_read == [2, 3]
+    assert _checks(mock_run) == [
+        ["check", "--read-data-subset=1/3"],
+        ["check", "--read-data-subset=2/3"],
+        ["check", "--read-data-subset=3/3"],
+    ]
+    record = load_state("check")["/srv/a"]
+    assert record["next_subset"] == 4
+    assert "last_full_read" in record
+
+
+@mock.patch("resticlvm.orchestration.check_runner.subprocess.run")
+def test_exhausted_budget_still_checks_structure(mock_run):
+    mock_run.side_effect = _restic()
+
+    result = check_repo(
+        CheckTarget("/srv/a", Path("/pw")), CheckSettings(subsets=3),
+        ReadBudget(10, None), {},
+    )
+
+    assert result.ok and result.subsets_read == []
+    assert _checks(mock_run) == [["check"]]
+    assert load_state("check")["/srv/a"]["next_subset"] == 1
+
+
+@mock.patch("resticlvm.orchestration.check_runner.subprocess.run")
+def test_failed_slice_is_retried_next_run(mock_run, capsys):
+    mock_run.side_effect = _restic(fail_subset=1)
+
+    result = check_repo(
+        CheckTarget("/srv/a", Path("/pw")), CheckSettings(subsets=3),
+        ReadBudget(None, None), {},
+    )
+
+    assert not result.ok
+    assert "repository contains errors" in capsys.readouterr().out
+    assert load_state("check")["/srv/a"]["next_subset"] == 1
+
+
+@mock.patch("resticlvm.orchestration.check_runner.subprocess.run")
+def test_parallel_checks_keep_every_record(mock_run):
+    """Repositories checked at once each keep their cycle position."""
+    mock_run.side_effect = _restic()
+    settings = CheckSettings(read_data_every_days=1, subsets=3)
+    targets = [CheckTarget(f"/srv/r{i}", Path("/pw")) for i in range(48)]
+    budget = ReadBudget(None, None)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda t: check_repo(t, settings, budget, {}), targets))
+
+    state = load_state("check")
+    assert sorted(state) == sorted(t.repo_path for t in targets)
+    assert all(record["next_subset"] == 2 for record in state.values())
+
+
+def test_plan_check_includes_copy_destinations_once():
+    policy = {"keep_last": 1, "keep_daily": 1, "keep_weekly": 1,
+              "keep_monthly": 1, "keep_yearly": 1}
+    repo = {"repo_path": "/srv/a", "password_file": "/pw",
+            "prune_policy": "p",
+            "copy_to": [{"repo": "sftp:nas:/a", "password_file": "/nas_pw",
+                         "prune_policy": "p"}]}
+    raw = {
+        "prune_policy": {"p": policy},
+        "volume": {
+            name: {"volume_type": "standard_path",
+                   "backup_source_path": f"/{name}", "exclude_paths": [],
+                   "repositories": [repo]}
+            for name in ("boot", "etc")
+        },
+    }
+
+    targets = plan_check(BackupConfigFactory(raw).build())
+
+    assert [(t.repo_path, str(t.password_file)) for t in targets] == [
+        ("/srv/a", "/pw"), ("sftp:nas:/a", "/nas_pw"),
+    ]
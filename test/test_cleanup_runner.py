@@ -0,0 +1,61 @@
+"""Tests for the cleanup_runner module."""
+
+from resticlvm.orchestration.cleanup_runner import find_leftovers
+
+TS_OLD = "20260301_010000"
+TS_LIVE = "20260301_020000"
+
+
+def _entry(vg, lv, ts, pid):
+    snap = f"{vg}_{lv}_snapshot_{ts}"
+    return {
+        "vg_name": vg, "snap_name": snap, "pid": pid,
+        "mount_base": f"/tmp/resticlvm-{ts}",
+        "mount_point": f"/tmp/resticlvm-{ts}/{snap}",
+    }
+
+
+def _alive(entry):
+    return entry["pid"] == 1
+
+
+def test_dead_journal_entries_and_unjournaled_leftovers_are_released():
+    journal = {
+        "vg0_root_snapshot_" + TS_OLD: _entry("vg0", "root", TS_OLD, 99),
+        "vg0_home_snapshot_" + TS_LIVE: _entry("vg0", "home", TS_LIVE, 1),
+        "vg0_gone_snapshot_" + TS_OLD: _entry("vg0", "gone", TS_OLD, 98),
+    }
+    lvs = [
+        ("vg0", "vg0_root_snapshot_" + TS_OLD),  # journaled, process dead
+        ("vg0", "vg0_home_snapshot_" + TS_LIVE),  # journaled, running
+        ("vg1", "vg1_data_snapshot_" + TS_OLD),  # not journaled
+        ("vg0", "root_rlvm_keep_" + TS_OLD),  # retained rollback point
+    ]
+    mounts = {
+        f"/tmp/resticlvm-{TS_OLD}": [
+            f"/tmp/resticlvm-{TS_OLD}/vg0_root_snapshot_{TS_OLD}",
+            # Overlay parts, released with the mount point above.
+            f"/tmp/resticlvm-{TS_OLD}/vg0_root_snapshot_{TS_OLD}.lower",
+            f"/tmp/resticlvm-{TS_OLD}/vg0_root_snapshot_{TS_OLD}.upper",
+        ],
+        f"/tmp/resticlvm-{TS_LIVE}": [
+            f"/tmp/resticlvm-{TS_LIVE}/vg0_home_snapshot_{TS_LIVE}",
+        ],
+        "/tmp/resticlvm-20260228_230000": [],
+    }
+
+    leftovers, stale = find_leftovers(journal, lvs, mounts, alive=_alive)
+
+    assert [(lo.describe(), lo.journal_key is not None) for lo in leftovers] == [
+        (f"vg0/vg0_root_snapshot_{TS_OLD}", True),
+        (f"vg1/vg1_data_snapshot_{TS_OLD}", False),
+        ("/tmp/resticlvm-20260228_230000", False),
+    ]
+    assert leftovers[1].mount_point == (
+        f"/tmp/resticlvm-{TS_OLD}/vg1_data_snapshot_{TS_OLD}"
+    )
+    assert stale == ["vg0_gone_snapshot_" + TS_OLD]
+
+
+def test_nothing_to_release():
+    assert find_leftovers({}, [], {}, alive=_alive) == ([], [])
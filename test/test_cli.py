@@ -1,10 +1,13 @@
-"""Tests for CLI config resolution and help output."""
+"""Tests for CLI config resolution, dispatch and help output."""
+
+from unittest import mock
 
 import pytest
 
 from resticlvm.orchestration.cli import (
     CONFIG_ENV_VAR,
     DEFAULT_CONFIG_PATH,
+    main,
     resolve_config,
 )
 
@@ -90,9 +93,6 @@ def test_env_wins_over_default(tmp_path, monkeypatch):
 
 def test_help_shows_default_path_and_env_var(capsys, monkeypatch):
     monkeypatch.setattr("sys.argv", ["rlvm", "backup", "--help"])
-
-    from resticlvm.orchestration.cli import main
-
     with pytest.raises(SystemExit) as exc_info:
         main()
 
@@ -100,3 +100,66 @@ def test_help_shows_default_path_and_env_var(capsys, monkeypatch):
     out = capsys.readouterr().out
     assert str(DEFAULT_CONFIG_PATH) in out
     assert CONFIG_ENV_VAR in out
+
+
+# --- Dispatch ---
+
+
+@pytest.fixture
+def no_config(tmp_path, monkeypatch):
+    """No --config, no environment variable and no default config file."""
+    monkeypatch.setattr(
+        "resticlvm.orchestration.cli.DEFAULT_CONFIG_PATH",
+        tmp_path / "nonexistent.toml",
+    )
+    monkeypatch.delenv(CONFIG_ENV_VAR, raising=False)
+    monkeypatch.setattr(
+        "resticlvm.orchestration.cli.ensure_running_as_root", lambda: None
+    )
+
+
+@mock.patch("resticlvm.orchestration.rebuild_runner.run")
+def test_rebuild_runs_without_config(mock_run, no_config, monkeypatch):
+    monkeypatch.setattr("sys.argv", [
+        "rlvm", "rebuild", "--manifest", "/mnt/layout.json",
+        "--pv", "pv0=/dev/sdb",
+    ])
+
+    main()
+
+    args = mock_run.call_args.args[0]
+    assert args.config is None
+    assert args.manifest == "/mnt/layout.json"
+    assert args.pv == ["pv0=/dev/sdb"]
+
+
+@mock.patch("resticlvm.orchestration.cleanup_runner.run")
+def test_cleanup_runs_without_config(mock_run, no_config, monkeypatch):
+    monkeypatch.setattr("sys.argv", ["rlvm", "cleanup"])
+
+    main()
+
+    assert mock_run.call_args.args[0].config is None
+
+
+@mock.patch("resticlvm.orchestration.rebuild_runner.run")
+def test_rebuild_resolves_explicit_config(
+    mock_run, no_config, tmp_path, monkeypatch
+):
+    f = tmp_path / "explicit.toml"
+    f.write_text("[prune_policy]\n")
+    monkeypatch.setattr("sys.argv", ["rlvm", "rebuild", "--config", str(f)])
+
+    main()
+
+    assert mock_run.call_args.args[0].config == str(f)
+
+
+@pytest.mark.parametrize(
+    "argv", [["backup"], ["prune"], ["restore"], ["rollback", "root"]]
+)
+def test_other_commands_still_require_config(argv, no_config, monkeypatch):
+    monkeypatch.setattr("sys.argv", ["rlvm", *argv])
+
+    with pytest.raises(SystemExit, match="no config file found"):
+        main()
@@ -0,0 +1,169 @@
+"""Tests for the copy_graph and concurrency modules."""
+
+import threading
+import time
+from pathlib import Path
+
+from resticlvm.orchestration.concurrency import BackendLimiter, backend_of
+from resticlvm.orchestration.copy_graph import copy_tasks_for_repo, run_copy_graph
+from resticlvm.orchestration.restic_repo import (
+    CopyDestination,
+    ResticPruneKeepParams,
+    ResticRepo,
+)
+
+
+def _params():
+    return ResticPruneKeepParams(last=1, daily=1, weekly=1, monthly=1, yearly=1)
+
+
+def _dest(path, name=None, source=None):
+    return CopyDestination(
+        repo_path=path,
+        password_file=Path(f"/tmp/{name or 'x'}_pw.txt"),
+        prune_keep_params=_params(),
+        name=name,
+        source=source,
+    )
+
+
+def _repo(dests):
+    return ResticRepo(
+        repo_path=Path("/srv/backup/local"),
+        password_file=Path("/tmp/pw.txt"),
+        prune_keep_params=_params(),
+        copy_destinations=dests,
+    )
+
+
+def _chain_repo():
+    """local → nas → {b2, offsite}, plus an independent local → usb."""
+    return _repo([
+        _dest("/mnt/nas", name="nas"),
+        _dest("s3:s3.example.com/b", name="b2", source="nas"),
+        _dest("sftp:host:/offsite", source="nas"),
+        _dest("/mnt/usb"),
+    ])
+
+
+def test_backend_of():
+    assert backend_of("/srv/backup") == "local"
+    assert backend_of("sftp:user@host:/p") == "sftp"
+    assert backend_of("s3:host/bucket") == "s3"
+
+
+def test_tasks_source_from_upstream_destination():
+    tasks = copy_tasks_for_repo(_chain_repo())
+    by_dest = {t.dest.repo_path: t for t in tasks}
+
+    assert by_dest["/mnt/nas"].source_path == "/srv/backup/local"
+    assert by_dest["/mnt/nas"].upstream is None
+    b2 = by_dest["s3:s3.example.com/b"]
+    assert b2.source_path == "/mnt/nas"
+    assert b2.source_password_file == Path("/tmp/nas_pw.txt")
+    assert b2.upstream is by_dest["/mnt/nas"]
+
+
+def test_sequential_runs_upstream_first():
+    order = []
+    failed = run_copy_graph(
+        copy_tasks_for_repo(_chain_repo()),
+        lambda t: order.append(t.dest.repo_path) or True,
+    )
+    assert failed == []
+    assert order.index("/mnt/nas") < order.index("s3:s3.example.com/b")
+    assert order.index("/mnt/nas") < order.index("sftp:host:/offsite")
+    assert len(order) == 4
+
+
+def test_failed_upstream_skips_downstream():
+    ran = []
+
+    def run_one(task):
+        ran.append(task.dest.repo_path)
+        return task.dest.repo_path != "/mnt/nas"
+
+    failed = run_copy_graph(copy_tasks_for_repo(_chain_repo()), run_one)
+
+    assert sorted(t.dest.repo_path for t in failed) == [
+        "/mnt/nas", "s3:s3.example.com/b", "sftp:host:/offsite",
+    ]
+    assert sorted(ran) == ["/mnt/nas", "/mnt/usb"]
+
+
+def test_parallel_runs_independent_branches_concurrently():
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def run_one(task):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return True
+
+    failed = run_copy_graph(
+        copy_tasks_for_repo(_chain_repo()), run_one, max_parallel=4
+    )
+
+    assert failed == []
+    assert peak >= 2
+
+
+def test_parallel_exception_counts_as_failure():
+    def run_one(task):
+        if task.dest.repo_path == "/mnt/usb":
+            raise RuntimeError("boom")
+        return True
+
+    failed = run_copy_graph(
+        copy_tasks_for_repo(_chain_repo()), run_one, max_parallel=2
+    )
+    assert [t.dest.repo_path for t in failed] == ["/mnt/usb"]
+
+
+def test_backend_limiter_caps_backend():
+    limiter = BackendLimiter({"local": 1})
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def run_one(task):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return True
+
+    repo = _repo([_dest("/mnt/a"), _dest("/mnt/b"), _dest("/mnt/c")])
+    run_copy_graph(copy_tasks_for_repo(repo), run_one, max_parallel=3,
+                   limiter=limiter)
+    assert peak == 1
+
+
+def test_identical_pairs_run_once():
+    """Two repos sharing a copy_to pair produce one copy."""
+    ran = []
+    tasks = copy_tasks_for_repo(_repo([_dest("/mnt/nas")]))
+    tasks += copy_tasks_for_repo(_repo([_dest("/mnt/nas")]))
+
+    failed = run_copy_graph(tasks, lambda t: ran.append(t.key) or True)
+
+    assert failed == []
+    assert ran == [("/srv/backup/local", "/mnt/nas")]
+
+
+def test_failed_shared_pair_reported_for_every_owner():
+    tasks = copy_tasks_for_repo(_repo([_dest("/mnt/nas")]))
+    tasks += copy_tasks_for_repo(_repo([_dest("/mnt/nas")]))
+
+    failed = run_copy_graph(tasks, lambda t: False)
+
+    assert len(failed) == 2
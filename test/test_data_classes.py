@@ -11,6 +11,9 @@ from resticlvm.orchestration.data_classes import (
     JobResult,
     TokenConfigKeyPair,
 )
+from resticlvm.orchestration import restic_features
+from resticlvm.orchestration.performance import PerformanceProfile
+from resticlvm.orchestration.state import load_state
 from resticlvm.orchestration.restic_repo import (
     CopyDestination,
     ResticRepo,
@@ -202,6 +205,43 @@ def test_backup_job_args_list():
     ]
 
 
+def test_backup_job_args_list_with_performance_profile(monkeypatch):
+    """Per-repo tuning is passed positionally once any repo has a profile."""
+    monkeypatch.setattr(restic_features, "restic_version", lambda: (0, 16, 4))
+    plain = ResticRepo(
+        repo_path=Path("/srv/backup/local"),
+        password_file=Path("/tmp/pw.txt"),
+        prune_keep_params=_make_prune_params(),
+    )
+    tuned = ResticRepo(
+        repo_path="sftp:nas:/backup",
+        password_file=Path("/tmp/pw.txt"),
+        prune_keep_params=_make_prune_params(),
+        performance=PerformanceProfile(
+            compression="max", read_concurrency=4,
+            connections={"sftp": 8}, gogc="200",
+        ),
+    )
+    job = BackupJob(
+        script_name="backup_path.sh",
+        script_token_config_key_pairs=[],
+        config={},
+        name="boot",
+        category="standard_path",
+        repositories=[plain, tuned],
+    )
+
+    args = job.args_list
+
+    assert args[args.index("--repo-opts") + 1] == ""
+    opts = [args[i + 1] for i, a in enumerate(args) if a == "--repo-opts"]
+    envs = [args[i + 1] for i, a in enumerate(args) if a == "--repo-env"]
+    assert opts == [
+        "", "--compression=max --read-concurrency=4 -o sftp.connections=8"
+    ]
+    assert envs == ["", "GOGC=200"]
+
+
 def test_backup_job_args_list_dry_run():
     """Test that args_list includes --dry-run when dry_run is True."""
     config = {
@@ -412,6 +452,98 @@ def test_run_copy_passes_dry_run(mock_run):
     assert "-n" in copy_cmd
 
 
+@mock.patch("resticlvm.orchestration.data_classes.subprocess.run")
+def test_run_copy_passes_destination_profile(mock_run, monkeypatch):
+    """A copy gets the destination's restic options and Go env."""
+    monkeypatch.setattr(restic_features, "restic_version", lambda: (0, 16, 4))
+    copy_dest = CopyDestination(
+        repo_path="sftp:nas:/backup",
+        password_file=Path("/tmp/remote_pw.txt"),
+        prune_keep_params=_make_prune_params(),
+        performance=PerformanceProfile(
+            compression="max", read_concurrency=4,
+            connections={"sftp": 2}, gomaxprocs=1,
+        ),
+    )
+    repo = ResticRepo(
+        repo_path=Path("/srv/backup/local"),
+        password_file=Path("/tmp/pw.txt"),
+        prune_keep_params=_make_prune_params(),
+        copy_destinations=[copy_dest],
+    )
+    job = BackupJob(
+        script_name="backup_path.sh",
+        script_token_config_key_pairs=[],
+        config={},
+        name="test_job",
+        category="standard_path",
+        repositories=[repo],
+    )
+
+    job.run()
+
+    copy_call = mock_run.call_args_list[1]
+    copy_cmd = copy_call.kwargs["args"]
+    assert copy_cmd[copy_cmd.index("-o") + 1] == (
+        "--compression=max -o sftp.connections=2"
+    )
+    assert copy_call.kwargs["env"]["GOMAXPROCS"] == "1"
+
+
+def _command_job(fan_out=False, dry_run=False):
+    return BackupJob(
+        script_name="backup_command.sh",
+        script_token_config_key_pairs=TokenConfigKeyPair.from_token_key_map(
+            {"-c": "command", "-f": "stdin_filename"}
+        ),
+        config={"command": "pg_dumpall", "stdin_filename": "pg.sql",
+                "fan_out": fan_out},
+        name="pg",
+        category="command",
+        repositories=[ResticRepo(
+            repo_path=Path("/srv/backup/pg"),
+            password_file=Path("/tmp/pw.txt"),
+            prune_keep_params=_make_prune_params(),
+        )],
+        dry_run=dry_run,
+        exclusions=None,
+    )
+
+
+@mock.patch("resticlvm.orchestration.data_classes.subprocess.run")
+def test_command_job_streams_and_records_throughput(mock_run, monkeypatch):
+    monkeypatch.setattr(restic_features, "restic_version", lambda: (0, 17, 1))
+
+    def write_report(args, **kwargs):
+        Path(args[args.index("--report") + 1]).write_text(
+            "/srv/backup/pg\t2.000\t1.000 GiB\n"
+        )
+    mock_run.side_effect = write_report
+
+    result = _command_job().run()
+
+    cmd = mock_run.call_args.kwargs["args"]
+    assert result.ok
+    assert cmd[cmd.index("-c") + 1] == "pg_dumpall"
+    assert cmd[cmd.index("--fan-out") + 1] == "false"
+    assert "--exclude-dir" not in cmd
+    record = load_state("throughput")["command.pg"]["/srv/backup/pg"]
+    assert record["bytes"] == 1024**3
+    assert record["bytes_per_s"] == 1024**3 // 2
+
+
+@mock.patch("resticlvm.orchestration.data_classes.subprocess.run")
+def test_command_job_falls_back_to_fan_out(mock_run, monkeypatch):
+    """restic < 0.17 has no --stdin-from-command; one run is fanned out."""
+    monkeypatch.setattr(restic_features, "restic_version", lambda: (0, 16, 4))
+
+    _command_job(dry_run=True).run()
+
+    cmd = mock_run.call_args.kwargs["args"]
+    assert cmd[cmd.index("--fan-out") + 1] == "true"
+    assert "--report" not in cmd
+
+
 # ─── Snapshot mount (batch mode, issue #84) ────────────────────────────────
 
 
@@ -516,3 +648,197 @@ def test_run_b2_job_loads_credentials_into_env(mock_run, monkeypatch):
     env = mock_run.call_args.kwargs["env"]
     assert env["AWS_ACCESS_KEY_ID"] == "id"
     assert env["AWS_SECRET_ACCESS_KEY"] == "secret"
+
+
+# ─── Mirror-mode copy destinations ──────────────────────────────────────────
+
+
+@mock.patch("resticlvm.orchestration.data_classes.subprocess.run")
+def test_mirror_copy_uses_mirror_script(mock_run):
+    """A mirror destination runs mirror_repo.sh, without password files."""
+    mirror = CopyDestination(
+        repo_path="sftp:user@host:/backups/root",
+        password_file=Path("/tmp/remote_pw.txt"),
+        prune_keep_params=None,
+        mode="mirror",
+    )
+    repo = ResticRepo(
+        repo_path=Path("/srv/backup/local"),
+        password_file=Path("/tmp/pw.txt"),
+        prune_keep_params=_make_prune_params(),
+        copy_destinations=[mirror],
+    )
+
+    failed = _make_job(repositories=[repo]).run_deferred_copies()
+
+    assert failed == []
+    cmd = mock_run.call_args.kwargs.get("args") or mock_run.call_args[0][0]
+    assert "mirror_repo.sh" in str(cmd[1])
+    assert cmd[2:] == [
+        "-s", "/srv/backup/local",
+        "-d", "sftp:user@host:/backups/root",
+    ]
+
+
+@mock.patch("resticlvm.orchestration.data_classes.subprocess.run")
+def test_chained_copy_sources_from_upstream_destination(mock_run):
+    """A destination with source=<name> copies from that destination."""
+    nas = CopyDestination(
+        repo_path="/mnt/nas/root",
+        password_file=Path("/tmp/nas_pw.txt"),
+        prune_keep_params=_make_prune_params(),
+        name="nas",
+    )
+    offsite = CopyDestination(
+        repo_path="sftp:host:/offsite/root",
+        password_file=Path("/tmp/offsite_pw.txt"),
+        prune_keep_params=_make_prune_params(),
+        source="nas",
+    )
+    repo = ResticRepo(
+        repo_path=Path("/srv/backup/local"),
+        password_file=Path("/tmp/pw.txt"),
+        prune_keep_params=_make_prune_params(),
+        copy_destinations=[offsite, nas],
+    )
+
+    failed = _make_job(repositories=[repo]).run_deferred_copies()
+
+    assert failed == []
+    cmds = [c.kwargs["args"] for c in mock_run.call_args_list]
+    assert cmds[0][2:10] == [
+        "-s", "/srv/backup/local", "-p", "/tmp/pw.txt",
+        "-d", "/mnt/nas/root", "-q", "/tmp/nas_pw.txt",
+    ]
+    assert cmds[1][2:10] == [
+        "-s", "/mnt/nas/root", "-p", "/tmp/nas_pw.txt",
+        "-d", "sftp:host:/offsite/root", "-q", "/tmp/offsite_pw.txt",
+    ]
+
+
+@mock.patch("resticlvm.orchestration.data_classes.subprocess.run")
+def test_chained_copy_skipped_when_upstream_fails(mock_run):
+    mock_run.side_effect = subprocess.CalledProcessError(1, "copy_repo.sh")
+    nas = CopyDestination(
+        repo_path="/mnt/nas/root",
+        password_file=Path("/tmp/nas_pw.txt"),
+        prune_keep_params=_make_prune_params(),
+        name="nas",
+    )
+    offsite = CopyDestination(
+        repo_path="sftp:host:/offsite/root",
+        password_file=Path("/tmp/offsite_pw.txt"),
+        prune_keep_params=_make_prune_params(),
+        source="nas",
+    )
+    repo = ResticRepo(
+        repo_path=Path("/srv/backup/local"),
+        password_file=Path("/tmp/pw.txt"),
+        prune_keep_params=_make_prune_params(),
+        copy_destinations=[nas, offsite],
+    )
+
+    failed = _make_job(repositories=[repo]).run_deferred_copies()
+
+    assert failed == ["/mnt/nas/root", "sftp:host:/offsite/root"]
+    assert mock_run.call_count == 1
+
+
+# ─── Exclusions ─────────────────────────────────────────────────────────────
+
+
+@mock.patch("resticlvm.orchestration.data_classes.subprocess.run")
+def test_run_passes_generated_exclusion_dir(mock_run):
+    """The job writes exclude_paths to a file and passes its directory."""
+    from resticlvm.orchestration.backup_config import ExclusionSettings
+
+    seen = {}
+
+    def capture(args, **kwargs):
+        excl_dir = Path(args[args.index("--exclude-dir") + 1])
+        seen["exclude"] = (excl_dir / "exclude.txt").read_text()
+        seen["args"] = args
+
+    mock_run.side_effect = capture
+    job = BackupJob(
+        script_name="backup_path.sh",
+        script_token_config_key_pairs=[],
+        config={"exclude_paths": ["/srv/VM images"]},
+        name="data",
+        category="standard_path",
+        repositories=[],
+        exclusions=ExclusionSettings(exclude_caches=True),
+    )
+
+    assert job.run().script_ok is True
+    assert seen["exclude"] == "/srv/VM images\n"
+    assert "--exclude-caches" in seen["args"]
+
+
+def _path_job():
+    return BackupJob(
+        script_name="backup_path.sh",
+        script_token_config_key_pairs=[],
+        config={"backup_source_path": "/boot"},
+        name="boot",
+        category="standard_path",
+        repositories=[
+            ResticRepo(
+                repo_path=Path("/srv/a"),
+                password_file=Path("/tmp/pw.txt"),
+                prune_keep_params=_make_prune_params(),
+            ),
+            ResticRepo(
+                repo_path=Path("/srv/b"),
+                password_file=Path("/tmp/pw.txt"),
+                prune_keep_params=_make_prune_params(),
+            ),
+        ],
+    )
+
+
+def test_run_records_parents_and_passes_them_next_time(tmp_path):
+    """Snapshots from the report become --repo-parent on the next run."""
+    job = _path_job()
+    assert "--repo-parent" not in job.args_list
+
+    def fake_run(args, **kwargs):
+        report = Path(args[args.index("--report") + 1])
+        report.write_text("/srv/a\t1234abcd\t\t1700000000\n")
+        raise subprocess.CalledProcessError(1, "bash")  # /srv/b failed
+
+    with mock.patch(
+        "resticlvm.orchestration.data_classes.subprocess.run",
+        side_effect=fake_run,
+    ):
+        assert job.run().script_ok is False
+
+    args = job.args_list
+    assert args.count("--repo-parent") == 2
+    assert args[args.index("--repo-parent") + 1] == "1234abcd"
+    assert args[args.index("--repo-parent") + 3] == ""
+
+
+def test_run_feeds_file_index_from_a_local_repo():
+    job = _path_job()
+    job.repositories[0].repo_path = "sftp:host:/a"
+    job.config["file_index"] = True
+
+    def fake_run(args, **kwargs):
+        report = Path(args[args.index("--report") + 1])
+        report.write_text("sftp:host:/a\t1111aaaa\t\t1700000000\n"
+                          "/srv/b\t2222bbbb\t\t1700000001\n")
+
+    with mock.patch(
+        "resticlvm.orchestration.data_classes.subprocess.run",
+        side_effect=fake_run,
+    ), mock.patch(
+        "resticlvm.orchestration.data_classes.update_index"
+    ) as update:
+        assert job.run().script_ok is True
+
+    key, roots, repo, _, _, generation = update.call_args.args
+    assert (key, roots, repo) == ("standard_path.boot", ["/boot"], "/srv/b")
+    assert generation.snapshots == {
+        "sftp:host:/a": "1111aaaa", "/srv/b": "2222bbbb",
+    }
@@ -2,6 +2,7 @@
 
 from resticlvm.orchestration.backup_config import VolumeType
 from resticlvm.orchestration.dispatch import (
+    COMMAND_TOKEN_KEY_MAP,
     LOGICAL_VOLUME_TOKEN_KEY_MAP,
     RESOURCE_DISPATCH,
     STANDARD_PATH_TOKEN_KEY_MAP,
@@ -11,7 +12,8 @@ from resticlvm.orchestration.dispatch import (
 def test_standard_path_token_key_map():
     """Test STANDARD_PATH_TOKEN_KEY_MAP has expected mappings."""
     assert STANDARD_PATH_TOKEN_KEY_MAP["-s"] == "backup_source_path"
-    assert STANDARD_PATH_TOKEN_KEY_MAP["-e"] == "exclude_paths"
+    # Exclusions travel in a generated exclusion directory, not as -e.
+    assert "-e" not in STANDARD_PATH_TOKEN_KEY_MAP
 
 
 def test_logical_volume_token_key_map():
@@ -20,7 +22,7 @@ def test_logical_volume_token_key_map():
     assert LOGICAL_VOLUME_TOKEN_KEY_MAP["-l"] == "lv_name"
     assert LOGICAL_VOLUME_TOKEN_KEY_MAP["-z"] == "snapshot_size"
     assert LOGICAL_VOLUME_TOKEN_KEY_MAP["-s"] == "backup_source_path"
-    assert LOGICAL_VOLUME_TOKEN_KEY_MAP["-e"] == "exclude_paths"
+    assert "-e" not in LOGICAL_VOLUME_TOKEN_KEY_MAP
 
 
 def test_resource_dispatch_structure():
@@ -51,7 +53,15 @@ def test_resource_dispatch_lv_nonroot():
     assert entry["token_key_map"] == LOGICAL_VOLUME_TOKEN_KEY_MAP
 
 
+def test_resource_dispatch_command():
+    """Test RESOURCE_DISPATCH command configuration."""
+    entry = RESOURCE_DISPATCH[VolumeType.COMMAND]
+    assert entry["script_name"] == "backup_command.sh"
+    assert entry["token_key_map"] == COMMAND_TOKEN_KEY_MAP
+    assert COMMAND_TOKEN_KEY_MAP == {"-c": "command", "-f": "stdin_filename"}
+
+
 def test_resource_dispatch_keys_count():
     """Test that RESOURCE_DISPATCH has exactly the expected volume types."""
-    assert len(RESOURCE_DISPATCH) == 3
+    assert len(RESOURCE_DISPATCH) == 4
     assert set(RESOURCE_DISPATCH.keys()) == set(VolumeType)
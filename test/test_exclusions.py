@@ -0,0 +1,62 @@
+"""Tests for the exclusions module."""
+
+import pytest
+
+from resticlvm.orchestration.backup_config import ExclusionSettings
+from resticlvm.orchestration.exclusions import (
+    exclusion_args,
+    exclusion_dir,
+    write_exclusion_dir,
+)
+
+
+def test_exclude_paths_written_one_per_line(tmp_path):
+    write_exclusion_dir(tmp_path, ["/srv/VM images", "/var/cache"], ExclusionSettings())
+
+    assert (tmp_path / "exclude.txt").read_text() == "/srv/VM images\n/var/cache\n"
+    assert not (tmp_path / "iexclude.txt").exists()
+
+
+def test_exclude_file_contents_appended(tmp_path):
+    user_file = tmp_path / "user-excludes"
+    user_file.write_text("*.o\n/home/*/.cache\n")
+    out = tmp_path / "out"
+    out.mkdir()
+
+    write_exclusion_dir(out, ["/tmp"], ExclusionSettings(exclude_file=[user_file]))
+
+    lines = (out / "exclude.txt").read_text().splitlines()
+    assert lines[0] == "/tmp"
+    assert lines[-2:] == ["*.o", "/home/*/.cache"]
+
+
+def test_missing_exclude_file_raises(tmp_path):
+    settings = ExclusionSettings(exclude_file=[tmp_path / "missing"])
+    with pytest.raises(ValueError, match="cannot read exclude_file"):
+        write_exclusion_dir(tmp_path, [], settings)
+
+
+def test_iexclude_written(tmp_path):
+    write_exclusion_dir(tmp_path, [], ExclusionSettings(iexclude=["*.JPG"]))
+    assert (tmp_path / "iexclude.txt").read_text() == "*.JPG\n"
+
+
+def test_exclusion_dir_is_removed_afterwards():
+    with exclusion_dir(["/tmp"], ExclusionSettings()) as directory:
+        assert (directory / "exclude.txt").exists()
+    assert not directory.exists()
+
+
+def test_exclusion_args(tmp_path):
+    settings = ExclusionSettings(
+        exclude_caches=True,
+        exclude_if_present=[".nobackup", ".git"],
+        exclude_larger_than="2G",
+    )
+    assert exclusion_args(tmp_path, settings) == [
+        "--exclude-dir", str(tmp_path),
+        "--exclude-caches",
+        "--exclude-if-present", ".nobackup",
+        "--exclude-if-present", ".git",
+        "--exclude-larger-than", "2G",
+    ]
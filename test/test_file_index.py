@@ -0,0 +1,129 @@
+"""Tests for the file_index module."""
+
+import json
+import subprocess
+from unittest import mock
+
+from resticlvm.orchestration.file_index import (
+    RESTART_INTERVAL,
+    FileIndex,
+    Generation,
+    apply_changes,
+    index_path,
+    load_entries,
+    update_index,
+    write_index,
+)
+
+
+def _many_entries():
+    entries = {f"/home/u/file{i:04d}.txt": [[0, None]] for i in range(300)}
+    entries["/home/u/notes.md"] = [[0, 2], [2, None]]
+    entries["/etc/fstab"] = [[1, None]]
+    entries["/home/caf\udce9"] = [[0, 1]]  # not valid UTF-8
+    return entries
+
+
+def test_round_trip_and_lookup(tmp_path):
+    path = tmp_path / "vol.idx"
+    entries = _many_entries()
+    gens = [Generation(100.0, {"/srv/a": "1111aaaa"}),
+            Generation(200.0, {"/srv/a": "2222bbbb"}),
+            Generation(300.0, {"/srv/a": "3333cccc"})]
+
+    write_index(path, gens, entries)
+
+    assert len(entries) > 2 * RESTART_INTERVAL
+    assert load_entries(path) == (gens, entries)
+    with FileIndex(path) as index:
+        assert index.lookup("/home/u/notes.md") == [[0, 2], [2, None]]
+        assert index.lookup("/home/u/file0299.txt") == [[0, None]]
+        assert index.lookup("/etc/fstab") == [[1, None]]
+        assert index.lookup("/home/caf\udce9") == [[0, 1]]
+        assert index.lookup("/home/u/missing") is None
+        assert index.lookup("/a") is None
+
+
+def test_match_globs_and_file_names(tmp_path):
+    path = tmp_path / "vol.idx"
+    write_index(path, [Generation(1.0)], _many_entries())
+
+    with FileIndex(path) as index:
+        assert [p for p, _ in index.match("/home/u/file012?.txt")] == [
+            f"/home/u/file{i:04d}.txt" for i in range(120, 130)
+        ]
+        assert [p for p, _ in index.match("*.md")] == ["/home/u/notes.md"]
+        assert [p for p, _ in index.match("/etc/fstab")] == ["/etc/fstab"]
+
+
+def test_apply_changes_tracks_versions():
+    entries = {"/a": [[0, None]], "/b": [[0, None]]}
+
+    apply_changes(entries, 1, [("M", "/a"), ("-", "/b"), ("+", "/c"),
+                               ("U", "/a")])
+
+    assert entries == {
+        "/a": [[0, 1], [1, None]],
+        "/b": [[0, 1]],
+        "/c": [[1, None]],
+    }
+
+
+def _restic(listing, diff):
+    def run(cmd, **kwargs):
+        sub = cmd[cmd.index("--no-lock") + 1]
+        if sub == "diff" and diff is None:
+            raise subprocess.CalledProcessError(1, cmd)
+        lines = listing if sub == "ls" else diff
+        return subprocess.CompletedProcess(
+            cmd, 0, stdout="\n".join(json.dumps(m) for m in lines)
+        )
+    return run
+
+
+@mock.patch("resticlvm.orchestration.file_index.subprocess.run")
+def test_update_lists_first_backup_then_diffs(mock_run):
+    mock_run.side_effect = _restic(
+        listing=[
+            {"struct_type": "snapshot", "paths": ["/boot"]},
+            {"struct_type": "node", "path": "/boot"},
+            {"struct_type": "node", "path": "/boot/vmlinuz"},
+        ],
+        diff=[
+            {"message_type": "change", "path": "/boot/vmlinuz", "modifier": "M"},
+            {"message_type": "change", "path": "/boot/grub/", "modifier": "+"},
+            {"message_type": "statistics"},
+        ],
+    )
+
+    update_index("standard_path.boot", ["/boot"], "/srv/a", "/pw", {},
+                 Generation(1.0, {"/srv/a": "1111aaaa"}))
+    update_index("standard_path.boot", ["/boot"], "/srv/a", "/pw", {},
+                 Generation(2.0, {"/srv/a": "2222bbbb"}))
+
+    subcommands = [c.args[0][6] for c in mock_run.call_args_list]
+    assert subcommands == ["ls", "diff"]
+    gens, entries = load_entries(index_path("standard_path.boot"))
+    assert [g.snapshots for g in gens] == [{"/srv/a": "1111aaaa"},
+                                           {"/srv/a": "2222bbbb"}]
+    assert entries == {
+        "/boot": [[0, None]],
+        "/boot/vmlinuz": [[0, 1], [1, None]],
+        "/boot/grub": [[1, None]],
+    }
+
+
+@mock.patch("resticlvm.orchestration.file_index.subprocess.run")
+def test_update_falls_back_to_listing_and_filters_roots(mock_run):
+    mock_run.side_effect = _restic(
+        listing=[{"path": "/boot/a"}, {"path": "/boot/efi/b"}], diff=None,
+    )
+    write_index(index_path("standard_path.boot"),
+                [Generation(1.0, {"/srv/a": "1111aaaa"})],
+                {"/boot/old": [[0, None]]})
+
+    update_index("standard_path.boot", ["/boot/efi"], "/srv/a", "/pw", {},
+                 Generation(2.0, {"/srv/a": "2222bbbb"}))
+
+    _, entries = load_entries(index_path("standard_path.boot"))
+    assert entries == {"/boot/old": [[0, 1]], "/boot/efi/b": [[1, None]]}
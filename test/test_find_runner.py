@@ -0,0 +1,88 @@
+"""Tests for the find_runner module."""
+
+import argparse
+from unittest import mock
+
+from resticlvm.orchestration.catalog import Catalog, SnapshotRecord
+from resticlvm.orchestration.file_index import (
+    Generation,
+    index_path,
+    write_index,
+)
+from resticlvm.orchestration.find_runner import run
+
+CONFIG = """
+[prune_policy.standard]
+keep_last = 1
+keep_daily = 1
+keep_weekly = 1
+keep_monthly = 1
+keep_yearly = 1
+
+[volume.boot]
+volume_type = "standard_path"
+backup_source_path = "/boot"
+exclude_paths = []
+file_index = true
+
+[[volume.boot.repositories]]
+repo_path = "/srv/backup/boot"
+password_file = "/tmp/pw.txt"
+prune_policy = "standard"
+
+[[volume.boot.repositories.copy_to]]
+repo = "/mnt/nas/boot"
+password_file = "/tmp/nas_pw.txt"
+prune_policy = "standard"
+"""
+
+
+def _args(config, pattern, **kwargs):
+    defaults = dict(config=str(config), dry_run=False, category=None,
+                    name=None, pattern=pattern, limit=100)
+    return argparse.Namespace(**{**defaults, **kwargs})
+
+
+@mock.patch("resticlvm.orchestration.find_runner.socket.gethostname",
+            return_value="host")
+def test_lists_versions_with_latest_snapshot_per_destination(
+    _hostname, tmp_path, capsys
+):
+    config = tmp_path / "backup.toml"
+    config.write_text(CONFIG)
+    write_index(
+        index_path("standard_path.boot"),
+        [Generation(1000.0, {"/srv/backup/boot": "1111aaaa"}),
+         Generation(2000.0, {"/srv/backup/boot": "2222bbbb"}),
+         Generation(3000.0, {"/srv/backup/boot": "3333cccc"})],
+        {"/boot/grub/grub.cfg": [[0, 2], [2, None]]},
+    )
+    catalog = Catalog()
+    # 1111aaaa was forgotten; the catalog still lists the others.
+    catalog.add("/srv/backup/boot", [
+        SnapshotRecord("2222bbbb", 2000.0, "host", ["/boot"]),
+        SnapshotRecord("3333cccc", 3000.0, "host", ["/boot"]),
+    ])
+    catalog.add("/mnt/nas/boot", [
+        SnapshotRecord("9999ffff", 1010.0, "host", ["/boot"]),
+    ])
+
+    run(_args(config, "grub.cfg"))
+
+    out = capsys.readouterr().out
+    version_1, version_2 = out.split("version 2:")
+    assert "/srv/backup/boot: 2222bbbb" in version_1
+    assert "copy → /mnt/nas/boot: 9999ffff" in version_1
+    assert "(2 backup(s))" in version_1
+    assert "→ present (1 backup(s))" in version_2
+    assert "/srv/backup/boot: 3333cccc" in version_2
+    assert "/mnt/nas/boot" not in version_2
+
+
+def test_reports_missing_index(tmp_path, capsys):
+    config = tmp_path / "backup.toml"
+    config.write_text(CONFIG)
+
+    run(_args(config, "/boot/*"))
+
+    assert "has no file index yet" in capsys.readouterr().out
@@ -0,0 +1,112 @@
+"""Tests for the grouping module."""
+
+import subprocess
+from pathlib import Path
+from unittest import mock
+
+from resticlvm.orchestration.backup_config import ExclusionSettings
+from resticlvm.orchestration.data_classes import BackupJob
+from resticlvm.orchestration.grouping import BackupGroupJob, group_jobs
+from resticlvm.orchestration.restic_repo import (
+    ResticPruneKeepParams,
+    ResticRepo,
+)
+
+
+def _repo(path="/srv/backup/small"):
+    return ResticRepo(
+        repo_path=Path(path),
+        password_file=Path("/root/pw.txt"),
+        prune_keep_params=ResticPruneKeepParams(
+            last=1, daily=1, weekly=1, monthly=1, yearly=1
+        ),
+    )
+
+
+def _job(name, source, category="standard_path", repo=None,
+         exclude_paths=(), exclusions=None, **config):
+    return BackupJob(
+        script_name="backup_path.sh",
+        script_token_config_key_pairs=[],
+        config={
+            "backup_source_path": source,
+            "exclude_paths": list(exclude_paths),
+            **config,
+        },
+        name=name,
+        category=category,
+        repositories=[repo or _repo()],
+        exclusions=exclusions or ExclusionSettings(),
+    )
+
+
+def test_jobs_sharing_repos_are_grouped():
+    boot = _job("boot", "/boot")
+    home = _job("home", "/home", exclude_paths=["/home/*/.cache"])
+    other = _job("srv", "/srv", repo=_repo("/srv/backup/other"))
+
+    units = group_jobs([boot, other, home])
+
+    assert len(units) == 2
+    group = units[0]
+    assert isinstance(group, BackupGroupJob)
+    assert group.members == [boot, home]
+    assert units[1] is other
+
+    args = group.args_list
+    assert args.count("--group-source") == 2
+    assert ["--tag", "vol:boot"] == args[args.index("/boot") + 1:][:2]
+    assert args.count("-r") == 1
+    assert group.config["exclude_paths"] == ["/home/*/.cache"]
+
+
+def test_overlapping_sources_and_reaching_excludes_are_not_grouped():
+    boot = _job("boot", "/boot", exclude_paths=["/boot/efi"])
+    efi = _job("efi", "/boot/efi")
+    var = _job("var", "/var", exclude_paths=["/srv/data"])
+    srv = _job("srv", "/srv")
+
+    assert group_jobs([boot, efi]) == [boot, efi]
+    assert group_jobs([var, srv]) == [var, srv]
+
+
+def test_differing_run_wide_exclusions_are_not_grouped():
+    a = _job("a", "/a", exclusions=ExclusionSettings(exclude_caches=True))
+    b = _job("b", "/b")
+    c = _job("c", "/c", exclude_paths=["*.tmp"])
+
+    assert group_jobs([a, b, c]) == [a, b, c]
+
+
+def test_lv_root_is_never_grouped():
+    root = _job("root", "/", category="lv_root")
+    assert group_jobs([root, _job("boot", "/boot")])[0] is root
+
+
+def test_lv_nonroot_group_binds_snapshots():
+    data = _job("data", "/data", category="lv_nonroot",
+                vg_name="vg0", lv_name="data")
+    logs = _job("logs", "/logs", category="lv_nonroot",
+                vg_name="vg0", lv_name="logs")
+    group = group_jobs([data, logs])[0]
+
+    group.snapshot_mounts = {"data": "/tmp/resticlvm/data"}
+    args = group.args_list
+
+    assert ["--snapshot-bind", "vg0/data:/tmp/resticlvm/data"] == (
+        args[args.index("--snapshot-bind"):][:2]
+    )
+    assert args.count("--snapshot-bind") == 1
+
+
+def test_run_members_reports_each_member():
+    group = group_jobs([_job("a", "/a"), _job("b", "/b")])[0]
+
+    with mock.patch(
+        "resticlvm.orchestration.data_classes.subprocess.run",
+        side_effect=subprocess.CalledProcessError(1, "bash"),
+    ) as run:
+        results = group.run_members()
+
+    run.assert_called_once()
+    assert [(r.name, r.ok) for r in results] == [("a", False), ("b", False)]
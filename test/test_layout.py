@@ -0,0 +1,122 @@
+"""Tests for the layout module."""
+
+import json
+import subprocess
+from pathlib import Path
+from unittest import mock
+
+from resticlvm.orchestration.backup_config import BackupConfigFactory
+from resticlvm.orchestration.layout import (
+    LAYOUT_FILENAME,
+    LAYOUT_TAG,
+    capture_layout,
+    layout_repositories,
+    manifest_digest,
+    store_layout,
+)
+
+POLICY = {"keep_last": 1, "keep_daily": 1, "keep_weekly": 1,
+          "keep_monthly": 1, "keep_yearly": 1}
+REPO = {"repo_path": "/srv/a", "password_file": "/pw", "prune_policy": "p",
+        "copy_to": [{"repo": "sftp:nas:/a", "password_file": "/nas_pw",
+                     "prune_policy": "p"}]}
+
+
+def _config():
+    raw = {
+        "prune_policy": {"p": POLICY},
+        "volume": {
+            "root": {"volume_type": "lv_root", "vg_name": "vg0",
+                     "lv_name": "root", "snapshot_size": "2G",
+                     "backup_source_path": "/", "exclude_paths": [],
+                     "repositories": [REPO]},
+            "boot": {"volume_type": "standard_path",
+                     "backup_source_path": "/boot", "exclude_paths": [],
+                     "repositories": [REPO]},
+        },
+    }
+    return BackupConfigFactory(raw).build()
+
+
+def _lvm_tools(cmd, **kwargs):
+    out = ""
+    if cmd[0] == "pvs":
+        out = json.dumps({"report": [{"pv": [
+            {"pv_name": "/dev/sda2", "pv_uuid": "PV-UUID", "pv_size": "1000"},
+        ]}]})
+    elif cmd[0] == "lvs":
+        out = json.dumps({"report": [{"lv": [
+            {"lv_name": "root", "lv_size": "600", "lv_attr": "-wi-ao----"},
+            {"lv_name": "swap", "lv_size": "100", "lv_attr": "-wi-ao----"},
+            {"lv_name": "root_snap", "lv_size": "50", "lv_attr": "swi-a-s---"},
+        ]}]})
+    elif cmd[0] == "vgcfgbackup":
+        Path(cmd[2]).write_text("vg0 {\n\tseqno = 7\n}\n")
+    elif cmd[0] == "blkid":
+        device = cmd[-1]
+        fstype = "swap" if device.endswith("swap") else "ext4"
+        out = f"DEVNAME={device}\nUUID=uuid-{device[-4:]}\nTYPE={fstype}\n"
+    elif cmd[0] == "findmnt":
+        if "--source" in cmd and cmd[-1].endswith("swap"):
+            raise subprocess.CalledProcessError(1, cmd)
+        target = "/boot" if "-T" in cmd else "/"
+        source = "/dev/sda1" if "-T" in cmd else cmd[-1]
+        out = json.dumps({"filesystems": [{
+            "target": target, "source": source, "fstype": "ext4",
+            "options": "rw,relatime",
+        }]})
+    return subprocess.CompletedProcess(cmd, 0, stdout=out, stderr="")
+
+
+@mock.patch("resticlvm.orchestration.layout.subprocess.run")
+def test_capture_layout(mock_run):
+    mock_run.side_effect = _lvm_tools
+
+    manifest = capture_layout(_config(), "# config\n")
+
+    assert manifest["vgs"]["vg0"]["pvs"] == [
+        {"name": "/dev/sda2", "uuid": "PV-UUID", "size_bytes": 1000},
+    ]
+    assert "seqno = 7" in manifest["vgs"]["vg0"]["vgcfgbackup"]
+    assert [(lv["lv"], lv["fstype"], lv["mount_point"], lv["volume"])
+            for lv in manifest["lvs"]] == [
+        ("root", "ext4", "/", "root"),
+        ("swap", "swap", None, None),
+    ]
+    assert manifest["mounts"][0]["source"] == "/dev/sda1"
+    assert manifest["config"] == "# config\n"
+
+
+def _manifest(seqno=7, size=600):
+    return {
+        "format": 1, "hostname": "host", "captured_at": f"2026-03-0{seqno % 9}",
+        "vgs": {"vg0": {"pvs": [], "vgcfgbackup":
+                        f"# Generated by LVM2 at {seqno}\nvg0 {{\n"
+                        f"\tseqno = {seqno}\n\tsize = {size}\n}}\n"}},
+        "lvs": [], "mounts": [], "config": "",
+    }
+
+
+def test_digest_ignores_timestamps_and_sequence_numbers():
+    assert manifest_digest(_manifest(7)) == manifest_digest(_manifest(8))
+    assert manifest_digest(_manifest(7)) != manifest_digest(_manifest(7, 700))
+
+
+@mock.patch("resticlvm.orchestration.layout.subprocess.run")
+def test_store_layout_only_when_changed(mock_run):
+    mock_run.return_value = subprocess.CompletedProcess([], 0, b"", b"")
+    repos = layout_repositories(_config().volumes)
+
+    store_layout(_manifest(7), repos, {})
+    store_layout(_manifest(8), repos, {})
+    store_layout(_manifest(8, 700), repos, {})
+
+    # Own repositories only; the copy destination gets it via restic copy.
+    assert [d.repo_path for d in repos] == ["/srv/a"]
+    assert mock_run.call_count == 2
+    cmd = mock_run.call_args.args[0]
+    assert cmd[cmd.index("backup"):] == [
+        "backup", "--stdin", "--stdin-filename", LAYOUT_FILENAME,
+        "--tag", LAYOUT_TAG, "--quiet",
+    ]
+    assert json.loads(mock_run.call_args.kwargs["input"])["hostname"] == "host"
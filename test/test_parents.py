@@ -0,0 +1,68 @@
+"""Tests for the parents module."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from resticlvm.orchestration.parents import (
+    record_backup_report,
+    recorded_parent,
+)
+
+
+def _report(tmp_path, *lines):
+    tmp_path.mkdir(exist_ok=True)
+    path = tmp_path / "report.tsv"
+    path.write_text("".join(f"{line}\n" for line in lines))
+    return path
+
+
+def test_records_snapshot_per_repo_and_paths(tmp_path):
+    report = _report(tmp_path, "/srv/a\t1234abcd\t\t1700000000", "/srv/b\t\t\t")
+
+    record_backup_report("standard_path.boot", report, ["/boot"], {})
+
+    assert recorded_parent("standard_path.boot", "/srv/a", ["/boot"]) == "1234abcd"
+    # No snapshot reported (backup failed): nothing recorded.
+    assert recorded_parent("standard_path.boot", "/srv/b", ["/boot"]) is None
+    # A different source path must not reuse the parent.
+    assert recorded_parent("standard_path.boot", "/srv/a", ["/efi"]) is None
+
+
+def test_warns_when_recorded_parent_not_used(tmp_path, capsys):
+    report = _report(tmp_path, "/srv/a\tbbbb0000\t\t1", "/srv/b\tcccc0000\t99990000\t1")
+
+    record_backup_report(
+        "standard_path.boot", report, ["/boot"],
+        {"/srv/a": "aaaa0000", "/srv/b": "99990000"},
+    )
+
+    out = capsys.readouterr().out
+    assert "did not use the recorded parent aaaa0000 for /srv/a" in out
+    assert "/srv/b" not in out
+    assert recorded_parent("standard_path.boot", "/srv/a", ["/boot"]) == "bbbb0000"
+
+
+def test_overlapping_reports_keep_both_jobs(tmp_path, monkeypatch):
+    """Two backups reporting at once each keep their recorded parent."""
+    from resticlvm.orchestration import parents
+
+    load = parents.load_state
+
+    def slow_load(name):
+        data = load(name)
+        time.sleep(0.05)
+        return data
+
+    monkeypatch.setattr(parents, "load_state", slow_load)
+    reports = {
+        "standard_path.boot": _report(tmp_path / "boot", "/srv/a\taaaa0000\t\t1"),
+        "standard_path.efi": _report(tmp_path / "efi", "/srv/a\tbbbb0000\t\t1"),
+    }
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        list(pool.map(
+            lambda key: record_backup_report(key, reports[key], ["/x"], {}),
+            reports,
+        ))
+
+    assert recorded_parent("standard_path.boot", "/srv/a", ["/x"]) == "aaaa0000"
+    assert recorded_parent("standard_path.efi", "/srv/a", ["/x"]) == "bbbb0000"
@@ -0,0 +1,85 @@
+"""Tests for the performance module."""
+
+import pytest
+
+from resticlvm.orchestration import performance, restic_features
+from resticlvm.orchestration.performance import (
+    PerformanceProfile,
+    merge_profiles,
+    restic_env,
+    restic_options,
+)
+
+
+@pytest.fixture(autouse=True)
+def restic_0_16(monkeypatch):
+    """Pretend restic 0.16.4 is installed; reset the once-only warnings."""
+    monkeypatch.setattr(restic_features, "restic_version", lambda: (0, 16, 4))
+    monkeypatch.setattr(performance, "_warned", set())
+
+
+PROFILE = PerformanceProfile(
+    compression="max",
+    pack_size=64,
+    read_concurrency=4,
+    connections={"sftp": 8, "s3": 16},
+    gomaxprocs=2,
+    gogc="200",
+)
+
+
+def test_backup_options():
+    assert restic_options(PROFILE, "sftp:host:/repo", command="backup") == [
+        "--compression=max",
+        "--pack-size=64",
+        "--read-concurrency=4",
+        "-o", "sftp.connections=8",
+    ]
+
+
+def test_read_concurrency_is_backup_only():
+    assert "--read-concurrency=4" not in restic_options(
+        PROFILE, "/srv/repo", command="prune"
+    )
+
+
+def test_connections_only_for_touched_backends():
+    opts = restic_options(PROFILE, "/srv/repo", "s3:host/bucket", command="copy")
+    assert opts[-2:] == ["-o", "s3.connections=16"]
+    assert "sftp.connections=8" not in opts
+
+
+def test_no_profile_no_options():
+    assert restic_options(None, "/srv/repo") == []
+    assert restic_env(None) == {}
+
+
+def test_unsupported_options_skipped(monkeypatch, capsys):
+    monkeypatch.setattr(restic_features, "restic_version", lambda: (0, 14, 0))
+
+    opts = restic_options(PROFILE, "sftp:host:/repo", command="backup")
+
+    assert opts == ["--compression=max", "--pack-size=64"]
+    assert "does not support --read-concurrency" in capsys.readouterr().out
+
+
+def test_unknown_restic_version_skips_versioned_options(monkeypatch):
+    monkeypatch.setattr(restic_features, "restic_version", lambda: None)
+    assert restic_options(PROFILE, "s3:host/bucket") == ["-o", "s3.connections=16"]
+
+
+def test_restic_env():
+    assert restic_env(PROFILE) == {"GOMAXPROCS": "2", "GOGC": "200"}
+
+
+def test_merge_profiles_override_wins():
+    base = PerformanceProfile(compression="auto", pack_size=16, connections={"s3": 4})
+    override = PerformanceProfile(compression="max", connections={"sftp": 2})
+
+    merged = merge_profiles(base, override)
+
+    assert merged.compression == "max"
+    assert merged.pack_size == 16
+    assert merged.connections == {"s3": 4, "sftp": 2}
+    assert merge_profiles(None, override) is override
+    assert merge_profiles(base, None) is base
@@ -0,0 +1,134 @@
+"""Tests for the prune_plan module."""
+
+from pathlib import Path
+
+from resticlvm.orchestration.backup_config import BackupConfigFactory
+from resticlvm.orchestration.prune_plan import merge_prune_params, plan_prune
+from resticlvm.orchestration.restic_repo import ResticPruneKeepParams
+
+
+def _policy(last):
+    return {
+        "keep_last": last,
+        "keep_daily": 7,
+        "keep_weekly": 4,
+        "keep_monthly": 6,
+        "keep_yearly": 1,
+    }
+
+
+def _volume(source, repo_path, policy="short", copy_to=None):
+    return {
+        "volume_type": "standard_path",
+        "backup_source_path": source,
+        "exclude_paths": [],
+        "repositories": [
+            {
+                "repo_path": repo_path,
+                "password_file": "/tmp/pw.txt",
+                "prune_policy": policy,
+                "copy_to": copy_to or [],
+            }
+        ],
+    }
+
+
+def _config(volumes):
+    return BackupConfigFactory({
+        "prune_policy": {"short": _policy(3), "long": _policy(30)},
+        "volume": volumes,
+    }).build()
+
+
+def test_copy_destinations_are_pruned():
+    config = _config({
+        "boot": _volume("/boot", "/srv/backup/boot", copy_to=[
+            {"repo": "sftp:host:/boot", "password_file": "/tmp/r.txt",
+             "prune_policy": "long"},
+        ]),
+    })
+
+    repos = plan_prune(config)
+
+    assert [str(r.repo_path) for r in repos] == ["/srv/backup/boot", "sftp:host:/boot"]
+    assert repos[1].password_file == Path("/tmp/r.txt")
+    assert repos[1].prune_keep_params.last == 30
+
+
+def test_shared_repo_pruned_once_with_merged_policy():
+    config = _config({
+        "boot": _volume("/boot", "/srv/backup/shared", policy="short"),
+        "efi": _volume("/boot/efi", "/srv/backup/shared", policy="long"),
+    })
+
+    repos = plan_prune(config)
+
+    assert len(repos) == 1
+    assert repos[0].prune_keep_params.last == 30
+
+
+def test_shared_copy_destination_pruned_once():
+    dest = {"repo": "sftp:host:/shared", "password_file": "/tmp/r.txt",
+            "prune_policy": "short"}
+    config = _config({
+        "boot": _volume("/boot", "/srv/backup/boot", copy_to=[dest]),
+        "efi": _volume("/boot/efi", "/srv/backup/efi", copy_to=[dict(dest)]),
+    })
+
+    paths = [str(r.repo_path) for r in plan_prune(config)]
+
+    assert paths.count("sftp:host:/shared") == 1
+
+
+def test_name_filter_still_merges_other_volumes():
+    """forget acts on the whole repo, so unselected volumes' policies count."""
+    config = _config({
+        "boot": _volume("/boot", "/srv/backup/shared", policy="short"),
+        "efi": _volume("/boot/efi", "/srv/backup/shared", policy="long"),
+        "home": _volume("/home", "/srv/backup/home"),
+    })
+
+    repos = plan_prune(config, name="boot")
+
+    assert [str(r.repo_path) for r in repos] == ["/srv/backup/shared"]
+    assert repos[0].prune_keep_params.last == 30
+
+
+def test_mirrors_follow_source_and_are_not_pruned():
+    config = _config({
+        "boot": _volume("/boot", "/srv/backup/boot", copy_to=[
+            {"repo": "sftp:u@host:/mirror", "password_file": "/tmp/r.txt",
+             "mode": "mirror"},
+        ]),
+    })
+
+    repos = plan_prune(config)
+
+    assert [str(r.repo_path) for r in repos] == ["/srv/backup/boot"]
+    assert [d.repo_path for d in repos[0].copy_destinations] == ["sftp:u@host:/mirror"]
+
+
+def test_merge_prune_params():
+    a = ResticPruneKeepParams(last=3, daily=10, weekly=1, monthly=1, yearly=0,
+                              min_reclaimable="2G", prune_every_days=7)
+    b = ResticPruneKeepParams(last=5, daily=2, weekly=4, monthly=1, yearly=2,
+                              min_reclaimable="500M", prune_every_days=1,
+                              max_unused="10%")
+
+    merged = merge_prune_params("/repo", [a, b])
+
+    assert (merged.last, merged.daily, merged.weekly, merged.yearly) == (5, 10, 4, 2)
+    assert merged.min_reclaimable == "500M"
+    assert merged.prune_every_days == 1
+    assert merged.max_unused == "10%"
+
+
+def test_copy_destination_urls_keep_double_slashes():
+    config = _config({
+        "boot": _volume("/boot", "/srv/backup/boot", copy_to=[
+            {"repo": "rest:https://host/boot", "password_file": "/pw",
+             "prune_policy": "long"},
+        ]),
+    })
+    paths = [r.repo_path for r in plan_prune(config)]
+    assert "rest:https://host/boot" in paths
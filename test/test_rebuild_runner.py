@@ -0,0 +1,85 @@
+"""Tests for the rebuild_runner module."""
+
+import subprocess
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from resticlvm.orchestration import rebuild_runner
+from resticlvm.orchestration.rebuild_runner import (
+    _restore_all,
+    filesystem_specs,
+    parse_pv_map,
+    pv_assignments,
+)
+
+MANIFEST = {
+    "vgs": {"vg0": {"pvs": [
+        {"name": "/dev/sda2", "uuid": "AAAA", "size_bytes": 1000},
+        {"name": "/dev/sdb1", "uuid": "BBBB", "size_bytes": 2000},
+    ], "vgcfgbackup": ""}},
+    "lvs": [
+        {"vg": "vg0", "lv": "root", "fstype": "ext4", "uuid": "u1",
+         "label": None},
+        {"vg": "vg0", "lv": "data", "fstype": "xfs", "uuid": "u2",
+         "label": "data"},
+        {"vg": "vg0", "lv": "raw", "fstype": None, "uuid": None,
+         "label": None},
+    ],
+}
+
+
+def test_pv_assignments_by_name_or_uuid():
+    pv_map = parse_pv_map(["/dev/sda2=/dev/loop0", "BBBB=/dev/loop1"])
+
+    assert pv_assignments(MANIFEST["vgs"]["vg0"], pv_map) == [
+        "AAAA=/dev/loop0", "BBBB=/dev/loop1",
+    ]
+
+
+def test_pv_assignments_reject_missing_or_reused_devices():
+    with pytest.raises(ValueError, match="/dev/sdb1"):
+        pv_assignments(MANIFEST["vgs"]["vg0"], {"/dev/sda2": "/dev/loop0"})
+    with pytest.raises(ValueError, match="same device"):
+        pv_assignments(MANIFEST["vgs"]["vg0"],
+                       {"AAAA": "/dev/loop0", "BBBB": "/dev/loop0"})
+    with pytest.raises(ValueError, match="OLD=NEW"):
+        parse_pv_map(["/dev/loop0"])
+
+
+def test_filesystem_specs_skip_unformatted_lvs():
+    assert filesystem_specs(MANIFEST, "vg0") == [
+        "root=ext4=u1=", "data=xfs=u2=data",
+    ]
+
+
+def test_volume_that_cannot_mount_fails_alone(capsys):
+    """One volume's mount failure is reported; the others still restore."""
+    volumes = {
+        name: SimpleNamespace(vg_name="vg0", lv_name=name)
+        for name in ("root", "data")
+    }
+    config = SimpleNamespace(
+        concurrency=SimpleNamespace(per_backend={}, max_parallel=2)
+    )
+
+    def run(cmd, check=False, **kwargs):
+        if cmd[0] == "mount" and cmd[1] == "/dev/vg0/data":
+            raise subprocess.CalledProcessError(32, cmd)
+        return subprocess.CompletedProcess(cmd, 0)
+
+    with mock.patch.object(rebuild_runner, "Catalog"), \
+            mock.patch.object(rebuild_runner, "refresh_catalog"), \
+            mock.patch.object(rebuild_runner, "plan_restores",
+                              return_value={n: (v, []) for n, v in volumes.items()}), \
+            mock.patch.object(rebuild_runner, "restore_volume",
+                              side_effect=lambda name, *a, **k: rebuild_runner.RestoreResult(name, True)), \
+            mock.patch.object(rebuild_runner.subprocess, "run", side_effect=run):
+        results = _restore_all(
+            config, {"hostname": "h"}, volumes, {},
+            SimpleNamespace(verify=False, connections=None),
+        )
+
+    assert [(r.name, r.ok) for r in results] == [("root", True), ("data", False)]
+    assert "could not mount /dev/vg0/data" in capsys.readouterr().out
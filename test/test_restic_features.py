@@ -0,0 +1,78 @@
+"""Tests for the restic_features module."""
+
+import subprocess
+from unittest import mock
+
+import pytest
+
+from resticlvm.orchestration import restic_features
+from resticlvm.orchestration.restic_features import (
+    parse_restic_version,
+    restic_version,
+    supports,
+)
+from resticlvm.orchestration.state import load_state
+
+
+@pytest.fixture
+def fake_restic(tmp_path, monkeypatch):
+    binary = tmp_path / "restic"
+    binary.write_text("#!/bin/sh\n")
+    monkeypatch.setattr(restic_features.shutil, "which", lambda name: str(binary))
+    restic_version.cache_clear()
+    yield binary
+    restic_version.cache_clear()
+
+
+def _version_output(version):
+    return subprocess.CompletedProcess(
+        args=[], returncode=0,
+        stdout=f"restic {version} compiled with go1.22.5 on linux/amd64\n",
+    )
+
+
+def test_parse_restic_version():
+    assert parse_restic_version("restic 0.16.4 compiled with go1.21") == (0, 16, 4)
+    assert parse_restic_version("garbage") is None
+
+
+@mock.patch("resticlvm.orchestration.restic_features.subprocess.run")
+def test_version_probed_once_and_cached(mock_run, fake_restic):
+    mock_run.return_value = _version_output("0.17.1")
+
+    assert restic_version() == (0, 17, 1)
+    restic_version.cache_clear()
+    assert restic_version() == (0, 17, 1)
+
+    assert mock_run.call_count == 1
+    assert load_state("restic")["version"] == "0.17.1"
+
+
+@mock.patch("resticlvm.orchestration.restic_features.subprocess.run")
+def test_upgraded_binary_reprobed(mock_run, fake_restic):
+    mock_run.return_value = _version_output("0.14.0")
+    assert restic_version() == (0, 14, 0)
+
+    fake_restic.write_text("#!/bin/sh\n# upgraded\n")
+    restic_version.cache_clear()
+    mock_run.return_value = _version_output("0.16.0")
+
+    assert restic_version() == (0, 16, 0)
+    assert mock_run.call_count == 2
+
+
+def test_missing_restic(monkeypatch):
+    monkeypatch.setattr(restic_features.shutil, "which", lambda name: None)
+    restic_version.cache_clear()
+    try:
+        assert restic_version() is None
+        assert not supports("compression")
+        assert supports("s3.connections")
+    finally:
+        restic_version.cache_clear()
+
+
+def test_supports_compares_versions(monkeypatch):
+    monkeypatch.setattr(restic_features, "restic_version", lambda: (0, 15, 2))
+    assert supports("read_concurrency")
+    assert not supports("compression_levels")
@@ -1,12 +1,19 @@
 """Tests for the restic_repo module."""
 
+import subprocess
+from datetime import datetime, timedelta
 from pathlib import Path
 from unittest import mock
 
+from resticlvm.orchestration import restic_features
+from resticlvm.orchestration.catalog import Catalog, SnapshotRecord
+from resticlvm.orchestration.performance import PerformanceProfile
 from resticlvm.orchestration.restic_repo import (
     ResticPruneKeepParams,
     ResticRepo,
+    parse_total_prune_bytes,
 )
+from resticlvm.orchestration.state import load_state, save_state
 
 
 def test_restic_prune_keep_params_creation():
@@ -91,9 +98,9 @@ def test_prune_local_repo_no_b2_credentials_needed(mock_run, monkeypatch):
     monkeypatch.delenv("AWS_SECRET_ACCESS_KEY", raising=False)
     monkeypatch.setenv("RESTICLVM_B2_ENV", "/nonexistent/b2-env")
 
-    _local_repo().prune()
+    assert _local_repo().prune() is True
 
-    mock_run.assert_called_once()
+    assert mock_run.call_count == 2  # forget, then prune
 
 
 @mock.patch("resticlvm.orchestration.restic_repo.subprocess.run")
@@ -105,3 +112,208 @@ def test_prune_respects_existing_ssh_auth_sock(mock_run, monkeypatch):
 
     env = mock_run.call_args.kwargs["env"]
     assert env["SSH_AUTH_SOCK"] == "/custom/agent.sock"
+
+
+# ─── Mirror deletion sync after prune ─────────────────────────────────────
+
+
+def _repo_with_mirror():
+    from resticlvm.orchestration.restic_repo import CopyDestination
+
+    return ResticRepo(
+        repo_path=Path("/srv/backup/local"),
+        password_file=Path("/tmp/pw.txt"),
+        prune_keep_params=_make_prune_params(),
+        copy_destinations=[
+            CopyDestination(
+                repo_path="sftp:user@host:/backups/local",
+                password_file=Path("/tmp/pw.txt"),
+                prune_keep_params=None,
+                mode="mirror",
+            )
+        ],
+    )
+
+
+@mock.patch("resticlvm.orchestration.restic_repo.subprocess.run")
+def test_prune_syncs_deletions_to_mirrors(mock_run):
+    """A successful prune is followed by a --delete sync of each mirror."""
+    assert _repo_with_mirror().prune() is True
+
+    assert mock_run.call_count == 3  # forget, prune, mirror sync
+    sync_cmd = mock_run.call_args_list[2][0][0]
+    assert "mirror_repo.sh" in sync_cmd[1]
+    assert "--delete" in sync_cmd
+
+
+@mock.patch("resticlvm.orchestration.restic_repo.subprocess.run")
+def test_failed_prune_skips_mirror_sync(mock_run):
+    """Mirrors are left untouched when the source prune fails."""
+    mock_run.side_effect = subprocess.CalledProcessError(1, "prune_repo.sh")
+
+    assert _repo_with_mirror().prune() is False
+    assert mock_run.call_count == 1
+
+
+# ─── Forget / prune split ─────────────────────────────────────────────────
+
+
+PRUNE_OUTPUT = """\
+to repack:            120 blobs / 10.000 MiB
+this removes:          80 blobs / 5.000 MiB
+to delete:            300 blobs / 1.500 GiB
+total prune:          380 blobs / 1.505 GiB
+remaining:           9000 blobs / 40.000 GiB
+"""
+
+
+def _modes(mock_run):
+    modes = []
+    for call in mock_run.call_args_list:
+        cmd = call[0][0]
+        modes.append(cmd[cmd.index("--mode") + 1] + (
+            " --dry-run" if "--dry-run" in cmd else ""
+        ))
+    return modes
+
+
+def _write_report(output):
+    """side_effect writing ``output`` to the script's --report file."""
+    def run(cmd, **kwargs):
+        Path(cmd[cmd.index("--report") + 1]).write_text(output)
+    return run
+
+
+def _repo_with_params(**kwargs):
+    return ResticRepo(
+        repo_path=Path("/media/backups/local"),
+        password_file=Path("/tmp/pw.txt"),
+        prune_keep_params=ResticPruneKeepParams(
+            last=5, daily=7, weekly=4, monthly=6, yearly=1, **kwargs
+        ),
+    )
+
+
+def test_parse_total_prune_bytes():
+    assert parse_total_prune_bytes(PRUNE_OUTPUT) == int(1.505 * 1024**3)
+    assert parse_total_prune_bytes("no prune here") is None
+
+
+@mock.patch("resticlvm.orchestration.restic_repo.subprocess.run")
+def test_prune_passes_repack_limits(mock_run):
+    _repo_with_params(max_unused="10%", max_repack_size="2G").prune()
+
+    forget_cmd = mock_run.call_args_list[0][0][0]
+    prune_cmd = mock_run.call_args_list[1][0][0]
+    assert "--max-unused" not in forget_cmd
+    assert prune_cmd[prune_cmd.index("--max-unused") + 1] == "10%"
+    assert prune_cmd[prune_cmd.index("--max-repack-size") + 1] == "2G"
+
+
+@mock.patch("resticlvm.orchestration.restic_repo.subprocess.run")
+def test_prune_passes_performance_profile(mock_run, monkeypatch):
+    monkeypatch.setattr(restic_features, "restic_version", lambda: (0, 16, 4))
+    repo = _repo_with_params()
+    repo.performance = PerformanceProfile(
+        compression="max", pack_size=32, read_concurrency=8, gogc="50"
+    )
+
+    repo.prune()
+
+    for call in mock_run.call_args_list:
+        cmd = call[0][0]
+        assert cmd[cmd.index("--restic-opts") + 1] == (
+            "--compression=max --pack-size=32"
+        )
+        assert call.kwargs["env"]["GOGC"] == "50"
+
+
+@mock.patch("resticlvm.orchestration.restic_repo.subprocess.run")
+def test_prune_dry_run_passes_dry_run(mock_run):
+    _repo_with_params().prune(dry_run=True)
+
+    assert _modes(mock_run) == ["forget --dry-run", "prune --dry-run"]
+    assert load_state("prune") == {}
+
+
+@mock.patch("resticlvm.orchestration.restic_repo.subprocess.run")
+def test_prune_skipped_within_cadence(mock_run):
+    recent = (datetime.now() - timedelta(days=2)).isoformat()
+    save_state("prune", {"/media/backups/local": {"last_prune": recent}})
+
+    assert _repo_with_params(prune_every_days=7).prune() is True
+
+    assert _modes(mock_run) == ["forget"]
+
+
+@mock.patch("resticlvm.orchestration.restic_repo.subprocess.run")
+def test_prune_runs_after_cadence(mock_run):
+    old = (datetime.now() - timedelta(days=8)).isoformat()
+    save_state("prune", {"/media/backups/local": {"last_prune": old}})
+
+    _repo_with_params(prune_every_days=7).prune()
+
+    assert _modes(mock_run) == ["forget", "prune"]
+
+
+@mock.patch("resticlvm.orchestration.restic_repo.subprocess.run")
+def test_prune_skipped_below_min_reclaimable(mock_run):
+    mock_run.side_effect = _write_report(PRUNE_OUTPUT)
+
+    _repo_with_params(min_reclaimable="5G").prune()
+
+    assert _modes(mock_run) == ["forget", "prune --dry-run"]
+    record = load_state("prune")["/media/backups/local"]
+    assert record["last_estimate_bytes"] == int(1.505 * 1024**3)
+    assert "last_prune" not in record
+
+
+@mock.patch("resticlvm.orchestration.restic_repo.subprocess.run")
+def test_failed_estimate_prunes_anyway(mock_run):
+    """A failed estimate is not a reason to skip; the prune's result counts."""
+    def run(cmd, **kwargs):
+        if "--dry-run" in cmd or cmd[cmd.index("--mode") + 1] == "prune":
+            raise subprocess.CalledProcessError(1, "prune_repo.sh")
+    mock_run.side_effect = run
+
+    assert _repo_with_params(min_reclaimable="1G").prune() is False
+    assert _modes(mock_run) == ["forget", "prune --dry-run", "prune"]
+
+
+@mock.patch("resticlvm.orchestration.restic_repo.subprocess.run")
+def test_prune_records_duration_and_bytes(mock_run):
+    mock_run.side_effect = _write_report(PRUNE_OUTPUT)
+
+    _repo_with_params(min_reclaimable="1G").prune()
+
+    assert _modes(mock_run) == ["forget", "prune --dry-run", "prune"]
+    record = load_state("prune")["/media/backups/local"]
+    assert record["last_bytes_reclaimed"] == int(1.505 * 1024**3)
+    assert record["total_bytes_reclaimed"] == int(1.505 * 1024**3)
+    assert "last_prune_duration_s" in record
+    assert "last_prune" in record
+
+
+@mock.patch("resticlvm.orchestration.restic_repo.subprocess.run")
+def test_failed_forget_skips_prune(mock_run):
+    mock_run.side_effect = subprocess.CalledProcessError(1, "prune_repo.sh")
+
+    assert _repo_with_params().prune() is False
+    assert mock_run.call_count == 1
+
+
+@mock.patch("resticlvm.orchestration.restic_repo.subprocess.run")
+def test_forget_removes_snapshots_from_catalog(mock_run):
+    catalog = Catalog()
+    catalog.add("/media/backups/local", [
+        SnapshotRecord("1111aaaa", 1.0, "host", ["/boot"]),
+        SnapshotRecord("3333cccc", 3.0, "host", ["/boot"]),
+    ])
+    mock_run.side_effect = _write_report(
+        "remove 1 snapshots:\n1111aaaa  2026-01-01 03:00:00  host  /boot\n"
+    )
+
+    _repo_with_params().prune()
+
+    rows = catalog.snapshots("/media/backups/local", "host", ["/boot"])
+    assert [s.short_id for s in rows] == ["3333cccc"]
@@ -0,0 +1,147 @@
+"""Tests for the restore_runner module."""
+
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from resticlvm.orchestration import performance, restic_features
+from resticlvm.orchestration.backup_config import BackupConfigFactory
+from resticlvm.orchestration.catalog import Catalog, SnapshotRecord
+from resticlvm.orchestration.concurrency import BackendLimiter
+from resticlvm.orchestration.restore_runner import (
+    Replica,
+    choose_snapshot,
+    rank_replicas,
+    restore_command,
+    restore_volume,
+)
+from resticlvm.orchestration.snapshots_runner import Destination
+
+POLICY = {"keep_last": 1, "keep_daily": 1, "keep_weekly": 1,
+          "keep_monthly": 1, "keep_yearly": 1}
+
+
+@pytest.fixture
+def restic_version(monkeypatch):
+    """Pretend a given restic version is installed."""
+    monkeypatch.setattr(performance, "_warned", set())
+
+    def set_version(version):
+        monkeypatch.setattr(restic_features, "restic_version", lambda: version)
+    return set_version
+
+
+def _config():
+    raw = {
+        "prune_policy": {"p": POLICY},
+        "volume": {"boot": {
+            "volume_type": "standard_path",
+            "backup_source_path": "/boot",
+            "exclude_paths": [],
+            "repositories": [{
+                "repo_path": "/srv/a", "password_file": "/pw",
+                "prune_policy": "p",
+                "copy_to": [{"repo": "sftp:nas:/a",
+                             "password_file": "/nas_pw",
+                             "prune_policy": "p"}],
+            }],
+        }},
+    }
+    return BackupConfigFactory(raw).build()
+
+
+def _snap(short_id, time):
+    return SnapshotRecord(short_id, time, "host", ["/boot"])
+
+
+def test_choose_latest_snapshot_and_its_replicas():
+    vol = _config().volumes["boot"]
+    catalog = Catalog()
+    catalog.add("/srv/a", [_snap("1111aaaa", 1000.0), _snap("2222bbbb", 2000.0)])
+    catalog.add("sftp:nas:/a", [_snap("9999ffff", 1010.0)])
+
+    chosen, replicas = choose_snapshot(catalog, "boot", vol, "host")
+
+    assert chosen.short_id == "2222bbbb"
+    assert [(r.repo_path, r.snapshot) for r in replicas] == [
+        ("/srv/a", "2222bbbb"),
+    ]
+
+
+def test_choose_before_time_finds_copy_replica():
+    vol = _config().volumes["boot"]
+    catalog = Catalog()
+    catalog.add("/srv/a", [_snap("1111aaaa", 1000.0), _snap("2222bbbb", 2000.0)])
+    catalog.add("sftp:nas:/a", [_snap("9999ffff", 1010.0)])
+
+    chosen, replicas = choose_snapshot(
+        catalog, "boot", vol, "host", before=datetime.fromtimestamp(1500.0)
+    )
+
+    assert chosen.local_time < datetime.fromtimestamp(1500.0)
+    assert [(r.repo_path, r.snapshot) for r in replicas] == [
+        ("/srv/a", "1111aaaa"), ("sftp:nas:/a", "9999ffff"),
+    ]
+    assert choose_snapshot(catalog, "boot", vol, "host",
+                           snapshot_id="9999")[0].short_id == "9999ffff"
+
+
+def test_rank_prefers_local_then_throughput():
+    def replica(repo, throughput, error=None):
+        return Replica(Destination(repo, Path("/pw")), "1111aaaa",
+                       latency_s=0.1, throughput=throughput, error=error)
+
+    ranked = rank_replicas([
+        replica("sftp:slow:/a", 1e6),
+        replica("sftp:fast:/a", 5e7),
+        replica("/srv/a", 1e5),
+        replica("sftp:down:/a", None, error="timeout"),
+    ])
+
+    assert [r.repo_path for r in ranked] == [
+        "/srv/a", "sftp:fast:/a", "sftp:slow:/a",
+    ]
+
+
+def test_restore_command_uses_subfolder_syntax_when_supported(restic_version):
+    replica = Replica(Destination("sftp:nas:/a", Path("/pw")), "1111aaaa")
+
+    restic_version((0, 17, 0))
+    cmd = restore_command(replica, "/boot", Path("/r/boot"), verify=True,
+                          connections=8)
+    assert cmd[cmd.index("restore"):] == [
+        "restore", "1111aaaa:/boot", "--target", "/r/boot", "--verify",
+    ]
+    assert "sftp.connections=8" in cmd
+
+    restic_version((0, 16, 4))
+    cmd = restore_command(replica, "/boot", Path("/r/boot"), verify=False)
+    assert cmd[cmd.index("restore"):] == [
+        "restore", "1111aaaa", "--include", "/boot", "--target", "/r/boot",
+    ]
+
+
+@mock.patch("resticlvm.orchestration.restore_runner.supports",
+            return_value=True)
+@mock.patch("resticlvm.orchestration.restore_runner.subprocess.run")
+def test_failed_restore_falls_back_to_next_replica(mock_run, _supports,
+                                                   tmp_path):
+    def run(cmd, **kwargs):
+        if cmd[2] == "/srv/a":
+            return subprocess.CompletedProcess(cmd, 1, "", "Fatal: broken")
+        (tmp_path / "boot" / "vmlinuz").write_bytes(b"x" * 100)
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+    mock_run.side_effect = run
+    vol = _config().volumes["boot"]
+    replicas = [Replica(Destination("/srv/a", Path("/pw")), "1111aaaa"),
+                Replica(Destination("sftp:nas:/a", Path("/pw")), "9999ffff")]
+
+    result = restore_volume("boot", vol, replicas, tmp_path / "boot", {},
+                            BackendLimiter(None))
+
+    assert result.ok
+    assert result.repo_path == "sftp:nas:/a"
+    assert result.bytes_restored == 100
@@ -0,0 +1,56 @@
+"""Tests for the retention module."""
+
+from resticlvm.orchestration.retention import (
+    RetainedSnapshot,
+    is_retained_name,
+    plan_rotation,
+    retained_name,
+)
+
+G = 1024**3
+
+
+def _snap(ts, origin="root", size=5 * G, thin=False, invalid=False):
+    return RetainedSnapshot(
+        vg="vg0", name=retained_name(origin, ts), origin=origin,
+        size_bytes=size, thin=thin, pool="pool0" if thin else None,
+        invalid=invalid,
+    )
+
+
+def _plan(snaps, keep=3, max_classic=1, budget=None, free=100 * G,
+          needed=10 * G, pool_pct=10.0):
+    removed = plan_rotation(
+        snaps, {("vg0", "root"): keep, ("vg0", "home"): keep}, max_classic,
+        budget, {"vg0": free}, {"vg0": needed},
+        {("vg0", "pool0"): pool_pct}, 80,
+    )
+    return [s.name.rpartition("_keep_")[2] for s in removed]
+
+
+def test_retained_names():
+    assert retained_name("root", "20260301_010000") == "root_rlvm_keep_20260301_010000"
+    assert is_retained_name("root_rlvm_keep_20260301_010000")
+    assert not is_retained_name("vg0_root_snapshot_20260301_010000")
+
+
+def test_keeps_newest_thin_and_limits_classic_per_origin():
+    thin = [_snap(f"20260301_0{h}0000", thin=True) for h in range(1, 6)]
+    assert _plan(thin) == ["20260301_010000", "20260301_020000"]
+
+    classic = [_snap(f"20260301_0{h}0000") for h in range(1, 4)]
+    assert _plan(classic, max_classic=2) == ["20260301_010000"]
+    # Invalid snapshots go regardless.
+    assert _plan([_snap("20260301_040000", invalid=True)]) == ["20260301_040000"]
+
+
+def test_budget_pool_and_vg_space_guards():
+    thin = [_snap(f"20260301_0{h}0000", thin=True, size=4 * G)
+            for h in range(1, 4)]
+    assert _plan(thin, budget=9 * G) == ["20260301_010000"]
+    assert _plan(thin, pool_pct=90.0) == ["20260301_010000", "20260301_020000"]
+
+    classic = [_snap("20260301_010000", origin="home"),
+               _snap("20260301_020000")]
+    # 8G free, 10G needed: the oldest classic snapshot frees enough.
+    assert _plan(classic, free=8 * G) == ["20260301_010000"]
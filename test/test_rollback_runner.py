@@ -0,0 +1,38 @@
+"""Tests for the rollback_runner module."""
+
+import pytest
+
+from resticlvm.orchestration.retention import RetainedSnapshot, retained_name
+from resticlvm.orchestration.rollback_runner import (
+    choose_retained,
+    rollback_command,
+)
+
+
+def _snap(ts, invalid=False):
+    return RetainedSnapshot(vg="vg0", name=retained_name("home", ts),
+                            origin="home", size_bytes=0, invalid=invalid)
+
+
+def test_choose_newest_valid_or_named():
+    snaps = [_snap("20260301_010000"), _snap("20260301_020000"),
+             _snap("20260301_030000", invalid=True)]
+    assert choose_retained(snaps).name.endswith("020000")
+    assert choose_retained(snaps, snaps[0].name) is snaps[0]
+    with pytest.raises(ValueError, match="invalid"):
+        choose_retained(snaps, snaps[2].name)
+    with pytest.raises(ValueError, match="no retained"):
+        choose_retained(snaps, "nope")
+
+
+def test_rollback_command_modes():
+    snap = _snap("20260301_010000")
+    merge = rollback_command(snap, True, [], None, dry_run=False)
+    assert merge[merge.index("-s") + 1] == snap.name
+    assert "-M" in merge and "-d" not in merge
+
+    copy = rollback_command(snap, False, ["etc", "/srv/www"], "/home",
+                            dry_run=True)
+    assert copy[copy.index("-t") + 2:] == [
+        "-p", "etc", "-p", "/srv/www", "-d", "/home", "-n",
+    ]
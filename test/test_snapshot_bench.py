@@ -0,0 +1,23 @@
+"""Tests for the snapshot_bench module."""
+
+from resticlvm.orchestration.snapshot_bench import (
+    LatencyStats,
+    best_chunksize,
+    summarize,
+)
+
+
+def test_summarize():
+    stats = summarize([i / 1000 for i in range(1, 101)])
+    assert stats.p50 == 51.0
+    assert stats.p99 == 100.0
+    assert round(stats.mean, 1) == 50.5
+
+
+def test_best_chunksize_prefers_lowest_p99_then_mean():
+    results = {
+        "4K": LatencyStats(p50=0.5, p99=9.0, mean=1.0),
+        "64K": LatencyStats(p50=0.6, p99=4.0, mean=1.4),
+        "256K": LatencyStats(p50=0.7, p99=4.0, mean=1.2),
+    }
+    assert best_chunksize(results) == "256K"
@@ -1,5 +1,7 @@
 """Tests for the SnapshotCoordinator (batch snapshot management, issue #84)."""
 
+import importlib.resources as pkg_resources
+import re
 import signal
 import subprocess
 from pathlib import Path
@@ -7,6 +9,7 @@ from unittest import mock
 
 import pytest
 
+from resticlvm import scripts
 from resticlvm.orchestration.data_classes import BackupJob, TokenConfigKeyPair
 from resticlvm.orchestration.snapshot_coordinator import (
     SnapshotCoordinator,
@@ -329,6 +332,75 @@ def test_teardown_all_reverse_order(mock_run):
     assert "lv0" in teardown_snaps[2]
 
 
+@mock.patch.object(SnapshotCoordinator, "_teardown_one")
+@mock.patch("resticlvm.orchestration.snapshot_coordinator.snapshot_journal")
+@mock.patch("resticlvm.orchestration.snapshot_coordinator.subprocess.run")
+def test_teardown_all_reports_latency_per_snapshot(
+    mock_run, _journal, mock_teardown, capsys
+):
+    """A real run reports how long each snapshot took to tear down."""
+    jobs = [
+        _make_lv_job(name="root", lv="lv0"),
+        _make_lv_job(name="git", lv="lv_git_01"),
+    ]
+    mock_run.side_effect = _mock_create_run(jobs)
+
+    coord = SnapshotCoordinator(jobs, dry_run=False)
+    coord.create_all()
+    capsys.readouterr()
+    coord.teardown_all()
+
+    assert mock_teardown.call_count == 2
+    lines = [
+        line for line in capsys.readouterr().out.splitlines()
+        if "Snapshot teardown:" in line
+    ]
+    assert len(lines) == 1
+    assert re.search(r"root \d+\.\d{2}s", lines[0])
+    assert re.search(r"git \d+\.\d{2}s", lines[0])
+
+
+@mock.patch.object(SnapshotCoordinator, "_teardown_one")
+@mock.patch("resticlvm.orchestration.snapshot_coordinator.subprocess.run")
+def test_teardown_all_dry_run_skips_latency_report(
+    mock_run, mock_teardown, capsys
+):
+    """A dry run has nothing to time and prints no latency line."""
+    jobs = [_make_lv_job()]
+    mock_run.side_effect = _mock_create_run(jobs)
+
+    coord = SnapshotCoordinator(jobs, dry_run=True)
+    coord.create_all()
+    coord.teardown_all()
+
+    mock_teardown.assert_called_once()
+    assert "Snapshot teardown:" not in capsys.readouterr().out
+
+
+def test_cleanup_snapshot_resources_sets_teardown_seconds(tmp_path):
+    """snapshot_teardown.sh reports the time cleanup_snapshot_resources took."""
+    lib = pkg_resources.files(scripts) / "lib" / "lv_snapshots.sh"
+    base = tmp_path / "resticlvm-20260717_120000"
+    mount_point = base / "vg0_lv0_snapshot_20260717_120000"
+    mount_point.mkdir(parents=True)
+
+    result = subprocess.run(
+        [
+            "bash", "-c",
+            'source "$1"; SNAPSHOT_RELEASE_TIMEOUT=1; '
+            'cleanup_snapshot_resources "$2" "$3" "" ""; '
+            'echo "TEARDOWN_SECONDS=$TEARDOWN_SECONDS"',
+            "bash", str(lib), str(mount_point), str(base),
+        ],
+        check=True, capture_output=True, text=True,
+    )
+
+    assert re.fullmatch(
+        r"TEARDOWN_SECONDS=\d+\.\d{2}", result.stdout.strip()
+    )
+    assert not base.exists()
+
+
 # ─── get_mount_point / has ────────────────────────────────────────
 
 
@@ -558,3 +630,170 @@ def test_signal_handler_installed_in_context(mock_run):
     # After exiting, original handlers should be restored
     assert signal.getsignal(signal.SIGINT) == original_int
     assert signal.getsignal(signal.SIGTERM) == original_term
+
+
+@mock.patch("resticlvm.orchestration.snapshot_coordinator.subprocess.run")
+def test_retained_snapshot_kept_under_new_name(mock_run):
+    """A retained volume's snapshot is taken thin-if-possible and renamed."""
+    jobs = [_make_lv_job(name="root", lv="lv0"),
+            _make_lv_job(name="home", lv="lv_home")]
+    jobs[0].config["retain_snapshots"] = 2
+    mock_run.side_effect = _mock_create_run(jobs)
+
+    coord = SnapshotCoordinator(jobs, dry_run=True)
+    coord.create_all()
+    coord.retain("root")
+    coord.teardown_all()
+
+    calls = [c.args[0] for c in mock_run.call_args_list]
+    creates = [c for c in calls if "snapshot_create.sh" in str(c)]
+    assert ["-T" in c for c in creates] == [True, False]
+    teardowns = {c[c.index("-s") + 1]: c for c in calls
+                 if "snapshot_teardown.sh" in str(c)}
+    root = next(c for s, c in teardowns.items() if "_lv0_" in s)
+    home = next(c for s, c in teardowns.items() if "lv_home" in s)
+    assert root[root.index("-k") + 1] == f"lv0_rlvm_keep_{coord._timestamp}"
+    assert "-k" not in home
+
+
+@mock.patch("resticlvm.orchestration.snapshot_coordinator.subprocess.run")
+def test_snapshots_journaled_until_torn_down(mock_run):
+    """Each snapshot is journaled before creation and forgotten at teardown."""
+    from resticlvm.orchestration.snapshot_journal import load_journal
+
+    jobs = [_make_lv_job(name="root", lv="lv0")]
+    mock_run.side_effect = _mock_create_run(jobs)
+    coord = SnapshotCoordinator(jobs)
+    coord._timestamp = "20260717_120000"
+    coord.create_all()
+
+    entry = load_journal()["vg0_lv0_snapshot_20260717_120000"]
+    assert entry["mount_point"] == coord.get_mount_point("root")
+    assert entry["mount_base"] == "/tmp/resticlvm-20260717_120000"
+
+    coord.teardown_all()
+    assert load_journal() == {}
+
+
+@mock.patch("resticlvm.orchestration.snapshot_coordinator.subprocess.run")
+def test_snapshots_created_first_and_mounted_on_demand(mock_run):
+    """All snapshots are taken unmounted; each is mounted once, when asked."""
+    jobs = [_make_lv_job(name="root", lv="lv0"),
+            _make_lv_job(name="git", lv="lv_git_01")]
+    mock_run.side_effect = _mock_create_run(jobs)
+
+    coord = SnapshotCoordinator(jobs, dry_run=True)
+    coord.create_all()
+
+    def scripts_called():
+        return [Path(c.args[0][1]).name for c in mock_run.call_args_list]
+
+    assert scripts_called() == ["snapshot_create.sh"] * 2
+    assert all("-N" in c.args[0] for c in mock_run.call_args_list)
+
+    mount_point = coord.get_mount_point("git")
+    coord.get_mount_point("git")
+    mount = mock_run.call_args_list[-1].args[0]
+    assert scripts_called()[2:] == ["snapshot_mount.sh"]
+    assert mount[mount.index("-m") + 1] == mount_point
+
+
+@mock.patch("resticlvm.orchestration.snapshot_coordinator.subprocess.run")
+def test_readonly_mount_profile_and_cow_split(mock_run, capsys):
+    """Snapshots mount read-only (lv_root with an overlay); the COW report
+    separates what mounting used from what the backup did."""
+    root = _make_lv_job(name="root", lv="lv0")
+    data = _make_lv_job(name="data", lv="lv_data")
+    data.category = "lv_nonroot"
+    create_run = _mock_create_run([root, data])
+    cow = ["  2.00\n"]
+
+    def side_effect(*args, **kwargs):
+        cmd = kwargs.get("args") or args[0]
+        if cmd[0] == "lvs":
+            return subprocess.CompletedProcess(cmd, 0, stdout=cow[0], stderr="")
+        return create_run(*args, **kwargs)
+
+    mock_run.side_effect = side_effect
+    coord = SnapshotCoordinator([root, data], snapshot_readonly_lv=True)
+    coord.create_all()
+    coord.get_mount_point("root")
+    root_mount = mock_run.call_args_list[-2].args[0]
+    coord.get_mount_point("data")
+    data_mount = mock_run.call_args_list[-2].args[0]
+
+    assert root_mount[root_mount.index("-p") + 1] == "readonly"
+    assert "-o" in root_mount and "-o" not in data_mount
+    assert "-r" in root_mount and "-r" in data_mount
+
+    cow[0] = "  10.00\n"
+    coord.report_cow_usage()
+    assert "2.0% after mount, 8.0% since" in capsys.readouterr().out
+
+
+@mock.patch("resticlvm.orchestration.snapshot_coordinator.plan_placement")
+@mock.patch("resticlvm.orchestration.snapshot_coordinator.subprocess.run")
+def test_chunksize_and_cow_pvs_passed_to_create(mock_run, mock_plan):
+    """Configured PVs win; other snapshots are placed off their origin."""
+    root = _make_lv_job(name="root", lv="lv0")
+    root.config["snapshot_chunksize"] = "64K"
+    data = _make_lv_job(name="data", lv="lv_data")
+    data.config["snapshot_pvs"] = ["/dev/sdc1"]
+    mock_run.side_effect = _mock_create_run([root, data])
+    mock_plan.return_value = {"root": ["/dev/sdb1"]}
+
+    coord = SnapshotCoordinator([root, data])
+    coord.create_all()
+
+    assert [r[0] for r in mock_plan.call_args.args[0]] == ["root"]
+    creates = [c.args[0] for c in mock_run.call_args_list
+               if "snapshot_create.sh" in str(c.args[0][1])]
+    assert creates[0][-4:] == ["-c", "64K", "-P", "/dev/sdb1"]
+    assert "-c" not in creates[1] and creates[1][-2:] == ["-P", "/dev/sdc1"]
+
+
+@mock.patch("resticlvm.orchestration.snapshot_coordinator.subprocess.run")
+def test_volumes_on_one_lv_share_a_snapshot(mock_run):
+    """One snapshot per origin LV, sized once, released after its last user."""
+    git = _make_lv_job(name="git", lv="data", snap_size="5G")
+    www = _make_lv_job(name="www", lv="data", snap_size="8G")
+    root = _make_lv_job(name="root", lv="lv0")
+    for job in (git, www):
+        job.category = "lv_nonroot"
+    mock_run.side_effect = _mock_create_run([git, root])
+
+    coord = SnapshotCoordinator([git, www, root])
+    coord.create_all()
+
+    def calls(script):
+        return [c.args[0] for c in mock_run.call_args_list
+                if script in str(c.args[0][1])]
+
+    creates = calls("snapshot_create.sh")
+    assert len(creates) == 2
+    assert creates[0][creates[0].index("-z") + 1] == "8G"
+    assert coord.get_mount_point("git") == coord.get_mount_point("www")
+    assert len(calls("snapshot_mount.sh")) == 1
+
+    coord.release("git")
+    assert calls("snapshot_teardown.sh") == []
+    coord.release("www")
+    teardowns = calls("snapshot_teardown.sh")
+    assert [t[t.index("-s") + 1] for t in teardowns] == [
+        "vg0_data_snapshot_20260717_120000"
+    ]
+    assert coord.has("root") and not coord.has("git")
+
+
+@mock.patch("resticlvm.orchestration.snapshot_coordinator.rotate")
+def test_rotation_needs_override_own_snapshots(mock_rotate):
+    """A wave's rotation keeps room for what the run still needs."""
+    jobs = [_make_lv_job("root", "vg0", "lv_root", "10G")]
+    jobs[0].config["retain_snapshots"] = 1
+    SnapshotCoordinator(
+        jobs, rotation_needs={"vg0": 15 * 1024**3},
+    ).rotate_retained()
+    assert mock_rotate.call_args.args[1] == {"vg0": 16 * 1024**3}
+
+    SnapshotCoordinator(jobs).rotate_retained()
+    assert mock_rotate.call_args.args[1] == {"vg0": 11 * 1024**3}
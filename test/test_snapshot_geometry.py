@@ -0,0 +1,44 @@
+"""Tests for the snapshot_geometry module."""
+
+import pytest
+
+from resticlvm.orchestration.snapshot_geometry import (
+    PhysicalVolume,
+    parse_chunksize,
+    place_snapshots,
+)
+
+G = 1024**3
+
+
+def test_parse_chunksize():
+    assert parse_chunksize("4K") == 4096
+    assert parse_chunksize("512k") == 512 * 1024
+    for bad in ("2K", "1M", "48K", "lots"):
+        with pytest.raises(ValueError):
+            parse_chunksize(bad)
+
+
+def test_snapshots_placed_off_their_origin_disks():
+    pvs = [
+        PhysicalVolume("/dev/sda2", 50 * G, frozenset({"sda"})),
+        PhysicalVolume("/dev/sda3", 90 * G, frozenset({"sda"})),
+        PhysicalVolume("/dev/sdb1", 30 * G, frozenset({"sdb"})),
+        PhysicalVolume("/dev/nvme0n1p1", 25 * G, frozenset({"nvme0n1"})),
+    ]
+    placement = place_snapshots(
+        [
+            ("root", 20 * G, frozenset({"sda"})),
+            ("home", 20 * G, frozenset({"sda"})),
+            ("db", 10 * G, frozenset({"sdb"})),
+            ("big", 60 * G, frozenset({"sda"})),
+        ],
+        pvs,
+    )
+    # The first takes the roomiest PV off sda; the second the next that fits.
+    assert placement["root"] == ["/dev/sdb1"]
+    assert placement["home"] == ["/dev/nvme0n1p1"]
+    # Partitions of the origin's own disk never qualify.
+    assert placement["db"] == ["/dev/sda3"]
+    # No PV off sda has room left: LVM places it.
+    assert "big" not in placement
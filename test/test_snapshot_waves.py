@@ -0,0 +1,79 @@
+"""Tests for the snapshot_waves module."""
+
+import pytest
+
+from resticlvm.orchestration.data_classes import BackupJob
+from resticlvm.orchestration.snapshot_waves import (
+    consistency_groups,
+    plan_waves,
+    rotation_needs,
+)
+
+G = 1024**3
+
+
+def _job(name, lv, size="10G", group=None, vg="vg0", retain=0):
+    config = {"vg_name": vg, "lv_name": lv, "snapshot_size": size}
+    if group:
+        config["consistency_group"] = group
+    if retain:
+        config["retain_snapshots"] = retain
+    return BackupJob(
+        script_name="backup_lv_nonroot.sh", script_token_config_key_pairs=[],
+        config=config, name=name, category="lv_nonroot", repositories=[],
+    )
+
+
+def test_groups_join_declared_groups_and_shared_lvs():
+    jobs = [
+        _job("db", "db", group="app"),
+        _job("www", "data"),
+        _job("uploads", "uploads", group="app"),
+        _job("git", "data", group="app"),  # shares www's LV: www joins "app"
+        _job("home", "home"),
+    ]
+    groups = consistency_groups(jobs)
+    assert [[j.name for j in g.jobs] for g in groups] == [
+        ["db", "www", "uploads", "git"], ["home"],
+    ]
+    # The shared data LV is reserved once.
+    assert groups[0].needs() == {"vg0": 30 * G}
+
+
+def test_waves_pack_groups_in_order():
+    groups = consistency_groups([
+        _job("a", "a", size="20G"),
+        _job("b", "b", size="15G"),
+        _job("c", "c", size="5G"),
+        _job("d", "d", size="8G", vg="vg1"),
+    ])
+    waves = plan_waves(groups, {"vg0": 25 * G, "vg1": 10 * G})
+    assert [[g.name for g in wave] for wave in waves] == [["a", "c", "d"], ["b"]]
+
+    assert len(plan_waves(groups, {"vg0": 40 * G, "vg1": 10 * G})) == 1
+    with pytest.raises(ValueError, match="'a' needs 20"):
+        plan_waves(groups, {"vg0": 10 * G, "vg1": 10 * G})
+
+
+def test_retained_snapshots_are_charged_to_later_waves():
+    """A retained snapshot stays after its wave; later waves must hold it."""
+    b, c = _job("b", "b", size="20G"), _job("c", "c", size="25G")
+    a = _job("a", "a", size="8G", retain=1)
+    groups = consistency_groups([b, c, a])
+    waves = plan_waves(groups, {"vg0": 30 * G})
+    # In the first wave, a's retained snapshot would leave c no room.
+    assert [[g.name for g in wave] for wave in waves] == [["b"], ["c"], ["a"]]
+
+
+def test_rotation_leaves_room_for_later_waves_and_next_run():
+    """VG free 25G, 1G margin: a (10G, retained) and b (15G) need two waves.
+    Rotating after a's wave must keep 15G free for b."""
+    a = _job("a", "a", size="10G", retain=1)
+    b = _job("b", "b", size="15G")
+    groups = consistency_groups([a, b])
+    waves = plan_waves(groups, {"vg0": 24 * G})
+    assert [[g.name for g in wave] for wave in waves] == [["a"], ["b"]]
+
+    needs = rotation_needs([[a], [b]])
+    assert needs == [{"vg0": 15 * G}, {"vg0": 15 * G}]
+    assert rotation_needs([[a, b]]) == [None]
@@ -0,0 +1,78 @@
+"""Tests for the snapshots_runner module."""
+
+import argparse
+from unittest import mock
+
+from resticlvm.orchestration.catalog import Catalog, SnapshotRecord
+from resticlvm.orchestration.snapshots_runner import run
+
+CONFIG = """
+[prune_policy.standard]
+keep_last = 1
+keep_daily = 1
+keep_weekly = 1
+keep_monthly = 1
+keep_yearly = 1
+
+[volume.boot]
+volume_type = "standard_path"
+backup_source_path = "/boot"
+exclude_paths = []
+
+[[volume.boot.repositories]]
+repo_path = "/srv/backup/boot"
+password_file = "/tmp/pw.txt"
+prune_policy = "standard"
+
+[[volume.boot.repositories.copy_to]]
+repo = "/mnt/nas/boot"
+password_file = "/tmp/nas_pw.txt"
+prune_policy = "standard"
+"""
+
+
+def _args(config, **kwargs):
+    defaults = dict(
+        config=str(config), dry_run=False, category=None, name=None,
+        refresh=False, cached=False, gaps=False,
+    )
+    return argparse.Namespace(**{**defaults, **kwargs})
+
+
+def _snap(short_id, time):
+    return SnapshotRecord(short_id, time, "host", ["/boot"])
+
+
+@mock.patch("resticlvm.orchestration.snapshots_runner.socket.gethostname",
+            return_value="host")
+@mock.patch("resticlvm.orchestration.snapshots_runner.reconcile")
+def test_shows_latest_snapshot_and_replication_gap(
+    mock_reconcile, _hostname, tmp_path, capsys
+):
+    config = tmp_path / "backup.toml"
+    config.write_text(CONFIG)
+    catalog = Catalog()
+    catalog.add("/srv/backup/boot", [_snap("1111aaaa", 1000.0),
+                                      _snap("2222bbbb", 2000.0)])
+    catalog.add("/mnt/nas/boot", [_snap("9999ffff", 1000.0)])
+
+    run(_args(config, cached=True, gaps=True))
+
+    out = capsys.readouterr().out
+    mock_reconcile.assert_not_called()
+    assert "/srv/backup/boot: 2222bbbb" in out
+    assert "copy → /mnt/nas/boot: 9999ffff" in out
+    assert "missing 1 snapshot(s) from /srv/backup/boot" in out
+    assert "- 2222bbbb" in out
+
+
+@mock.patch("resticlvm.orchestration.snapshots_runner.reconcile")
+def test_reconciles_only_stale_repositories(mock_reconcile, tmp_path):
+    config = tmp_path / "backup.toml"
+    config.write_text(CONFIG)
+    Catalog().replace("/srv/backup/boot", [])
+
+    run(_args(config))
+
+    targets = mock_reconcile.call_args.args[1]
+    assert list(targets) == ["/mnt/nas/boot"]
@@ -0,0 +1,93 @@
+"""Tests for the standby module."""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from resticlvm.orchestration import restic_features
+from resticlvm.orchestration.data_classes import BackupJob
+from resticlvm.orchestration.restic_repo import ResticRepo
+from resticlvm.orchestration.standby import (
+    refresh_standbys,
+    standby_source,
+)
+from resticlvm.orchestration.state import load_state, save_state
+
+
+@pytest.fixture(autouse=True)
+def restic_0_17(monkeypatch):
+    monkeypatch.setattr(restic_features, "restic_version", lambda: (0, 17, 3))
+
+
+def _repo(path):
+    return ResticRepo(repo_path=Path(path), password_file=Path("/pw"),
+                      prune_keep_params=None)
+
+
+def _job(standby=None, name="home"):
+    config = {"backup_source_path": f"/{name}", "exclude_paths": []}
+    if standby is not None:
+        config["standby"] = standby
+    return BackupJob(
+        script_name="backup_path.sh", script_token_config_key_pairs=[],
+        config=config, name=name, category="standard_path",
+        repositories=[_repo("sftp:nas:/home"), _repo("/srv/home")],
+    )
+
+
+def _record(key, repo, snapshot, paths, time):
+    state = load_state("parents")
+    state.setdefault(key, {})[repo] = {
+        "snapshot": snapshot, "paths": paths, "time": time,
+    }
+    save_state("parents", state)
+
+
+def test_source_prefers_local_repo_and_latest_grouped_backup():
+    _record("standard_path.home", "sftp:nas:/home", "1111aaaa", ["/home"],
+            "2026-03-01T01:00:00")
+    _record("standard_path.home", "/srv/home", "2222bbbb", ["/home"],
+            "2026-03-01T01:00:00")
+    assert standby_source(_job()).snapshot == "2222bbbb"
+
+    # A later grouped run recorded under the group's key wins.
+    _record("standard_path.home+srv", "/srv/home", "3333cccc",
+            ["/home", "/srv"], "2026-03-02T01:00:00")
+    source = standby_source(_job())
+    assert (str(source.repo.repo_path), source.snapshot) == (
+        "/srv/home", "3333cccc",
+    )
+
+
+@mock.patch("resticlvm.orchestration.standby.subprocess.run")
+def test_refresh_restores_changes_at_low_priority_once(mock_run, tmp_path):
+    backup_time = (datetime.now() - timedelta(minutes=30)).isoformat()
+    _record("standard_path.home", "/srv/home", "2222bbbb", ["/home"],
+            backup_time)
+    target = tmp_path / "standby"
+    job = _job({"path": str(target), "vg_name": None, "lv_name": None})
+
+    assert refresh_standbys([job]) == []
+    assert refresh_standbys([job]) == []  # already up to date
+
+    cmd = mock_run.call_args.args[0]
+    assert mock_run.call_count == 1
+    assert cmd[:6] == ["nice", "-n", "19", "ionice", "-c", "3"]
+    assert cmd[cmd.index("restore"):] == [
+        "restore", "2222bbbb:/home", "--target", str(target),
+        "--overwrite", "if-changed", "--delete",
+    ]
+    record = load_state("standby")["standard_path.home"]
+    assert record["snapshot"] == "2222bbbb"
+    assert 29 * 60 <= record["lag_seconds"] <= 31 * 60
+
+
+@mock.patch("resticlvm.orchestration.standby.subprocess.run")
+def test_old_restic_skips_standbys(mock_run, monkeypatch):
+    monkeypatch.setattr(restic_features, "restic_version", lambda: (0, 16, 4))
+    job = _job({"path": "/srv/standby", "vg_name": None, "lv_name": None})
+
+    assert refresh_standbys([job, _job(name="srv")]) == ["standard_path.home"]
+    mock_run.assert_not_called()
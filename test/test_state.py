@@ -0,0 +1,34 @@
+"""Tests for the state module."""
+
+from resticlvm.orchestration.state import (
+    load_state,
+    save_state,
+    state_dir,
+    update_state,
+)
+
+
+def test_state_dir_from_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("RESTICLVM_STATE_DIR", str(tmp_path))
+    assert state_dir() == tmp_path
+
+
+def test_missing_state_is_empty():
+    assert load_state("nothing") == {}
+
+
+def test_save_and_load_roundtrip():
+    save_state("prune", {"/repo": {"last_prune": "2026-01-01T00:00:00"}})
+    assert load_state("prune") == {"/repo": {"last_prune": "2026-01-01T00:00:00"}}
+
+
+def test_update_state_merges_record():
+    update_state("prune", "/repo", {"a": 1})
+    update_state("prune", "/repo", {"b": 2})
+    assert load_state("prune") == {"/repo": {"a": 1, "b": 2}}
+
+
+def test_corrupt_state_is_ignored():
+    state_dir().mkdir(parents=True)
+    (state_dir() / "prune.json").write_text("{not json")
+    assert load_state("prune") == {}
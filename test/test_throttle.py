@@ -0,0 +1,70 @@
+"""Tests for the throttle module."""
+
+from unittest import mock
+
+from resticlvm.orchestration import throttle
+from resticlvm.orchestration.backup_config import ThrottleSettings
+from resticlvm.orchestration.throttle import (
+    DiskStat,
+    DutyCycle,
+    ThrottleReport,
+    interval_stats,
+    latency_throttle,
+    parse_disk_stat,
+)
+
+
+def test_latency_and_queue_depth_from_disk_stat():
+    # reads, merges, sectors, ticks, writes, merges, sectors, ticks,
+    # in flight, io ticks, time in queue, ...
+    before = parse_disk_stat(
+        "100 0 800 50 200 0 1600 400 0 300 450 0 0 0 0 0 0\n"
+    )
+    assert before == DiskStat(ios=300, ticks_ms=450, queue_ms=450)
+    after = DiskStat(ios=350, ticks_ms=1450, queue_ms=2450)
+    latency, depth = interval_stats(before, after, seconds=1.0)
+    assert latency == 20.0
+    assert depth == 2.0
+    # No I/O completed: nothing to wait for.
+    assert interval_stats(after, after, 1.0) == (0.0, 0.0)
+
+
+def test_duty_cycle_backs_off_over_slo_and_recovers():
+    duty = DutyCycle(slo_ms=20, min_duty=0.1)
+    assert duty.update(50) == 0.5
+    assert duty.update(50) == 0.25
+    assert duty.update(50) == 0.125
+    assert duty.update(50) == 0.1
+    assert duty.update(18) == 0.1  # within the SLO but no headroom: hold
+    assert round(duty.update(5), 2) == 0.2
+    for _ in range(20):
+        duty.update(0)
+    assert duty.duty == 1.0
+
+
+def test_report_states_throughput_traded():
+    report = ThrottleReport(slo_ms=20, elapsed=100.0, paused=25.0,
+                            read_bytes=75 * 1024**3)
+    report.add(30, 4.0)
+    report.add(10, 1.0)
+    lines = report.lines()
+    assert lines[0].startswith("origin latency over 20 ms in 1 of 2")
+    assert lines[1] == "restic paused 25s of 100s (25%)"
+    assert lines[2] == (
+        "read 75.0G at 768.0M/s, vs 1.0G/s unpaused: 256.0M/s traded"
+    )
+
+
+def test_throttle_watches_wave_origins_only_when_enabled():
+    job = mock.Mock(config={"vg_name": "vg0", "lv_name": "db"})
+    assert not isinstance(
+        latency_throttle(ThrottleSettings(), [job], dry_run=False),
+        throttle.LatencyThrottle,
+    )
+    with mock.patch.object(throttle, "LatencyThrottle") as cls:
+        settings = ThrottleSettings(latency_slo_ms=20)
+        latency_throttle(settings, [job, job], dry_run=False)
+        cls.assert_called_once_with(["/dev/vg0/db"], settings)
+        cls.reset_mock()
+        latency_throttle(settings, [job], dry_run=True)
+        cls.assert_not_called()
@@ -0,0 +1,191 @@
+"""Tests for the tune module."""
+
+import tomllib
+from unittest import mock
+
+import pytest
+
+from resticlvm.orchestration import restic_features
+from resticlvm.orchestration.backup_config import (
+    BackupConfigFactory,
+    VolumeConfig,
+    VolumeType,
+)
+from resticlvm.orchestration.tune import (
+    Trial,
+    TrialResult,
+    choose_best,
+    profile_snippet,
+    remove_scratch,
+    sample_files,
+    trial_grid,
+    tune_volume,
+)
+
+FAKE_RESTIC = """#!/bin/sh
+# Minimal restic stand-in: init/backup succeed, stats reports a size.
+for arg in "$@"; do
+    case "$arg" in
+        stats) echo '{"total_size": 4096}'; exit 0 ;;
+    esac
+done
+exit 0
+"""
+
+
+@pytest.fixture
+def fake_restic(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    restic = bin_dir / "restic"
+    restic.write_text(FAKE_RESTIC)
+    restic.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir) + ":/usr/bin:/bin")
+    monkeypatch.setattr(restic_features, "restic_version", lambda: (0, 16, 4))
+
+
+def _result(compression, seconds, stored):
+    return TrialResult(
+        trial=Trial(compression, 16, 2),
+        target="local",
+        seconds=seconds,
+        bytes_read=1000,
+        stored_bytes=stored,
+        cpu_seconds=1.0,
+        max_rss_kib=1024,
+    )
+
+
+def test_trial_grid_varies_one_setting_first():
+    grid = trial_grid(("auto", "max"), (16, 64), (2, 4))
+
+    assert grid[0] == Trial("auto", 16, 2)
+    assert set(grid[1:4]) == {
+        Trial("max", 16, 2), Trial("auto", 64, 2), Trial("auto", 16, 4)
+    }
+    assert grid[-1] == Trial("max", 64, 4)
+    assert len(grid) == 8
+
+
+def test_sample_files_is_deterministic_and_bounded(tmp_path):
+    for d in ("a", "b", "skip"):
+        (tmp_path / d).mkdir()
+        for i in range(10):
+            (tmp_path / d / f"f{i}").write_bytes(b"x" * 100)
+
+    files, total = sample_files(str(tmp_path), 450, {str(tmp_path / "skip")})
+
+    assert total == 500
+    assert len(files) == 5
+    assert not any("/skip/" in f for f in files)
+    assert sample_files(str(tmp_path), 450, {str(tmp_path / "skip")})[0] == files
+
+
+def test_choose_best():
+    fast_big = _result("off", 1.0, 1000)
+    slow_small = _result("max", 4.0, 500)
+    mid = _result("auto", 2.0, 540)
+    results = [fast_big, slow_small, mid]
+
+    assert choose_best(results, "speed") is fast_big
+    assert choose_best(results, "size") is slow_small
+    assert choose_best(results, "balanced") is mid
+    assert choose_best([], "speed") is None
+
+
+def test_profile_snippet_is_valid_config():
+    snippet = profile_snippet("home", _result("max", 2.0, 500), {"sftp": 5}, 1000)
+
+    raw = tomllib.loads(snippet)
+    config = BackupConfigFactory(raw).build()
+    profile = config.performance_profiles["home-tuned"]
+    assert profile.compression == "max"
+    assert profile.connections == {"sftp": 5}
+
+
+def test_tune_volume_runs_trials_within_budget(tmp_path, fake_restic, capsys):
+    data = tmp_path / "data"
+    data.mkdir()
+    for i in range(5):
+        (data / f"f{i}").write_bytes(b"x" * 1000)
+    vol = VolumeConfig(
+        volume_type=VolumeType.STANDARD_PATH,
+        backup_source_path=str(data),
+        exclude_paths=[],
+        repositories=[],
+    )
+
+    snippet = tune_volume(
+        "data", vol, None, sample_bytes=10_000, budget_s=60,
+        backends=False, prefer="speed", scratch_root=str(tmp_path),
+    )
+
+    assert "[performance_profile.data-tuned]" in snippet
+    out = capsys.readouterr().out
+    assert "Local trial 18/18" in out
+    assert not list(tmp_path.glob("rlvm-tune-*"))
+
+
+def test_tune_volume_stops_at_budget(tmp_path, fake_restic, capsys):
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / "f").write_bytes(b"x" * 1000)
+    vol = VolumeConfig(
+        volume_type=VolumeType.STANDARD_PATH,
+        backup_source_path=str(data),
+        exclude_paths=[],
+        repositories=[],
+    )
+
+    snippet = tune_volume(
+        "data", vol, None, sample_bytes=10_000, budget_s=0,
+        backends=False, prefer="speed", scratch_root=str(tmp_path),
+    )
+
+    assert snippet is None
+    assert "Time budget reached after 0 of 18" in capsys.readouterr().out
+
+
+def test_tune_volume_samples_subdirectory_of_lv(tmp_path, fake_restic, capsys):
+    """An lv_nonroot source below the LV's mount point maps into the snapshot."""
+    snapshot = tmp_path / "snap"
+    (snapshot / "git" / "x").mkdir(parents=True)
+    (snapshot / "git" / "x" / "f").write_bytes(b"x" * 1000)
+    (snapshot / "other").mkdir()
+    (snapshot / "other" / "g").write_bytes(b"y" * 1000)
+    vol = VolumeConfig(
+        volume_type=VolumeType.LV_NONROOT,
+        backup_source_path="/srv/git",
+        exclude_paths=[],
+        repositories=[],
+        vg_name="vg0",
+        lv_name="srv",
+    )
+
+    snippet = tune_volume(
+        "git", vol, str(snapshot), sample_bytes=10_000, budget_s=60,
+        backends=False, prefer="speed", scratch_root=str(tmp_path),
+        lv_mount="/srv",
+    )
+
+    assert snippet is not None
+    out = capsys.readouterr().out
+    assert f"from {snapshot}/git..." in out
+    assert "1 file(s), 1000B." in out
+
+
+@mock.patch("resticlvm.orchestration.tune.subprocess.run")
+def test_remove_scratch_per_backend(mock_run):
+    mock_run.return_value = mock.Mock(returncode=0)
+    assert remove_scratch("sftp:u@host:/srv/repo-rlvm-tune-1-5", {})
+    assert mock_run.call_args.args[0] == [
+        "ssh", "u@host", "rm -rf -- /srv/repo-rlvm-tune-1-5",
+    ]
+    assert remove_scratch("rclone:remote:repo-rlvm-tune-1-5", {})
+    assert mock_run.call_args.args[0] == [
+        "rclone", "purge", "remote:repo-rlvm-tune-1-5",
+    ]
+    mock_run.reset_mock()
+    assert not remove_scratch("s3:host/bucket/repo-rlvm-tune-1-5", {})
+    assert not remove_scratch("sftp:u@host:/srv/repo", {})
+    mock_run.assert_not_called()